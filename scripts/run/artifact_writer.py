@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""Control-loop artifact writers.
+
+Every window produces four artifact writes: a control-log line, a decisions
+CSV row, and rewrites of ``last_decision.json`` and ``policy_state.json``.
+Written inline, each one costs a ``mkdir``, an open, a write, and a close, so
+on parallel filesystems every window pays several metadata operations per GPU.
+
+:class:`InlineArtifactWriter` keeps that legacy behavior and is the default.
+:class:`BackgroundArtifactWriter` hands writes to a bounded queue drained by a
+background thread, which:
+
+1. Batches log lines and CSV rows, so one open/write/close covers every
+   pending line for a file.
+2. Coalesces ``last_decision.json`` and ``policy_state.json`` rewrites to the
+   latest pending value.
+3. Creates each parent directory once per run.
+
+Payloads, including timestamps, are rendered when the write is enqueued, so
+artifacts are identical to inline writes apart from when they reach disk.
+``flush()`` blocks until everything enqueued so far is on disk; the control
+loop calls it before writing ``final_summary.json`` and on every exit path.
+"""
+from __future__ import annotations
+
+import csv
+import dataclasses
+import io
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Literal, Protocol, runtime_checkable
+
+from src.common.experiment import AlgorithmState, Decision
+
+from scripts.run.control_runtime import (
+    DECISIONS_CSV_HEADER,
+    append_decision_row,
+    append_log,
+    decision_row,
+    decisions_csv_width,
+    format_log_line,
+    last_decision_json,
+    persist_state,
+    state_snapshot_json,
+    write_last_decision,
+)
+
+
+@runtime_checkable
+class ArtifactWriter(Protocol):
+    """Destination for the control loop's per-window artifact writes."""
+
+    def append_log(self, control_log: Path, message: str) -> None:
+        """Appends one timestamped line to the control log."""
+
+    def append_decision_row(
+        self,
+        path: Path,
+        policy_name: str,
+        decision: Decision,
+        window_index: int,
+        actuation_ms: float | None = None,
+    ) -> None:
+        """Appends one row to the decisions CSV."""
+
+    def write_last_decision(
+        self,
+        path: Path,
+        policy_name: str,
+        window_index: int,
+        decision: Decision,
+        actuation_ms: float | None = None,
+    ) -> None:
+        """Replaces ``last_decision.json`` with *decision*."""
+
+    def persist_state(self, state_path: Path, state: AlgorithmState) -> None:
+        """Replaces the ``policy_state.json`` snapshot with *state*."""
+
+    def append_text(self, path: Path, text: str) -> None:
+        """Appends pre-rendered *text* to *path*."""
+
+    def replace_text(self, path: Path, text: str) -> None:
+        """Replaces the contents of *path* with pre-rendered *text*."""
+
+    def flush(self) -> None:
+        """Blocks until every write submitted so far is on disk."""
+
+    def close(self) -> None:
+        """Flushes and releases writer resources.  Idempotent."""
+
+    def metrics(self) -> dict[str, object]:
+        """Returns JSON-serializable writer statistics."""
+
+
+class InlineArtifactWriter:
+    """Writes every artifact synchronously on the calling thread (legacy behavior)."""
+
+    def append_log(self, control_log: Path, message: str) -> None:
+        append_log(control_log, message)
+
+    def append_decision_row(
+        self,
+        path: Path,
+        policy_name: str,
+        decision: Decision,
+        window_index: int,
+        actuation_ms: float | None = None,
+    ) -> None:
+        append_decision_row(path, policy_name, decision, window_index, actuation_ms)
+
+    def write_last_decision(
+        self,
+        path: Path,
+        policy_name: str,
+        window_index: int,
+        decision: Decision,
+        actuation_ms: float | None = None,
+    ) -> None:
+        write_last_decision(path, policy_name, window_index, decision, actuation_ms)
+
+    def persist_state(self, state_path: Path, state: AlgorithmState) -> None:
+        persist_state(state_path, state)
+
+    def append_text(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as fp:
+            fp.write(text)
+
+    def replace_text(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+    def metrics(self) -> dict[str, object]:
+        return {"mode": "inline"}
+
+
+_OpKind = Literal["append", "csv_row", "replace", "barrier", "stop"]
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class _WriteOp:
+    """One queued artifact write (or a control marker for the writer thread)."""
+
+    kind: _OpKind
+    path: Path | None = None
+    text: str = ""
+    row: tuple[str, ...] = ()
+    enqueued_at_s: float = 0.0
+    done: threading.Event | None = None
+
+
+class BackgroundArtifactWriter:
+    """Batches artifact writes on a background thread behind a bounded queue.
+
+    The writer thread takes the first pending write, keeps collecting writes
+    for up to ``flush_interval_s`` (or until ``max_queue_size`` writes are
+    batched, or a flush is requested), then writes the batch grouped by file.
+    When the queue is full, submitting blocks, which bounds memory if the
+    filesystem stalls for longer than the queue can absorb.
+
+    Write errors of any type (I/O failures, unencodable text) are reported on
+    stderr and counted in :meth:`metrics`; they never propagate into the
+    control loop and never stop the writer thread, so :meth:`flush` and a
+    submit blocked on a full queue always return.  Writes submitted after
+    :meth:`close` are performed synchronously on the calling thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int = 1024,
+        flush_interval_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be >= 1.")
+        if flush_interval_s < 0:
+            raise ValueError("flush_interval_s must be >= 0.")
+        self.max_queue_size = int(max_queue_size)
+        self.flush_interval_s = float(flush_interval_s)
+        self._clock = clock
+        self._queue: queue.Queue[_WriteOp] = queue.Queue(maxsize=self.max_queue_size)
+        self._closed = False
+        self._close_lock = threading.Lock()
+
+        # Only touched by the thread that writes batches.
+        self._ready_dirs: set[Path] = set()
+        # Column count of each decisions CSV already opened.
+        self._csv_widths: dict[Path, int] = {}
+
+        self._enqueued_count = 0
+        self._max_queue_depth = 0
+        self._written_op_count = 0
+        self._coalesced_replace_count = 0
+        self._batch_count = 0
+        self._max_batch_size = 0
+        self._total_flush_s = 0.0
+        self._max_flush_s = 0.0
+        self._max_write_delay_s = 0.0
+        self._write_error_count = 0
+        self._last_write_error: str | None = None
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="control-artifact-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    # -- ArtifactWriter -----------------------------------------------------
+
+    def append_log(self, control_log: Path, message: str) -> None:
+        self._submit(_WriteOp("append", control_log, text=format_log_line(message)))
+
+    def append_decision_row(
+        self,
+        path: Path,
+        policy_name: str,
+        decision: Decision,
+        window_index: int,
+        actuation_ms: float | None = None,
+    ) -> None:
+        row = tuple(decision_row(policy_name, decision, window_index, actuation_ms))
+        self._submit(_WriteOp("csv_row", path, row=row))
+
+    def write_last_decision(
+        self,
+        path: Path,
+        policy_name: str,
+        window_index: int,
+        decision: Decision,
+        actuation_ms: float | None = None,
+    ) -> None:
+        text = last_decision_json(policy_name, window_index, decision, actuation_ms)
+        self._submit(_WriteOp("replace", path, text=text))
+
+    def persist_state(self, state_path: Path, state: AlgorithmState) -> None:
+        # Serialized now: the caller keeps mutating ``state`` after this returns.
+        self._submit(_WriteOp("replace", state_path, text=state_snapshot_json(state)))
+
+    def append_text(self, path: Path, text: str) -> None:
+        self._submit(_WriteOp("append", path, text=text))
+
+    def replace_text(self, path: Path, text: str) -> None:
+        self._submit(_WriteOp("replace", path, text=text))
+
+    def flush(self) -> None:
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(_WriteOp("barrier", done=done))
+        done.wait()
+
+    def close(self) -> None:
+        with self._close_lock:
+            if self._closed:
+                return
+            # Later submits write synchronously instead of queueing behind "stop".
+            self._closed = True
+            self._queue.put(_WriteOp("stop"))
+            self._thread.join()
+
+    def metrics(self) -> dict[str, object]:
+        batch_count = self._batch_count
+        return {
+            "mode": "background",
+            "queue_capacity": self.max_queue_size,
+            "flush_interval_s": self.flush_interval_s,
+            "enqueued_count": self._enqueued_count,
+            "max_queue_depth": self._max_queue_depth,
+            "written_op_count": self._written_op_count,
+            "coalesced_replace_count": self._coalesced_replace_count,
+            "batch_count": batch_count,
+            "max_batch_size": self._max_batch_size,
+            "mean_flush_latency_s": self._total_flush_s / batch_count if batch_count else 0.0,
+            "max_flush_latency_s": self._max_flush_s,
+            "max_write_delay_s": self._max_write_delay_s,
+            "write_error_count": self._write_error_count,
+            "last_write_error": self._last_write_error,
+        }
+
+    # -- Internals ----------------------------------------------------------
+
+    def _submit(self, op: _WriteOp) -> None:
+        op = dataclasses.replace(op, enqueued_at_s=self._clock())
+        if self._closed:
+            self._write_batch([op])
+            return
+        self._queue.put(op)
+        self._enqueued_count += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline_s = self._clock() + self.flush_interval_s
+            while batch[-1].kind not in ("barrier", "stop") and len(batch) < self.max_queue_size:
+                remaining_s = deadline_s - self._clock()
+                if remaining_s <= 0.0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining_s))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch([op for op in batch if op.path is not None])
+            except Exception as exc:  # noqa: BLE001 (the thread must outlive any batch)
+                self._record_error("batch", exc)
+            finally:
+                for op in batch:
+                    if op.done is not None:
+                        op.done.set()
+            if batch[-1].kind == "stop":
+                return
+
+    def _write_batch(self, ops: list[_WriteOp]) -> None:
+        if not ops:
+            return
+        started_s = self._clock()
+
+        appends: dict[Path, list[str]] = {}
+        rows: dict[Path, list[tuple[str, ...]]] = {}
+        replaces: dict[Path, str] = {}
+        for op in ops:
+            assert op.path is not None
+            if op.kind == "append":
+                appends.setdefault(op.path, []).append(op.text)
+            elif op.kind == "csv_row":
+                rows.setdefault(op.path, []).append(op.row)
+            else:
+                if op.path in replaces:
+                    self._coalesced_replace_count += 1
+                replaces[op.path] = op.text
+
+        for path, lines in appends.items():
+            self._guarded(path, self._append_text, path, "".join(lines))
+        for path, path_rows in rows.items():
+            self._guarded(path, self._append_rows, path, path_rows)
+        for path, text in replaces.items():
+            self._guarded(path, self._replace_text, path, text)
+
+        finished_s = self._clock()
+        flush_s = finished_s - started_s
+        self._written_op_count += len(ops)
+        self._batch_count += 1
+        self._max_batch_size = max(self._max_batch_size, len(ops))
+        self._total_flush_s += flush_s
+        self._max_flush_s = max(self._max_flush_s, flush_s)
+        oldest_s = min(op.enqueued_at_s for op in ops)
+        self._max_write_delay_s = max(self._max_write_delay_s, finished_s - oldest_s)
+
+    def _guarded(self, path: Path, write: Callable[..., None], *args: object) -> None:
+        try:
+            write(*args)
+        except Exception as exc:  # noqa: BLE001 (one bad write must not drop the rest)
+            self._record_error(str(path), exc)
+
+    def _record_error(self, where: str, exc: Exception) -> None:
+        self._write_error_count += 1
+        self._last_write_error = f"{where}: {type(exc).__name__}: {exc}"
+        print(f"artifact writer: {self._last_write_error}", file=sys.stderr)
+
+    def _ensure_parent(self, path: Path) -> None:
+        if path.parent not in self._ready_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._ready_dirs.add(path.parent)
+
+    def _append_text(self, path: Path, text: str) -> None:
+        self._ensure_parent(path)
+        with path.open("a", encoding="utf-8") as fp:
+            fp.write(text)
+
+    def _append_rows(self, path: Path, path_rows: list[tuple[str, ...]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        width = self._csv_widths.get(path)
+        if width is None:
+            self._ensure_parent(path)
+            width = decisions_csv_width(path)
+            if width is None:
+                writer.writerow(DECISIONS_CSV_HEADER)
+                width = len(DECISIONS_CSV_HEADER)
+        writer.writerows(row[:width] for row in path_rows)
+        with path.open("a", encoding="utf-8", newline="") as fp:
+            fp.write(buffer.getvalue())
+        self._csv_widths[path] = width
+
+    def _replace_text(self, path: Path, text: str) -> None:
+        self._ensure_parent(path)
+        path.write_text(text, encoding="utf-8")
+
+
+def build_artifact_writer(
+    mode: str,
+    *,
+    max_queue_size: int = 1024,
+    flush_interval_s: float = 1.0,
+) -> ArtifactWriter:
+    """Returns the writer for ``CONTROL_ARTIFACT_WRITER`` *mode*."""
+    normalized = mode.strip().lower()
+    if normalized == "inline":
+        return InlineArtifactWriter()
+    if normalized == "background":
+        return BackgroundArtifactWriter(
+            max_queue_size=max_queue_size,
+            flush_interval_s=flush_interval_s,
+        )
+    raise ValueError(
+        f"Unsupported CONTROL_ARTIFACT_WRITER={mode!r}. Supported values: background, inline."
+    )
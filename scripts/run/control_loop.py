@@ -11,22 +11,42 @@ Key improvements over the legacy hook:
 - Policy state lives in memory for the whole run (no JSON round-trip per window).
 - ``finalize()`` is guaranteed to be called and its output is persisted.
 - A single failing window is caught, logged, and skipped; the run continues.
+
+:func:`run_control_loop_async` is a pipelined alternative that overlaps the
+next window's telemetry with the current window's actuation and artifact
+writes, while keeping ``on_window()`` calls strictly ordered.
+
+Both loops write their per-window artifacts through an
+:class:`~scripts.run.artifact_writer.ArtifactWriter`; the background writer
+batches those writes off the control path.
 """
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import contextlib
 import dataclasses
 import json
 import os
+import signal
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Any, Callable, Mapping
+from typing import Any, Awaitable, Callable, Mapping, Sequence
 
 # Ensure repository root is importable when invoked directly from Slurm or CLI.
 REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from src.common.control import (
+    ClockController,
+    ClockObserver,
+    DeduplicatingClockController,
+    ShellTemplateController,
+    TimedClockController,
+)
 from src.common.experiment import (
     AlgorithmInterface,
     AlgorithmState,
@@ -37,22 +57,61 @@ from src.common.experiment import (
     StaticPolicy,
     validate_decision,
 )
+from src.common.telemetry import TelemetrySource
 from src.methods.registry import resolve_policy
 
+from scripts.run.artifact_writer import (
+    ArtifactWriter,
+    InlineArtifactWriter,
+    build_artifact_writer,
+)
 from scripts.run.control_runtime import (
-    append_decision_row,
     append_log,
-    apply_decision,
     build_context,
+    build_device_window,
+    build_device_window_builder,
+    build_loop_clock_controller,
+    build_replay_source,
+    build_telemetry_source,
     build_window,
+    build_window_builder,
+    device_context,
+    format_actuation_ms,
     load_policy_config,
+    parse_bool_env,
+    parse_gpu_indices,
     parse_int_env,
     parse_float_env,
-    persist_state,
     utc_now,
-    write_last_decision,
     write_run_manifest,
 )
+from scripts.run.state_journal import (
+    SnapshotStateStore,
+    StateStore,
+    StateUpdate,
+    build_state_store,
+    persist_window_state,
+)
+from scripts.run.stage_profiler import (
+    STAGE_APPEND_DECISION_ROW,
+    STAGE_APPEND_LOG,
+    STAGE_APPLY_DECISION,
+    STAGE_CAPTURE_STATE,
+    STAGE_ON_WINDOW,
+    STAGE_PERSIST_STATE,
+    STAGE_VALIDATE_DECISION,
+    STAGE_WINDOW_BUILDER,
+    STAGE_WRITE_LAST_DECISION,
+    NullProfiler,
+    StageProfiler,
+    build_stage_profiler,
+    profiled_call,
+)
+from scripts.run.window_scheduler import (
+    DeadlineScheduler,
+    WindowTiming,
+    build_window_scheduler,
+)
 
 
 class ControlLoopAbortError(RuntimeError):
@@ -67,9 +126,22 @@ class ControlLoopAbortError(RuntimeError):
 #            applied by an earlier ``prerun`` phase in the same job.
 _CONTROL_PHASES = frozenset({"all", "prerun", "loop"})
 
+# Supported values for the ``CONTROL_LOOP_MODE`` environment variable:
+#   sync  - serial per-window loop (``run_control_loop``).
+#   async - pipelined asyncio loop (``run_control_loop_async``).
+_CONTROL_LOOP_MODES = frozenset({"sync", "async"})
+
+
+def _skip_sleep(_seconds: float) -> None:
+    """Replay-mode ``sleep_fn``: windows follow each other without waiting."""
+
+
+async def _skip_sleep_async(_seconds: float) -> None:
+    """Async counterpart of :func:`_skip_sleep`."""
+
 
 # ---------------------------------------------------------------------------
-# Internal stop-condition helper
+# Internal loop helpers
 # ---------------------------------------------------------------------------
 
 
@@ -79,8 +151,11 @@ def _should_stop(
     max_windows: int | None,
     bench_pid: int | None,
     stop_file: Path | None,
+    stop_event: threading.Event | None = None,
 ) -> bool:
     """Returns ``True`` when the loop should exit before processing *window_index*."""
+    if stop_event is not None and stop_event.is_set():
+        return True
     if stop_file is not None and stop_file.exists():
         return True
     if max_windows is not None and window_index >= max_windows:
@@ -119,8 +194,12 @@ def _apply_initial_decision_if_present(
     state: AlgorithmState,
     control_log: Path,
     decisions_csv: Path,
-    state_path: Path,
     decision_path: Path,
+    writer: ArtifactWriter,
+    state_store: StateStore,
+    controller: ClockController,
+    timer: TimedClockController,
+    device_index: int | None = None,
 ) -> None:
     """Applies a policy's optional run-level decision before window 0."""
     decision = _get_initial_decision(policy, context, state)
@@ -129,21 +208,326 @@ def _apply_initial_decision_if_present(
 
     policy_name = context.metadata.policy_name
     validate_decision(decision, context.platform)
-    apply_decision(decision, control_log)
-    persist_state(state_path, state)
-    append_decision_row(decisions_csv, policy_name, decision, window_index=-1)
-    write_last_decision(decision_path, policy_name, window_index=-1, decision=decision)
-    append_log(
+    actuation_ms = _apply_timed(controller, timer, decision)
+    persist_window_state(state_store, state, -1)
+    writer.append_decision_row(
+        decisions_csv, policy_name, decision, window_index=-1, actuation_ms=actuation_ms
+    )
+    writer.write_last_decision(
+        decision_path,
+        policy_name,
+        window_index=-1,
+        decision=decision,
+        actuation_ms=actuation_ms,
+    )
+    writer.append_log(
         control_log,
         (
-            f"initial_decision policy={policy_name} "
+            f"initial_decision{_device_label(device_index)} policy={policy_name} "
             f"decision={decision.action.value} "
             f"target={decision.target_graphics_clock_mhz} "
-            f"reason={decision.reason_code}"
+            f"reason={decision.reason_code} "
+            f"actuation_ms={format_actuation_ms(actuation_ms) or 'none'}"
         ),
     )
 
 
+@dataclasses.dataclass(slots=True)
+class _WindowFailureTracker:
+    """Consecutive-failure bookkeeping shared by the sync and async loops."""
+
+    limit: int
+    consecutive: int = 0
+    failed_window_count: int = 0
+    max_consecutive_observed: int = 0
+    abort_reason: str | None = None
+
+    def record_success(self) -> None:
+        self.consecutive = 0
+
+    def record_failure(
+        self,
+        writer: ArtifactWriter,
+        control_log: Path,
+        window_index: int,
+        exc: BaseException,
+        *,
+        device_index: int | None = None,
+    ) -> bool:
+        """Logs one failed window and returns ``True`` when the loop must abort."""
+        device = _device_label(device_index)
+        self.consecutive += 1
+        self.failed_window_count += 1
+        self.max_consecutive_observed = max(self.max_consecutive_observed, self.consecutive)
+        writer.append_log(
+            control_log,
+            f"window {window_index}{device} failed: {type(exc).__name__}: {exc}; continuing",
+        )
+        if self.consecutive < self.limit:
+            return False
+        writer.append_log(
+            control_log,
+            f"aborting{device}: too many consecutive failures ({self.consecutive})",
+        )
+        self.abort_reason = f"max_consecutive_failures_reached:{self.consecutive}/{self.limit}"
+        if device_index is not None:
+            self.abort_reason += f":gpu={device_index}"
+        return True
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class _PipelineWindow:
+    """One telemetry window handed from the telemetry stage to the decide stage."""
+
+    window_index: int
+    metrics: MetricWindow | None
+    window_end_s: float
+    error: Exception | None
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class _PendingPersist:
+    """One applied decision waiting for the persist stage."""
+
+    window_index: int
+    decision: Decision
+    state_update: StateUpdate
+    actuation_ms: float | None = None
+    device_index: int | None = None
+
+
+@dataclasses.dataclass(slots=True)
+class _PipelineStats:
+    """Decision-latency and persist-stage counters for the async loop."""
+
+    decision_count: int = 0
+    total_decision_latency_s: float = 0.0
+    max_decision_latency_s: float = 0.0
+    max_persist_backlog: int = 0
+    persist_failure_count: int = 0
+
+    def record_latency(self, latency_s: float) -> None:
+        self.decision_count += 1
+        self.total_decision_latency_s += latency_s
+        self.max_decision_latency_s = max(self.max_decision_latency_s, latency_s)
+
+    def summary(self) -> dict[str, object]:
+        return {
+            "mode": "async",
+            "decision_count": self.decision_count,
+            "mean_decision_latency_s": (
+                self.total_decision_latency_s / self.decision_count
+                if self.decision_count
+                else 0.0
+            ),
+            "max_decision_latency_s": self.max_decision_latency_s,
+            "max_persist_backlog": self.max_persist_backlog,
+            "persist_failure_count": self.persist_failure_count,
+        }
+
+
+def _log_to(writer: ArtifactWriter, control_log: Path) -> Callable[[str], None]:
+    """Returns a controller logger that writes through *writer*."""
+    return lambda message: writer.append_log(control_log, message)
+
+
+def _device_label(device_index: int | None) -> str:
+    """Returns the `` gpu=<index>`` log suffix for multi-GPU runs, else ``""``."""
+    return "" if device_index is None else f" gpu={device_index}"
+
+
+def _window_log_message(
+    window_index: int,
+    policy_name: str,
+    decision: Decision,
+    actuation_ms: float | None = None,
+    device_index: int | None = None,
+) -> str:
+    return (
+        f"window={window_index}{_device_label(device_index)} policy={policy_name} "
+        f"decision={decision.action.value} "
+        f"target={decision.target_graphics_clock_mhz} "
+        f"reason={decision.reason_code} "
+        f"actuation_ms={format_actuation_ms(actuation_ms) or 'none'}"
+    )
+
+
+def _log_window_timing(
+    writer: ArtifactWriter,
+    control_log: Path,
+    window_index: int,
+    timing: WindowTiming,
+) -> None:
+    writer.append_log(
+        control_log,
+        (
+            f"schedule window={window_index} "
+            f"overrun_s={timing.overrun_s:.6f} "
+            f"jitter_s={timing.jitter_s:.6f} "
+            f"skipped_windows={timing.skipped_windows}"
+        ),
+    )
+
+
+def _persist_window_artifacts(
+    pending: _PendingPersist,
+    *,
+    writer: ArtifactWriter,
+    state_store: StateStore,
+    policy_name: str,
+    control_log: Path,
+    decisions_csv: Path,
+    decision_path: Path,
+    profiler: StageProfiler,
+) -> None:
+    window_index = pending.window_index
+    with profiler.span(STAGE_PERSIST_STATE, window_index):
+        state_store.write(pending.state_update)
+    with profiler.span(STAGE_APPEND_DECISION_ROW, window_index):
+        writer.append_decision_row(
+            decisions_csv, policy_name, pending.decision, window_index, pending.actuation_ms
+        )
+    with profiler.span(STAGE_WRITE_LAST_DECISION, window_index):
+        writer.write_last_decision(
+            decision_path, policy_name, window_index, pending.decision, pending.actuation_ms
+        )
+    with profiler.span(STAGE_APPEND_LOG, window_index):
+        writer.append_log(
+            control_log,
+            _window_log_message(
+                window_index,
+                policy_name,
+                pending.decision,
+                pending.actuation_ms,
+                pending.device_index,
+            ),
+        )
+
+
+def _find_wrapped(controller: ClockController, kind: type[Any]) -> Any | None:
+    """Returns the first controller of *kind* in the ``inner`` wrapper chain."""
+    current: Any = controller
+    while current is not None:
+        if isinstance(current, kind):
+            return current
+        current = getattr(current, "inner", None)
+    return None
+
+
+def _with_actuation_timer(
+    controller: ClockController,
+) -> tuple[ClockController, TimedClockController]:
+    """Returns *controller* and the :class:`TimedClockController` timing it.
+
+    The env-built loop controller already times the backend inside its
+    deduplication layer; any other controller is wrapped here so every
+    actuation in the loop is timed.
+    """
+    timer = _find_wrapped(controller, TimedClockController)
+    if timer is None:
+        timer = TimedClockController(controller)
+        controller = timer
+    return controller, timer
+
+
+def _apply_timed(
+    controller: ClockController,
+    timer: TimedClockController,
+    decision: Decision,
+) -> float | None:
+    """Applies *decision* and returns the backend actuation time in milliseconds.
+
+    Returns ``None`` when no actuation reached the backend (no clock change
+    or a deduplicated decision).
+    """
+    timer.pop_last_duration_s()
+    controller.apply(decision)
+    duration_s = timer.pop_last_duration_s()
+    return None if duration_s is None else duration_s * 1e3
+
+
+def _observe_applied_clock(controller: ClockController, metrics: MetricWindow) -> None:
+    """Feeds the observed window clock to controllers that track the applied clock."""
+    observer = _find_wrapped(controller, ClockObserver)
+    if observer is not None:
+        observer.observe_clock(metrics.graphics_clock_avg_mhz)
+
+
+def _close_controller(controller: ClockController) -> None:
+    """Releases controller resources, such as a persistent clock-helper process."""
+    close = getattr(controller, "close", None)
+    if callable(close):
+        close()
+
+
+def _actuation_summary(controller: ClockController) -> dict[str, object]:
+    deduplicating = _find_wrapped(controller, DeduplicatingClockController)
+    if deduplicating is not None:
+        return deduplicating.metrics()
+    return {"deduplicating": False}
+
+
+def _actuation_latency_summary(timer: TimedClockController) -> dict[str, object]:
+    """Latency histograms keyed by backend, then by action."""
+    metrics = timer.metrics()
+    return {str(metrics["backend"]): metrics["by_action"]}
+
+
+def _scheduler_summary(
+    window_scheduler: DeadlineScheduler | None,
+    window_seconds: float,
+) -> dict[str, object]:
+    if window_scheduler is None:
+        return {"mode": "sleep", "window_seconds": window_seconds}
+    return window_scheduler.summary()
+
+
+def _write_final_summary(
+    *,
+    run_dir: Path,
+    control_log: Path,
+    policy_name: str,
+    summary: FinalSummary,
+    failures: _WindowFailureTracker,
+    writer: ArtifactWriter,
+    extra: Mapping[str, object],
+) -> Path:
+    """Writes ``<run_dir>/control/final_summary.json`` and logs the finish line.
+
+    Pending artifact writes are flushed first, so the summary is only written
+    once every window artifact is on disk and the writer metrics are final.
+    """
+    writer.flush()
+    summary_dir = run_dir / "control"
+    summary_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = summary_dir / "final_summary.json"
+
+    summary_dict: dict[str, Any] = dataclasses.asdict(summary)
+    summary_dict["generated_at_utc"] = utc_now()
+    summary_dict["control_status"] = "aborted" if failures.abort_reason else "completed"
+    summary_dict["abort_reason"] = failures.abort_reason
+    summary_dict["window_failure_count"] = failures.failed_window_count
+    summary_dict["max_consecutive_failures_observed"] = failures.max_consecutive_observed
+    summary_dict["consecutive_failure_limit"] = failures.limit
+    summary_dict.update(extra)
+    summary_dict["artifact_writer"] = writer.metrics()
+    summary_path.write_text(
+        json.dumps(summary_dict, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+
+    writer.append_log(
+        control_log,
+        (
+            f"control_loop finished: policy={policy_name} "
+            f"status={summary_dict['control_status']} "
+            f"total_windows={summary.total_windows} "
+            f"final_summary={summary_path}"
+        ),
+    )
+    return summary_path
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -168,6 +552,12 @@ def run_control_loop(
     sleep_fn: Callable[[float], Any] = time.sleep,
     raise_on_abort: bool = False,
     apply_initial_decision: bool = True,
+    window_scheduler: DeadlineScheduler | None = None,
+    artifact_writer: ArtifactWriter | None = None,
+    state_store: StateStore | None = None,
+    clock_controller: ClockController | None = None,
+    stop_event: threading.Event | None = None,
+    profiler: StageProfiler | None = None,
 ) -> FinalSummary:
     """Runs the DVFS control loop until a stop condition is met.
 
@@ -188,7 +578,7 @@ def run_control_loop(
         Path to the decisions CSV.
     state_path:
         Path for periodic state snapshots (observability only, not the source
-        of truth).
+        of truth).  Used by the default ``state_store``.
     decision_path:
         Path for the ``last_decision.json`` file (overwritten each window).
     window_seconds:
@@ -218,6 +608,52 @@ def run_control_loop(
         ``initial_decision(context, state)`` before building telemetry window 0.
         Driven by ``CONTROL_PHASE``: true for ``all``, false for ``loop`` (where
         an earlier ``prerun`` phase already applied the prelaunch decision).
+    window_scheduler:
+        Optional :class:`DeadlineScheduler`.  When set, the loop wakes at
+        absolute window boundaries instead of calling ``sleep_fn`` after each
+        window, logs per-window overrun and jitter, and records the
+        scheduler statistics under ``scheduler`` in ``final_summary.json``.
+        With the ``skip`` overrun policy, skipped boundaries also advance
+        the window index so indices stay aligned with the window grid.
+    artifact_writer:
+        Destination for the log, decisions CSV, ``last_decision.json``, and
+        state snapshot writes.  Defaults to :class:`InlineArtifactWriter`.
+        The loop flushes the writer before writing ``final_summary.json`` and
+        on every exit path, including exceptions; closing it is left to the
+        caller that created it.  Its metrics are recorded under
+        ``artifact_writer`` in ``final_summary.json``.
+    state_store:
+        How policy state is persisted after ``initialize()``, after each
+        window, and once more after ``finalize()``.  Defaults to a
+        :class:`SnapshotStateStore` that rewrites ``state_path``; a
+        :class:`~scripts.run.state_journal.JournalStateStore` journals only
+        changed keys.  Its metrics are recorded under ``state_persistence``.
+    clock_controller:
+        Long-lived :class:`ClockController` used for every actuation in the
+        run.  Defaults to the env-configured controller wrapped in a
+        :class:`DeduplicatingClockController`, which skips decisions whose
+        target matches the already-applied clock; the loop closes a default
+        controller when it returns, while an injected one is left to the
+        caller.  Controllers implementing
+        :class:`ClockObserver` receive each window's observed clock before
+        the policy decides.  Issued and suppressed actuations are recorded
+        under ``actuation`` in ``final_summary.json``.  Every actuation is
+        timed by a :class:`TimedClockController` (the default controller
+        times only calls that reach the backend; an injected controller
+        without one is wrapped whole); the duration is written as
+        ``actuation_ms`` to the decisions CSV, ``last_decision.json``, and
+        the window log line, and latency histograms by backend and action
+        are recorded under ``actuation_latency``.
+    stop_event:
+        When set, the loop exits before the next window and finalizes
+        normally.  ``main()`` sets it from a ``SIGTERM`` handler.
+    profiler:
+        :class:`~scripts.run.stage_profiler.StageProfiler` that times each
+        window's stages (telemetry, ``on_window``, validation, actuation,
+        state capture, and each artifact write).  Defaults to a no-op
+        :class:`NullProfiler`.  Its per-stage statistics are recorded under
+        ``profile`` in ``final_summary.json``, and its spans are written to
+        ``control/trace.json``.
 
     Returns
     -------
@@ -225,12 +661,264 @@ def run_control_loop(
         The summary returned by ``policy.finalize(state)``.
     """
     policy_name = context.metadata.policy_name
+    writer = artifact_writer if artifact_writer is not None else InlineArtifactWriter()
+    if profiler is None:
+        profiler = NullProfiler()
+    if state_store is None:
+        state_store = SnapshotStateStore(state_path, writer)
+    owns_controller = clock_controller is None
+    controller = (
+        clock_controller
+        if clock_controller is not None
+        else build_loop_clock_controller(context, _log_to(writer, control_log))
+    )
+    controller, timer = _with_actuation_timer(controller)
+
+    try:
+        # Initialise once; keep state in memory for the entire run.
+        state: AlgorithmState = policy.initialize(context, policy_config)
+        persist_window_state(state_store, state, -1)
+        write_run_manifest(run_dir / "control" / "run_manifest.json", context, policy_config)
+        writer.append_log(control_log, f"control_loop started: policy={policy_name}")
+        if apply_initial_decision:
+            _apply_initial_decision_if_present(
+                policy=policy,
+                context=context,
+                state=state,
+                control_log=control_log,
+                decisions_csv=decisions_csv,
+                decision_path=decision_path,
+                writer=writer,
+                state_store=state_store,
+                controller=controller,
+                timer=timer,
+            )
+
+        window_index: int = 0
+        failures = _WindowFailureTracker(limit=max_consecutive_failures)
+
+        if window_scheduler is not None:
+            window_scheduler.start()
+
+        while not _should_stop(
+            window_index,
+            max_windows=max_windows,
+            bench_pid=bench_pid,
+            stop_file=stop_file,
+            stop_event=stop_event,
+        ):
+            try:
+                with profiler.span(STAGE_WINDOW_BUILDER, window_index):
+                    metrics = window_builder(context, window_index)
+                _observe_applied_clock(controller, metrics)
+                with profiler.span(STAGE_ON_WINDOW, window_index):
+                    decision = policy.on_window(metrics, state)
+                with profiler.span(STAGE_VALIDATE_DECISION, window_index):
+                    validate_decision(decision, context.platform)
+                with profiler.span(STAGE_APPLY_DECISION, window_index):
+                    actuation_ms = _apply_timed(controller, timer, decision)
+                with profiler.span(STAGE_CAPTURE_STATE, window_index):
+                    state_update = state_store.capture(state, window_index)
+                _persist_window_artifacts(
+                    _PendingPersist(window_index, decision, state_update, actuation_ms),
+                    writer=writer,
+                    state_store=state_store,
+                    policy_name=policy_name,
+                    control_log=control_log,
+                    decisions_csv=decisions_csv,
+                    decision_path=decision_path,
+                    profiler=profiler,
+                )
+                failures.record_success()
+
+            except Exception as exc:  # noqa: BLE001
+                if failures.record_failure(writer, control_log, window_index, exc):
+                    break
+
+            window_index += 1
+            if window_scheduler is None:
+                sleep_fn(window_seconds)
+                continue
+
+            timing = window_scheduler.wait_next()
+            _log_window_timing(writer, control_log, window_index - 1, timing)
+            window_index += timing.skipped_windows
+
+        # Finalise: always called, even if we aborted early.
+        summary: FinalSummary = policy.finalize(state)
+        persist_window_state(state_store, state, window_index, force_snapshot=True)
+        _write_final_summary(
+            run_dir=run_dir,
+            control_log=control_log,
+            policy_name=policy_name,
+            summary=summary,
+            failures=failures,
+            writer=writer,
+            extra={
+                "scheduler": _scheduler_summary(window_scheduler, window_seconds),
+                "state_persistence": state_store.metrics(),
+                "actuation": _actuation_summary(controller),
+                "actuation_latency": _actuation_latency_summary(timer),
+                "profile": profiler.summary(),
+            },
+        )
+        profiler.write_trace(run_dir / "control" / "trace.json")
+    finally:
+        if owns_controller:
+            _close_controller(controller)
+        writer.flush()
+
+    if failures.abort_reason and raise_on_abort:
+        raise ControlLoopAbortError(failures.abort_reason)
+    return summary
+
+
+async def run_control_loop_async(
+    *,
+    policy: AlgorithmInterface,
+    context: ExperimentContext,
+    policy_config: Mapping[str, object],
+    run_dir: Path,
+    control_log: Path,
+    decisions_csv: Path,
+    state_path: Path,
+    decision_path: Path,
+    window_seconds: float,
+    max_windows: int | None = None,
+    bench_pid: int | None = None,
+    stop_file: Path | None = None,
+    max_consecutive_failures: int = 5,
+    window_builder: Callable[[ExperimentContext, int], MetricWindow] = build_window,
+    sleep_fn: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    raise_on_abort: bool = False,
+    apply_initial_decision: bool = True,
+    window_scheduler: DeadlineScheduler | None = None,
+    artifact_writer: ArtifactWriter | None = None,
+    state_store: StateStore | None = None,
+    clock_controller: ClockController | None = None,
+    stop_event: threading.Event | None = None,
+    profiler: StageProfiler | None = None,
+    max_pending_persists: int = 8,
+) -> FinalSummary:
+    """Pipelined variant of :func:`run_control_loop` built on ``asyncio``.
+
+    Each window passes through three overlapping stages:
+
+    1. *telemetry*: ``window_builder`` runs in a worker thread and produces at
+       most one window ahead of the decision stage.
+    2. *decide/actuate*: ``policy.on_window`` and ``validate_decision`` run on
+       the event-loop thread, one window at a time and strictly in window
+       order; ``apply_decision`` then runs in a worker thread.
+    3. *persist*: a single ordered worker writes the state snapshot, decisions
+       row, ``last_decision.json``, and log line in a worker thread.
+
+    The next window's telemetry is therefore collected while the current
+    decision is actuated and its artifacts are flushed, so decision latency
+    (end of window to clock applied) does not grow when artifact I/O is slow.
+    The persist stage receives the state changes rendered by
+    ``state_store.capture`` right after actuation, so later ``on_window``
+    calls cannot race with serialization.
+
+    Parameters match :func:`run_control_loop`, except:
+
+    sleep_fn:
+        Awaitable used by the telemetry stage to wait between windows.
+    window_scheduler:
+        Optional :class:`DeadlineScheduler` that paces the telemetry stage on
+        absolute window boundaries; its wait runs in a worker thread.
+    max_pending_persists:
+        Bound on windows waiting for the persist stage.  When the bound is
+        reached the decide stage waits, after the decision was applied, so
+        memory stays bounded without delaying actuation.
+
+    Persist-stage failures are logged and counted under ``pipeline`` in
+    ``final_summary.json``; they do not count towards
+    ``max_consecutive_failures`` because they surface after later windows
+    have already been decided.
+    """
+    policy_name = context.metadata.policy_name
+    writer = artifact_writer if artifact_writer is not None else InlineArtifactWriter()
+    if profiler is None:
+        profiler = NullProfiler()
+    if state_store is None:
+        state_store = SnapshotStateStore(state_path, writer)
+    owns_controller = clock_controller is None
+    controller = (
+        clock_controller
+        if clock_controller is not None
+        else build_loop_clock_controller(context, _log_to(writer, control_log))
+    )
+    controller, timer = _with_actuation_timer(controller)
+
+    try:
+        summary, failures = await _run_pipeline(
+            policy=policy,
+            context=context,
+            policy_config=policy_config,
+            run_dir=run_dir,
+            control_log=control_log,
+            decisions_csv=decisions_csv,
+            decision_path=decision_path,
+            window_seconds=window_seconds,
+            max_windows=max_windows,
+            bench_pid=bench_pid,
+            stop_file=stop_file,
+            max_consecutive_failures=max_consecutive_failures,
+            window_builder=window_builder,
+            sleep_fn=sleep_fn,
+            apply_initial_decision=apply_initial_decision,
+            window_scheduler=window_scheduler,
+            max_pending_persists=max_pending_persists,
+            writer=writer,
+            state_store=state_store,
+            controller=controller,
+            timer=timer,
+            stop_event=stop_event,
+            profiler=profiler,
+        )
+    finally:
+        if owns_controller:
+            await asyncio.to_thread(_close_controller, controller)
+        await asyncio.to_thread(writer.flush)
+
+    if failures.abort_reason and raise_on_abort:
+        raise ControlLoopAbortError(failures.abort_reason)
+    return summary
+
+
+async def _run_pipeline(
+    *,
+    policy: AlgorithmInterface,
+    context: ExperimentContext,
+    policy_config: Mapping[str, object],
+    run_dir: Path,
+    control_log: Path,
+    decisions_csv: Path,
+    decision_path: Path,
+    window_seconds: float,
+    max_windows: int | None,
+    bench_pid: int | None,
+    stop_file: Path | None,
+    max_consecutive_failures: int,
+    window_builder: Callable[[ExperimentContext, int], MetricWindow],
+    sleep_fn: Callable[[float], Awaitable[Any]],
+    apply_initial_decision: bool,
+    window_scheduler: DeadlineScheduler | None,
+    max_pending_persists: int,
+    writer: ArtifactWriter,
+    state_store: StateStore,
+    controller: ClockController,
+    timer: TimedClockController,
+    stop_event: threading.Event | None,
+    profiler: StageProfiler,
+) -> tuple[FinalSummary, _WindowFailureTracker]:
+    """Body of :func:`run_control_loop_async`; the caller owns the writer flush."""
+    policy_name = context.metadata.policy_name
 
-    # Initialise once; keep state in memory for the entire run.
     state: AlgorithmState = policy.initialize(context, policy_config)
-    persist_state(state_path, state)
+    persist_window_state(state_store, state, -1)
     write_run_manifest(run_dir / "control" / "run_manifest.json", context, policy_config)
-    append_log(control_log, f"control_loop started: policy={policy_name}")
+    writer.append_log(control_log, f"control_loop started: policy={policy_name} mode=async")
     if apply_initial_decision:
         _apply_initial_decision_if_present(
             policy=policy,
@@ -238,103 +926,535 @@ def run_control_loop(
             state=state,
             control_log=control_log,
             decisions_csv=decisions_csv,
-            state_path=state_path,
             decision_path=decision_path,
+            writer=writer,
+            state_store=state_store,
+            controller=controller,
+            timer=timer,
         )
 
-    window_index: int = 0
-    consecutive_failures: int = 0
-    failed_window_count: int = 0
-    max_consecutive_failures_observed: int = 0
-    abort_reason: str | None = None
+    failures = _WindowFailureTracker(limit=max_consecutive_failures)
+    stats = _PipelineStats()
+    windows: asyncio.Queue[_PipelineWindow | None] = asyncio.Queue(maxsize=1)
+    persists: asyncio.Queue[_PendingPersist | None] = asyncio.Queue(
+        maxsize=max(1, max_pending_persists)
+    )
 
-    while not _should_stop(
-        window_index,
-        max_windows=max_windows,
-        bench_pid=bench_pid,
-        stop_file=stop_file,
-    ):
+    async def _telemetry_stage() -> None:
+        window_index = 0
+        if window_scheduler is not None:
+            window_scheduler.start()
         try:
-            metrics = window_builder(context, window_index)
-            decision = policy.on_window(metrics, state)
-            validate_decision(decision, context.platform)
-            apply_decision(decision, control_log)
-            persist_state(state_path, state)
-            append_decision_row(decisions_csv, policy_name, decision, window_index)
-            write_last_decision(decision_path, policy_name, window_index, decision)
-            append_log(
-                control_log,
-                (
-                    f"window={window_index} policy={policy_name} "
-                    f"decision={decision.action.value} "
-                    f"target={decision.target_graphics_clock_mhz} "
-                    f"reason={decision.reason_code}"
-                ),
-            )
-            consecutive_failures = 0
+            while not _should_stop(
+                window_index,
+                max_windows=max_windows,
+                bench_pid=bench_pid,
+                stop_file=stop_file,
+                stop_event=stop_event,
+            ):
+                try:
+                    metrics = await asyncio.to_thread(
+                        profiled_call,
+                        profiler,
+                        STAGE_WINDOW_BUILDER,
+                        window_index,
+                        window_builder,
+                        context,
+                        window_index,
+                    )
+                    item = _PipelineWindow(window_index, metrics, time.perf_counter(), None)
+                except Exception as exc:  # noqa: BLE001
+                    item = _PipelineWindow(window_index, None, time.perf_counter(), exc)
+                await windows.put(item)
 
+                window_index += 1
+                if window_scheduler is None:
+                    await sleep_fn(window_seconds)
+                    continue
+                timing = await asyncio.to_thread(window_scheduler.wait_next)
+                await asyncio.to_thread(
+                    _log_window_timing, writer, control_log, window_index - 1, timing
+                )
+                window_index += timing.skipped_windows
         except Exception as exc:  # noqa: BLE001
-            consecutive_failures += 1
-            failed_window_count += 1
-            max_consecutive_failures_observed = max(
-                max_consecutive_failures_observed,
-                consecutive_failures,
-            )
-            append_log(
+            # A stop-check or scheduler failure ends the run instead of leaving
+            # the decide stage waiting for a window that never arrives.
+            await asyncio.to_thread(
+                writer.append_log,
                 control_log,
-                (
-                    f"window {window_index} failed: "
-                    f"{type(exc).__name__}: {exc}; continuing"
-                ),
+                f"telemetry stage failed: {type(exc).__name__}: {exc}; stopping",
             )
-            if consecutive_failures >= max_consecutive_failures:
-                append_log(
+        await windows.put(None)
+
+    async def _persist_stage() -> None:
+        while (pending := await persists.get()) is not None:
+            try:
+                await asyncio.to_thread(
+                    _persist_window_artifacts,
+                    pending,
+                    writer=writer,
+                    state_store=state_store,
+                    policy_name=policy_name,
+                    control_log=control_log,
+                    decisions_csv=decisions_csv,
+                    decision_path=decision_path,
+                    profiler=profiler,
+                )
+            except Exception as exc:  # noqa: BLE001
+                stats.persist_failure_count += 1
+                await asyncio.to_thread(
+                    writer.append_log,
                     control_log,
                     (
-                        f"aborting: too many consecutive failures "
-                        f"({consecutive_failures})"
+                        f"window {pending.window_index} persist failed: "
+                        f"{type(exc).__name__}: {exc}; continuing"
                     ),
                 )
-                abort_reason = (
-                    "max_consecutive_failures_reached:"
-                    f"{consecutive_failures}/{max_consecutive_failures}"
-                )
-                break
 
-        window_index += 1
-        sleep_fn(window_seconds)
+    telemetry_task = asyncio.create_task(_telemetry_stage())
+    persist_task = asyncio.create_task(_persist_stage())
+    next_window_index = 0
+    try:
+        while (item := await windows.get()) is not None:
+            next_window_index = item.window_index + 1
+            try:
+                if item.error is not None:
+                    raise item.error
+                assert item.metrics is not None
+                _observe_applied_clock(controller, item.metrics)
+                with profiler.span(STAGE_ON_WINDOW, item.window_index):
+                    decision = policy.on_window(item.metrics, state)
+                with profiler.span(STAGE_VALIDATE_DECISION, item.window_index):
+                    validate_decision(decision, context.platform)
+                actuation_ms = await asyncio.to_thread(
+                    profiled_call,
+                    profiler,
+                    STAGE_APPLY_DECISION,
+                    item.window_index,
+                    _apply_timed,
+                    controller,
+                    timer,
+                    decision,
+                )
+                stats.record_latency(time.perf_counter() - item.window_end_s)
+                failures.record_success()
+                with profiler.span(STAGE_CAPTURE_STATE, item.window_index):
+                    state_update = state_store.capture(state, item.window_index)
+                await persists.put(
+                    _PendingPersist(
+                        window_index=item.window_index,
+                        decision=decision,
+                        state_update=state_update,
+                        actuation_ms=actuation_ms,
+                    )
+                )
+                stats.max_persist_backlog = max(stats.max_persist_backlog, persists.qsize())
+            except Exception as exc:  # noqa: BLE001
+                aborting = await asyncio.to_thread(
+                    failures.record_failure, writer, control_log, item.window_index, exc
+                )
+                if aborting:
+                    break
+    finally:
+        telemetry_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await telemetry_task
+        await persists.put(None)
+        await persist_task
 
-    # Finalise: always called, even if we aborted early.
     summary: FinalSummary = policy.finalize(state)
+    await asyncio.to_thread(
+        persist_window_state, state_store, state, next_window_index, force_snapshot=True
+    )
+    await asyncio.to_thread(
+        _write_final_summary,
+        run_dir=run_dir,
+        control_log=control_log,
+        policy_name=policy_name,
+        summary=summary,
+        failures=failures,
+        writer=writer,
+        extra={
+            "scheduler": _scheduler_summary(window_scheduler, window_seconds),
+            "pipeline": stats.summary(),
+            "state_persistence": state_store.metrics(),
+            "actuation": _actuation_summary(controller),
+            "actuation_latency": _actuation_latency_summary(timer),
+            "profile": profiler.summary(),
+        },
+    )
+    await asyncio.to_thread(profiler.write_trace, run_dir / "control" / "trace.json")
+    return summary, failures
 
-    summary_dir = run_dir / "control"
-    summary_dir.mkdir(parents=True, exist_ok=True)
-    summary_path = summary_dir / "final_summary.json"
 
-    summary_dict: dict[str, Any] = dataclasses.asdict(summary)
-    summary_dict["generated_at_utc"] = utc_now()
-    summary_dict["control_status"] = "aborted" if abort_reason else "completed"
-    summary_dict["abort_reason"] = abort_reason
-    summary_dict["window_failure_count"] = failed_window_count
-    summary_dict["max_consecutive_failures_observed"] = max_consecutive_failures_observed
-    summary_dict["consecutive_failure_limit"] = max_consecutive_failures
-    summary_path.write_text(
-        json.dumps(summary_dict, indent=2, sort_keys=True),
-        encoding="utf-8",
-    )
+@dataclasses.dataclass(slots=True)
+class _DeviceLane:
+    """Per-device policy, state, controller, and artifacts of a multi-GPU run."""
+
+    device_index: int
+    context: ExperimentContext
+    policy: AlgorithmInterface
+    controller: ClockController
+    timer: TimedClockController
+    owns_controller: bool
+    state_store: StateStore
+    decisions_csv: Path
+    decision_path: Path
+    failures: _WindowFailureTracker
+    state: AlgorithmState | None = None
+
+
+def _device_dir(run_dir: Path, device_index: int) -> Path:
+    """Per-device artifact directory of a multi-GPU run."""
+    return run_dir / "control" / f"gpu{device_index}"
+
 
-    append_log(
+def run_multi_gpu_control_loop(
+    *,
+    policy_factory: Callable[[], AlgorithmInterface],
+    context: ExperimentContext,
+    policy_config: Mapping[str, object],
+    run_dir: Path,
+    control_log: Path,
+    device_indices: Sequence[int],
+    window_seconds: float,
+    max_windows: int | None = None,
+    bench_pid: int | None = None,
+    stop_file: Path | None = None,
+    max_consecutive_failures: int = 5,
+    window_builder: Callable[[ExperimentContext, int, int], MetricWindow] = build_device_window,
+    sleep_fn: Callable[[float], Any] = time.sleep,
+    raise_on_abort: bool = False,
+    apply_initial_decision: bool = True,
+    window_scheduler: DeadlineScheduler | None = None,
+    artifact_writer: ArtifactWriter | None = None,
+    state_store_factory: Callable[[Path, ArtifactWriter], StateStore] | None = None,
+    clock_controllers: Mapping[int, ClockController] | None = None,
+    stop_event: threading.Event | None = None,
+    profiler: StageProfiler | None = None,
+    max_workers: int | None = None,
+) -> dict[int, FinalSummary]:
+    """Drives one policy instance per GPU from a single control-loop process.
+
+    Each device index gets its own policy (from *policy_factory*), in-memory
+    state, context (tagged ``gpu_index``), clock controller, and artifacts
+    under ``control/gpu<index>/`` (``decisions.csv``, ``last_decision.json``,
+    ``policy_state.json``).  Log lines share ``control_log`` and carry a
+    ``gpu=<index>`` field.
+
+    Per window, device telemetry windows are built concurrently on a thread
+    pool, each device's policy decides on the calling thread in device
+    order, and the decisions are then actuated concurrently on the pool, so
+    one slow actuation does not delay the others.  Artifacts are written
+    after all actuations of the window were issued.
+
+    Parameters match :func:`run_control_loop`, except:
+
+    policy_factory:
+        Returns a fresh policy instance; called once per device.
+    device_indices:
+        GPU indices to control, in log and summary order.
+    window_builder:
+        ``(device_context, device_index, window_index) -> MetricWindow``.
+        Defaults to :func:`build_device_window`.
+    state_store_factory:
+        ``(device_dir, writer) -> StateStore``.  Defaults to a
+        :class:`SnapshotStateStore` rewriting ``<device_dir>/policy_state.json``.
+    clock_controllers:
+        Controllers keyed by device index.  Devices without one get the
+        env-configured loop controller built with ``gpu_index``, which the
+        loop closes when it returns.
+    max_workers:
+        Thread-pool size; defaults to the number of devices.
+
+    Failures are tracked per device: a failed device window is logged and
+    skipped while the other devices continue, and the run aborts when any
+    device reaches ``max_consecutive_failures`` consecutive failures.
+
+    ``final_summary.json`` merges the per-device summaries: the top-level
+    :class:`FinalSummary` fields aggregate over devices (window count and
+    maximum violation are maxima, violation counts are sums), and
+    ``devices`` holds each device's full summary with its failure,
+    persistence, actuation, and actuation-latency statistics.
+
+    Returns
+    -------
+    dict[int, FinalSummary]
+        Per-device summaries from ``policy.finalize(state)``.
+    """
+    if not device_indices:
+        raise ValueError("device_indices must not be empty.")
+    if len(set(device_indices)) != len(device_indices):
+        raise ValueError("device_indices must be unique.")
+    policy_name = context.metadata.policy_name
+    writer = artifact_writer if artifact_writer is not None else InlineArtifactWriter()
+    if profiler is None:
+        profiler = NullProfiler()
+    if state_store_factory is None:
+        state_store_factory = lambda device_dir, store_writer: SnapshotStateStore(  # noqa: E731
+            device_dir / "policy_state.json", store_writer
+        )
+
+    lanes: list[_DeviceLane] = []
+    try:
+        for device_index in device_indices:
+            device_dir = _device_dir(run_dir, device_index)
+            injected = (clock_controllers or {}).get(device_index)
+            controller = (
+                injected
+                if injected is not None
+                else build_loop_clock_controller(
+                    context, _log_to(writer, control_log), gpu_index=device_index
+                )
+            )
+            controller, timer = _with_actuation_timer(controller)
+            lanes.append(
+                _DeviceLane(
+                    device_index=device_index,
+                    context=device_context(context, device_index),
+                    policy=policy_factory(),
+                    controller=controller,
+                    timer=timer,
+                    owns_controller=injected is None,
+                    state_store=state_store_factory(device_dir, writer),
+                    decisions_csv=device_dir / "decisions.csv",
+                    decision_path=device_dir / "last_decision.json",
+                    failures=_WindowFailureTracker(limit=max_consecutive_failures),
+                )
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(lanes),
+            thread_name_prefix="control-gpu",
+        ) as pool:
+            summaries, abort_reason = _run_device_lanes(
+                lanes,
+                pool=pool,
+                policy_name=policy_name,
+                policy_config=policy_config,
+                context=context,
+                run_dir=run_dir,
+                control_log=control_log,
+                window_seconds=window_seconds,
+                max_windows=max_windows,
+                bench_pid=bench_pid,
+                stop_file=stop_file,
+                window_builder=window_builder,
+                sleep_fn=sleep_fn,
+                apply_initial_decision=apply_initial_decision,
+                window_scheduler=window_scheduler,
+                writer=writer,
+                stop_event=stop_event,
+                profiler=profiler,
+            )
+    finally:
+        for lane in lanes:
+            if lane.owns_controller:
+                _close_controller(lane.controller)
+        writer.flush()
+
+    if abort_reason and raise_on_abort:
+        raise ControlLoopAbortError(abort_reason)
+    return summaries
+
+
+def _run_device_lanes(
+    lanes: list[_DeviceLane],
+    *,
+    pool: concurrent.futures.Executor,
+    policy_name: str,
+    policy_config: Mapping[str, object],
+    context: ExperimentContext,
+    run_dir: Path,
+    control_log: Path,
+    window_seconds: float,
+    max_windows: int | None,
+    bench_pid: int | None,
+    stop_file: Path | None,
+    window_builder: Callable[[ExperimentContext, int, int], MetricWindow],
+    sleep_fn: Callable[[float], Any],
+    apply_initial_decision: bool,
+    window_scheduler: DeadlineScheduler | None,
+    writer: ArtifactWriter,
+    stop_event: threading.Event | None,
+    profiler: StageProfiler,
+) -> tuple[dict[int, FinalSummary], str | None]:
+    """Body of :func:`run_multi_gpu_control_loop`; the caller owns cleanup."""
+    for lane in lanes:
+        lane.state = lane.policy.initialize(lane.context, policy_config)
+        persist_window_state(lane.state_store, lane.state, -1)
+    write_run_manifest(run_dir / "control" / "run_manifest.json", context, policy_config)
+    writer.append_log(
         control_log,
         (
-            f"control_loop finished: policy={policy_name} "
-            f"status={summary_dict['control_status']} "
-            f"total_windows={summary.total_windows} "
-            f"final_summary={summary_path}"
+            f"control_loop started: policy={policy_name} mode=multi_gpu "
+            f"gpus={','.join(str(lane.device_index) for lane in lanes)}"
         ),
     )
-    if abort_reason and raise_on_abort:
-        raise ControlLoopAbortError(abort_reason)
-    return summary
+    if apply_initial_decision:
+        for lane in lanes:
+            assert lane.state is not None
+            _apply_initial_decision_if_present(
+                policy=lane.policy,
+                context=lane.context,
+                state=lane.state,
+                control_log=control_log,
+                decisions_csv=lane.decisions_csv,
+                decision_path=lane.decision_path,
+                writer=writer,
+                state_store=lane.state_store,
+                controller=lane.controller,
+                timer=lane.timer,
+                device_index=lane.device_index,
+            )
+
+    abort_reason: str | None = None
+    window_index = 0
+    if window_scheduler is not None:
+        window_scheduler.start()
+
+    while abort_reason is None and not _should_stop(
+        window_index,
+        max_windows=max_windows,
+        bench_pid=bench_pid,
+        stop_file=stop_file,
+        stop_event=stop_event,
+    ):
+        window_futures = {
+            lane.device_index: pool.submit(
+                profiled_call,
+                profiler,
+                STAGE_WINDOW_BUILDER,
+                window_index,
+                window_builder,
+                lane.context,
+                lane.device_index,
+                window_index,
+            )
+            for lane in lanes
+        }
+
+        def _fail(lane: _DeviceLane, exc: BaseException) -> None:
+            nonlocal abort_reason
+            if lane.failures.record_failure(
+                writer, control_log, window_index, exc, device_index=lane.device_index
+            ):
+                abort_reason = abort_reason or lane.failures.abort_reason
+
+        decided: list[tuple[_DeviceLane, Decision]] = []
+        for lane in lanes:
+            assert lane.state is not None
+            try:
+                metrics = window_futures[lane.device_index].result()
+                _observe_applied_clock(lane.controller, metrics)
+                with profiler.span(STAGE_ON_WINDOW, window_index):
+                    decision = lane.policy.on_window(metrics, lane.state)
+                with profiler.span(STAGE_VALIDATE_DECISION, window_index):
+                    validate_decision(decision, lane.context.platform)
+                decided.append((lane, decision))
+            except Exception as exc:  # noqa: BLE001
+                _fail(lane, exc)
+
+        apply_futures = [
+            (
+                lane,
+                decision,
+                pool.submit(
+                    profiled_call,
+                    profiler,
+                    STAGE_APPLY_DECISION,
+                    window_index,
+                    _apply_timed,
+                    lane.controller,
+                    lane.timer,
+                    decision,
+                ),
+            )
+            for lane, decision in decided
+        ]
+        for lane, decision, future in apply_futures:
+            assert lane.state is not None
+            try:
+                actuation_ms = future.result()
+                with profiler.span(STAGE_CAPTURE_STATE, window_index):
+                    state_update = lane.state_store.capture(lane.state, window_index)
+                _persist_window_artifacts(
+                    _PendingPersist(
+                        window_index,
+                        decision,
+                        state_update,
+                        actuation_ms,
+                        device_index=lane.device_index,
+                    ),
+                    writer=writer,
+                    state_store=lane.state_store,
+                    policy_name=policy_name,
+                    control_log=control_log,
+                    decisions_csv=lane.decisions_csv,
+                    decision_path=lane.decision_path,
+                    profiler=profiler,
+                )
+                lane.failures.record_success()
+            except Exception as exc:  # noqa: BLE001
+                _fail(lane, exc)
+
+        if abort_reason is not None:
+            break
+        window_index += 1
+        if window_scheduler is None:
+            sleep_fn(window_seconds)
+            continue
+        timing = window_scheduler.wait_next()
+        _log_window_timing(writer, control_log, window_index - 1, timing)
+        window_index += timing.skipped_windows
+
+    summaries: dict[int, FinalSummary] = {}
+    devices: dict[str, object] = {}
+    for lane in lanes:
+        assert lane.state is not None
+        summary = lane.policy.finalize(lane.state)
+        persist_window_state(lane.state_store, lane.state, window_index, force_snapshot=True)
+        summaries[lane.device_index] = summary
+        devices[str(lane.device_index)] = {
+            **dataclasses.asdict(summary),
+            "window_failure_count": lane.failures.failed_window_count,
+            "max_consecutive_failures_observed": lane.failures.max_consecutive_observed,
+            "state_persistence": lane.state_store.metrics(),
+            "actuation": _actuation_summary(lane.controller),
+            "actuation_latency": _actuation_latency_summary(lane.timer),
+        }
+
+    merged = FinalSummary(
+        policy_name=policy_name,
+        run_id=context.metadata.run_id,
+        total_windows=max(summary.total_windows for summary in summaries.values()),
+        pd_target=context.pd_target,
+        pd_violation_count=sum(summary.pd_violation_count for summary in summaries.values()),
+        max_pd_violation=max(summary.max_pd_violation for summary in summaries.values()),
+    )
+    failures = _WindowFailureTracker(
+        limit=lanes[0].failures.limit,
+        failed_window_count=sum(lane.failures.failed_window_count for lane in lanes),
+        max_consecutive_observed=max(lane.failures.max_consecutive_observed for lane in lanes),
+        abort_reason=abort_reason,
+    )
+    _write_final_summary(
+        run_dir=run_dir,
+        control_log=control_log,
+        policy_name=policy_name,
+        summary=merged,
+        failures=failures,
+        writer=writer,
+        extra={
+            "mode": "multi_gpu",
+            "device_indices": [lane.device_index for lane in lanes],
+            "devices": devices,
+            "scheduler": _scheduler_summary(window_scheduler, window_seconds),
+            "profile": profiler.summary(),
+        },
+    )
+    profiler.write_trace(run_dir / "control" / "trace.json")
+    return summaries, abort_reason
 
 
 def run_initial_decision_only(
@@ -347,28 +1467,63 @@ def run_initial_decision_only(
     decisions_csv: Path,
     state_path: Path,
     decision_path: Path,
+    artifact_writer: ArtifactWriter | None = None,
+    state_store: StateStore | None = None,
+    clock_controller: ClockController | None = None,
+    device_index: int | None = None,
 ) -> None:
-    """Initializes a policy and applies only its optional pre-window decision."""
-    state: AlgorithmState = policy.initialize(context, policy_config)
-    persist_state(state_path, state)
-    write_run_manifest(run_dir / "control" / "run_manifest.json", context, policy_config)
-    append_log(
-        control_log,
-        f"initial_decision_only started: policy={context.metadata.policy_name}",
-    )
-    _apply_initial_decision_if_present(
-        policy=policy,
-        context=context,
-        state=state,
-        control_log=control_log,
-        decisions_csv=decisions_csv,
-        state_path=state_path,
-        decision_path=decision_path,
-    )
-    append_log(
-        control_log,
-        f"initial_decision_only finished: policy={context.metadata.policy_name}",
+    """Initializes a policy and applies only its optional pre-window decision.
+
+    *device_index* selects one GPU of a multi-GPU run: the default controller
+    is built with that ``gpu_index`` and log lines carry ``gpu=<index>``.
+    """
+    writer = artifact_writer if artifact_writer is not None else InlineArtifactWriter()
+    if state_store is None:
+        state_store = SnapshotStateStore(state_path, writer)
+    owns_controller = clock_controller is None
+    controller = (
+        clock_controller
+        if clock_controller is not None
+        else build_loop_clock_controller(
+            context, _log_to(writer, control_log), gpu_index=device_index
+        )
     )
+    controller, timer = _with_actuation_timer(controller)
+    try:
+        state: AlgorithmState = policy.initialize(context, policy_config)
+        persist_window_state(state_store, state, -1)
+        write_run_manifest(run_dir / "control" / "run_manifest.json", context, policy_config)
+        writer.append_log(
+            control_log,
+            (
+                f"initial_decision_only started{_device_label(device_index)}: "
+                f"policy={context.metadata.policy_name}"
+            ),
+        )
+        _apply_initial_decision_if_present(
+            policy=policy,
+            context=context,
+            state=state,
+            control_log=control_log,
+            decisions_csv=decisions_csv,
+            decision_path=decision_path,
+            writer=writer,
+            state_store=state_store,
+            controller=controller,
+            timer=timer,
+            device_index=device_index,
+        )
+        writer.append_log(
+            control_log,
+            (
+                f"initial_decision_only finished{_device_label(device_index)}: "
+                f"policy={context.metadata.policy_name}"
+            ),
+        )
+    finally:
+        if owns_controller:
+            _close_controller(controller)
+        writer.flush()
 
 
 # ---------------------------------------------------------------------------
@@ -397,13 +1552,103 @@ def main(argv: list[str] | None = None) -> int:  # noqa: ARG001 (argv reserved f
     MAX_WINDOWS (optional int)
         Maximum number of windows to run.  Either ``BENCH_PID`` or
         ``MAX_WINDOWS`` (or both) must be set; the loop refuses to run
-        unbounded.
+        unbounded.  A replay run is bounded by its trace instead.
     MAX_CONSECUTIVE_FAILURES (default: ``5``)
         Abort after this many consecutive per-window exceptions.
     CONTROL_LOG (default: ``<run_dir>/control_loop.log``)
         Path to the append-only control log.
     CONTROL_WINDOW_SECONDS (default: ``5.0``)
         Nominal window duration in seconds.
+    CONTROL_LOOP_MODE (default: ``sync``)
+        ``sync`` runs :func:`run_control_loop`. ``async`` runs
+        :func:`run_control_loop_async`, which overlaps telemetry collection,
+        actuation, and artifact writes across windows.
+    CONTROL_GPU_INDICES (optional)
+        ``all`` (every index below ``PLATFORM_GPU_COUNT``) or comma-separated
+        GPU indices.  When set, :func:`run_multi_gpu_control_loop` drives one
+        policy instance per GPU with per-device artifacts under
+        ``control/gpu<index>/`` (``CONTROL_DECISIONS_CSV`` is ignored).
+        Telemetry reads ``METRIC_<NAME>_GPU<index>`` before ``METRIC_<NAME>``,
+        and ``{gpu_index}`` is substituted in the clock commands.  Requires
+        ``CONTROL_LOOP_MODE=sync``.
+    CONTROL_GPU_WORKERS (default: number of GPUs)
+        Multi-GPU thread-pool size for telemetry and actuation.
+    CONTROL_TELEMETRY_MONITOR_CMD (optional)
+        Streaming monitor command started once for the run, e.g.
+        ``nvidia-smi dmon -s pucm -d 1``.  Its stdout table is parsed by a
+        reader thread into per-window statistics, rows are routed by GPU in
+        multi-GPU mode, and the monitor is restarted if it exits.  A window
+        with no rows fails.  Takes precedence over ``CONTROL_TELEMETRY_FILE``.
+    CONTROL_TELEMETRY_SYSFS (optional)
+        amdgpu sysfs telemetry, sampled every ``METRIC_SAMPLING_INTERVAL_MS``
+        by a background thread per GPU from ``gpu_busy_percent``,
+        ``pp_dpm_sclk``, and hwmon files kept open and re-read with
+        ``pread``.  ``auto`` takes amdgpu cards in card order; otherwise a
+        ``/sys/class/drm/card{gpu_index}/device``-style template.  A window
+        with no samples fails.  Takes precedence over
+        ``CONTROL_TELEMETRY_FILE``.
+    CONTROL_TELEMETRY_SHM (optional)
+        Name of a shared-memory segment that an external sampler publishes
+        samples into (layout in ``src/common/telemetry/shm_channel.py``).
+        Each window reads the samples published since the previous window
+        without locking; a window with no samples, or before the segment
+        exists, fails.  Multi-GPU runs need ``{gpu_index}`` in the name.
+        Used when no monitor or sysfs source is set, and takes precedence
+        over ``CONTROL_TELEMETRY_FILE``.
+    CONTROL_TELEMETRY_FILE (optional)
+        CSV or JSONL telemetry log appended to by a sidecar (e.g.
+        ``nvidia-smi --query-gpu=... --format=csv -lms 100``).  When set,
+        each window aggregates only the rows appended since the previous
+        window instead of reading ``METRIC_*`` variables; a window with no
+        new rows fails.  In multi-GPU mode ``{gpu_index}`` in the path
+        selects a per-device file, otherwise rows are split by their
+        ``index`` column.
+    CONTROL_TELEMETRY_FORMAT (default: from the file suffix)
+        ``csv`` or ``jsonl``; ``.jsonl``/``.ndjson`` paths default to JSONL.
+    CONTROL_TELEMETRY_COLUMNS (optional)
+        Comma-separated column names for headerless CSV, e.g.
+        ``timestamp,utilization.gpu,utilization.memory,clocks.gr,power.draw``.
+    CONTROL_REPLAY_TRACE (optional)
+        Fast-forward replay of a recorded CSV, JSONL, or NPZ trace.  Rows
+        with ``graphics_clock_avg_mhz`` are replayed as recorded windows;
+        per-sample rows are binned into ``CONTROL_WINDOW_SECONDS`` windows.
+        Windows run back to back with a no-op sleep (``CONTROL_SCHEDULER``
+        is ignored), the run ends with the trace (or at ``MAX_WINDOWS`` if
+        smaller), and live telemetry settings are ignored.  ``{gpu_index}``
+        selects a per-device trace in multi-GPU mode.  Leave the
+        ``APPLY_CLOCK_*`` variables unset so no clock is actuated.
+    CONTROL_SCHEDULER (default: ``sleep``)
+        Window pacing. ``sleep`` sleeps ``CONTROL_WINDOW_SECONDS`` after each
+        window (legacy behavior, windows drift by the per-window work time).
+        ``deadline`` wakes at absolute monotonic window boundaries.
+    CONTROL_OVERRUN_POLICY (default: ``skip``)
+        Deadline-mode policy for windows that finish past their deadline:
+        ``skip``, ``catch_up``, or ``stretch``.
+    CONTROL_ARTIFACT_WRITER (default: ``inline``)
+        ``inline`` writes each artifact synchronously (legacy behavior).
+        ``background`` batches log lines and CSV rows and coalesces JSON
+        rewrites on a writer thread.
+    CONTROL_ARTIFACT_QUEUE_SIZE (default: ``1024``)
+        Background writer queue bound; submitting blocks when it is full.
+    CONTROL_ARTIFACT_FLUSH_INTERVAL_S (default: ``1.0``)
+        How long the background writer collects writes before one batch.
+    CONTROL_STATE_PERSISTENCE (default: ``snapshot``)
+        ``snapshot`` rewrites ``control/policy_state.json`` every window.
+        ``journal`` appends changed keys to ``control/policy_state.jsonl``
+        and refreshes ``policy_state.json`` only at compacted snapshots,
+        each of which starts a new ``policy_state.<n>.jsonl`` segment.
+    CONTROL_STATE_SNAPSHOT_EVERY (default: ``100``)
+        Journal mode: number of delta records between compacted snapshots.
+    CONTROL_CONFIRM_APPLIED_CLOCK (default: ``0``)
+        When true, the deduplicating controller compares each window's
+        observed clock with the applied clock and re-issues the next
+        actuation after a mismatch.
+    CONTROL_CONFIRM_TOLERANCE_MHZ (default: one platform clock step)
+        Allowed observed-vs-applied clock difference for confirmation.
+    CONTROL_PROFILE (default: ``0``)
+        When true, records wall and CPU time per window stage, aggregates
+        it under ``profile`` in ``final_summary.json``, and writes a Chrome
+        trace to ``control/trace.json``.
     CONTROL_PHASE (default: ``all``)
         Run phase. ``all`` applies the pre-run decision (for static policies)
         then runs the windowed loop. ``prerun`` applies only the pre-run
@@ -412,8 +1657,15 @@ def main(argv: list[str] | None = None) -> int:  # noqa: ARG001 (argv reserved f
         the windowed loop and skips the pre-run decision because an earlier
         ``prerun`` phase already applied it.
 
+    ``SIGTERM`` (e.g. from Slurm at the time limit) stops the loop before the
+    next window; the policy is finalized and pending artifacts are flushed
+    as on a normal exit.
+
     Policy config is loaded from ``POLICY_CONFIG_PATH`` or
     ``POLICY_CONFIG_JSON`` (same as ``control_hook.py``).
+    Clock actuation uses ``APPLY_CLOCK_HELPER_CMD`` (a persistent helper
+    process, see ``src/common/control/clock_helper.py``) when set, else
+    ``APPLY_CLOCK_CMD_TEMPLATE`` / ``APPLY_CLOCK_RESET_CMD``.
     Platform / metrics telemetry env vars are identical to those read by
     ``control_hook.py``.
 
@@ -433,6 +1685,15 @@ def main(argv: list[str] | None = None) -> int:  # noqa: ARG001 (argv reserved f
         print("BENCH_ID is required for control loop.", file=sys.stderr)
         return 2
 
+    loop_mode = os.getenv("CONTROL_LOOP_MODE", "sync").strip().lower()
+    if loop_mode not in _CONTROL_LOOP_MODES:
+        supported = ", ".join(sorted(_CONTROL_LOOP_MODES))
+        print(
+            f"Unsupported CONTROL_LOOP_MODE={loop_mode!r}. Supported values: {supported}.",
+            file=sys.stderr,
+        )
+        return 2
+
     phase = os.getenv("CONTROL_PHASE", "all").strip().lower()
     if phase not in _CONTROL_PHASES:
         supported = ", ".join(sorted(_CONTROL_PHASES))
@@ -449,7 +1710,8 @@ def main(argv: list[str] | None = None) -> int:  # noqa: ARG001 (argv reserved f
     bench_pid: int | None = int(bench_pid_raw) if bench_pid_raw else None
     max_windows: int | None = int(max_windows_raw) if max_windows_raw else None
 
-    if phase != "prerun" and bench_pid is None and max_windows is None:
+    replay_trace = os.getenv("CONTROL_REPLAY_TRACE", "")
+    if phase != "prerun" and bench_pid is None and max_windows is None and not replay_trace:
         print(
             "Either BENCH_PID or MAX_WINDOWS must be set to bound the control loop.",
             file=sys.stderr,
@@ -465,17 +1727,76 @@ def main(argv: list[str] | None = None) -> int:  # noqa: ARG001 (argv reserved f
         os.getenv("CONTROL_DECISIONS_CSV", str(run_dir / "control" / "decisions.csv"))
     )
     state_path = run_dir / "control" / "policy_state.json"
+    state_journal_path = run_dir / "control" / "policy_state.jsonl"
     decision_path = run_dir / "control" / "last_decision.json"
     stop_file = run_dir / "control" / "STOP"
 
     started_at_utc = os.getenv("CONTROL_STARTED_AT_UTC", utc_now())
     os.environ["CONTROL_STARTED_AT_UTC"] = started_at_utc
 
+    stop_event = threading.Event()
+    previous_sigterm = signal.signal(signal.SIGTERM, lambda _signum, _frame: stop_event.set())
+    artifact_writer: ArtifactWriter | None = None
+    telemetry_source: TelemetrySource | None = None
+
     try:
+        artifact_writer = build_artifact_writer(
+            os.getenv("CONTROL_ARTIFACT_WRITER", "inline"),
+            max_queue_size=parse_int_env("CONTROL_ARTIFACT_QUEUE_SIZE", 1024),
+            flush_interval_s=parse_float_env("CONTROL_ARTIFACT_FLUSH_INTERVAL_S", 1.0),
+        )
+        state_persistence = os.getenv("CONTROL_STATE_PERSISTENCE", "snapshot")
+        snapshot_every = parse_int_env("CONTROL_STATE_SNAPSHOT_EVERY", 100)
+        state_store = build_state_store(
+            state_persistence,
+            state_path=state_path,
+            journal_path=state_journal_path,
+            writer=artifact_writer,
+            snapshot_every=snapshot_every,
+        )
+
+        def _device_state_store(device_dir: Path, writer: ArtifactWriter) -> StateStore:
+            return build_state_store(
+                state_persistence,
+                state_path=device_dir / "policy_state.json",
+                journal_path=device_dir / "policy_state.jsonl",
+                writer=writer,
+                snapshot_every=snapshot_every,
+            )
+
+        profiler = build_stage_profiler(parse_bool_env("CONTROL_PROFILE", False))
         policy_config = load_policy_config()
         policy = resolve_policy(policy_name)
         context = build_context(policy_name, bench_id, run_id, started_at_utc)
         window_seconds = parse_float_env("CONTROL_WINDOW_SECONDS", 5.0)
+        window_scheduler = build_window_scheduler(
+            os.getenv("CONTROL_SCHEDULER", "sleep"),
+            window_seconds,
+            overrun_policy=os.getenv("CONTROL_OVERRUN_POLICY", "skip"),
+        )
+        gpu_indices = parse_gpu_indices(
+            os.getenv("CONTROL_GPU_INDICES", ""), context.platform.gpu_count
+        )
+        if gpu_indices is not None and loop_mode != "sync":
+            raise ValueError("CONTROL_GPU_INDICES requires CONTROL_LOOP_MODE=sync.")
+
+        if phase == "prerun" and gpu_indices is not None:
+            for device_index in gpu_indices:
+                device_dir = _device_dir(run_dir, device_index)
+                run_initial_decision_only(
+                    policy=resolve_policy(policy_name),
+                    context=device_context(context, device_index),
+                    policy_config=policy_config,
+                    run_dir=run_dir,
+                    control_log=control_log,
+                    decisions_csv=device_dir / "decisions.csv",
+                    state_path=device_dir / "policy_state.json",
+                    decision_path=device_dir / "last_decision.json",
+                    artifact_writer=artifact_writer,
+                    state_store=_device_state_store(device_dir, artifact_writer),
+                    device_index=device_index,
+                )
+            return 0
 
         if phase == "prerun":
             run_initial_decision_only(
@@ -487,26 +1808,76 @@ def main(argv: list[str] | None = None) -> int:  # noqa: ARG001 (argv reserved f
                 decisions_csv=decisions_csv,
                 state_path=state_path,
                 decision_path=decision_path,
+                artifact_writer=artifact_writer,
+                state_store=state_store,
             )
             return 0
 
-        run_control_loop(
+        if replay_trace:
+            replay_source = build_replay_source(
+                replay_trace, gpu_indices, window_seconds=context.window_seconds
+            )
+            telemetry_source = replay_source
+            if max_windows is None or max_windows > replay_source.window_count:
+                max_windows = replay_source.window_count
+            window_scheduler = None
+        else:
+            telemetry_source = build_telemetry_source(
+                gpu_indices, sampling_interval_s=context.sampling_interval_ms / 1000.0
+            )
+        loop_kwargs: dict[str, Any] = {
+            "context": context,
+            "policy_config": policy_config,
+            "run_dir": run_dir,
+            "control_log": control_log,
+            "window_seconds": window_seconds,
+            "max_windows": max_windows,
+            "bench_pid": bench_pid,
+            "stop_file": stop_file,
+            "max_consecutive_failures": max_consecutive_failures,
+            "raise_on_abort": True,
+            "apply_initial_decision": phase == "all",
+            "window_scheduler": window_scheduler,
+            "artifact_writer": artifact_writer,
+            "stop_event": stop_event,
+            "profiler": profiler,
+        }
+        replay_controllers: dict[int, ClockController] = {}
+        if replay_trace:
+            loop_kwargs["sleep_fn"] = _skip_sleep_async if loop_mode == "async" else _skip_sleep
+            # Replayed telemetry does not respond to clocks, and a fast-forward
+            # run must never drive the real GPU: ignore APPLY_CLOCK_*.
+            if gpu_indices is None:
+                loop_kwargs["clock_controller"] = ShellTemplateController(apply_template=None)
+            else:
+                replay_controllers = {
+                    index: ShellTemplateController(apply_template=None, gpu_index=index)
+                    for index in gpu_indices
+                }
+        if gpu_indices is not None:
+            run_multi_gpu_control_loop(
+                clock_controllers=replay_controllers or None,
+                policy_factory=lambda: resolve_policy(policy_name),
+                device_indices=gpu_indices,
+                state_store_factory=_device_state_store,
+                window_builder=build_device_window_builder(gpu_indices, telemetry_source),
+                max_workers=parse_int_env("CONTROL_GPU_WORKERS", 0) or None,
+                **loop_kwargs,
+            )
+            return 0
+
+        loop_kwargs.update(
             policy=policy,
-            context=context,
-            policy_config=policy_config,
-            run_dir=run_dir,
-            control_log=control_log,
             decisions_csv=decisions_csv,
             state_path=state_path,
             decision_path=decision_path,
-            window_seconds=window_seconds,
-            max_windows=max_windows,
-            bench_pid=bench_pid,
-            stop_file=stop_file,
-            max_consecutive_failures=max_consecutive_failures,
-            raise_on_abort=True,
-            apply_initial_decision=phase == "all",
+            state_store=state_store,
+            window_builder=build_window_builder(telemetry_source),
         )
+        if loop_mode == "async":
+            asyncio.run(run_control_loop_async(**loop_kwargs))
+        else:
+            run_control_loop(**loop_kwargs)
         return 0
 
     except ControlLoopAbortError as exc:
@@ -525,6 +1896,13 @@ def main(argv: list[str] | None = None) -> int:  # noqa: ARG001 (argv reserved f
         print(f"control loop fatal error: {exc}", file=sys.stderr)
         return 1
 
+    finally:
+        if telemetry_source is not None:
+            telemetry_source.stop()
+        if artifact_writer is not None:
+            artifact_writer.close()
+        signal.signal(signal.SIGTERM, previous_sigterm)
+
 
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -12,11 +12,12 @@ import dataclasses
 import hashlib
 import json
 import os
+import shlex
 import subprocess
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Mapping
+from typing import Any, Callable, Mapping, Sequence
 
 # Ensure the repository root is importable when invoked from Slurm hooks or
 # directly via ``python3 scripts/run/<module>.py``.
@@ -24,7 +25,13 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from src.common.control import ClockController, ShellTemplateController
+from src.common.control import (
+    ClockController,
+    CoprocessClockController,
+    DeduplicatingClockController,
+    ShellTemplateController,
+    TimedClockController,
+)
 from src.common.experiment import (
     AlgorithmState,
     Decision,
@@ -34,7 +41,18 @@ from src.common.experiment import (
     PerformanceTargetType,
     PlatformSpec,
 )
-from src.common.telemetry import EnvTelemetryProvider
+from src.common.telemetry import (
+    EnvTelemetryProvider,
+    FileTelemetryProvider,
+    MonitorTelemetrySource,
+    SharedMemoryTelemetryProvider,
+    SysfsTelemetrySource,
+    TelemetrySource,
+    TraceReplayProvider,
+    TraceReplaySource,
+    WindowTelemetryProvider,
+    discover_drm_devices,
+)
 
 
 _MANIFEST_ENV_KEYS = (
@@ -46,7 +64,27 @@ _MANIFEST_ENV_KEYS = (
     "PD_TARGET",
     "PERFORMANCE_TARGET_TYPE",
     "CONTROL_WINDOW_SECONDS",
+    "CONTROL_LOOP_MODE",
+    "CONTROL_GPU_INDICES",
+    "CONTROL_GPU_WORKERS",
+    "CONTROL_ARTIFACT_WRITER",
+    "CONTROL_ARTIFACT_QUEUE_SIZE",
+    "CONTROL_ARTIFACT_FLUSH_INTERVAL_S",
+    "CONTROL_STATE_PERSISTENCE",
+    "CONTROL_STATE_SNAPSHOT_EVERY",
+    "CONTROL_CONFIRM_APPLIED_CLOCK",
+    "CONTROL_CONFIRM_TOLERANCE_MHZ",
+    "CONTROL_PROFILE",
+    "CONTROL_SCHEDULER",
+    "CONTROL_OVERRUN_POLICY",
     "CONTROL_DECISIONS_CSV",
+    "CONTROL_TELEMETRY_MONITOR_CMD",
+    "CONTROL_TELEMETRY_SYSFS",
+    "CONTROL_TELEMETRY_SHM",
+    "CONTROL_TELEMETRY_FILE",
+    "CONTROL_TELEMETRY_FORMAT",
+    "CONTROL_TELEMETRY_COLUMNS",
+    "CONTROL_REPLAY_TRACE",
     "METRIC_SAMPLING_INTERVAL_MS",
     "PLATFORM_VENDOR",
     "PLATFORM_GPU_MODEL",
@@ -60,6 +98,8 @@ _MANIFEST_ENV_KEYS = (
     "POLICY_CONFIG_PATH",
     "APPLY_CLOCK_CMD_TEMPLATE",
     "APPLY_CLOCK_RESET_CMD",
+    "APPLY_CLOCK_HELPER_CMD",
+    "APPLY_CLOCK_HELPER_TIMEOUT_S",
 )
 
 
@@ -94,16 +134,38 @@ def parse_float_env(name: str, default: float) -> float:
     return float(raw)
 
 
+_TRUE_ENV_VALUES = frozenset({"1", "true", "yes", "on"})
+_FALSE_ENV_VALUES = frozenset({"0", "false", "no", "off"})
+
+
+def parse_bool_env(name: str, default: bool) -> bool:
+    """Returns the boolean value of an environment variable, or *default*."""
+    raw = os.getenv(name)
+    if raw is None or raw == "":
+        return default
+    normalized = raw.strip().lower()
+    if normalized in _TRUE_ENV_VALUES:
+        return True
+    if normalized in _FALSE_ENV_VALUES:
+        return False
+    raise ValueError(f"{name} must be one of 1/0, true/false, yes/no, on/off; got {raw!r}.")
+
+
 # ---------------------------------------------------------------------------
 # Log helpers
 # ---------------------------------------------------------------------------
 
 
+def format_log_line(message: str) -> str:
+    """Returns *message* as one timestamped control-log line (with newline)."""
+    return f"[{utc_now()}] {message}\n"
+
+
 def append_log(control_log: Path, message: str) -> None:
     """Appends a single timestamped line to *control_log*."""
     control_log.parent.mkdir(parents=True, exist_ok=True)
     with control_log.open("a", encoding="utf-8") as fp:
-        fp.write(f"[{utc_now()}] {message}\n")
+        fp.write(format_log_line(message))
 
 
 # ---------------------------------------------------------------------------
@@ -111,38 +173,80 @@ def append_log(control_log: Path, message: str) -> None:
 # ---------------------------------------------------------------------------
 
 
-def ensure_decisions_csv(path: Path) -> None:
-    """Creates the decisions CSV with a header row if it does not yet exist."""
-    if path.exists():
-        return
+DECISIONS_CSV_HEADER = ("timestamp_utc", "component", "decision", "reason", "actuation_ms")
+
+
+def decisions_csv_width(path: Path) -> int | None:
+    """Returns the column count of an existing decisions CSV, or None when it does not exist.
+
+    Files written before a column was added keep their narrower header, so
+    rows appended to them must be cut to this width.
+    """
+    try:
+        with path.open("r", encoding="utf-8", newline="") as fp:
+            header = next(csv.reader(fp), None)
+    except FileNotFoundError:
+        return None
+    return len(DECISIONS_CSV_HEADER) if header is None else len(header)
+
+
+def ensure_decisions_csv(path: Path) -> int:
+    """Creates the decisions CSV with a header row if it does not yet exist.
+
+    Returns the number of columns appended rows must have (see
+    :func:`decisions_csv_width`).
+    """
+    width = decisions_csv_width(path)
+    if width is not None:
+        return width
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as fp:
         writer = csv.writer(fp)
-        writer.writerow(["timestamp_utc", "component", "decision", "reason"])
+        writer.writerow(DECISIONS_CSV_HEADER)
+    return len(DECISIONS_CSV_HEADER)
 
 
-def append_decision_row(
-    path: Path,
+def format_actuation_ms(actuation_ms: float | None) -> str:
+    """Formats an actuation duration for logs and CSV rows; ``""`` when none was issued."""
+    return "" if actuation_ms is None else f"{actuation_ms:.3f}"
+
+
+def decision_row(
     policy_name: str,
     decision: Decision,
     window_index: int,
-) -> None:
-    """Appends one decision row to the decisions CSV."""
-    ensure_decisions_csv(path)
+    actuation_ms: float | None = None,
+) -> list[str]:
+    """Returns the decisions-CSV row for one decision, timestamped now.
+
+    ``actuation_ms`` is the time the clock backend took to apply the decision;
+    it is left empty when no actuation was issued (no clock change, a
+    deduplicated decision, or a caller that does not time actuations).
+    """
     decision_value = decision.action.value
     if decision.target_graphics_clock_mhz is not None:
         decision_value = f"{decision_value}:{decision.target_graphics_clock_mhz}"
+    return [
+        utc_now(),
+        f"policy:{policy_name}",
+        decision_value,
+        f"{decision.reason_code};window={window_index}",
+        format_actuation_ms(actuation_ms),
+    ]
+
 
+def append_decision_row(
+    path: Path,
+    policy_name: str,
+    decision: Decision,
+    window_index: int,
+    actuation_ms: float | None = None,
+) -> None:
+    """Appends one decision row to the decisions CSV, matching its existing header."""
+    width = ensure_decisions_csv(path)
     with path.open("a", encoding="utf-8", newline="") as fp:
         writer = csv.writer(fp)
-        writer.writerow(
-            [
-                utc_now(),
-                f"policy:{policy_name}",
-                decision_value,
-                f"{decision.reason_code};window={window_index}",
-            ]
-        )
+        writer.writerow(decision_row(policy_name, decision, window_index, actuation_ms)[:width])
 
 
 # ---------------------------------------------------------------------------
@@ -311,16 +415,244 @@ def build_window(context: ExperimentContext, window_index: int) -> MetricWindow:
     return EnvTelemetryProvider().get_window(context, window_index)
 
 
+def build_device_window(
+    context: ExperimentContext,
+    device_index: int,
+    window_index: int,
+) -> MetricWindow:
+    """Builds one device's :class:`MetricWindow` from ``METRIC_*_GPU<index>`` variables.
+
+    Falls back to the shared ``METRIC_*`` variables for metrics without a
+    per-device value.
+    """
+    return EnvTelemetryProvider(device_index=device_index).get_window(context, window_index)
+
+
+def _telemetry_columns() -> list[str] | None:
+    columns_raw = os.getenv("CONTROL_TELEMETRY_COLUMNS", "")
+    return [name.strip() for name in columns_raw.split(",") if name.strip()] or None
+
+
+def _file_telemetry_provider(
+    path_template: str,
+    device_index: int | None = None,
+) -> FileTelemetryProvider:
+    path = path_template.format(gpu_index="" if device_index is None else device_index)
+    return FileTelemetryProvider(
+        Path(path),
+        row_format=os.getenv("CONTROL_TELEMETRY_FORMAT", "").strip().lower() or None,
+        columns=_telemetry_columns(),
+        # One file per device needs no row filtering; a shared file does.
+        device_index=device_index if path == path_template else None,
+    )
+
+
+def _polled_telemetry_provider(
+    device_index: int | None = None,
+) -> WindowTelemetryProvider | None:
+    shm_template = os.getenv("CONTROL_TELEMETRY_SHM", "").strip()
+    if shm_template:
+        if device_index is not None and "{gpu_index}" not in shm_template:
+            raise ValueError(
+                "CONTROL_TELEMETRY_SHM must contain {gpu_index} for a multi-GPU run; "
+                "each device needs its own segment."
+            )
+        name = shm_template.format(gpu_index="" if device_index is None else device_index)
+        return SharedMemoryTelemetryProvider(name)
+    path_template = os.getenv("CONTROL_TELEMETRY_FILE", "")
+    if path_template:
+        return _file_telemetry_provider(path_template, device_index)
+    return None
+
+
+def _sysfs_device_dirs(
+    spec: str,
+    device_indices: Sequence[int] | None,
+) -> dict[int | None, Path]:
+    if spec.strip().lower() == "auto":
+        discovered = discover_drm_devices()
+        if not discovered:
+            raise ValueError("CONTROL_TELEMETRY_SYSFS=auto found no amdgpu devices.")
+
+        def _locate(index: int) -> Path:
+            if index >= len(discovered):
+                raise ValueError(
+                    f"CONTROL_TELEMETRY_SYSFS=auto found {len(discovered)} amdgpu devices; "
+                    f"GPU index {index} is out of range."
+                )
+            return discovered[index]
+
+    else:
+
+        def _locate(index: int) -> Path:
+            return Path(spec.format(gpu_index=index))
+
+    if device_indices is None:
+        return {None: _locate(0)}
+    return {index: _locate(index) for index in device_indices}
+
+
+def build_telemetry_source(
+    device_indices: Sequence[int] | None = None,
+    *,
+    sampling_interval_s: float = 1.0,
+) -> TelemetrySource | None:
+    """Returns the configured background telemetry source, or ``None``.
+
+    ``CONTROL_TELEMETRY_MONITOR_CMD`` selects a :class:`MonitorTelemetrySource`
+    whose rows are routed by GPU column when *device_indices* is given.
+    ``CONTROL_TELEMETRY_SYSFS`` selects a :class:`SysfsTelemetrySource`
+    sampling every *sampling_interval_s*; its value is ``auto`` (amdgpu cards
+    in card order) or a ``card<N>/device`` path template with
+    ``{gpu_index}``, which a single-GPU run formats with index 0.  The source
+    is returned already collecting, so window 0 has samples; the caller owns
+    it and must ``stop()`` it at exit.
+    """
+    command = os.getenv("CONTROL_TELEMETRY_MONITOR_CMD", "")
+    if command.strip():
+        return MonitorTelemetrySource(shlex.split(command), device_indices=device_indices).start()
+    sysfs_spec = os.getenv("CONTROL_TELEMETRY_SYSFS", "")
+    if sysfs_spec.strip():
+        return SysfsTelemetrySource(
+            _sysfs_device_dirs(sysfs_spec, device_indices),
+            interval_s=sampling_interval_s,
+        ).start()
+    return None
+
+
+def build_replay_source(
+    path_template: str,
+    device_indices: Sequence[int] | None = None,
+    *,
+    window_seconds: float,
+) -> TraceReplaySource:
+    """Loads the ``CONTROL_REPLAY_TRACE`` trace(s) for a fast-forward replay run.
+
+    As with ``CONTROL_TELEMETRY_FILE``, ``{gpu_index}`` in *path_template*
+    names one trace per device, otherwise every device reads the shared trace
+    and keeps the rows whose ``index`` column matches it.
+    ``CONTROL_TELEMETRY_FORMAT`` (``csv``, ``jsonl``, or ``npz``) and
+    ``CONTROL_TELEMETRY_COLUMNS`` apply to the trace.
+    """
+    row_format = os.getenv("CONTROL_TELEMETRY_FORMAT", "").strip().lower() or None
+    columns = _telemetry_columns()
+
+    def _load(device_index: int | None) -> TraceReplayProvider:
+        path = path_template.format(gpu_index="" if device_index is None else device_index)
+        return TraceReplayProvider.from_path(
+            Path(path),
+            window_seconds=window_seconds,
+            row_format=row_format,
+            columns=columns,
+            device_index=device_index if path == path_template else None,
+        )
+
+    if device_indices is None:
+        return TraceReplaySource({None: _load(None)})
+    return TraceReplaySource({index: _load(index) for index in device_indices})
+
+
+def build_window_builder(
+    source: TelemetrySource | None = None,
+) -> Callable[[ExperimentContext, int], MetricWindow]:
+    """Returns the single-GPU window builder for the configured telemetry source.
+
+    Uses *source* when given, else reads the ``CONTROL_TELEMETRY_SHM``
+    segment with a :class:`SharedMemoryTelemetryProvider`, else follows
+    ``CONTROL_TELEMETRY_FILE`` with a :class:`FileTelemetryProvider`, else
+    reads ``METRIC_*`` variables via :func:`build_window`.
+    """
+    if source is not None:
+        return source.provider().get_window
+    provider = _polled_telemetry_provider()
+    if provider is None:
+        return build_window
+    return provider.get_window
+
+
+def build_device_window_builder(
+    device_indices: Sequence[int],
+    source: TelemetrySource | None = None,
+) -> Callable[[ExperimentContext, int, int], MetricWindow]:
+    """Returns the multi-GPU window builder for the configured telemetry source.
+
+    With *source*, each device reads its own provider of the shared source
+    (built with the same *device_indices*).  With ``CONTROL_TELEMETRY_SHM``
+    set, each device reads the segment named by formatting ``{gpu_index}``
+    into it.  With ``CONTROL_TELEMETRY_FILE`` set, each device gets its own
+    :class:`FileTelemetryProvider`.  A path containing ``{gpu_index}`` names
+    one file per device; otherwise every device follows the shared file and
+    keeps only the rows whose ``index`` column matches it.
+    """
+    providers: Mapping[int, WindowTelemetryProvider]
+    if source is not None:
+        providers = {index: source.provider(index) for index in device_indices}
+    else:
+        polled = {index: _polled_telemetry_provider(index) for index in device_indices}
+        if any(provider is None for provider in polled.values()):
+            return build_device_window
+        providers = polled  # type: ignore[assignment]
+
+    def _device_window(
+        context: ExperimentContext,
+        device_index: int,
+        window_index: int,
+    ) -> MetricWindow:
+        return providers[device_index].get_window(context, window_index)
+
+    return _device_window
+
+
+def device_context(context: ExperimentContext, device_index: int) -> ExperimentContext:
+    """Returns *context* tagged with ``gpu_index`` for one device of a multi-GPU run."""
+    metadata = dataclasses.replace(
+        context.metadata,
+        tags={**context.metadata.tags, "gpu_index": str(device_index)},
+    )
+    return dataclasses.replace(context, metadata=metadata)
+
+
+def parse_gpu_indices(raw: str, gpu_count: int) -> list[int] | None:
+    """Parses ``CONTROL_GPU_INDICES``.
+
+    Returns ``None`` for an empty value (single-GPU mode), every index below
+    *gpu_count* for ``all``, and otherwise the comma-separated indices in the
+    given order.
+    """
+    normalized = raw.strip().lower()
+    if not normalized:
+        return None
+    if normalized == "all":
+        if gpu_count < 1:
+            raise ValueError("CONTROL_GPU_INDICES=all requires PLATFORM_GPU_COUNT >= 1.")
+        return list(range(gpu_count))
+    try:
+        indices = [int(part) for part in normalized.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError(
+            f"CONTROL_GPU_INDICES must be 'all' or comma-separated integers; got {raw!r}."
+        ) from None
+    if not indices or any(index < 0 for index in indices) or len(set(indices)) != len(indices):
+        raise ValueError(
+            f"CONTROL_GPU_INDICES must list unique non-negative indices; got {raw!r}."
+        )
+    return indices
+
+
 # ---------------------------------------------------------------------------
 # State persistence
 # ---------------------------------------------------------------------------
 
 
+def state_snapshot_json(state: AlgorithmState) -> str:
+    """Serializes *state* in the ``policy_state.json`` snapshot format."""
+    return json.dumps({"policy_state": state.data}, indent=2, sort_keys=True)
+
+
 def persist_state(state_path: Path, state: AlgorithmState) -> None:
     """Writes a JSON snapshot of *state* to *state_path* (observability only)."""
     state_path.parent.mkdir(parents=True, exist_ok=True)
-    payload = {"policy_state": state.data}
-    state_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    state_path.write_text(state_snapshot_json(state), encoding="utf-8")
 
 
 # ---------------------------------------------------------------------------
@@ -328,24 +660,88 @@ def persist_state(state_path: Path, state: AlgorithmState) -> None:
 # ---------------------------------------------------------------------------
 
 
-def build_clock_controller(logger: Callable[[str], None]) -> ClockController:
+def build_clock_controller(
+    logger: Callable[[str], None],
+    *,
+    gpu_index: int | None = None,
+) -> ClockController:
     """Builds the default env-backed clock controller.
 
-    Reads ``APPLY_CLOCK_CMD_TEMPLATE`` and ``APPLY_CLOCK_RESET_CMD`` and returns
+    When ``APPLY_CLOCK_HELPER_CMD`` is set, returns a
+    :class:`CoprocessClockController` that starts that command once as a
+    persistent helper (timeout ``APPLY_CLOCK_HELPER_TIMEOUT_S``). Otherwise
+    reads ``APPLY_CLOCK_CMD_TEMPLATE`` and ``APPLY_CLOCK_RESET_CMD`` and returns
     a :class:`ShellTemplateController`. This is the env-binding adapter for the
     typed actuation seam, mirroring how ``build_window`` binds telemetry.
+
+    With *gpu_index* set (multi-GPU runs), ``{gpu_index}`` is substituted in
+    the helper command and in both shell commands.
     """
+    helper_cmd = os.getenv("APPLY_CLOCK_HELPER_CMD", "")
+    if helper_cmd:
+        if gpu_index is not None:
+            helper_cmd = helper_cmd.format(gpu_index=gpu_index)
+        return CoprocessClockController(
+            shlex.split(helper_cmd),
+            timeout_s=parse_float_env("APPLY_CLOCK_HELPER_TIMEOUT_S", 5.0),
+            logger=logger,
+        )
     return ShellTemplateController(
         apply_template=os.getenv("APPLY_CLOCK_CMD_TEMPLATE", "") or None,
         reset_cmd=os.getenv("APPLY_CLOCK_RESET_CMD", "") or None,
+        gpu_index=gpu_index,
+        logger=logger,
+    )
+
+
+def build_loop_clock_controller(
+    context: ExperimentContext,
+    logger: Callable[[str], None],
+    *,
+    gpu_index: int | None = None,
+) -> DeduplicatingClockController:
+    """Builds the long-lived, deduplicating clock controller for the control loop.
+
+    Wraps :func:`build_clock_controller` in a :class:`TimedClockController`,
+    so every issued actuation is timed, and then in a
+    :class:`DeduplicatingClockController`, so the env is read once per run and
+    repeated decisions at the already-applied clock are not re-issued.
+    ``CONTROL_CONFIRM_APPLIED_CLOCK`` enables confirmation against the observed
+    window clock within ``CONTROL_CONFIRM_TOLERANCE_MHZ`` (default: one
+    platform clock step).
+    """
+    confirm = parse_bool_env("CONTROL_CONFIRM_APPLIED_CLOCK", False)
+    tolerance_mhz = parse_float_env(
+        "CONTROL_CONFIRM_TOLERANCE_MHZ",
+        float(context.platform.graphics_clock_step_mhz),
+    )
+    return DeduplicatingClockController(
+        TimedClockController(build_clock_controller(logger, gpu_index=gpu_index)),
+        confirm_tolerance_mhz=tolerance_mhz if confirm else None,
         logger=logger,
     )
 
 
-def apply_decision(decision: Decision, control_log: Path) -> None:
-    """Applies *decision* through the env-backed :class:`ClockController`."""
-    controller = build_clock_controller(lambda message: append_log(control_log, message))
-    controller.apply(decision)
+def apply_decision(
+    decision: Decision,
+    control_log: Path,
+    *,
+    logger: Callable[[str], None] | None = None,
+) -> None:
+    """Applies *decision* through the env-backed :class:`ClockController`.
+
+    Controller messages go to *logger* when given, else straight to
+    *control_log*.
+    """
+    if logger is None:
+        logger = lambda message: append_log(control_log, message)  # noqa: E731
+    controller = build_clock_controller(logger)
+    try:
+        controller.apply(decision)
+    finally:
+        close = getattr(controller, "close", None)
+        if callable(close):
+            close()
 
 
 # ---------------------------------------------------------------------------
@@ -358,27 +754,39 @@ def write_last_decision(
     policy_name: str,
     window_index: int,
     decision: Decision,
+    actuation_ms: float | None = None,
 ) -> None:
     """Writes the most-recent decision as JSON to *path* (replaces previous file)."""
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(
-        json.dumps(
-            {
-                "timestamp_utc": utc_now(),
-                "policy_name": policy_name,
-                "window_index": window_index,
-                "action": decision.action.value,
-                "target_graphics_clock_mhz": decision.target_graphics_clock_mhz,
-                "reason_code": decision.reason_code,
-                "debug_fields": decision.debug_fields,
-            },
-            indent=2,
-            sort_keys=True,
-        ),
+        last_decision_json(policy_name, window_index, decision, actuation_ms),
         encoding="utf-8",
     )
 
 
+def last_decision_json(
+    policy_name: str,
+    window_index: int,
+    decision: Decision,
+    actuation_ms: float | None = None,
+) -> str:
+    """Serializes one decision in the ``last_decision.json`` format, timestamped now."""
+    return json.dumps(
+        {
+            "timestamp_utc": utc_now(),
+            "policy_name": policy_name,
+            "window_index": window_index,
+            "action": decision.action.value,
+            "target_graphics_clock_mhz": decision.target_graphics_clock_mhz,
+            "reason_code": decision.reason_code,
+            "debug_fields": decision.debug_fields,
+            "actuation_ms": actuation_ms,
+        },
+        indent=2,
+        sort_keys=True,
+    )
+
+
 # ---------------------------------------------------------------------------
 # State initialiser (legacy helper kept for control_hook.py)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Per-stage hot-path profiling for the control loop.
+
+Every window passes through the same stages: telemetry (``window_builder``),
+``policy.on_window``, ``validate_decision``, actuation (``apply_decision``),
+the policy-state copy (``capture_state``), and the artifact writes
+(``persist_state``, ``append_decision_row``, ``write_last_decision``,
+``append_log``).  When a window runs long, the
+control log alone cannot tell which stage was slow.
+
+:class:`TraceProfiler` records one span per stage per window with its wall
+time (``time.perf_counter_ns``) and CPU time (``time.thread_time_ns`` of the
+thread that ran the stage; a stage waiting on I/O or a subprocess shows wall
+time without CPU time).  It aggregates spans into per-stage statistics for
+``final_summary.json`` and exports them to ``control/trace.json`` in Chrome
+trace-event format, viewable in ``chrome://tracing`` or Perfetto.
+
+:class:`NullProfiler` is the default.  Its ``span`` returns one shared no-op
+context manager, so a disabled profiler costs a method call per stage.
+
+Artifact-write spans measure the writer call on the control path; with
+``CONTROL_ARTIFACT_WRITER=background`` that is the enqueue cost, not the
+eventual disk write.
+"""
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Protocol, TypeVar, runtime_checkable
+
+from src.common.control import LatencyHistogram
+
+_T = TypeVar("_T")
+
+# Stage names, in hot-path order.
+STAGE_WINDOW_BUILDER = "window_builder"
+STAGE_ON_WINDOW = "on_window"
+STAGE_VALIDATE_DECISION = "validate_decision"
+STAGE_APPLY_DECISION = "apply_decision"
+STAGE_CAPTURE_STATE = "capture_state"
+STAGE_PERSIST_STATE = "persist_state"
+STAGE_APPEND_DECISION_ROW = "append_decision_row"
+STAGE_WRITE_LAST_DECISION = "write_last_decision"
+STAGE_APPEND_LOG = "append_log"
+
+
+@runtime_checkable
+class StageProfiler(Protocol):
+    """Records timed spans for control-loop stages."""
+
+    def span(self, stage: str, window_index: int) -> ContextManager[None]:
+        """Returns a context manager that times one *stage* of *window_index*."""
+
+    def summary(self) -> dict[str, object]:
+        """Returns JSON-serializable per-stage statistics."""
+
+    def write_trace(self, path: Path) -> None:
+        """Writes the recorded spans to *path* (no-op when nothing is recorded)."""
+
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class NullProfiler:
+    """Disabled profiler: spans are a shared no-op and nothing is written."""
+
+    def span(self, stage: str, window_index: int) -> ContextManager[None]:  # noqa: ARG002
+        return _NULL_SPAN
+
+    def summary(self) -> dict[str, object]:
+        return {"enabled": False}
+
+    def write_trace(self, path: Path) -> None:  # noqa: ARG002
+        return None
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class _SpanRecord:
+    stage: str
+    window_index: int
+    thread_id: int
+    start_ns: int
+    wall_ns: int
+    cpu_ns: int
+
+
+@dataclasses.dataclass(slots=True)
+class _StageStats:
+    wall: LatencyHistogram = dataclasses.field(default_factory=LatencyHistogram)
+    total_wall_ns: int = 0
+    total_cpu_ns: int = 0
+    max_cpu_ns: int = 0
+
+
+class _Span:
+    """Context manager that times one stage and reports it to its profiler."""
+
+    __slots__ = ("_profiler", "_stage", "_window_index", "_start_ns", "_start_cpu_ns")
+
+    def __init__(self, profiler: TraceProfiler, stage: str, window_index: int) -> None:
+        self._profiler = profiler
+        self._stage = stage
+        self._window_index = window_index
+        self._start_ns = 0
+        self._start_cpu_ns = 0
+
+    def __enter__(self) -> None:
+        self._start_cpu_ns = self._profiler._cpu_clock_ns()
+        self._start_ns = self._profiler._clock_ns()
+
+    def __exit__(self, *_exc_info: object) -> None:
+        end_ns = self._profiler._clock_ns()
+        end_cpu_ns = self._profiler._cpu_clock_ns()
+        self._profiler._record(
+            _SpanRecord(
+                stage=self._stage,
+                window_index=self._window_index,
+                thread_id=threading.get_ident(),
+                start_ns=self._start_ns,
+                wall_ns=end_ns - self._start_ns,
+                cpu_ns=end_cpu_ns - self._start_cpu_ns,
+            )
+        )
+
+
+class TraceProfiler:
+    """Records per-stage wall and CPU time and exports a Chrome trace.
+
+    Statistics cover every span.  The trace keeps the first
+    ``max_trace_events`` spans and counts the rest as dropped, which bounds
+    memory on long runs.  Spans may be recorded from worker threads (the
+    pipelined loop runs stages via ``asyncio.to_thread``).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_trace_events: int = 200_000,
+        clock_ns: Callable[[], int] = time.perf_counter_ns,
+        cpu_clock_ns: Callable[[], int] = time.thread_time_ns,
+    ) -> None:
+        if max_trace_events < 0:
+            raise ValueError("max_trace_events must be >= 0.")
+        self._max_trace_events = int(max_trace_events)
+        self._clock_ns = clock_ns
+        self._cpu_clock_ns = cpu_clock_ns
+        self._origin_ns = clock_ns()
+        self._lock = threading.Lock()
+        self._spans: list[_SpanRecord] = []
+        self._stages: dict[str, _StageStats] = {}
+        self._thread_names: dict[int, str] = {}
+        self._dropped_event_count = 0
+
+    def span(self, stage: str, window_index: int) -> ContextManager[None]:
+        return _Span(self, stage, window_index)
+
+    def summary(self) -> dict[str, object]:
+        with self._lock:
+            stages: dict[str, object] = {}
+            for stage, stats in self._stages.items():
+                count = stats.wall.count
+                stages[stage] = {
+                    **stats.wall.summary(),
+                    "total_ms": stats.total_wall_ns / 1e6,
+                    "cpu_total_ms": stats.total_cpu_ns / 1e6,
+                    "cpu_mean_ms": stats.total_cpu_ns / 1e6 / count if count else None,
+                    "cpu_max_ms": stats.max_cpu_ns / 1e6,
+                }
+            return {
+                "enabled": True,
+                "stages": stages,
+                "trace_event_count": len(self._spans),
+                "dropped_trace_event_count": self._dropped_event_count,
+            }
+
+    def write_trace(self, path: Path) -> None:
+        with self._lock:
+            spans = list(self._spans)
+            thread_names = dict(self._thread_names)
+        pid = os.getpid()
+        # Small stable tids in first-seen order instead of raw thread idents.
+        thread_ids = {
+            ident: tid for tid, ident in enumerate(dict.fromkeys(s.thread_id for s in spans))
+        }
+        events: list[dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": thread_names.get(ident, f"thread-{tid}")},
+            }
+            for ident, tid in thread_ids.items()
+        ]
+        events.extend(
+            {
+                "name": span.stage,
+                "cat": "control",
+                "ph": "X",
+                "ts": (span.start_ns - self._origin_ns) / 1e3,
+                "dur": span.wall_ns / 1e3,
+                "pid": pid,
+                "tid": thread_ids[span.thread_id],
+                "args": {"window_index": span.window_index, "cpu_ms": span.cpu_ns / 1e6},
+            }
+            for span in spans
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}),
+            encoding="utf-8",
+        )
+
+    def _record(self, span: _SpanRecord) -> None:
+        with self._lock:
+            if span.thread_id not in self._thread_names:
+                self._thread_names[span.thread_id] = threading.current_thread().name
+            stats = self._stages.get(span.stage)
+            if stats is None:
+                stats = self._stages[span.stage] = _StageStats()
+            stats.wall.record(span.wall_ns / 1e9)
+            stats.total_wall_ns += span.wall_ns
+            stats.total_cpu_ns += span.cpu_ns
+            stats.max_cpu_ns = max(stats.max_cpu_ns, span.cpu_ns)
+            if len(self._spans) < self._max_trace_events:
+                self._spans.append(span)
+            else:
+                self._dropped_event_count += 1
+
+
+def profiled_call(
+    profiler: StageProfiler,
+    stage: str,
+    window_index: int,
+    fn: Callable[..., _T],
+    *args: Any,
+    **kwargs: Any,
+) -> _T:
+    """Calls ``fn(*args, **kwargs)`` inside a *stage* span.
+
+    Lets the pipelined loop time a stage on the worker thread that runs it,
+    e.g. ``asyncio.to_thread(profiled_call, profiler, stage, index, fn)``.
+    """
+    with profiler.span(stage, window_index):
+        return fn(*args, **kwargs)
+
+
+def build_stage_profiler(enabled: bool) -> StageProfiler:
+    """Returns the profiler for ``CONTROL_PROFILE``."""
+    return TraceProfiler() if enabled else NullProfiler()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Policy-state persistence for the control loop.
+
+The legacy runner rewrites ``policy_state.json`` with the whole
+``AlgorithmState.data`` after every window.  For policies whose state grows
+with run length (EVeREST's ``phase_cache`` mirror), that cost grows too.
+
+Two :class:`StateStore` implementations are provided:
+
+1. :class:`SnapshotStateStore` keeps the legacy full rewrite of
+   ``policy_state.json`` per window (default).
+2. :class:`JournalStateStore` appends one JSONL record per window to
+   ``policy_state.jsonl`` containing only the keys changed since the previous
+   record (tracked by ``AlgorithmState.set``), plus a compacted snapshot every
+   ``snapshot_every`` windows.  Mappings updated through
+   ``AlgorithmState.set_entry``/``pop_entry`` journal only the touched entries,
+   so a growing mirror is written in full only at snapshots.  Each periodic
+   snapshot starts a new segment file (``policy_state.1.jsonl``,
+   ``policy_state.2.jsonl``, ...), so no file holds more than
+   ``snapshot_every`` deltas; segments are only ever appended to.
+   ``policy_state.json`` is refreshed at each snapshot and at the end of the
+   run.
+
+Journal record formats (one JSON object per line)::
+
+    {"kind": "snapshot", "window_index": 0, "data": {...}}
+    {"kind": "delta", "window_index": 1, "set": {...}, "unset": [...],
+     "set_entries": {"key": {...}}, "unset_entries": {"key": [...]}}
+
+``unset``, ``set_entries``, and ``unset_entries`` are omitted when empty.
+
+:func:`rebuild_state` replays the journal segments to reconstruct the state as
+of any window index.  Window index ``-1`` covers ``initialize()`` and the
+optional pre-run decision.
+
+Persisting is split into :meth:`StateStore.capture`, which copies what must be
+written while the caller still owns the state, and :meth:`StateStore.write`,
+which submits the copy to an :class:`ArtifactWriter` and may run on another
+thread.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+from typing import Any, Literal, Protocol, runtime_checkable
+
+from src.common.experiment import AlgorithmState
+
+from scripts.run.artifact_writer import ArtifactWriter
+from scripts.run.control_runtime import state_snapshot_json
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class StateUpdate:
+    """Rendered state changes for one window, ready to be written."""
+
+    window_index: int
+    kind: Literal["snapshot", "delta"]
+    # Full pretty-printed ``policy_state.json`` payload (snapshots only).
+    snapshot_text: str | None
+    # One compact JSONL journal record including the trailing newline
+    # (journal stores only).
+    journal_line: str | None
+    changed_key_count: int
+    # Journal segment the record is appended to (journal stores only).
+    journal_segment: int = 0
+
+
+@runtime_checkable
+class StateStore(Protocol):
+    """Persists policy state after each window."""
+
+    def capture(
+        self,
+        state: AlgorithmState,
+        window_index: int,
+        *,
+        force_snapshot: bool = False,
+    ) -> StateUpdate:
+        """Renders the state changes to persist for *window_index*."""
+
+    def write(self, update: StateUpdate) -> None:
+        """Submits a captured update to the artifact writer."""
+
+    def metrics(self) -> dict[str, object]:
+        """Returns JSON-serializable persistence statistics."""
+
+
+def persist_window_state(
+    store: StateStore,
+    state: AlgorithmState,
+    window_index: int,
+    *,
+    force_snapshot: bool = False,
+) -> None:
+    """Captures and writes the state for *window_index* on the calling thread."""
+    store.write(store.capture(state, window_index, force_snapshot=force_snapshot))
+
+
+class SnapshotStateStore:
+    """Rewrites the full ``policy_state.json`` snapshot for every update."""
+
+    def __init__(self, state_path: Path, writer: ArtifactWriter) -> None:
+        self.state_path = state_path
+        self._writer = writer
+        self._snapshot_count = 0
+
+    def capture(
+        self,
+        state: AlgorithmState,
+        window_index: int,
+        *,
+        force_snapshot: bool = False,  # noqa: ARG002 (every update is a snapshot)
+    ) -> StateUpdate:
+        state.pop_dirty_keys()
+        state.pop_dirty_entries()
+        return StateUpdate(
+            window_index=window_index,
+            kind="snapshot",
+            snapshot_text=state_snapshot_json(state),
+            journal_line=None,
+            changed_key_count=len(state.data),
+        )
+
+    def write(self, update: StateUpdate) -> None:
+        assert update.snapshot_text is not None
+        self._writer.replace_text(self.state_path, update.snapshot_text)
+        self._snapshot_count += 1
+
+    def metrics(self) -> dict[str, object]:
+        return {"mode": "snapshot", "snapshot_count": self._snapshot_count}
+
+
+class JournalStateStore:
+    """Appends per-window key deltas to a JSONL journal with periodic snapshots.
+
+    The first update is always a snapshot.  After that, an update journals
+    only the keys returned by ``AlgorithmState.pop_dirty_keys()`` and the
+    mapping entries returned by ``AlgorithmState.pop_dirty_entries()``, so its
+    cost depends on how much changed, not on the total state size.  Every
+    ``snapshot_every`` deltas a compacted snapshot opens a new journal segment
+    (see :func:`journal_segment_path`) and ``policy_state.json`` is
+    refreshed, which bounds the segment size, replay length, and the
+    staleness of the JSON snapshot.  Forced snapshots are appended to the
+    current segment.
+    """
+
+    def __init__(
+        self,
+        journal_path: Path,
+        state_path: Path,
+        writer: ArtifactWriter,
+        *,
+        snapshot_every: int = 100,
+    ) -> None:
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be >= 1.")
+        self.journal_path = journal_path
+        self.state_path = state_path
+        self.snapshot_every = int(snapshot_every)
+        self._writer = writer
+        self._has_snapshot = False
+        self._deltas_since_snapshot = 0
+        self._segment = 0
+
+        self._snapshot_count = 0
+        self._delta_count = 0
+        self._journaled_key_count = 0
+        self._max_delta_keys = 0
+
+    def capture(
+        self,
+        state: AlgorithmState,
+        window_index: int,
+        *,
+        force_snapshot: bool = False,
+    ) -> StateUpdate:
+        dirty_keys = state.pop_dirty_keys()
+        dirty_entries = state.pop_dirty_entries()
+        periodic = self._has_snapshot and self._deltas_since_snapshot >= self.snapshot_every
+        if force_snapshot or periodic or not self._has_snapshot:
+            if periodic:
+                self._segment += 1
+            self._has_snapshot = True
+            self._deltas_since_snapshot = 0
+            record = {"kind": "snapshot", "window_index": window_index, "data": state.data}
+            return StateUpdate(
+                window_index=window_index,
+                kind="snapshot",
+                snapshot_text=state_snapshot_json(state),
+                journal_line=_journal_line(record),
+                changed_key_count=len(state.data),
+                journal_segment=self._segment,
+            )
+
+        self._deltas_since_snapshot += 1
+        changed = {key: state.data[key] for key in dirty_keys if key in state.data}
+        unset = sorted(key for key in dirty_keys if key not in state.data)
+        record: dict[str, Any] = {"kind": "delta", "window_index": window_index, "set": changed}
+        if unset:
+            record["unset"] = unset
+        set_entries, unset_entries = _entry_changes(state, dirty_keys, dirty_entries)
+        if set_entries:
+            record["set_entries"] = set_entries
+        if unset_entries:
+            record["unset_entries"] = unset_entries
+        entry_count = sum(map(len, set_entries.values())) + sum(map(len, unset_entries.values()))
+        return StateUpdate(
+            window_index=window_index,
+            kind="delta",
+            snapshot_text=None,
+            journal_line=_journal_line(record),
+            changed_key_count=len(dirty_keys) + entry_count,
+            journal_segment=self._segment,
+        )
+
+    def write(self, update: StateUpdate) -> None:
+        assert update.journal_line is not None
+        self._writer.append_text(
+            journal_segment_path(self.journal_path, update.journal_segment), update.journal_line
+        )
+        if update.kind == "snapshot":
+            assert update.snapshot_text is not None
+            self._writer.replace_text(self.state_path, update.snapshot_text)
+            self._snapshot_count += 1
+            return
+        self._delta_count += 1
+        self._journaled_key_count += update.changed_key_count
+        self._max_delta_keys = max(self._max_delta_keys, update.changed_key_count)
+
+    def metrics(self) -> dict[str, object]:
+        return {
+            "mode": "journal",
+            "journal_path": str(self.journal_path),
+            "snapshot_every": self.snapshot_every,
+            "segment_count": self._segment + 1 if self._has_snapshot else 0,
+            "snapshot_count": self._snapshot_count,
+            "delta_count": self._delta_count,
+            "journaled_key_count": self._journaled_key_count,
+            "max_delta_keys": self._max_delta_keys,
+        }
+
+
+def _entry_changes(
+    state: AlgorithmState,
+    dirty_keys: set[str],
+    dirty_entries: dict[str, set[str]],
+) -> tuple[dict[str, dict[str, Any]], dict[str, list[str]]]:
+    """Splits dirty mapping entries into current values and removals.
+
+    Keys that are dirty as a whole are skipped: the delta already carries (or
+    unsets) their full value.
+    """
+    set_entries: dict[str, dict[str, Any]] = {}
+    unset_entries: dict[str, list[str]] = {}
+    for key, entries in dirty_entries.items():
+        mapping = state.data.get(key)
+        if key in dirty_keys or not isinstance(mapping, dict):
+            continue
+        present = {entry: mapping[entry] for entry in entries if entry in mapping}
+        removed = sorted(entry for entry in entries if entry not in mapping)
+        if present:
+            set_entries[key] = present
+        if removed:
+            unset_entries[key] = removed
+    return set_entries, unset_entries
+
+
+def _journal_line(record: dict[str, Any]) -> str:
+    return json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n"
+
+
+def journal_segment_path(journal_path: Path, segment: int) -> Path:
+    """Returns the file of journal *segment*; segment 0 is *journal_path* itself."""
+    if segment == 0:
+        return journal_path
+    return journal_path.with_name(f"{journal_path.stem}.{segment}{journal_path.suffix}")
+
+
+def journal_segments(journal_path: Path) -> list[Path]:
+    """Returns the segment files of the journal at *journal_path*, oldest first."""
+    segments = [journal_path]
+    while (path := journal_segment_path(journal_path, len(segments))).exists():
+        segments.append(path)
+    return segments
+
+
+def rebuild_state(journal_path: Path, window_index: int | None = None) -> AlgorithmState:
+    """Replays the journal at *journal_path* and returns the state as of *window_index*.
+
+    ``None`` replays the whole journal.  Every segment after the first opens
+    with a snapshot, so replay starts at the latest segment beginning at or
+    before *window_index* and reads on from there.  A truncated final line
+    (for example, from a run killed mid-write) is ignored.  Lines are
+    streamed, so memory does not grow with the journal length.
+    """
+    segments = journal_segments(journal_path)
+    start = 0
+    for index in range(len(segments) - 1, 0, -1):
+        first_window = _first_window_index(segments[index])
+        if first_window is not None and (window_index is None or first_window <= window_index):
+            start = index
+            break
+
+    data: dict[str, Any] | None = None
+    for segment_path in segments[start:]:
+        data, reached = _replay_segment(segment_path, data, window_index)
+        if reached:
+            break
+
+    if data is None:
+        raise ValueError(f"{journal_path}: no snapshot at or before window {window_index}.")
+    return AlgorithmState(data=data)
+
+
+def _first_window_index(segment_path: Path) -> int | None:
+    with segment_path.open("r", encoding="utf-8") as fp:
+        line = fp.readline()
+    try:
+        return int(json.loads(line)["window_index"])
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _replay_segment(
+    segment_path: Path,
+    data: dict[str, Any] | None,
+    window_index: int | None,
+) -> tuple[dict[str, Any] | None, bool]:
+    """Applies one segment's records to *data*; also returns whether *window_index* was passed."""
+    with segment_path.open("r", encoding="utf-8") as fp:
+        for line_number, line in enumerate(fp, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Only the final line can lack its newline.
+                if not line.endswith("\n"):
+                    break
+                raise ValueError(f"{segment_path}:{line_number}: invalid journal record.") from None
+
+            record_window = int(record["window_index"])
+            if window_index is not None and record_window > window_index:
+                return data, True
+            if record["kind"] == "snapshot":
+                data = dict(record["data"])
+            elif record["kind"] == "delta":
+                if data is None:
+                    raise ValueError(f"{segment_path}:{line_number}: delta before first snapshot.")
+                data.update(record["set"])
+                for key in record.get("unset", ()):
+                    data.pop(key, None)
+                # Records are parsed fresh here, so their mappings can be updated in place.
+                for key, entries in record.get("set_entries", {}).items():
+                    data.setdefault(key, {}).update(entries)
+                for key, entries in record.get("unset_entries", {}).items():
+                    for entry in entries:
+                        data.get(key, {}).pop(entry, None)
+            else:
+                raise ValueError(
+                    f"{segment_path}:{line_number}: unknown journal record kind {record['kind']!r}."
+                )
+    return data, False
+
+
+def build_state_store(
+    mode: str,
+    *,
+    state_path: Path,
+    journal_path: Path,
+    writer: ArtifactWriter,
+    snapshot_every: int = 100,
+) -> StateStore:
+    """Returns the store for ``CONTROL_STATE_PERSISTENCE`` *mode*."""
+    normalized = mode.strip().lower()
+    if normalized == "snapshot":
+        return SnapshotStateStore(state_path, writer)
+    if normalized == "journal":
+        return JournalStateStore(
+            journal_path,
+            state_path,
+            writer,
+            snapshot_every=snapshot_every,
+        )
+    raise ValueError(
+        f"Unsupported CONTROL_STATE_PERSISTENCE={mode!r}. Supported values: journal, snapshot."
+    )
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Monotonic-deadline window scheduling for the control loop.
+
+The legacy loop calls ``sleep_fn(window_seconds)`` after each window, so every
+window is longer than nominal by the time spent on telemetry, policy,
+actuation, and artifact writes.  :class:`DeadlineScheduler` instead wakes at
+absolute window boundaries ``anchor + k * window_seconds`` on a monotonic
+clock, records per-window overrun and wake-up jitter, and applies an
+:class:`OverrunPolicy` when a window's work runs past its deadline.
+"""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable
+
+
+class OverrunPolicy(str, Enum):
+    """What the scheduler does when a window finishes after its deadline."""
+
+    # Drop the missed boundaries and wake at the next boundary still ahead on
+    # the original grid.  The skipped window indices are not processed.
+    SKIP = "skip"
+    # Keep the original grid and start the next window immediately; windows
+    # run back-to-back until the loop is on schedule again.
+    CATCH_UP = "catch_up"
+    # Re-anchor the grid at the moment the late window finished, absorbing the
+    # overrun into a one-off longer window.
+    STRETCH = "stretch"
+
+    @classmethod
+    def parse(cls, value: str | OverrunPolicy) -> OverrunPolicy:
+        """Parses an overrun policy from its stable environment spelling."""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(value.strip().lower())
+        except (AttributeError, ValueError) as exc:
+            supported = ", ".join(member.value for member in cls)
+            raise ValueError(
+                f"Unsupported overrun policy {value!r}. Supported values: {supported}."
+            ) from exc
+
+
+@dataclass(slots=True, frozen=True)
+class WindowTiming:
+    """Timing record for one scheduler wait at the end of a window."""
+
+    deadline_s: float
+    wake_target_s: float
+    woke_at_s: float
+    overrun_s: float
+    jitter_s: float
+    skipped_windows: int
+
+
+class DeadlineScheduler:
+    """Wakes the control loop at absolute, drift-free window boundaries.
+
+    ``start()`` anchors the grid on the monotonic clock.  ``wait_next()`` is
+    called after each window's work and blocks until the next boundary.
+
+    Per-window measurements:
+
+    1. ``overrun_s``: how far past its deadline the window's work finished
+       (``0.0`` when on time).
+    2. ``jitter_s``: wake-up lateness relative to the intended wake time, i.e.
+       timer/sleep inaccuracy only, excluding any overrun.
+
+    The clock and sleep callables are injectable so tests can drive the
+    scheduler with a fake clock.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        *,
+        overrun_policy: OverrunPolicy | str = OverrunPolicy.SKIP,
+        clock: Callable[[], float] = time.monotonic,
+        sleep_fn: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be > 0.")
+        self.window_seconds = float(window_seconds)
+        self.overrun_policy = OverrunPolicy.parse(overrun_policy)
+        self._clock = clock
+        self._sleep = sleep_fn
+
+        self._anchor_s: float | None = None
+        self._next_deadline_s: float | None = None
+
+        self._window_count = 0
+        self._overrun_count = 0
+        self._total_overrun_s = 0.0
+        self._max_overrun_s = 0.0
+        self._skipped_window_count = 0
+        self._stretched_s = 0.0
+        self._total_abs_jitter_s = 0.0
+        self._max_jitter_s = 0.0
+
+    def start(self) -> None:
+        """Anchors the window grid at the current monotonic time."""
+        self._anchor_s = self._clock()
+        self._next_deadline_s = self._anchor_s + self.window_seconds
+
+    def wait_next(self) -> WindowTiming:
+        """Blocks until the next window boundary and returns its timing record."""
+        if self._next_deadline_s is None:
+            self.start()
+        assert self._next_deadline_s is not None
+
+        deadline_s = self._next_deadline_s
+        now_s = self._clock()
+        overrun_s = max(0.0, now_s - deadline_s)
+        skipped_windows = 0
+
+        if overrun_s <= 0.0:
+            wake_target_s = deadline_s
+        elif self.overrun_policy is OverrunPolicy.SKIP:
+            skipped_windows = int(math.floor(overrun_s / self.window_seconds)) + 1
+            wake_target_s = deadline_s + skipped_windows * self.window_seconds
+        elif self.overrun_policy is OverrunPolicy.CATCH_UP:
+            wake_target_s = deadline_s
+        else:
+            wake_target_s = now_s
+            self._stretched_s += overrun_s
+
+        remaining_s = wake_target_s - now_s
+        if remaining_s > 0.0:
+            self._sleep(remaining_s)
+        woke_at_s = self._clock()
+        jitter_s = woke_at_s - max(wake_target_s, now_s)
+
+        self._next_deadline_s = wake_target_s + self.window_seconds
+        self._record(overrun_s, jitter_s, skipped_windows)
+        return WindowTiming(
+            deadline_s=deadline_s,
+            wake_target_s=wake_target_s,
+            woke_at_s=woke_at_s,
+            overrun_s=overrun_s,
+            jitter_s=jitter_s,
+            skipped_windows=skipped_windows,
+        )
+
+    def summary(self) -> dict[str, object]:
+        """Returns JSON-serializable overrun and jitter statistics."""
+        window_count = self._window_count
+        return {
+            "mode": "deadline",
+            "window_seconds": self.window_seconds,
+            "overrun_policy": self.overrun_policy.value,
+            "scheduled_window_count": window_count,
+            "overrun_count": self._overrun_count,
+            "total_overrun_s": self._total_overrun_s,
+            "max_overrun_s": self._max_overrun_s,
+            "mean_overrun_s": (
+                self._total_overrun_s / self._overrun_count if self._overrun_count else 0.0
+            ),
+            "skipped_window_count": self._skipped_window_count,
+            "stretched_s": self._stretched_s,
+            "max_jitter_s": self._max_jitter_s,
+            "mean_abs_jitter_s": (
+                self._total_abs_jitter_s / window_count if window_count else 0.0
+            ),
+        }
+
+    def _record(self, overrun_s: float, jitter_s: float, skipped_windows: int) -> None:
+        self._window_count += 1
+        if overrun_s > 0.0:
+            self._overrun_count += 1
+            self._total_overrun_s += overrun_s
+            self._max_overrun_s = max(self._max_overrun_s, overrun_s)
+        self._skipped_window_count += skipped_windows
+        self._total_abs_jitter_s += abs(jitter_s)
+        self._max_jitter_s = max(self._max_jitter_s, jitter_s)
+
+
+def build_window_scheduler(
+    mode: str,
+    window_seconds: float,
+    *,
+    overrun_policy: OverrunPolicy | str = OverrunPolicy.SKIP,
+    sleep_fn: Callable[[float], Any] = time.sleep,
+) -> DeadlineScheduler | None:
+    """Returns a scheduler for ``CONTROL_SCHEDULER`` *mode*, or ``None`` for ``sleep``."""
+    normalized = mode.strip().lower()
+    if normalized == "sleep":
+        return None
+    if normalized == "deadline":
+        return DeadlineScheduler(
+            window_seconds,
+            overrun_policy=overrun_policy,
+            sleep_fn=sleep_fn,
+        )
+    raise ValueError(
+        f"Unsupported CONTROL_SCHEDULER={mode!r}. Supported values: deadline, sleep."
+    )
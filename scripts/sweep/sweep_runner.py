@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""Offline experiment-matrix sweep runner.
+
+Expands a sweep matrix (policies x ``PD_TARGET`` values x
+``PERFORMANCE_TARGET_TYPE`` values x workloads x policy-config grids) into
+cells and runs every cell through :func:`run_control_loop` with an injected
+window builder and a no-op sleep, spread over a ``ProcessPoolExecutor``.
+
+Each finished cell appends one row, including its :class:`FinalSummary`, to
+``<out_dir>/results.jsonl``.  The row is flushed as soon as the cell ends, so
+the file doubles as the checkpoint: rerunning the same command skips every
+cell that already has an ``ok`` row and retries failed ones.  Cells are
+identified by a hash of their settings, so editing the matrix only runs the
+new cells.  ``results.csv`` flattens the latest row per cell when the sweep
+ends.
+
+Workloads are either recorded traces (replayed open loop, as with
+``CONTROL_REPLAY_TRACE``) or simulated workloads driven closed loop by
+:class:`~src.common.simulation.GpuSimulator`; simulated cells also record the
+simulator's runtime, slowdown, and energy totals.  See
+``config/experiments/README.md`` for the matrix file schema.
+
+Usage::
+
+    python scripts/sweep/sweep_runner.py config/experiments/<matrix>.json \\
+        --out-dir artifacts/sweeps/<name> --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import csv
+import dataclasses
+import hashlib
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+# Ensure repository root is importable when invoked directly from the CLI.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.common.control import ShellTemplateController
+from src.common.experiment.types import (
+    ExperimentContext,
+    ExperimentMetadata,
+    JSONValue,
+    PerformanceTargetType,
+    PlatformSpec,
+)
+from src.common.simulation import GpuSimulator, SimulatedWorkload
+from src.common.telemetry import TraceReplayProvider
+from src.methods.registry import resolve_policy
+
+from scripts.run.control_loop import run_control_loop
+from scripts.run.control_runtime import utc_now
+
+RESULTS_FILE = "results.jsonl"
+RESULTS_CSV_FILE = "results.csv"
+
+_STATUS_OK = "ok"
+_STATUS_ERROR = "error"
+
+
+@dataclass(slots=True, frozen=True)
+class SweepWorkload:
+    """One workload axis entry: a recorded ``trace`` or a ``simulated`` workload."""
+
+    name: str
+    trace: str | None = None
+    simulated: Mapping[str, object] | None = None
+    simulator: Mapping[str, object] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if (self.trace is None) == (self.simulated is None):
+            raise ValueError(f"workload {self.name!r} needs exactly one of 'trace' or 'simulated'.")
+
+    def describe(self) -> dict[str, JSONValue]:
+        payload: dict[str, JSONValue] = {"name": self.name}
+        if self.trace is not None:
+            payload["trace"] = self.trace
+        else:
+            payload["simulated"] = dict(self.simulated or {})  # type: ignore[arg-type]
+            payload["simulator"] = dict(self.simulator)  # type: ignore[arg-type]
+        return payload
+
+
+@dataclass(slots=True, frozen=True)
+class SweepCell:
+    """One point of the expanded matrix."""
+
+    policy_name: str
+    pd_target: float
+    performance_target_type: str
+    workload: SweepWorkload
+    policy_config: Mapping[str, object]
+
+    def describe(self) -> dict[str, JSONValue]:
+        return {
+            "policy_name": self.policy_name,
+            "pd_target": self.pd_target,
+            "performance_target_type": self.performance_target_type,
+            "workload": self.workload.describe(),
+            "policy_config": dict(self.policy_config),  # type: ignore[dict-item]
+        }
+
+    @property
+    def cell_id(self) -> str:
+        encoded = json.dumps(self.describe(), sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(slots=True, frozen=True)
+class SweepMatrix:
+    """A parsed sweep matrix file; :meth:`cells` expands it."""
+
+    name: str
+    platform: PlatformSpec
+    policies: tuple[str, ...]
+    pd_targets: tuple[float, ...]
+    performance_target_types: tuple[str, ...]
+    workloads: tuple[SweepWorkload, ...]
+    policy_configs: Mapping[str, tuple[Mapping[str, object], ...]]
+    window_seconds: float = 5.0
+    sampling_interval_ms: int = 1000
+    max_windows: int = 100_000
+
+    def cells(self) -> list[SweepCell]:
+        return [
+            SweepCell(
+                policy_name=policy_name,
+                pd_target=pd_target,
+                performance_target_type=target_type,
+                workload=workload,
+                policy_config=config,
+            )
+            for policy_name in self.policies
+            for config in self.policy_configs.get(policy_name, ({},))
+            for pd_target, target_type, workload in itertools.product(
+                self.pd_targets,
+                self.performance_target_types,
+                self.workloads,
+            )
+        ]
+
+    @classmethod
+    def from_mapping(cls, raw: Mapping[str, Any], base_dir: Path | None = None) -> SweepMatrix:
+        """Parses a matrix mapping; relative trace paths resolve against *base_dir*."""
+        platform_raw = raw.get("platform")
+        if not isinstance(platform_raw, Mapping):
+            raise ValueError("sweep matrix needs a 'platform' object.")
+        policies = _string_list(raw, "policies")
+        for policy_name in policies:
+            resolve_policy(policy_name)
+        target_types = tuple(
+            PerformanceTargetType.parse(value).value
+            for value in _string_list(raw, "performance_target_types", default=["runtime_slowdown"])
+        )
+        pd_targets = tuple(float(value) for value in _list(raw, "pd_targets", default=[0.0]))
+        workloads = tuple(
+            _parse_workload(entry, index, base_dir)
+            for index, entry in enumerate(_list(raw, "workloads"))
+        )
+        configs_raw = raw.get("policy_configs", {})
+        if not isinstance(configs_raw, Mapping):
+            raise ValueError("'policy_configs' must map policy names to config grids.")
+        return cls(
+            name=str(raw.get("name", "sweep")),
+            platform=PlatformSpec(**platform_raw),
+            policies=policies,
+            pd_targets=pd_targets,
+            performance_target_types=target_types,
+            workloads=workloads,
+            policy_configs={
+                str(policy_name): expand_config_grid(grid, str(policy_name))
+                for policy_name, grid in configs_raw.items()
+            },
+            window_seconds=float(raw.get("window_seconds", 5.0)),
+            sampling_interval_ms=int(raw.get("sampling_interval_ms", 1000)),
+            max_windows=int(raw.get("max_windows", 100_000)),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> SweepMatrix:
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(raw, Mapping):
+            raise ValueError(f"{path}: sweep matrix must be a JSON object.")
+        return cls.from_mapping(raw, base_dir=Path(path).resolve().parent)
+
+
+@dataclass(slots=True)
+class SweepReport:
+    """Counts for one :func:`run_sweep` invocation."""
+
+    total: int = 0
+    skipped: int = 0
+    completed: int = 0
+    failed: int = 0
+    elapsed_s: float = 0.0
+
+
+def expand_config_grid(grid: object, policy_name: str = "") -> tuple[Mapping[str, object], ...]:
+    """Expands ``{"base": {...}, "grid": {key: [values, ...]}}`` into configs.
+
+    Every combination of the ``grid`` values is merged over ``base``; an empty
+    or missing ``grid`` yields ``base`` alone.
+    """
+    if not isinstance(grid, Mapping):
+        raise ValueError(f"policy_configs[{policy_name!r}] must be an object.")
+    base = grid.get("base", {})
+    axes = grid.get("grid", {})
+    if not isinstance(base, Mapping) or not isinstance(axes, Mapping):
+        raise ValueError(f"policy_configs[{policy_name!r}] 'base' and 'grid' must be objects.")
+    keys = list(axes)
+    for key in keys:
+        if not isinstance(axes[key], list) or not axes[key]:
+            raise ValueError(f"policy_configs[{policy_name!r}].grid.{key} must be a non-empty list.")
+    return tuple(
+        {**base, **dict(zip(keys, values))}
+        for values in itertools.product(*(axes[key] for key in keys))
+    )
+
+
+def run_cell(matrix: SweepMatrix, cell: SweepCell, out_dir: Path) -> dict[str, JSONValue]:
+    """Runs one cell in the current process and returns its results row.
+
+    Exceptions are reported in the row (``status: error``) rather than raised,
+    so one bad cell does not stop the sweep.
+    """
+    cell_id = cell.cell_id
+    row: dict[str, JSONValue] = {"cell_id": cell_id, **cell.describe()}
+    started_s = time.perf_counter()
+    try:
+        summary, simulation = _run_cell_loop(matrix, cell, Path(out_dir) / "cells" / cell_id)
+    except Exception as exc:  # noqa: BLE001
+        row.update(status=_STATUS_ERROR, error=f"{type(exc).__name__}: {exc}")
+    else:
+        row.update(status=_STATUS_OK, final_summary=summary)
+        if simulation is not None:
+            row["simulation"] = simulation
+    row["elapsed_s"] = time.perf_counter() - started_s
+    return row
+
+
+def run_sweep(
+    matrix: SweepMatrix,
+    out_dir: Path,
+    *,
+    workers: int | None = None,
+    on_row: Callable[[dict[str, JSONValue]], None] | None = None,
+) -> SweepReport:
+    """Runs every cell without an ``ok`` row in ``results.jsonl``.
+
+    ``workers`` defaults to the CPU count; ``1`` or less runs the cells
+    inline in this process, which is easier to debug.  ``on_row`` sees each
+    row after it has been written.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results_path = out_dir / RESULTS_FILE
+    started_s = time.perf_counter()
+    done = {
+        cell_id for cell_id, row in load_results(results_path).items() if row.get("status") == _STATUS_OK
+    }
+    cells = matrix.cells()
+    pending = [cell for cell in cells if cell.cell_id not in done]
+    report = SweepReport(total=len(cells), skipped=len(cells) - len(pending))
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with results_path.open("a", encoding="utf-8") as results:
+
+        def _record(row: dict[str, JSONValue]) -> None:
+            results.write(json.dumps(row, sort_keys=True, default=str) + "\n")
+            results.flush()
+            os.fsync(results.fileno())
+            if row["status"] == _STATUS_OK:
+                report.completed += 1
+            else:
+                report.failed += 1
+            if on_row is not None:
+                on_row(row)
+
+        if workers <= 1 or len(pending) <= 1:
+            for cell in pending:
+                _record(run_cell(matrix, cell, out_dir))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                futures = [pool.submit(run_cell, matrix, cell, out_dir) for cell in pending]
+                for future in concurrent.futures.as_completed(futures):
+                    _record(future.result())
+
+    write_results_csv(out_dir / RESULTS_CSV_FILE, load_results(results_path).values())
+    report.elapsed_s = time.perf_counter() - started_s
+    return report
+
+
+def load_results(path: Path) -> dict[str, dict[str, JSONValue]]:
+    """Latest row per cell from a ``results.jsonl`` file.
+
+    A missing file is empty, and a line torn by an interrupted write is
+    ignored, so the cell it belonged to simply runs again.
+    """
+    rows: dict[str, dict[str, JSONValue]] = {}
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return rows
+    for line in lines:
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(row, dict) and isinstance(row.get("cell_id"), str):
+            rows[row["cell_id"]] = row
+    return rows
+
+
+def write_results_csv(path: Path, rows: Iterable[Mapping[str, JSONValue]]) -> None:
+    """Flattens results rows into one CSV (nested keys joined with ``.``)."""
+    flat_rows = [_flatten(row) for row in rows]
+    fieldnames: list[str] = []
+    for flat in flat_rows:
+        fieldnames.extend(key for key in flat if key not in fieldnames)
+    with Path(path).open("w", encoding="utf-8", newline="") as fp:
+        writer = csv.DictWriter(fp, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(flat_rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("matrix", type=Path, help="sweep matrix JSON file")
+    parser.add_argument("--out-dir", type=Path, required=True)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        matrix = SweepMatrix.load(args.matrix)
+    except (OSError, ValueError, TypeError) as exc:
+        print(f"sweep_runner: invalid matrix {args.matrix}: {exc}", file=sys.stderr)
+        return 2
+
+    def _progress(row: dict[str, JSONValue]) -> None:
+        print(f"{row['status']:5s} {row['cell_id']} {row['policy_name']} pd={row['pd_target']}")
+
+    report = run_sweep(matrix, args.out_dir, workers=args.workers, on_row=_progress)
+    print(
+        f"sweep {matrix.name}: {report.completed} completed, {report.failed} failed, "
+        f"{report.skipped} already done of {report.total} cells in {report.elapsed_s:.1f}s"
+    )
+    return 1 if report.failed else 0
+
+
+def _run_cell_loop(
+    matrix: SweepMatrix,
+    cell: SweepCell,
+    run_dir: Path,
+) -> tuple[dict[str, JSONValue], dict[str, JSONValue] | None]:
+    context = ExperimentContext(
+        platform=matrix.platform,
+        metadata=ExperimentMetadata(
+            run_id=f"{matrix.name}-{cell.cell_id}",
+            experiment_id=matrix.name,
+            policy_name=cell.policy_name,
+            workload_name=cell.workload.name,
+            started_at_utc=utc_now(),
+        ),
+        pd_target=cell.pd_target,
+        window_seconds=matrix.window_seconds,
+        sampling_interval_ms=matrix.sampling_interval_ms,
+        performance_target_type=PerformanceTargetType.parse(cell.performance_target_type),
+    )
+    stop_event = threading.Event()
+    simulator: GpuSimulator | None = None
+    if cell.workload.trace is not None:
+        provider = TraceReplayProvider.from_path(
+            Path(cell.workload.trace),
+            window_seconds=matrix.window_seconds,
+        )
+        window_builder = provider.get_window
+        max_windows = min(len(provider), matrix.max_windows)
+        # Replayed telemetry does not respond to clocks: actuate nothing.
+        controller: Any = ShellTemplateController(apply_template=None)
+    else:
+        simulator = _build_simulator(matrix.platform, cell.workload, stop_event)
+        window_builder = simulator.get_window
+        max_windows = matrix.max_windows
+        controller = simulator
+
+    summary = run_control_loop(
+        policy=resolve_policy(cell.policy_name),
+        context=context,
+        policy_config=cell.policy_config,
+        run_dir=run_dir,
+        control_log=run_dir / "control_loop.log",
+        decisions_csv=run_dir / "control" / "decisions.csv",
+        state_path=run_dir / "control" / "policy_state.json",
+        decision_path=run_dir / "control" / "last_decision.json",
+        window_seconds=matrix.window_seconds,
+        max_windows=max_windows,
+        window_builder=window_builder,
+        sleep_fn=lambda _seconds: None,
+        raise_on_abort=True,
+        clock_controller=controller,
+        stop_event=stop_event,
+    )
+    return dataclasses.asdict(summary), None if simulator is None else simulator.summary()
+
+
+def _build_simulator(
+    platform: PlatformSpec,
+    workload: SweepWorkload,
+    finished_event: threading.Event,
+) -> GpuSimulator:
+    options = workload.simulator
+    return GpuSimulator(
+        platform,
+        SimulatedWorkload.from_mapping(workload.simulated or {}),
+        clock_transition_s=float(options.get("clock_transition_s", 0.0)),  # type: ignore[arg-type]
+        noise_pct=float(options.get("noise_pct", 0.0)),  # type: ignore[arg-type]
+        seed=int(options.get("seed", 0)),  # type: ignore[call-overload]
+        finished_event=finished_event,
+    )
+
+
+def _parse_workload(entry: object, index: int, base_dir: Path | None) -> SweepWorkload:
+    if not isinstance(entry, Mapping):
+        raise ValueError(f"workloads[{index}] must be an object.")
+    name = str(entry.get("name", f"workload{index}"))
+    trace = entry.get("trace")
+    simulated = entry.get("simulated")
+    if isinstance(simulated, str):
+        simulated = _load_json_object(_resolve(simulated, base_dir))
+    simulator = entry.get("simulator", {})
+    if not isinstance(simulator, Mapping):
+        raise ValueError(f"workloads[{index}].simulator must be an object.")
+    if simulated is not None:
+        if not isinstance(simulated, Mapping):
+            raise ValueError(f"workloads[{index}].simulated must be an object or a JSON path.")
+        SimulatedWorkload.from_mapping(simulated)
+    return SweepWorkload(
+        name=name,
+        trace=None if trace is None else str(_resolve(str(trace), base_dir)),
+        simulated=simulated,
+        simulator=dict(simulator),
+    )
+
+
+def _resolve(path: str, base_dir: Path | None) -> Path:
+    candidate = Path(path)
+    if candidate.is_absolute() or base_dir is None:
+        return candidate
+    return base_dir / candidate
+
+
+def _load_json_object(path: Path) -> Mapping[str, object]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(raw, Mapping):
+        raise ValueError(f"{path}: expected a JSON object.")
+    return raw
+
+
+def _list(raw: Mapping[str, Any], key: str, default: list[Any] | None = None) -> list[Any]:
+    value = raw.get(key, default)
+    if not isinstance(value, list) or not value:
+        raise ValueError(f"sweep matrix '{key}' must be a non-empty list.")
+    return value
+
+
+def _string_list(
+    raw: Mapping[str, Any],
+    key: str,
+    default: list[str] | None = None,
+) -> tuple[str, ...]:
+    return tuple(str(value) for value in _list(raw, key, default))
+
+
+def _flatten(value: Mapping[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, item in value.items():
+        name = f"{prefix}{key}"
+        if isinstance(item, Mapping):
+            flat.update(_flatten(item, f"{name}."))
+        elif isinstance(item, (list, tuple)):
+            flat[name] = json.dumps(item, default=str)
+        else:
+            flat[name] = item
+    return flat
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,20 @@
 """Clock-control actuation adapters."""
 
-from .interfaces import ClockController
+from .coprocess_controller import ClockHelperError, CoprocessClockController
+from .dedup_controller import DeduplicatingClockController
+from .interfaces import ClockController, ClockObserver
+from .latency import LatencyHistogram
 from .shell_controller import ShellTemplateController
+from .timed_controller import TimedClockController, controller_backend_name
 
 __all__ = [
     "ClockController",
+    "ClockHelperError",
+    "ClockObserver",
+    "CoprocessClockController",
+    "DeduplicatingClockController",
+    "LatencyHistogram",
     "ShellTemplateController",
+    "TimedClockController",
+    "controller_backend_name",
 ]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Persistent clock-actuation helper process.
+
+Started once per run by :class:`~src.common.control.coprocess_controller.
+CoprocessClockController`, which streams newline-delimited commands on stdin
+and reads one acknowledgement line per command on stdout:
+
+=================  =====================================================
+Request            Response
+=================  =====================================================
+``SET <mhz>``      ``OK <elapsed_us>`` after locking the graphics clock
+``RESET``          ``OK <elapsed_us>`` after restoring default clocks
+``PING``           ``OK 0``
+``QUIT``           ``OK 0``, then the helper exits
+=================  =====================================================
+
+Failures answer ``ERR <message>`` and the helper keeps serving.
+``elapsed_us`` is the backend's own actuation time in microseconds.
+
+Backends:
+
+``dry-run``
+    Pure-Python stand-in for tests and GPU-less runs.  Optionally sleeps
+    ``--delay-ms`` per actuation, appends each command to ``--record``, and
+    exits after ``--exit-after`` commands to simulate a crash.
+``nvml``
+    Locks clocks with ``pynvml`` (``nvmlDeviceSetGpuLockedClocks``), imported
+    lazily so the module has no hard NVML dependency.  Usually requires
+    root or a privileged launch (e.g. via ``sudo``).
+
+This file is stdlib-only and runnable as a script, so it can be launched
+without the repository on ``sys.path``.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Callable, TextIO
+
+
+class DryRunBackend:
+    """Records commands instead of touching hardware."""
+
+    name = "dry-run"
+
+    def __init__(self, *, delay_s: float = 0.0, record_path: str | None = None) -> None:
+        self._delay_s = delay_s
+        self._record_path = record_path
+
+    def set_clock(self, mhz: int) -> None:
+        self._actuate(f"SET {mhz}")
+
+    def reset(self) -> None:
+        self._actuate("RESET")
+
+    def _actuate(self, command: str) -> None:
+        if self._delay_s > 0:
+            time.sleep(self._delay_s)
+        if self._record_path:
+            with open(self._record_path, "a", encoding="utf-8") as fp:
+                fp.write(command + "\n")
+
+
+class NvmlBackend:
+    """Locks graphics clocks for one GPU through NVML."""
+
+    name = "nvml"
+
+    def __init__(self, *, gpu_index: int) -> None:
+        import pynvml  # noqa: PLC0415 (optional dependency)
+
+        self._nvml = pynvml
+        pynvml.nvmlInit()
+        self._handle = pynvml.nvmlDeviceGetHandleByIndex(gpu_index)
+
+    def set_clock(self, mhz: int) -> None:
+        self._nvml.nvmlDeviceSetGpuLockedClocks(self._handle, mhz, mhz)
+
+    def reset(self) -> None:
+        self._nvml.nvmlDeviceResetGpuLockedClocks(self._handle)
+
+
+def serve(
+    backend: DryRunBackend | NvmlBackend,
+    stdin: TextIO,
+    stdout: TextIO,
+    *,
+    exit_after: int | None = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> int:
+    """Serves protocol requests from *stdin* until ``QUIT`` or EOF."""
+    handled = 0
+    for raw in stdin:
+        parts = raw.split()
+        if not parts:
+            continue
+        verb = parts[0].upper()
+        try:
+            if verb == "PING":
+                response = "OK 0"
+            elif verb == "QUIT":
+                stdout.write("OK 0\n")
+                stdout.flush()
+                return 0
+            elif verb == "SET" and len(parts) == 2:
+                started = clock()
+                backend.set_clock(int(parts[1]))
+                response = f"OK {int((clock() - started) * 1e6)}"
+            elif verb == "RESET" and len(parts) == 1:
+                started = clock()
+                backend.reset()
+                response = f"OK {int((clock() - started) * 1e6)}"
+            else:
+                response = f"ERR unsupported request: {raw.strip()}"
+        except Exception as exc:  # noqa: BLE001
+            response = f"ERR {type(exc).__name__}: {exc}".replace("\n", " ")
+        stdout.write(response + "\n")
+        stdout.flush()
+
+        handled += 1
+        if exit_after is not None and handled >= exit_after:
+            return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("dry-run", "nvml"), default="dry-run")
+    parser.add_argument("--gpu-index", type=int, default=0)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--record", default=None)
+    parser.add_argument("--exit-after", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    backend: DryRunBackend | NvmlBackend
+    if args.backend == "nvml":
+        backend = NvmlBackend(gpu_index=args.gpu_index)
+    else:
+        backend = DryRunBackend(delay_s=args.delay_ms / 1000.0, record_path=args.record)
+    return serve(backend, sys.stdin, sys.stdout, exit_after=args.exit_after)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import select
+import subprocess
+import time
+from typing import Any, Callable, Sequence
+
+from src.common.experiment.types import Decision
+
+
+class ClockHelperError(RuntimeError):
+    """Raised when the clock helper rejects, times out on, or dies during a request."""
+
+
+class _HelperExitedError(ClockHelperError):
+    """The helper closed its pipes (exited) while a request was in flight."""
+
+
+def _noop_logger(_message: str) -> None:
+    """Default logger that drops messages."""
+
+
+class CoprocessClockController:
+    """Clock controller that talks to one persistent helper process.
+
+    :class:`~src.common.control.shell_controller.ShellTemplateController`
+    pays a fork/exec, a shell, and usually a privileged tool start-up for
+    every clock change.  This backend starts *command* once and streams the
+    line protocol documented in :mod:`src.common.control.clock_helper` over
+    the helper's stdin/stdout, so each actuation costs one pipe round trip
+    plus the actual driver call.
+
+    Each request waits at most ``timeout_s`` for its acknowledgement.  If the
+    helper has exited, or exits while a request is in flight, a fresh helper
+    is started and the request is retried once (``SET`` and ``RESET`` are
+    idempotent), up to ``max_restarts`` restarts per controller.  A timeout
+    kills the helper and raises :class:`ClockHelperError` without retrying,
+    since the hung request may still take effect; the next request starts a
+    fresh helper.  ``ERR`` responses raise without restarting.
+    ``last_elapsed_us`` holds the helper-reported actuation time of the
+    latest successful request.
+    """
+
+    backend = "coprocess"
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        *,
+        timeout_s: float = 5.0,
+        max_restarts: int = 3,
+        logger: Callable[[str], None] | None = None,
+        popen: Callable[..., Any] = subprocess.Popen,
+    ) -> None:
+        if not command:
+            raise ValueError("command must not be empty.")
+        if timeout_s <= 0:
+            raise ValueError("timeout_s must be > 0.")
+        self._command = list(command)
+        self._timeout_s = float(timeout_s)
+        self._max_restarts = int(max_restarts)
+        self._log = logger if logger is not None else _noop_logger
+        self._popen = popen
+
+        self._process: Any = None
+        self._buffer = b""
+        self._start_count = 0
+        self._request_count = 0
+        self._error_count = 0
+        self.last_elapsed_us: int | None = None
+
+    def apply(self, decision: Decision) -> None:
+        if not decision.requires_clock_change or decision.target_graphics_clock_mhz is None:
+            return
+        self._request(f"SET {int(decision.target_graphics_clock_mhz)}")
+
+    def reset(self) -> None:
+        self._request("RESET")
+
+    def ping(self) -> None:
+        """Round-trips a ``PING``, starting the helper if needed."""
+        self._request("PING")
+
+    def close(self) -> None:
+        """Asks the helper to quit, killing it if it does not exit in time."""
+        process = self._process
+        self._process = None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.stdin.write(b"QUIT\n")
+            process.stdin.flush()
+            process.wait(timeout=self._timeout_s)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            self._close_pipes(process)
+
+    def __enter__(self) -> CoprocessClockController:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def metrics(self) -> dict[str, object]:
+        """Returns JSON-serializable helper statistics."""
+        return {
+            "backend": self.backend,
+            "command": self._command,
+            "request_count": self._request_count,
+            "error_count": self._error_count,
+            "restart_count": max(0, self._start_count - 1),
+            "last_elapsed_us": self.last_elapsed_us,
+        }
+
+    # -- Internals ----------------------------------------------------------
+
+    def _request(self, line: str) -> int:
+        self._request_count += 1
+        try:
+            response = self._round_trip(line)
+        except _HelperExitedError:
+            self._log(f"clock helper exited during {line!r}; restarting and retrying")
+            try:
+                response = self._round_trip(line)
+            except ClockHelperError:
+                self._error_count += 1
+                raise
+        except ClockHelperError:
+            self._error_count += 1
+            raise
+
+        verb, _, payload = response.partition(" ")
+        if verb == "OK":
+            self.last_elapsed_us = int(payload or 0)
+            return self.last_elapsed_us
+        self._error_count += 1
+        raise ClockHelperError(f"clock helper rejected {line!r}: {payload or response}")
+
+    def _round_trip(self, line: str) -> str:
+        self._ensure_started()
+        process = self._process
+        try:
+            process.stdin.write(line.encode("utf-8") + b"\n")
+            process.stdin.flush()
+            return self._read_line(time.monotonic() + self._timeout_s)
+        except OSError as exc:
+            self._discard_process()
+            raise _HelperExitedError(
+                f"clock helper pipe failed during {line!r}: {exc}"
+            ) from exc
+        except ClockHelperError:
+            self._discard_process()
+            raise
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            return
+        if self._process is not None:
+            self._log(f"clock helper exited with code {self._process.returncode}; restarting")
+            self._discard_process()
+        if self._start_count > self._max_restarts:
+            raise ClockHelperError(
+                f"clock helper restarted {self._start_count - 1} times; giving up"
+            )
+        self._process = self._popen(
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+        self._buffer = b""
+        self._start_count += 1
+        self._log(f"started clock helper: {' '.join(self._command)}")
+
+    def _read_line(self, deadline_s: float) -> str:
+        fd = self._process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining_s = deadline_s - time.monotonic()
+            if remaining_s <= 0:
+                raise ClockHelperError(
+                    f"clock helper did not answer within {self._timeout_s:.3f} s"
+                )
+            ready, _, _ = select.select([fd], [], [], remaining_s)
+            if not ready:
+                continue
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                raise _HelperExitedError("clock helper closed its stdout")
+            self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return line.decode("utf-8", errors="replace").strip()
+
+    def _discard_process(self) -> None:
+        process = self._process
+        self._process = None
+        self._buffer = b""
+        if process is None:
+            return
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        self._close_pipes(process)
+
+    @staticmethod
+    def _close_pipes(process: Any) -> None:
+        for pipe in (process.stdin, process.stdout):
+            if pipe is not None:
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from src.common.experiment.types import Decision
+
+from .interfaces import ClockController
+
+
+def _noop_logger(_message: str) -> None:
+    """Default logger that drops messages."""
+
+
+class DeduplicatingClockController:
+    """Long-lived wrapper that skips actuations matching the applied clock.
+
+    Policies re-emit ``SET_CLOCK`` at the same MHz for many consecutive
+    windows, and every call to the wrapped backend (a shell-out for
+    :class:`~src.common.control.shell_controller.ShellTemplateController`)
+    costs the same whether or not the clock changes. This wrapper remembers
+    the clock it last applied and suppresses decisions whose target matches.
+
+    A decision without an explicit target (``RESET_TO_MAX`` may omit it) is
+    forwarded but gives the backend no clock to apply; the shipped backends
+    ignore it. The controller then no longer knows the applied clock, as after
+    a failed actuation, ``reset()``, or ``invalidate()``, so the next
+    clock-changing decision is always issued.
+
+    When ``confirm_tolerance_mhz`` is set, ``observe_clock`` compares the
+    observed window clock with the tracked clock and forgets the tracked
+    clock on a mismatch larger than the tolerance. This catches clocks changed
+    outside the controller (driver resets, other tools) at the cost of an
+    occasional redundant actuation, for example while the GPU idles below the
+    applied clock.
+    """
+
+    def __init__(
+        self,
+        inner: ClockController,
+        *,
+        confirm_tolerance_mhz: float | None = None,
+        logger: Callable[[str], None] | None = None,
+    ) -> None:
+        if confirm_tolerance_mhz is not None and confirm_tolerance_mhz < 0:
+            raise ValueError("confirm_tolerance_mhz must be >= 0.")
+        self._inner = inner
+        self._confirm_tolerance_mhz = confirm_tolerance_mhz
+        self._log = logger if logger is not None else _noop_logger
+
+        self._applied_clock_mhz: int | None = None
+        self._issued_count = 0
+        self._suppressed_count = 0
+        self._confirmation_mismatch_count = 0
+
+    @property
+    def inner(self) -> ClockController:
+        return self._inner
+
+    @property
+    def applied_clock_mhz(self) -> int | None:
+        """The clock the controller believes is applied, or ``None`` if unknown."""
+        return self._applied_clock_mhz
+
+    def apply(self, decision: Decision) -> None:
+        if not decision.requires_clock_change:
+            return
+
+        target_mhz = decision.target_graphics_clock_mhz
+        if target_mhz is None:
+            self._applied_clock_mhz = None
+            self._inner.apply(decision)
+            return
+        if target_mhz == self._applied_clock_mhz:
+            self._suppressed_count += 1
+            return
+
+        try:
+            self._inner.apply(decision)
+        except BaseException:
+            self._applied_clock_mhz = None
+            raise
+        self._issued_count += 1
+        self._applied_clock_mhz = target_mhz
+
+    def reset(self) -> None:
+        self._applied_clock_mhz = None
+        self._inner.reset()
+
+    def close(self) -> None:
+        """Closes the wrapped controller when it holds resources (e.g. a helper process)."""
+        close = getattr(self._inner, "close", None)
+        if callable(close):
+            close()
+
+    def invalidate(self) -> None:
+        """Forgets the tracked clock so the next actuation is always issued."""
+        self._applied_clock_mhz = None
+
+    def observe_clock(self, observed_mhz: float) -> None:
+        if self._confirm_tolerance_mhz is None or self._applied_clock_mhz is None:
+            return
+        if abs(observed_mhz - self._applied_clock_mhz) <= self._confirm_tolerance_mhz:
+            return
+        self._confirmation_mismatch_count += 1
+        self._log(
+            "applied clock not confirmed: "
+            f"expected={self._applied_clock_mhz} MHz observed={observed_mhz:.1f} MHz; "
+            "next actuation will be issued"
+        )
+        self._applied_clock_mhz = None
+
+    def metrics(self) -> dict[str, object]:
+        """Returns JSON-serializable actuation counters."""
+        return {
+            "deduplicating": True,
+            "issued_count": self._issued_count,
+            "suppressed_count": self._suppressed_count,
+            "confirm_applied_clock": self._confirm_tolerance_mhz is not None,
+            "confirm_tolerance_mhz": self._confirm_tolerance_mhz,
+            "confirmation_mismatch_count": self._confirmation_mismatch_count,
+            "applied_clock_mhz": self._applied_clock_mhz,
+        }
@@ -24,3 +24,17 @@ class ClockController(Protocol):
 
     def reset(self) -> None:
         """Restores default/hardware clock state, if the backend supports it."""
+
+
+@runtime_checkable
+class ClockObserver(Protocol):
+    """Optional capability for controllers that track the applied clock.
+
+    The control loop detects this structurally with ``isinstance`` and feeds
+    each window's observed average graphics clock to ``observe_clock`` before
+    the policy decides, so a tracking controller can notice that the hardware
+    clock no longer matches what it last applied.
+    """
+
+    def observe_clock(self, observed_mhz: float) -> None:
+        """Reports the graphics clock observed over the latest window."""
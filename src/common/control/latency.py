@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import math
+
+
+class LatencyHistogram:
+    """Streaming latency histogram with log-spaced buckets.
+
+    Samples are counted into geometric buckets (``buckets_per_doubling`` per
+    factor of two, starting at ``min_resolution_s``), so memory grows with the
+    dynamic range of the samples rather than their number.  Percentiles are
+    reported as the upper bound of the bucket holding the requested rank,
+    clamped to the exact maximum, which bounds the relative error by the
+    bucket width (about 9% with the default 8 buckets per doubling).  Count,
+    sum, minimum, and maximum are exact.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_resolution_s: float = 1e-6,
+        buckets_per_doubling: int = 8,
+    ) -> None:
+        if min_resolution_s <= 0:
+            raise ValueError("min_resolution_s must be > 0.")
+        if buckets_per_doubling < 1:
+            raise ValueError("buckets_per_doubling must be >= 1.")
+        self._min_resolution_s = float(min_resolution_s)
+        self._log_ratio = math.log(2.0) / buckets_per_doubling
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total_s = 0.0
+        self.min_s: float | None = None
+        self.max_s: float | None = None
+
+    def record(self, latency_s: float) -> None:
+        latency_s = max(0.0, float(latency_s))
+        index = self._bucket_index(latency_s)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_s += latency_s
+        self.min_s = latency_s if self.min_s is None else min(self.min_s, latency_s)
+        self.max_s = latency_s if self.max_s is None else max(self.max_s, latency_s)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Returns the latency at *fraction* (0-1] in seconds, or ``None`` if empty."""
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError("fraction must be in (0, 1].")
+        if self.count == 0:
+            return None
+        assert self.max_s is not None
+        rank = math.ceil(fraction * self.count)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self._bucket_upper_s(index), self.max_s)
+        return self.max_s
+
+    def summary(self) -> dict[str, object]:
+        """Returns JSON-serializable count and millisecond statistics."""
+
+        def _ms(value_s: float | None) -> float | None:
+            return None if value_s is None else round(value_s * 1e3, 6)
+
+        return {
+            "count": self.count,
+            "mean_ms": _ms(self.total_s / self.count if self.count else None),
+            "min_ms": _ms(self.min_s),
+            "p50_ms": _ms(self.percentile(0.50) if self.count else None),
+            "p95_ms": _ms(self.percentile(0.95) if self.count else None),
+            "p99_ms": _ms(self.percentile(0.99) if self.count else None),
+            "max_ms": _ms(self.max_s),
+        }
+
+    def _bucket_index(self, latency_s: float) -> int:
+        if latency_s <= self._min_resolution_s:
+            return 0
+        return max(0, math.ceil(math.log(latency_s / self._min_resolution_s) / self._log_ratio))
+
+    def _bucket_upper_s(self, index: int) -> float:
+        return self._min_resolution_s * math.exp(index * self._log_ratio)
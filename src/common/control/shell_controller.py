@@ -17,21 +17,29 @@ class ShellTemplateController:
     :class:`~src.common.control.interfaces.ClockController` protocol. ``apply``
     formats ``apply_template`` with ``target_mhz`` / ``action`` / ``reason`` and
     runs it; when no template is configured it logs a dry-run instead. ``reset``
-    runs an optional reset command. The subprocess runner and logger are
+    runs an optional reset command. With ``gpu_index`` set, ``{gpu_index}`` is
+    also substituted in both commands, so one template serves every device of
+    a multi-GPU run. The subprocess runner and logger are
     injectable, so this backend is fully unit-testable without touching real
     hardware.
     """
 
+    backend = "shell"
+
     def __init__(
         self,
         *,
         apply_template: str | None,
         reset_cmd: str | None = None,
+        gpu_index: int | None = None,
         logger: Callable[[str], None] | None = None,
         runner: Callable[..., Any] = subprocess.run,
     ) -> None:
         self._apply_template = apply_template or None
         self._reset_cmd = reset_cmd or None
+        self._gpu_index = gpu_index
+        if gpu_index is not None and self._reset_cmd:
+            self._reset_cmd = self._reset_cmd.format(gpu_index=gpu_index)
         self._log = logger if logger is not None else _noop_logger
         self._runner = runner
 
@@ -40,17 +48,21 @@ class ShellTemplateController:
             return
 
         if not self._apply_template:
+            device = "" if self._gpu_index is None else f" gpu={self._gpu_index}"
             self._log(
                 "dry-run control action: set_clock "
-                f"target={decision.target_graphics_clock_mhz} MHz"
+                f"target={decision.target_graphics_clock_mhz} MHz{device}"
             )
             return
 
-        cmd = self._apply_template.format(
-            target_mhz=decision.target_graphics_clock_mhz,
-            action=decision.action.value,
-            reason=decision.reason_code,
-        )
+        fields: dict[str, object] = {
+            "target_mhz": decision.target_graphics_clock_mhz,
+            "action": decision.action.value,
+            "reason": decision.reason_code,
+        }
+        if self._gpu_index is not None:
+            fields["gpu_index"] = self._gpu_index
+        cmd = self._apply_template.format(**fields)
         self._log(f"applying control command: {cmd}")
         self._runner(cmd, shell=True, check=True)
 
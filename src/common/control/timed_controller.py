@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from src.common.experiment.types import Decision
+
+from .interfaces import ClockController
+from .latency import LatencyHistogram
+
+
+def controller_backend_name(controller: ClockController) -> str:
+    """Returns the backend label of *controller*, looking through wrappers.
+
+    Backends declare a ``backend`` class attribute; wrappers expose the
+    wrapped controller as ``inner``.  Controllers without either are labelled
+    with their class name.
+    """
+    current: object = controller
+    while True:
+        backend = getattr(current, "backend", None)
+        if isinstance(backend, str):
+            return backend
+        inner = getattr(current, "inner", None)
+        if inner is None:
+            return type(current).__name__
+        current = inner
+
+
+class TimedClockController:
+    """Wrapper that times every actuation issued to the wrapped controller.
+
+    ``apply`` calls for decisions that change the clock and ``reset`` calls
+    are timed with ``clock``.  Successful durations go into one
+    :class:`LatencyHistogram` per action (``set_clock``, ``reset_to_max``,
+    ``reset``); failed calls are counted per action and re-raised.
+    Decisions that do not change the clock, or that carry no target clock
+    for the backend to apply, are forwarded untimed.
+
+    Place this wrapper directly around the backend (inside any
+    deduplication) so that only real actuations are measured.  The duration
+    of the latest timed call is available once through
+    :meth:`pop_last_duration_s`, which the control loop uses to record a
+    per-decision actuation time.
+    """
+
+    def __init__(
+        self,
+        inner: ClockController,
+        *,
+        backend: str | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._inner = inner
+        self.backend = backend if backend is not None else controller_backend_name(inner)
+        self._clock = clock
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._failure_counts: dict[str, int] = {}
+        self._last_duration_s: float | None = None
+
+    @property
+    def inner(self) -> ClockController:
+        return self._inner
+
+    def apply(self, decision: Decision) -> None:
+        if not decision.requires_clock_change or decision.target_graphics_clock_mhz is None:
+            self._inner.apply(decision)
+            return
+        self._timed(decision.action.value, self._inner.apply, decision)
+
+    def reset(self) -> None:
+        self._timed("reset", self._inner.reset)
+
+    def close(self) -> None:
+        """Closes the wrapped controller when it holds resources."""
+        close = getattr(self._inner, "close", None)
+        if callable(close):
+            close()
+
+    def pop_last_duration_s(self) -> float | None:
+        """Returns and clears the duration of the latest timed actuation."""
+        duration_s = self._last_duration_s
+        self._last_duration_s = None
+        return duration_s
+
+    def metrics(self) -> dict[str, object]:
+        """Returns JSON-serializable latency histograms keyed by action."""
+        actions = sorted(set(self._histograms) | set(self._failure_counts))
+        by_action: dict[str, object] = {}
+        for action in actions:
+            histogram = self._histograms.get(action, LatencyHistogram())
+            by_action[action] = {
+                **histogram.summary(),
+                "failure_count": self._failure_counts.get(action, 0),
+            }
+        return {"backend": self.backend, "by_action": by_action}
+
+    def _timed(self, action: str, call: Callable[..., None], *args: object) -> None:
+        started = self._clock()
+        try:
+            call(*args)
+        except BaseException:
+            self._last_duration_s = self._clock() - started
+            self._failure_counts[action] = self._failure_counts.get(action, 0) + 1
+            raise
+        self._last_duration_s = self._clock() - started
+        self._histograms.setdefault(action, LatencyHistogram()).record(self._last_duration_s)
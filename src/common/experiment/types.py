@@ -219,16 +219,64 @@ class AlgorithmState:
     """
     Mutable state bag owned by one algorithm instance.
 
-    The shared runner should treat this object as opaque.
+    The shared runner should treat this object as opaque, apart from the
+    dirty-key set: ``set()`` records which top-level keys changed so the
+    runner can persist only those.  Algorithms that mutate a stored value in
+    place must call ``mark_dirty(key)`` for the change to be persisted.
+
+    Large mappings that grow one entry at a time (EVeREST's ``phase_cache``
+    mirror) can instead be updated with ``set_entry()`` and ``pop_entry()``,
+    which record only the touched entries, so an incremental persister does
+    not re-serialize the whole mapping.
     """
 
     data: dict[str, Any] = field(default_factory=dict)
+    _dirty_keys: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _dirty_entries: dict[str, set[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def get(self, key: str, default: Any = None) -> Any:
         return self.data.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         self.data[key] = value
+        self._dirty_keys.add(key)
+
+    def mark_dirty(self, key: str) -> None:
+        """Records that the value under *key* was mutated in place."""
+        self._dirty_keys.add(key)
+
+    def pop_dirty_keys(self) -> set[str]:
+        """Returns the keys changed since the previous call and clears the set."""
+        dirty = self._dirty_keys
+        self._dirty_keys = set()
+        return dirty
+
+    def set_entry(self, key: str, entry: str, value: Any) -> None:
+        """Sets ``data[key][entry]`` in place, creating the mapping if absent."""
+        mapping = self.data.get(key)
+        if not isinstance(mapping, dict):
+            self.set(key, {entry: value})
+            return
+        mapping[entry] = value
+        self._dirty_entries.setdefault(key, set()).add(entry)
+
+    def pop_entry(self, key: str, entry: str, default: Any = None) -> Any:
+        """Removes and returns ``data[key][entry]``, or *default* if absent."""
+        mapping = self.data.get(key)
+        if not isinstance(mapping, dict) or entry not in mapping:
+            return default
+        self._dirty_entries.setdefault(key, set()).add(entry)
+        return mapping.pop(entry)
+
+    def pop_dirty_entries(self) -> dict[str, set[str]]:
+        """Returns the mapping entries changed since the previous call and clears them.
+
+        An entry listed here may since have been removed; callers check
+        ``data[key]`` to tell a set from a removal.
+        """
+        dirty = self._dirty_entries
+        self._dirty_entries = {}
+        return dirty
 
 
 @dataclass(slots=True, frozen=True)
@@ -0,0 +1,11 @@
+"""Closed-loop GPU simulation for offline policy evaluation."""
+
+from .simulator import GpuSimulator, PowerModel
+from .workload import SimulatedPhase, SimulatedWorkload
+
+__all__ = [
+    "GpuSimulator",
+    "PowerModel",
+    "SimulatedPhase",
+    "SimulatedWorkload",
+]
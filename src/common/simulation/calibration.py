@@ -0,0 +1,337 @@
+"""Simulator calibration from offline frequency-sweep profiles.
+
+Fits monotone per-workload performance-vs-clock and power-vs-clock
+surrogates from sweep points (the ``workload_profiles`` records the static
+oracle selects from) and tabulates them on the platform clock grid, so
+runtime and energy at any grid clock are an array lookup.
+
+This module needs NumPy, so it is not imported by ``src.common.simulation``;
+import it explicitly::
+
+    from src.common.simulation.calibration import load_or_fit_surrogates
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Mapping, Protocol, Sequence
+
+import numpy as np
+
+from src.common.experiment.types import PlatformSpec
+
+from .workload import SimulatedPhase
+
+# Bumped when the fit changes, so cached artifacts from an older fit miss.
+CALIBRATION_VERSION = 1
+
+# Performance ratios are floored here so runtime (work / ratio) stays finite
+# when a surrogate is extrapolated far below the swept clocks.
+_MIN_PERFORMANCE_RATIO = 1e-3
+
+
+class ProfilePoint(Protocol):
+    """One sweep measurement; the static oracle's ``SweepPoint`` satisfies it."""
+
+    @property
+    def frequency_mhz(self) -> int: ...
+
+    @property
+    def performance_ratio(self) -> float: ...
+
+    @property
+    def power_w(self) -> float | None: ...
+
+
+@dataclass(slots=True, frozen=True)
+class SurrogateEstimate:
+    """Surrogate prediction for one workload at one grid clock."""
+
+    clock_mhz: int
+    performance_ratio: float
+    power_w: float | None
+    runtime_s: float
+    energy_j: float | None
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class SurrogateTable:
+    """Per-workload surrogates tabulated on a clock grid.
+
+    Row ``i`` of ``performance_ratio`` / ``power_w`` belongs to
+    ``workloads[i]``; column ``j`` to ``clock_grid_mhz[j]``.  Both curves are
+    non-decreasing in clock.  ``power_w`` rows are NaN for workloads whose
+    profile has no power readings.  Arrays are read-only.
+    """
+
+    profile_hash: str
+    workloads: tuple[str, ...]
+    clock_grid_mhz: np.ndarray
+    performance_ratio: np.ndarray
+    power_w: np.ndarray
+    _rows: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        shape = (len(self.workloads), len(self.clock_grid_mhz))
+        if self.performance_ratio.shape != shape or self.power_w.shape != shape:
+            raise ValueError(f"surrogate arrays must have shape {shape}.")
+        for array in (self.clock_grid_mhz, self.performance_ratio, self.power_w):
+            array.setflags(write=False)
+        object.__setattr__(self, "_rows", {name: row for row, name in enumerate(self.workloads)})
+
+    def row(self, workload: str) -> int:
+        try:
+            return self._rows[workload]
+        except KeyError:
+            raise KeyError(f"no surrogate for workload {workload!r}.") from None
+
+    def runtime_s(self, workload: str, baseline_runtime_s: float) -> np.ndarray:
+        """Runtime at every grid clock for a run taking *baseline_runtime_s* at ratio 1."""
+        return baseline_runtime_s / self.performance_ratio[self.row(workload)]
+
+    def energy_j(self, workload: str, baseline_runtime_s: float) -> np.ndarray:
+        """Energy at every grid clock; NaN when the profile has no power."""
+        return self.power_w[self.row(workload)] * self.runtime_s(workload, baseline_runtime_s)
+
+    def estimate(
+        self,
+        workload: str,
+        clock_mhz: int,
+        baseline_runtime_s: float,
+    ) -> SurrogateEstimate:
+        column = self._column(clock_mhz)
+        row = self.row(workload)
+        performance_ratio = float(self.performance_ratio[row, column])
+        power_w = float(self.power_w[row, column])
+        runtime_s = baseline_runtime_s / performance_ratio
+        has_power = not np.isnan(power_w)
+        return SurrogateEstimate(
+            clock_mhz=int(self.clock_grid_mhz[column]),
+            performance_ratio=performance_ratio,
+            power_w=power_w if has_power else None,
+            runtime_s=runtime_s,
+            energy_j=power_w * runtime_s if has_power else None,
+        )
+
+    def energy_optimal_clocks(self, minimum_performance_ratio: float) -> np.ndarray:
+        """Per-workload grid clock minimizing energy subject to the performance floor.
+
+        Energy per unit of work is ``power / performance``.  Workloads where no
+        clock meets the floor get the maximum grid clock; workloads without
+        power readings get the lowest clock that meets the floor, matching the
+        static oracle's choice.
+        """
+        feasible = self.performance_ratio >= minimum_performance_ratio
+        energy_per_work = self.power_w / self.performance_ratio
+        # Lower clocks win ties and power-less rows (all NaN -> 0 cost).
+        cost = np.where(feasible, np.nan_to_num(energy_per_work, nan=0.0), np.inf)
+        columns = np.argmin(cost, axis=1)
+        columns = np.where(feasible.any(axis=1), columns, len(self.clock_grid_mhz) - 1)
+        return self.clock_grid_mhz[columns]
+
+    def compute_fractions(self) -> np.ndarray:
+        """Per-workload clock-bound fraction for :class:`SimulatedPhase`.
+
+        Least-squares fit of ``1 / ratio - 1 = c * (f_max / f - 1)``, the
+        simulator's phase model, over the grid, clipped to ``[0, 1]``.
+        """
+        x = self.clock_grid_mhz[-1] / self.clock_grid_mhz.astype(float) - 1.0
+        y = 1.0 / self.performance_ratio - 1.0
+        denominator = float(x @ x)
+        if denominator == 0.0:
+            return np.zeros(len(self.workloads))
+        return np.clip((y @ x) / denominator, 0.0, 1.0)
+
+    def simulated_phase(
+        self,
+        workload: str,
+        *,
+        work_s: float,
+        gpu_util_pct: float,
+        mem_util_pct: float,
+    ) -> SimulatedPhase:
+        """A simulator phase whose clock response follows this workload's surrogate."""
+        return SimulatedPhase(
+            name=workload,
+            work_s=work_s,
+            compute_fraction=float(self.compute_fractions()[self.row(workload)]),
+            gpu_util_pct=gpu_util_pct,
+            mem_util_pct=mem_util_pct,
+        )
+
+    def save(self, path: Path) -> None:
+        """Writes the table as ``.npz``; the file is replaced atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                version=np.array(CALIBRATION_VERSION),
+                profile_hash=np.array(self.profile_hash),
+                workloads=np.array(self.workloads, dtype=str),
+                clock_grid_mhz=self.clock_grid_mhz,
+                performance_ratio=self.performance_ratio,
+                power_w=self.power_w,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> SurrogateTable:
+        with np.load(Path(path), allow_pickle=False) as data:
+            if int(data["version"]) != CALIBRATION_VERSION:
+                raise ValueError(f"{path}: calibration version {int(data['version'])} is stale.")
+            return cls(
+                profile_hash=str(data["profile_hash"].item()),
+                workloads=tuple(str(name) for name in data["workloads"]),
+                clock_grid_mhz=data["clock_grid_mhz"].astype(np.int64),
+                performance_ratio=data["performance_ratio"].astype(float),
+                power_w=data["power_w"].astype(float),
+            )
+
+    def _column(self, clock_mhz: int) -> int:
+        column = int(np.searchsorted(self.clock_grid_mhz, clock_mhz))
+        if column >= len(self.clock_grid_mhz) or self.clock_grid_mhz[column] != clock_mhz:
+            raise ValueError(f"clock {clock_mhz} MHz is not on the surrogate clock grid.")
+        return column
+
+
+def platform_clock_grid(platform: PlatformSpec) -> np.ndarray:
+    """Settable clocks from min to max in ``graphics_clock_step_mhz`` steps; max always included."""
+    step_mhz = platform.graphics_clock_step_mhz
+    if step_mhz <= 0:
+        raise ValueError("platform graphics_clock_step_mhz must be positive.")
+    grid = np.arange(
+        platform.min_graphics_clock_mhz,
+        platform.max_graphics_clock_mhz + 1,
+        step_mhz,
+        dtype=np.int64,
+    )
+    if grid[-1] != platform.max_graphics_clock_mhz:
+        grid = np.append(grid, np.int64(platform.max_graphics_clock_mhz))
+    return grid
+
+
+def profile_hash(
+    profiles: Mapping[str, Sequence[ProfilePoint]],
+    clock_grid_mhz: Sequence[int] | np.ndarray,
+) -> str:
+    """SHA-256 of the profiles and grid; independent of point and workload order."""
+    canonical = {
+        "version": CALIBRATION_VERSION,
+        "clock_grid_mhz": [int(clock) for clock in clock_grid_mhz],
+        "profiles": {
+            str(name): sorted(
+                (
+                    int(point.frequency_mhz),
+                    float(point.performance_ratio),
+                    None if point.power_w is None else float(point.power_w),
+                )
+                for point in points
+            )
+            for name, points in profiles.items()
+        },
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def fit_surrogates(
+    profiles: Mapping[str, Sequence[ProfilePoint]],
+    clock_grid_mhz: Sequence[int] | np.ndarray,
+) -> SurrogateTable:
+    """Fits and tabulates one performance and one power surrogate per workload.
+
+    Each curve is the weighted isotonic (non-decreasing) regression of the
+    sweep points, with repeated clocks averaged.  It is interpolated linearly
+    between swept clocks and extended along its end segments outside them.
+    """
+    grid = np.array(clock_grid_mhz, dtype=np.int64)
+    if grid.ndim != 1 or grid.size == 0 or np.any(np.diff(grid) <= 0):
+        raise ValueError("clock_grid_mhz must be a non-empty, strictly increasing sequence.")
+    workloads = tuple(sorted(str(name) for name in profiles))
+    performance = np.empty((len(workloads), grid.size))
+    power = np.full((len(workloads), grid.size), np.nan)
+    for row, name in enumerate(workloads):
+        points = profiles[name]
+        if not points:
+            raise ValueError(f"profile for workload {name!r} has no sweep points.")
+        clocks = np.array([point.frequency_mhz for point in points], dtype=float)
+        ratios = np.array([point.performance_ratio for point in points], dtype=float)
+        performance[row] = _monotone_curve(clocks, ratios, grid)
+        powers = np.array(
+            [np.nan if point.power_w is None else point.power_w for point in points],
+            dtype=float,
+        )
+        measured = ~np.isnan(powers)
+        if measured.any():
+            power[row] = _monotone_curve(clocks[measured], powers[measured], grid)
+    return SurrogateTable(
+        profile_hash=profile_hash({name: profiles[name] for name in workloads}, grid),
+        workloads=workloads,
+        clock_grid_mhz=grid,
+        performance_ratio=np.maximum(performance, _MIN_PERFORMANCE_RATIO),
+        power_w=np.maximum(power, 0.0),
+    )
+
+
+def load_or_fit_surrogates(
+    profiles: Mapping[str, Sequence[ProfilePoint]],
+    clock_grid_mhz: Sequence[int] | np.ndarray,
+    cache_dir: Path,
+) -> SurrogateTable:
+    """Returns the cached table for these profiles, fitting and caching it on a miss.
+
+    Artifacts live at ``cache_dir/surrogates-<hash prefix>.npz``.  An
+    unreadable or mismatched artifact is refit and overwritten.
+    """
+    digest = profile_hash(profiles, clock_grid_mhz)
+    path = Path(cache_dir) / f"surrogates-{digest[:16]}.npz"
+    if path.exists():
+        try:
+            cached = SurrogateTable.load(path)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            cached = None
+        if cached is not None and cached.profile_hash == digest:
+            return cached
+    table = fit_surrogates(profiles, clock_grid_mhz)
+    table.save(path)
+    return table
+
+
+def _monotone_curve(clocks: np.ndarray, values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    knots, inverse, counts = np.unique(clocks, return_inverse=True, return_counts=True)
+    means = np.bincount(inverse, weights=values) / counts
+    fitted = _isotonic_increasing(means, counts.astype(float))
+    if knots.size == 1:
+        return np.full(grid.size, fitted[0])
+    curve = np.interp(grid, knots, fitted)
+    low_slope = (fitted[1] - fitted[0]) / (knots[1] - knots[0])
+    high_slope = (fitted[-1] - fitted[-2]) / (knots[-1] - knots[-2])
+    below = grid < knots[0]
+    above = grid > knots[-1]
+    curve[below] = fitted[0] + low_slope * (grid[below] - knots[0])
+    curve[above] = fitted[-1] + high_slope * (grid[above] - knots[-1])
+    return curve
+
+
+def _isotonic_increasing(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Pool-adjacent-violators: weighted least-squares non-decreasing fit."""
+    block_means: list[float] = []
+    block_weights: list[float] = []
+    block_sizes: list[int] = []
+    for value, weight in zip(values.tolist(), weights.tolist()):
+        mean, total, size = value, weight, 1
+        while block_means and block_means[-1] > mean:
+            previous_weight = block_weights.pop()
+            mean = (block_means.pop() * previous_weight + mean * total) / (previous_weight + total)
+            total += previous_weight
+            size += block_sizes.pop()
+        block_means.append(mean)
+        block_weights.append(total)
+        block_sizes.append(size)
+    return np.repeat(np.array(block_means), block_sizes)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass
+
+from src.common.experiment.types import (
+    Decision,
+    DecisionAction,
+    ExperimentContext,
+    JSONValue,
+    MetricWindow,
+    PlatformSpec,
+)
+
+from .workload import SimulatedPhase, SimulatedWorkload
+
+
+@dataclass(slots=True, frozen=True)
+class PowerModel:
+    """Board power as a function of utilization and graphics clock.
+
+    ``power = idle_w + core_w * u_gpu * (clock / max_clock) ** clock_exponent
+    + memory_w * u_mem`` with utilizations as fractions.  An exponent above 1
+    stands for the supply voltage scaling with frequency.
+    """
+
+    idle_w: float = 60.0
+    core_w: float = 240.0
+    memory_w: float = 50.0
+    clock_exponent: float = 2.4
+
+    def power_w(
+        self,
+        gpu_util_pct: float,
+        mem_util_pct: float,
+        clock_mhz: float,
+        max_clock_mhz: float,
+    ) -> float:
+        clock_scale = (clock_mhz / max_clock_mhz) ** self.clock_exponent
+        return (
+            self.idle_w
+            + self.core_w * (gpu_util_pct / 100.0) * clock_scale
+            + self.memory_w * (mem_util_pct / 100.0)
+        )
+
+
+class GpuSimulator:
+    """Closed-loop stand-in for one GPU running a :class:`SimulatedWorkload`.
+
+    The simulator is both the :class:`WindowTelemetryProvider` and the
+    :class:`ClockController` of a control loop, so a policy's decisions feed
+    back into the telemetry it sees next:
+
+    1. :meth:`apply` sets the clock used from the next window on.  With
+       ``clock_transition_s``, that window's first seconds still run at the
+       old clock.
+    2. :meth:`get_window` advances simulated time by ``window_seconds``.
+       Each phase's clock-bound share runs slower at lower clocks, so runtime
+       progress, memory utilization, and power all follow the applied clock.
+       A window may span phase boundaries; its metrics are time-weighted.
+    3. ``custom_metrics["performance_ratio"]`` is the window's progress rate
+       relative to the maximum clock, and ``custom_metrics["phase"]`` names
+       the phase running at the window end.
+
+    When the last phase completes, the window is cut short, ``finished`` is
+    set (and ``finished_event``, e.g. a loop's ``stop_event``), and later
+    windows raise :class:`LookupError`.  ``noise_pct`` adds seeded Gaussian
+    noise (relative standard deviation) to the reported utilizations.  Only
+    arithmetic runs per window, so thousands of windows take well under a
+    second.
+    """
+
+    backend = "simulator"
+
+    def __init__(
+        self,
+        platform: PlatformSpec,
+        workload: SimulatedWorkload,
+        *,
+        power_model: PowerModel | None = None,
+        start_unix_s: float = 0.0,
+        clock_transition_s: float = 0.0,
+        noise_pct: float = 0.0,
+        seed: int = 0,
+        finished_event: threading.Event | None = None,
+    ) -> None:
+        if clock_transition_s < 0:
+            raise ValueError("clock_transition_s must be >= 0.")
+        if noise_pct < 0:
+            raise ValueError("noise_pct must be >= 0.")
+        self.platform = platform
+        self.workload = workload
+        self.power_model = power_model if power_model is not None else PowerModel()
+        self.finished_event = finished_event if finished_event is not None else threading.Event()
+        self._max_clock_mhz = float(platform.max_graphics_clock_mhz)
+        self._transition_s = clock_transition_s
+        self._noise = noise_pct / 100.0
+        self._random = random.Random(seed)
+        self._phases = workload.schedule()
+        self._phase_index = 0
+        self._phase_remaining_work_s = self._phases[0].work_s
+        self._clock_mhz = self._max_clock_mhz
+        self._pending_clock_mhz: float | None = None
+        self._now_s = start_unix_s
+        self.elapsed_s = 0.0
+        self.energy_j = 0.0
+        self.work_done_s = 0.0
+        self.window_count = 0
+        self.clock_change_count = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._phase_index >= len(self._phases)
+
+    @property
+    def applied_clock_mhz(self) -> float:
+        """The clock the next window will settle at."""
+        return self._clock_mhz if self._pending_clock_mhz is None else self._pending_clock_mhz
+
+    # ------------------------------------------------------------------
+    # ClockController
+    # ------------------------------------------------------------------
+
+    def apply(self, decision: Decision) -> None:
+        if decision.action == DecisionAction.RESET_TO_MAX:
+            self._set_clock(self._max_clock_mhz)
+        elif decision.requires_clock_change and decision.target_graphics_clock_mhz is not None:
+            self._set_clock(float(decision.target_graphics_clock_mhz))
+
+    def reset(self) -> None:
+        self._set_clock(self._max_clock_mhz)
+
+    # ------------------------------------------------------------------
+    # WindowTelemetryProvider
+    # ------------------------------------------------------------------
+
+    def get_window(self, context: ExperimentContext, sequence_id: int) -> MetricWindow:
+        if self.finished:
+            raise LookupError(f"simulated workload finished before window {sequence_id}.")
+        window_s = context.window_seconds
+        switch_at_s: float | None = None
+        if self._pending_clock_mhz is not None:
+            if self._transition_s > 0:
+                switch_at_s = min(self._transition_s, window_s)
+            else:
+                self._settle_clock()
+
+        elapsed_s = 0.0
+        work_s = gpu_sum = mem_sum = clock_sum = energy_j = 0.0
+        while elapsed_s < window_s and not self.finished:
+            if switch_at_s is not None and elapsed_s >= switch_at_s:
+                self._settle_clock()
+                switch_at_s = None
+            segment_end_s = window_s if switch_at_s is None else switch_at_s
+            phase = self._phases[self._phase_index]
+            time_per_work = phase.time_per_work(self._clock_mhz, self._max_clock_mhz)
+            finish_s = self._phase_remaining_work_s * time_per_work
+            if finish_s <= segment_end_s - elapsed_s:
+                dt_s = finish_s
+                work_s += self._phase_remaining_work_s
+                self._next_phase()
+            else:
+                dt_s = segment_end_s - elapsed_s
+                work_s += dt_s / time_per_work
+                self._phase_remaining_work_s -= dt_s / time_per_work
+            mem_util_pct = phase.mem_util_pct / time_per_work
+            gpu_sum += phase.gpu_util_pct * dt_s
+            mem_sum += mem_util_pct * dt_s
+            clock_sum += self._clock_mhz * dt_s
+            energy_j += dt_s * self.power_model.power_w(
+                phase.gpu_util_pct, mem_util_pct, self._clock_mhz, self._max_clock_mhz
+            )
+            elapsed_s += dt_s
+        if switch_at_s is not None:
+            self._settle_clock()
+
+        start_s = self._now_s
+        self._now_s += elapsed_s
+        self.elapsed_s += elapsed_s
+        self.energy_j += energy_j
+        self.work_done_s += work_s
+        self.window_count += 1
+        if self.finished:
+            self.finished_event.set()
+
+        duration_s = elapsed_s if elapsed_s > 0 else window_s
+        custom_metrics: dict[str, JSONValue] = {
+            "performance_ratio": work_s / duration_s if elapsed_s > 0 else 1.0,
+            "phase": self._current_phase_name(),
+        }
+        return MetricWindow(
+            sequence_id=sequence_id,
+            start_unix_s=start_s,
+            end_unix_s=self._now_s,
+            duration_s=duration_s,
+            sample_count=max(1, int(duration_s * 1000.0 / max(1, context.sampling_interval_ms))),
+            gpu_util_avg_pct=self._noisy(gpu_sum / duration_s),
+            mem_util_avg_pct=self._noisy(mem_sum / duration_s),
+            graphics_clock_avg_mhz=clock_sum / duration_s,
+            power_avg_w=energy_j / duration_s,
+            energy_delta_j=energy_j,
+            custom_metrics=custom_metrics,
+        )
+
+    def summary(self) -> dict[str, JSONValue]:
+        """Run totals; ``slowdown`` compares the runtime with the all-max-clock runtime."""
+        baseline_s = self.workload.baseline_runtime_s
+        return {
+            "finished": self.finished,
+            "window_count": self.window_count,
+            "runtime_s": self.elapsed_s,
+            "baseline_runtime_s": baseline_s,
+            "slowdown": self.elapsed_s / baseline_s - 1.0 if self.finished else None,
+            "work_done_s": self.work_done_s,
+            "energy_j": self.energy_j,
+            "clock_change_count": self.clock_change_count,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _set_clock(self, target_mhz: float) -> None:
+        target_mhz = min(
+            max(target_mhz, float(self.platform.min_graphics_clock_mhz)), self._max_clock_mhz
+        )
+        if target_mhz == self.applied_clock_mhz:
+            return
+        self.clock_change_count += 1
+        self._pending_clock_mhz = None if target_mhz == self._clock_mhz else target_mhz
+
+    def _settle_clock(self) -> None:
+        if self._pending_clock_mhz is not None:
+            self._clock_mhz = self._pending_clock_mhz
+            self._pending_clock_mhz = None
+
+    def _next_phase(self) -> None:
+        self._phase_index += 1
+        if not self.finished:
+            self._phase_remaining_work_s = self._phases[self._phase_index].work_s
+
+    def _current_phase_name(self) -> str:
+        phase: SimulatedPhase = self._phases[min(self._phase_index, len(self._phases) - 1)]
+        return phase.name
+
+    def _noisy(self, value_pct: float) -> float:
+        if self._noise == 0.0:
+            return value_pct
+        return min(100.0, max(0.0, value_pct * (1.0 + self._random.gauss(0.0, self._noise))))
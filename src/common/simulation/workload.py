@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping, Sequence
+
+
+@dataclass(slots=True, frozen=True)
+class SimulatedPhase:
+    """One workload phase, described as it runs at the maximum graphics clock.
+
+    ``work_s`` is the phase's runtime at the maximum clock.  A share
+    ``compute_fraction`` of that time is clock-bound and stretches with
+    ``max_clock / clock``; the rest (memory- or I/O-bound) does not.
+    ``mem_util_pct`` is the memory utilization at the maximum clock; the same
+    bytes spread over a longer runtime at lower clocks lower it.
+    """
+
+    name: str
+    work_s: float
+    compute_fraction: float
+    gpu_util_pct: float
+    mem_util_pct: float
+
+    def __post_init__(self) -> None:
+        if self.work_s <= 0:
+            raise ValueError(f"phase {self.name!r}: work_s must be > 0.")
+        if not 0.0 <= self.compute_fraction <= 1.0:
+            raise ValueError(f"phase {self.name!r}: compute_fraction must be in [0, 1].")
+        for field_name in ("gpu_util_pct", "mem_util_pct"):
+            if not 0.0 <= getattr(self, field_name) <= 100.0:
+                raise ValueError(f"phase {self.name!r}: {field_name} must be in [0, 100].")
+
+    def time_per_work(self, clock_mhz: float, max_clock_mhz: float) -> float:
+        """Seconds needed at *clock_mhz* per second of maximum-clock work."""
+        return self.compute_fraction * (max_clock_mhz / clock_mhz) + (1.0 - self.compute_fraction)
+
+
+@dataclass(slots=True, frozen=True)
+class SimulatedWorkload:
+    """An ordered sequence of phases, optionally repeated ``repeat`` times."""
+
+    phases: tuple[SimulatedPhase, ...]
+    repeat: int = 1
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "phases", tuple(self.phases))
+        if not self.phases:
+            raise ValueError("a simulated workload needs at least one phase.")
+        if self.repeat < 1:
+            raise ValueError("repeat must be >= 1.")
+
+    @property
+    def baseline_runtime_s(self) -> float:
+        """Runtime of the whole workload at the maximum clock."""
+        return self.repeat * sum(phase.work_s for phase in self.phases)
+
+    def schedule(self) -> tuple[SimulatedPhase, ...]:
+        """Returns the phases in execution order, repeats expanded."""
+        return self.phases * self.repeat
+
+    @classmethod
+    def from_mapping(cls, raw: Mapping[str, object]) -> SimulatedWorkload:
+        """Builds a workload from ``{"phases": [{...}, ...], "repeat": n}``."""
+        phases_raw = raw.get("phases")
+        if not isinstance(phases_raw, Sequence) or isinstance(phases_raw, str):
+            raise ValueError("workload 'phases' must be a list of phase objects.")
+        phases = []
+        for index, phase in enumerate(phases_raw):
+            if not isinstance(phase, Mapping):
+                raise ValueError(f"workload phase {index} must be an object.")
+            try:
+                phases.append(
+                    SimulatedPhase(
+                        name=str(phase.get("name", f"phase{index}")),
+                        work_s=float(phase["work_s"]),
+                        compute_fraction=float(phase["compute_fraction"]),
+                        gpu_util_pct=float(phase["gpu_util_pct"]),
+                        mem_util_pct=float(phase["mem_util_pct"]),
+                    )
+                )
+            except KeyError as exc:
+                raise ValueError(f"workload phase {index} is missing {exc.args[0]!r}.") from None
+        return cls(phases=tuple(phases), repeat=int(raw.get("repeat", 1)))  # type: ignore[arg-type]
+
+    @classmethod
+    def load(cls, path: Path) -> SimulatedWorkload:
+        """Reads a workload from a JSON file in the :meth:`from_mapping` layout."""
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(raw, Mapping):
+            raise ValueError(f"{path}: workload file must contain a JSON object.")
+        return cls.from_mapping(raw)
@@ -1,9 +1,40 @@
 from __future__ import annotations
 
 from .env_provider import EnvTelemetryProvider
-from .interfaces import WindowTelemetryProvider
+from .file_provider import FileTelemetryProvider, TailReader, TelemetryRowParser
+from .interfaces import TelemetrySource, WindowTelemetryProvider
+from .monitor_provider import MonitorLineParser, MonitorTelemetrySource
+from .replay_provider import TraceReplayProvider, TraceReplaySource, load_trace
+from .sampler import SampleSink, TelemetrySampler
+from .shm_channel import (
+    SharedMemoryTelemetryProvider,
+    SharedMemoryTelemetryReader,
+    SharedMemoryTelemetryWriter,
+)
+from .streaming import RunningStats, StreamingTelemetryProvider, StreamingWindowAggregator
+from .sysfs_provider import SysfsGpuReader, SysfsTelemetrySource, discover_drm_devices
 
 __all__ = [
     "EnvTelemetryProvider",
+    "FileTelemetryProvider",
+    "MonitorLineParser",
+    "MonitorTelemetrySource",
+    "RunningStats",
+    "SampleSink",
+    "SharedMemoryTelemetryProvider",
+    "SharedMemoryTelemetryReader",
+    "SharedMemoryTelemetryWriter",
+    "StreamingTelemetryProvider",
+    "StreamingWindowAggregator",
+    "SysfsGpuReader",
+    "SysfsTelemetrySource",
+    "TailReader",
+    "TelemetryRowParser",
+    "TelemetrySampler",
+    "TelemetrySource",
+    "TraceReplayProvider",
+    "TraceReplaySource",
     "WindowTelemetryProvider",
+    "discover_drm_devices",
+    "load_trace",
 ]
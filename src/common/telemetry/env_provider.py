@@ -22,12 +22,25 @@ def _parse_optional_float(raw: str | None) -> float | None:
 
 @dataclass(frozen=True, slots=True)
 class EnvTelemetryProvider:
-    """Builds metric windows from the existing ``METRIC_*`` environment contract."""
+    """Builds metric windows from the existing ``METRIC_*`` environment contract.
+
+    With ``device_index`` set, each ``METRIC_<NAME>`` lookup first tries the
+    per-device variable ``METRIC_<NAME>_GPU<index>`` and falls back to the
+    shared one, so a multi-GPU loop can feed each device its own telemetry.
+    """
 
     environ: Mapping[str, str] | None = None
     clock: Callable[[], float] = time.time
+    device_index: int | None = None
 
     def _get(self, name: str) -> str | None:
+        if self.device_index is not None:
+            value = self._lookup(f"{name}_GPU{self.device_index}")
+            if value not in (None, ""):
+                return value
+        return self._lookup(name)
+
+    def _lookup(self, name: str) -> str | None:
         if self.environ is None:
             return os.getenv(name)
         return self.environ.get(name)
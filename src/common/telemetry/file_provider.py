@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Mapping, Sequence
+
+from src.common.experiment.types import ExperimentContext, MetricWindow, TelemetrySample
+
+from .streaming import StreamingTelemetryProvider, StreamingWindowAggregator
+
+_FORMATS = ("csv", "jsonl")
+
+# Column name -> (TelemetrySample field, scale).  Names are matched after
+# lowercasing and dropping a trailing unit suffix such as `` [MHz]``, so
+# both ``nvidia-smi --format=csv`` headers and field names work.
+_COLUMN_ALIASES: dict[str, tuple[str, float]] = {
+    "timestamp": ("timestamp_unix_s", 1.0),
+    "timestamp_unix_s": ("timestamp_unix_s", 1.0),
+    "index": ("gpu_index", 1.0),
+    "gpu_index": ("gpu_index", 1.0),
+    "utilization.gpu": ("gpu_util_pct", 1.0),
+    "gpu_util_pct": ("gpu_util_pct", 1.0),
+    "utilization.memory": ("mem_util_pct", 1.0),
+    "mem_util_pct": ("mem_util_pct", 1.0),
+    "clocks.gr": ("graphics_clock_mhz", 1.0),
+    "clocks.current.graphics": ("graphics_clock_mhz", 1.0),
+    "graphics_clock_mhz": ("graphics_clock_mhz", 1.0),
+    "power.draw": ("power_w", 1.0),
+    "power.draw.instant": ("power_w", 1.0),
+    "power_w": ("power_w", 1.0),
+    # nvidia-smi reports the energy counter in millijoules.
+    "total_energy_consumption": ("energy_j", 1e-3),
+    "energy_j": ("energy_j", 1.0),
+    "temperature.gpu": ("temperature_c", 1.0),
+    "temperature_c": ("temperature_c", 1.0),
+}
+
+_MISSING_VALUES = frozenset({"", "n/a", "[n/a]", "[not supported]", "nan"})
+
+# ``nvidia-smi`` local-time timestamp format, e.g. ``2026/01/01 12:00:00.125``.
+_NVIDIA_SMI_TIMESTAMP = "%Y/%m/%d %H:%M:%S.%f"
+
+
+def _normalize_column(name: str) -> str:
+    name = name.strip().lower()
+    if name.endswith("]") and " [" in name:
+        name = name[: name.rindex(" [")]
+    return name
+
+
+def _parse_timestamp(raw: object) -> float:
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    text = str(raw).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(text, _NVIDIA_SMI_TIMESTAMP).timestamp()
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def _first_line(path: Path, max_bytes: int = 65536) -> str:
+    try:
+        with path.open("rb") as fp:
+            return fp.readline(max_bytes).decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        return ""
+
+
+class TailReader:
+    """Incrementally reads complete lines appended to a growing file.
+
+    Each :meth:`read_lines` call reads only the bytes appended since the
+    previous call with ``os.pread`` at the tracked offset, so the cost is
+    proportional to the new data rather than the file size.  A trailing
+    partial line is held back until its newline arrives.
+
+    With ``skip_existing`` (the default), content already in the file when the
+    reader is created is skipped, like ``tail -n 0 -f``: a sidecar that was
+    running before the loop would otherwise fold stale rows into the first
+    read, at a cost that grows with the file.  A line cut by that point is
+    dropped up to its newline.
+
+    Truncation (the file shrinks below the offset, e.g. ``copytruncate``
+    rotation) restarts from the beginning.  Rotation by rename (the path now
+    names a different inode) first drains what remains of the old file, then
+    follows the new one from its start.  A missing file reads as no lines.
+    """
+
+    def __init__(self, path: Path, *, skip_existing: bool = True) -> None:
+        self.path = Path(path)
+        self._fd: int | None = None
+        self._offset = 0
+        self._partial = b""
+        self._skip_to_newline = False
+        self.truncation_count = 0
+        self.rotation_count = 0
+        self.skipped_byte_count = 0
+        # (st_dev, st_ino, st_size) of the file as found at creation, consumed by
+        # the first open; files opened later (created or rotated in) start at 0.
+        self._existing: tuple[int, int, int] | None = None
+        if skip_existing:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                pass
+            else:
+                self._existing = (stat.st_dev, stat.st_ino, stat.st_size)
+
+    @property
+    def skip_pending(self) -> bool:
+        """Whether the first open will skip content that predates the reader."""
+        return self._existing is not None and self._existing[2] > 0
+
+    def read_lines(self) -> list[str]:
+        if self._fd is None and not self._open():
+            return []
+        assert self._fd is not None
+        lines = self._read_available()
+        try:
+            path_stat = os.stat(self.path)
+        except FileNotFoundError:
+            return lines
+        fd_stat = os.fstat(self._fd)
+        if (path_stat.st_dev, path_stat.st_ino) != (fd_stat.st_dev, fd_stat.st_ino):
+            self.rotation_count += 1
+            if self._partial:
+                lines.append(self._partial.decode("utf-8", errors="replace"))
+            self.close()
+            if self._open():
+                lines.extend(self._read_available())
+        return lines
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = None
+        self._offset = 0
+        self._partial = b""
+        self._skip_to_newline = False
+
+    def _open(self) -> bool:
+        try:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        existing, self._existing = self._existing, None
+        if existing is not None and existing[2] > 0:
+            stat = os.fstat(self._fd)
+            if (stat.st_dev, stat.st_ino) == existing[:2] and stat.st_size >= existing[2]:
+                self._offset = self.skipped_byte_count = existing[2]
+                self._skip_to_newline = os.pread(self._fd, 1, self._offset - 1) != b"\n"
+        return True
+
+    def _read_available(self) -> list[str]:
+        assert self._fd is not None
+        size = os.fstat(self._fd).st_size
+        if size < self._offset:
+            self.truncation_count += 1
+            self._offset = 0
+            self._partial = b""
+            self._skip_to_newline = False
+        if size == self._offset:
+            return []
+        data = os.pread(self._fd, size - self._offset, self._offset)
+        self._offset += len(data)
+        if self._skip_to_newline:
+            _, newline, data = data.partition(b"\n")
+            if not newline:
+                return []
+            self._skip_to_newline = False
+        data = self._partial + data
+        complete, _, self._partial = data.rpartition(b"\n")
+        return complete.decode("utf-8", errors="replace").splitlines()
+
+
+class TelemetryRowParser:
+    """Parses CSV or JSONL telemetry rows into :class:`TelemetrySample` values.
+
+    CSV rows are mapped by ``columns`` when given (for headerless output such
+    as ``nvidia-smi --format=csv,noheader,nounits``), otherwise by the most
+    recent header line, which is re-read whenever it reappears after rotation.
+    JSONL objects are mapped by key.  Column names are the
+    :class:`TelemetrySample` field names or their ``nvidia-smi --query-gpu``
+    equivalents; unknown columns are ignored.  With ``device_index`` set,
+    rows whose ``index``/``gpu_index`` column names another GPU are skipped,
+    so one multi-GPU log can feed one provider per device.
+    """
+
+    def __init__(
+        self,
+        row_format: str,
+        *,
+        columns: Sequence[str] | None = None,
+        device_index: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if row_format not in _FORMATS:
+            raise ValueError(f"row_format must be one of {', '.join(_FORMATS)}; got {row_format!r}.")
+        self.row_format = row_format
+        self._columns = self._resolve_columns(columns) if columns else None
+        self._fixed_columns = columns is not None
+        self._device_index = device_index
+        self._clock = clock
+        self.malformed_row_count = 0
+
+    def parse(self, line: str) -> TelemetrySample | None:
+        """Returns the sample for *line*, or ``None`` for headers, blanks, other GPUs, and bad rows."""
+        if not line.strip():
+            return None
+        try:
+            if self.row_format == "jsonl":
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("JSONL row must be an object.")
+                return self.parse_record(record)
+            values = self._parse_csv(line)
+            if values is None:
+                return None
+            return self._to_sample(values)
+        except (ValueError, TypeError, KeyError):
+            self.malformed_row_count += 1
+            return None
+
+    def parse_record(self, record: Mapping[str, object]) -> TelemetrySample | None:
+        """Returns the sample for one already-decoded row keyed by column name."""
+        try:
+            return self._to_sample(self._map_record(record))
+        except (ValueError, TypeError, KeyError):
+            self.malformed_row_count += 1
+            return None
+
+    def read_header(self, line: str) -> bool:
+        """Adopts *line* as the CSV header if it is one; returns whether it was."""
+        if self.row_format != "csv" or self._fixed_columns:
+            return False
+        return self._adopt_header(next(csv.reader([line], skipinitialspace=True), []))
+
+    def _adopt_header(self, cells: Sequence[str]) -> bool:
+        normalized = [_normalize_column(cell) for cell in cells]
+        # Data cells never spell a known column name, so any match marks a header.
+        if not any(name in _COLUMN_ALIASES for name in normalized):
+            return False
+        self._columns = self._resolve_columns(normalized)
+        return True
+
+    def _parse_csv(self, line: str) -> dict[str, object] | None:
+        cells = next(csv.reader([line], skipinitialspace=True))
+        if not self._fixed_columns and self._adopt_header(cells):
+            return None
+        if self._columns is None:
+            raise ValueError("CSV row before any header.")
+        if len(cells) != len(self._columns):
+            raise ValueError("CSV row width does not match its header.")
+        values: dict[str, object] = {}
+        for mapping, cell in zip(self._columns, cells):
+            if mapping is not None:
+                self._store(values, mapping, cell)
+        return values
+
+    def _map_record(self, record: Mapping[str, object]) -> dict[str, object]:
+        values: dict[str, object] = {}
+        for key, raw in record.items():
+            mapping = _COLUMN_ALIASES.get(_normalize_column(key))
+            if mapping is not None:
+                self._store(values, mapping, raw)
+        return values
+
+    @staticmethod
+    def _resolve_columns(names: Sequence[str]) -> list[tuple[str, float] | None]:
+        return [_COLUMN_ALIASES.get(_normalize_column(name)) for name in names]
+
+    @staticmethod
+    def _store(values: dict[str, object], mapping: tuple[str, float], raw: object) -> None:
+        field, scale = mapping
+        if raw is None or (isinstance(raw, str) and raw.strip().lower() in _MISSING_VALUES):
+            return
+        if isinstance(raw, float) and math.isnan(raw):
+            return
+        if field == "timestamp_unix_s":
+            values[field] = _parse_timestamp(raw)
+        elif field == "gpu_index":
+            values[field] = int(str(raw).strip())
+        else:
+            # ``--format=csv`` without ``nounits`` appends units, e.g. ``250.50 W``.
+            values[field] = float(str(raw).split()[0]) * scale
+
+    def _to_sample(self, values: dict[str, object]) -> TelemetrySample | None:
+        gpu_index = values.get("gpu_index")
+        if self._device_index is not None and gpu_index is not None and gpu_index != self._device_index:
+            return None
+        return TelemetrySample(
+            timestamp_unix_s=float(values.get("timestamp_unix_s", self._clock())),  # type: ignore[arg-type]
+            gpu_util_pct=float(values.get("gpu_util_pct", 0.0)),  # type: ignore[arg-type]
+            mem_util_pct=float(values.get("mem_util_pct", 0.0)),  # type: ignore[arg-type]
+            graphics_clock_mhz=int(round(values["graphics_clock_mhz"])),  # type: ignore[arg-type]
+            power_w=values.get("power_w"),  # type: ignore[arg-type]
+            energy_j=values.get("energy_j"),  # type: ignore[arg-type]
+            temperature_c=values.get("temperature_c"),  # type: ignore[arg-type]
+        )
+
+
+class FileTelemetryProvider:
+    """Builds windows from a telemetry log that a sidecar keeps appending to.
+
+    Intended for a long-lived control loop fed by, for example::
+
+        nvidia-smi --query-gpu=timestamp,index,utilization.gpu,utilization.memory,\\
+            clocks.gr,power.draw,total_energy_consumption --format=csv -lms 100 > gpu.csv
+
+    Each :meth:`get_window` call reads only the rows appended since the
+    previous call (:class:`TailReader`), folds them into a
+    :class:`StreamingWindowAggregator`, and rolls the window, so per-window
+    cost is proportional to the new rows.  Rows already in the log when the
+    provider is created are skipped; its CSV header line is still read.  Windows tile time from the
+    previous call.  Raises :class:`LookupError` for a window in which no row
+    arrived, which the control loop records as a window failure.
+
+    ``row_format`` defaults to ``jsonl`` for ``.jsonl``/``.ndjson`` paths and
+    ``csv`` otherwise.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        row_format: str | None = None,
+        columns: Sequence[str] | None = None,
+        device_index: int | None = None,
+        energy_counter_wrap_j: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        path = Path(path)
+        if row_format is None:
+            row_format = "jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv"
+        self._reader = TailReader(path)
+        self._parser = TelemetryRowParser(
+            row_format, columns=columns, device_index=device_index, clock=clock
+        )
+        if self._reader.skip_pending:
+            self._parser.read_header(_first_line(path))
+        self._aggregator = StreamingWindowAggregator(energy_counter_wrap_j=energy_counter_wrap_j)
+        self._windows = StreamingTelemetryProvider(self._aggregator, clock=clock)
+        self.row_count = 0
+
+    def get_window(self, context: ExperimentContext, sequence_id: int) -> MetricWindow:
+        rows = 0
+        for line in self._reader.read_lines():
+            sample = self._parser.parse(line)
+            if sample is not None:
+                self._aggregator.append(sample)
+                rows += 1
+        self.row_count += rows
+        window = self._windows.get_window(context, sequence_id)
+        if rows == 0:
+            raise LookupError(
+                f"no telemetry rows appended to {self._reader.path} during window {sequence_id}."
+            )
+        return window
+
+    def metrics(self) -> dict[str, object]:
+        return {
+            "path": str(self._reader.path),
+            "row_count": self.row_count,
+            "malformed_row_count": self._parser.malformed_row_count,
+            "truncation_count": self._reader.truncation_count,
+            "rotation_count": self._reader.rotation_count,
+        }
+
+    def close(self) -> None:
+        self._reader.close()
@@ -15,3 +15,17 @@ class WindowTelemetryProvider(Protocol):
         sequence_id: int,
     ) -> MetricWindow:
         """Returns telemetry for ``sequence_id`` in ``context``."""
+
+
+@runtime_checkable
+class TelemetrySource(Protocol):
+    """Long-lived background collector that serves one window provider per GPU.
+
+    The owner must call :meth:`stop` when the run ends.
+    """
+
+    def provider(self, device_index: int | None = None) -> WindowTelemetryProvider:
+        """Returns the provider for *device_index* (``None`` for a single-GPU source)."""
+
+    def stop(self) -> None:
+        """Stops background collection and releases its resources."""
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from typing import IO, Any, Callable, Sequence
+
+from src.common.experiment.types import TelemetrySample
+
+from .streaming import StreamingTelemetryProvider, StreamingWindowAggregator
+
+# Monitor column header (lowercased) -> TelemetrySample field.  Covers
+# ``nvidia-smi dmon -s pucm`` and ``amd-smi monitor -p -u -t``.
+_MONITOR_COLUMN_ALIASES: dict[str, str] = {
+    # nvidia-smi dmon
+    "gpu": "gpu_index",
+    "pwr": "power_w",
+    "gtemp": "temperature_c",
+    "sm": "gpu_util_pct",
+    "mem": "mem_util_pct",
+    "pclk": "graphics_clock_mhz",
+    # amd-smi monitor
+    "power": "power_w",
+    "gpu_temp": "temperature_c",
+    "gfx_util": "gpu_util_pct",
+    "gfx%": "gpu_util_pct",
+    "mem_util": "mem_util_pct",
+    "mem%": "mem_util_pct",
+    "gfx_clock": "graphics_clock_mhz",
+    "gfx_clk": "graphics_clock_mhz",
+}
+
+_MISSING_TOKENS = frozenset({"-", "n/a", "na"})
+
+# Columns added by ``dmon -o DT``.
+_TIME_COLUMNS = frozenset({"date", "time"})
+
+
+def _is_value_token(token: str) -> bool:
+    """True for numeric and missing-value cells, False for unit suffixes like ``W``."""
+    if token.lower() in _MISSING_TOKENS:
+        return True
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+class MonitorLineParser:
+    """Parses the whitespace table printed by a streaming GPU monitor.
+
+    Header lines (``# gpu pwr gtemp ...`` from ``nvidia-smi dmon``, or
+    ``GPU POWER GPU_TEMP ...`` from ``amd-smi monitor``) set the column
+    order; lines without a known column name (such as dmon's unit row) are
+    skipped.  In data rows, unit tokens (``W``, ``MHz``, ``%``, ``°C``) are
+    dropped before cells are matched to columns, and ``-``/``N/A`` read as
+    missing.  Each sample is stamped with ``clock()`` when its line is parsed
+    and carries the row's GPU index in ``raw_counters["gpu_index"]``.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._columns: list[str | None] | None = None
+        self.malformed_row_count = 0
+
+    def parse(self, line: str) -> TelemetrySample | None:
+        text = line.strip()
+        if not text:
+            return None
+        tokens = text.lstrip("#").split()
+        names = [token.lower() for token in tokens]
+        if any(name in _MONITOR_COLUMN_ALIASES for name in names):
+            # Date/time cells are not numeric and get dropped with the units.
+            self._columns = [
+                _MONITOR_COLUMN_ALIASES.get(name)
+                for name in names
+                if name not in _TIME_COLUMNS
+            ]
+            return None
+        if text.startswith("#"):
+            return None
+        cells = [token for token in tokens if _is_value_token(token)]
+        if self._columns is None or len(cells) != len(self._columns):
+            self.malformed_row_count += 1
+            return None
+        values: dict[str, float] = {}
+        for field, cell in zip(self._columns, cells):
+            if field is not None and cell.lower() not in _MISSING_TOKENS:
+                values[field] = float(cell)
+        if "graphics_clock_mhz" not in values:
+            self.malformed_row_count += 1
+            return None
+        raw_counters: dict[str, Any] = {}
+        if "gpu_index" in values:
+            raw_counters["gpu_index"] = int(values["gpu_index"])
+        return TelemetrySample(
+            timestamp_unix_s=self._clock(),
+            gpu_util_pct=values.get("gpu_util_pct", 0.0),
+            mem_util_pct=values.get("mem_util_pct", 0.0),
+            graphics_clock_mhz=int(round(values["graphics_clock_mhz"])),
+            power_w=values.get("power_w"),
+            temperature_c=values.get("temperature_c"),
+            raw_counters=raw_counters,
+        )
+
+
+class MonitorTelemetrySource:
+    """Runs one streaming monitor subprocess for the whole run.
+
+    ``command`` (e.g. ``nvidia-smi dmon -s pucm -d 1``) is started once and
+    a reader thread parses its stdout line by line with
+    :class:`MonitorLineParser`, folding samples into one
+    :class:`StreamingWindowAggregator` per device, so no process is spawned
+    per sample or per window.  With ``device_indices`` set, rows are routed
+    by their GPU column and rows for other GPUs are dropped; without it,
+    every row goes to a single aggregator (monitor one GPU, e.g. ``-i 0``).
+
+    When the monitor exits it is restarted after ``restart_backoff_s``, up to
+    ``max_restarts`` times.  :meth:`provider` returns the
+    ``WindowTelemetryProvider`` for one device.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        *,
+        device_indices: Sequence[int] | None = None,
+        restart_backoff_s: float = 1.0,
+        max_restarts: int = 10,
+        energy_counter_wrap_j: float | None = None,
+        clock: Callable[[], float] = time.time,
+        popen: Callable[..., Any] = subprocess.Popen,
+    ) -> None:
+        if not command:
+            raise ValueError("command must not be empty.")
+        self._command = list(command)
+        self._restart_backoff_s = float(restart_backoff_s)
+        self._max_restarts = int(max_restarts)
+        self._clock = clock
+        self._popen = popen
+        self._parser = MonitorLineParser(clock=clock)
+        keys: list[int | None] = list(device_indices) if device_indices is not None else [None]
+        self._aggregators = {
+            key: StreamingWindowAggregator(energy_counter_wrap_j=energy_counter_wrap_j)
+            for key in keys
+        }
+        self._providers = {
+            key: StreamingTelemetryProvider(
+                aggregator,
+                clock=clock,
+                before_window=self.start,
+                require_samples=True,
+                wait_for_first_sample=True,
+            )
+            for key, aggregator in self._aggregators.items()
+        }
+        self._route_by_index = device_indices is not None
+        self._stop = threading.Event()
+        self._process_lock = threading.Lock()
+        self._process: Any = None
+        self._thread: threading.Thread | None = None
+
+        self.start_count = 0
+        self.sample_count = 0
+        self.dropped_row_count = 0
+        self.last_exit_code: int | None = None
+
+    def provider(self, device_index: int | None = None) -> StreamingTelemetryProvider:
+        """Returns the window provider for *device_index* (``None`` when not routing)."""
+        return self._providers[device_index if self._route_by_index else None]
+
+    def start(self) -> MonitorTelemetrySource:
+        with self._process_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="telemetry-monitor", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        """Stops the reader thread and terminates the monitor."""
+        self._stop.set()
+        with self._process_lock:
+            process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=timeout_s)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+
+    def __enter__(self) -> MonitorTelemetrySource:
+        return self.start()
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.stop()
+
+    def metrics(self) -> dict[str, object]:
+        return {
+            "command": self._command,
+            "sample_count": self.sample_count,
+            "restart_count": max(0, self.start_count - 1),
+            "malformed_row_count": self._parser.malformed_row_count,
+            "dropped_row_count": self.dropped_row_count,
+            "last_exit_code": self.last_exit_code,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.start_count > self._max_restarts:
+                return
+            try:
+                process = self._popen(
+                    self._command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                )
+            except OSError:
+                self.start_count += 1
+                self._stop.wait(self._restart_backoff_s)
+                continue
+            with self._process_lock:
+                self._process = process
+                if self._stop.is_set():
+                    process.terminate()
+            self.start_count += 1
+            self._consume(process.stdout)
+            self.last_exit_code = process.wait()
+            process.stdout.close()
+            self._stop.wait(self._restart_backoff_s)
+
+    def _consume(self, stdout: IO[str]) -> None:
+        for line in stdout:
+            sample = self._parser.parse(line)
+            if sample is None:
+                continue
+            key = sample.raw_counters.get("gpu_index") if self._route_by_index else None
+            aggregator = self._aggregators.get(key)  # type: ignore[arg-type]
+            if aggregator is None:
+                self.dropped_row_count += 1
+                continue
+            aggregator.append(sample)
+            self.sample_count += 1
+
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import csv
+import dataclasses
+import json
+import math
+from pathlib import Path
+from typing import Iterator, Mapping, Sequence
+
+from src.common.experiment.types import ExperimentContext, JSONValue, MetricWindow, TelemetrySample
+
+from .file_provider import TelemetryRowParser
+from .streaming import StreamingWindowAggregator
+
+_FORMATS = ("csv", "jsonl", "npz")
+
+# A trace whose rows carry this column holds recorded windows; otherwise its
+# rows are samples.
+_WINDOW_MARKER = "graphics_clock_avg_mhz"
+
+_WINDOW_FIELDS = frozenset(
+    {
+        "sequence_id",
+        "start_unix_s",
+        "end_unix_s",
+        "duration_s",
+        "sample_count",
+        "gpu_util_avg_pct",
+        "mem_util_avg_pct",
+        "graphics_clock_avg_mhz",
+        "power_avg_w",
+        "energy_delta_j",
+        "custom_metrics",
+        "index",
+        "gpu_index",
+    }
+)
+
+_MISSING_VALUES = frozenset({"", "n/a", "nan", "none", "null"})
+
+
+def _is_missing(raw: object) -> bool:
+    if raw is None:
+        return True
+    if isinstance(raw, float):
+        return math.isnan(raw)
+    return isinstance(raw, str) and raw.strip().lower() in _MISSING_VALUES
+
+
+def _optional_float(record: Mapping[str, object], name: str) -> float | None:
+    raw = record.get(name)
+    return None if _is_missing(raw) else float(raw)  # type: ignore[arg-type]
+
+
+def _custom_metric(raw: object) -> JSONValue:
+    if isinstance(raw, (bool, int, float)):
+        return raw
+    text = str(raw).strip()
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _window_from_record(
+    record: Mapping[str, object],
+    position: int,
+    window_seconds: float,
+) -> MetricWindow:
+    """Builds a recorded window; missing times are laid out on a ``window_seconds`` grid."""
+    start_s = _optional_float(record, "start_unix_s")
+    end_s = _optional_float(record, "end_unix_s")
+    duration_s = _optional_float(record, "duration_s")
+    if duration_s is None:
+        duration_s = end_s - start_s if start_s is not None and end_s is not None else window_seconds
+    if end_s is None:
+        end_s = start_s + duration_s if start_s is not None else (position + 1) * duration_s
+    if start_s is None:
+        start_s = end_s - duration_s
+
+    custom_metrics: dict[str, JSONValue] = {}
+    recorded = record.get("custom_metrics")
+    if isinstance(recorded, str) and recorded.strip():
+        recorded = json.loads(recorded)
+    if isinstance(recorded, dict):
+        custom_metrics.update(recorded)
+    for name, raw in record.items():
+        if name not in _WINDOW_FIELDS and not _is_missing(raw):
+            custom_metrics[name] = _custom_metric(raw)
+
+    sample_count = _optional_float(record, "sample_count")
+    return MetricWindow(
+        sequence_id=position,
+        start_unix_s=start_s,
+        end_unix_s=end_s,
+        duration_s=duration_s,
+        sample_count=1 if sample_count is None else int(sample_count),
+        gpu_util_avg_pct=_optional_float(record, "gpu_util_avg_pct") or 0.0,
+        mem_util_avg_pct=_optional_float(record, "mem_util_avg_pct") or 0.0,
+        graphics_clock_avg_mhz=float(record[_WINDOW_MARKER]),  # type: ignore[arg-type]
+        power_avg_w=_optional_float(record, "power_avg_w"),
+        energy_delta_j=_optional_float(record, "energy_delta_j"),
+        custom_metrics=custom_metrics,
+    )
+
+
+def _record_device(record: Mapping[str, object]) -> int | None:
+    for name in ("gpu_index", "index"):
+        raw = record.get(name)
+        if not _is_missing(raw):
+            return int(float(raw))  # type: ignore[arg-type]
+    return None
+
+
+def _windows_from_samples(
+    samples: list[TelemetrySample],
+    window_seconds: float,
+    energy_counter_wrap_j: float | None,
+) -> list[MetricWindow]:
+    """Bins samples into ``window_seconds`` windows aligned to the first sample.
+
+    Bins without samples (gaps in the recording) produce no window.
+    """
+    if not samples:
+        return []
+    samples.sort(key=lambda sample: sample.timestamp_unix_s)
+    aggregator = StreamingWindowAggregator(energy_counter_wrap_j=energy_counter_wrap_j)
+    origin_s = samples[0].timestamp_unix_s
+    windows: list[MetricWindow] = []
+
+    def _roll(bin_index: int) -> None:
+        start_s = origin_s + bin_index * window_seconds
+        windows.append(aggregator.roll(start_s, start_s + window_seconds, len(windows)))
+
+    current_bin = 0
+    for sample in samples:
+        bin_index = int((sample.timestamp_unix_s - origin_s) // window_seconds)
+        if bin_index != current_bin:
+            _roll(current_bin)
+            current_bin = bin_index
+        aggregator.append(sample)
+    _roll(current_bin)
+    return windows
+
+
+def _read_npz_records(path: Path) -> Iterator[dict[str, object]]:
+    import numpy as np  # NPZ traces are the only NumPy-dependent path here.
+
+    with np.load(path, allow_pickle=False) as archive:
+        columns = {name: archive[name] for name in archive.files}
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"{path}: NPZ trace arrays must all have the same length.")
+    for row in range(lengths.pop() if lengths else 0):
+        yield {name: values[row].item() for name, values in columns.items()}
+
+
+def load_trace(
+    path: Path,
+    *,
+    window_seconds: float,
+    row_format: str | None = None,
+    columns: Sequence[str] | None = None,
+    device_index: int | None = None,
+    energy_counter_wrap_j: float | None = None,
+) -> list[MetricWindow]:
+    """Loads a recorded telemetry trace as the list of windows to replay.
+
+    ``row_format`` is ``csv``, ``jsonl``, or ``npz`` (one 1-D array per
+    column) and defaults from the suffix.  Rows carrying
+    ``graphics_clock_avg_mhz`` are recorded windows using the
+    :class:`MetricWindow` field names; unknown columns (e.g.
+    ``performance_ratio``) go to ``custom_metrics``.  Any other trace is
+    per-sample, with the :class:`TelemetryRowParser` column names, and is
+    binned into ``window_seconds`` windows with the streaming aggregator.
+    With ``device_index`` set, rows whose ``index``/``gpu_index`` names
+    another GPU are skipped.
+    """
+    path = Path(path)
+    if row_format is None:
+        suffix = path.suffix.lower()
+        row_format = {".npz": "npz", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(suffix, "csv")
+    if row_format not in _FORMATS:
+        raise ValueError(f"row_format must be one of {', '.join(_FORMATS)}; got {row_format!r}.")
+    if window_seconds <= 0:
+        raise ValueError("window_seconds must be > 0.")
+
+    records: Iterator[Mapping[str, object]]
+    if row_format == "csv":
+        lines = path.read_text(encoding="utf-8").splitlines()
+        header = list(columns) if columns else next(csv.reader(lines[:1], skipinitialspace=True), [])
+        if _WINDOW_MARKER not in (name.strip() for name in header):
+            parser = TelemetryRowParser("csv", columns=columns, device_index=device_index)
+            samples = [sample for sample in map(parser.parse, lines) if sample is not None]
+            return _windows_from_samples(samples, window_seconds, energy_counter_wrap_j)
+        rows = csv.reader(lines if columns else lines[1:], skipinitialspace=True)
+        records = (dict(zip((name.strip() for name in header), row)) for row in rows if row)
+    elif row_format == "jsonl":
+        with path.open(encoding="utf-8") as handle:
+            records = iter([json.loads(line) for line in handle if line.strip()])
+    else:
+        records = _read_npz_records(path)
+
+    windows: list[MetricWindow] = []
+    samples: list[TelemetrySample] = []
+    parser = TelemetryRowParser("jsonl", device_index=device_index)
+    for record in records:
+        if _WINDOW_MARKER in record:
+            if device_index is None or _record_device(record) in (None, device_index):
+                windows.append(_window_from_record(record, len(windows), window_seconds))
+        else:
+            sample = parser.parse_record(record)
+            if sample is not None:
+                samples.append(sample)
+    return windows + _windows_from_samples(samples, window_seconds, energy_counter_wrap_j)
+
+
+class TraceReplayProvider:
+    """Replays recorded windows as a :class:`WindowTelemetryProvider`.
+
+    ``get_window(context, i)`` returns the trace's ``i``-th window with no
+    clock reads or waiting, so a loop driven by it (with a no-op sleep) runs
+    as fast as the policy allows.  Asking past the end of the trace raises
+    :class:`LookupError`.
+    """
+
+    def __init__(self, windows: Sequence[MetricWindow]) -> None:
+        self._windows = list(windows)
+        self.replayed_count = 0
+
+    @classmethod
+    def from_path(
+        cls,
+        path: Path,
+        *,
+        window_seconds: float,
+        row_format: str | None = None,
+        columns: Sequence[str] | None = None,
+        device_index: int | None = None,
+    ) -> TraceReplayProvider:
+        return cls(
+            load_trace(
+                path,
+                window_seconds=window_seconds,
+                row_format=row_format,
+                columns=columns,
+                device_index=device_index,
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def get_window(self, context: ExperimentContext, sequence_id: int) -> MetricWindow:
+        if not 0 <= sequence_id < len(self._windows):
+            raise LookupError(
+                f"trace has {len(self._windows)} windows; window {sequence_id} is past its end."
+            )
+        self.replayed_count += 1
+        window = self._windows[sequence_id]
+        if window.sequence_id == sequence_id:
+            return window
+        return dataclasses.replace(window, sequence_id=sequence_id)
+
+    def metrics(self) -> dict[str, object]:
+        return {"window_count": len(self._windows), "replayed_count": self.replayed_count}
+
+
+class TraceReplaySource:
+    """Groups one :class:`TraceReplayProvider` per GPU as a :class:`TelemetrySource`.
+
+    ``window_count`` is the shortest trace, the number of windows every
+    device can replay.
+    """
+
+    def __init__(self, providers: Mapping[int | None, TraceReplayProvider]) -> None:
+        if not providers:
+            raise ValueError("providers must not be empty.")
+        self._providers = dict(providers)
+
+    @property
+    def window_count(self) -> int:
+        return min(len(provider) for provider in self._providers.values())
+
+    def provider(self, device_index: int | None = None) -> TraceReplayProvider:
+        return self._providers[device_index]
+
+    def stop(self) -> None:
+        """Nothing to release; traces are loaded up front."""
+
+    def metrics(self) -> dict[str, object]:
+        return {
+            ("gpu" if index is None else f"gpu{index}"): provider.metrics()
+            for index, provider in self._providers.items()
+        }
@@ -0,0 +1,219 @@
+"""NumPy-backed telemetry sample ring buffer and window provider.
+
+This module needs NumPy, so it is not imported by ``src.common.telemetry``;
+import it explicitly::
+
+    from src.common.telemetry.ring_buffer import RingBufferTelemetryProvider
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+from src.common.experiment.types import ExperimentContext, MetricWindow, TelemetrySample
+
+# Column order of the buffer; ``None`` power/energy/temperature values are
+# stored as NaN.
+_FIELDS = (
+    "timestamp_unix_s",
+    "gpu_util_pct",
+    "mem_util_pct",
+    "graphics_clock_mhz",
+    "power_w",
+    "energy_j",
+    "temperature_c",
+)
+_TIMESTAMP = 0
+
+
+class SampleRingBuffer:
+    """Fixed-capacity, thread-safe ring of :class:`TelemetrySample` columns.
+
+    Samples are stored column-wise in one preallocated ``float64`` array, so
+    memory is fixed at ``capacity * 7 * 8`` bytes regardless of run length.
+    When full, the oldest sample is overwritten.  Samples must be appended
+    in non-decreasing timestamp order (one sampler thread);
+    :meth:`window_columns` locates a time range by binary search and copies
+    only that range.  ``raw_counters`` are not stored.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 2:
+            raise ValueError("capacity must be >= 2.")
+        self.capacity = int(capacity)
+        self._data = np.full((len(_FIELDS), self.capacity), np.nan, dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        self._appended_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def appended_count(self) -> int:
+        """Samples appended since creation, including overwritten ones."""
+        return self._appended_count
+
+    @property
+    def overwritten_count(self) -> int:
+        return self._appended_count - self._size
+
+    def append(self, sample: TelemetrySample) -> None:
+        with self._lock:
+            if self._size and sample.timestamp_unix_s < self._data[_TIMESTAMP, self._last_index()]:
+                raise ValueError("samples must be appended in timestamp order.")
+            column = self._data[:, self._head]
+            column[0] = sample.timestamp_unix_s
+            column[1] = sample.gpu_util_pct
+            column[2] = sample.mem_util_pct
+            column[3] = sample.graphics_clock_mhz
+            column[4] = math.nan if sample.power_w is None else sample.power_w
+            column[5] = math.nan if sample.energy_j is None else sample.energy_j
+            column[6] = math.nan if sample.temperature_c is None else sample.temperature_c
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            self._appended_count += 1
+
+    def window_columns(self, start_s: float, end_s: float) -> np.ndarray | None:
+        """Returns a ``(fields, n)`` copy of the samples covering ``(start_s, end_s]``.
+
+        The copy also includes the latest sample at or before ``start_s``
+        (when one is buffered), whose values hold until the first in-window
+        sample.  Returns ``None`` when no sample at or before ``end_s`` is
+        buffered.
+        """
+        with self._lock:
+            if self._size == 0:
+                return None
+            first = self._search(start_s, side="right") - 1
+            stop = self._search(end_s, side="right")
+            first = max(first, 0)
+            if stop <= first:
+                return None
+            oldest = (self._head - self._size) % self.capacity
+            indices = (np.arange(first, stop) + oldest) % self.capacity
+            return self._data[:, indices]
+
+    def _last_index(self) -> int:
+        return (self._head - 1) % self.capacity
+
+    def _search(self, timestamp_s: float, *, side: str) -> int:
+        """Logical insertion index of *timestamp_s* among the buffered timestamps."""
+        timestamps = self._data[_TIMESTAMP]
+        oldest = (self._head - self._size) % self.capacity
+        if oldest + self._size <= self.capacity:
+            segment = timestamps[oldest : oldest + self._size]
+            return int(np.searchsorted(segment, timestamp_s, side=side))
+        older = timestamps[oldest:]
+        newer = timestamps[: self._head]
+        if timestamp_s < older[-1] or (side == "left" and timestamp_s == older[-1]):
+            return int(np.searchsorted(older, timestamp_s, side=side))
+        return len(older) + int(np.searchsorted(newer, timestamp_s, side=side))
+
+
+def aggregate_window(
+    columns: np.ndarray,
+    start_s: float,
+    end_s: float,
+    *,
+    sequence_id: int,
+    energy_counter_wrap_j: float | None = None,
+) -> MetricWindow:
+    """Reduces sample columns from :meth:`SampleRingBuffer.window_columns`.
+
+    Each sample's values hold from its timestamp (clipped to ``start_s``)
+    until the next sample or ``end_s``, and the means are weighted by those
+    durations, so irregular sampling intervals do not bias the result.
+    ``energy_delta_j`` is the energy-counter difference when every sample
+    has a counter, else the duration-weighted mean power times the window
+    duration, else ``None``.  As in
+    :class:`~src.common.telemetry.streaming.StreamingWindowAggregator`, a
+    counter that goes backwards wraps by ``energy_counter_wrap_j`` when that
+    is set, and otherwise counts as a reset that falls back to mean power.
+    """
+    timestamps = columns[_TIMESTAMP]
+    clipped = np.clip(timestamps, start_s, end_s)
+    weights = np.diff(np.append(clipped, end_s))
+    total_weight = float(weights.sum())
+    if total_weight <= 0.0:
+        # All samples sit exactly at ``end_s``: fall back to plain means.
+        weights = np.ones_like(timestamps)
+        total_weight = float(weights.size)
+
+    def _mean(row: np.ndarray) -> float | None:
+        valid = ~np.isnan(row)
+        valid_weight = float(weights[valid].sum())
+        if not valid.any() or valid_weight <= 0.0:
+            return None
+        return float(np.dot(row[valid], weights[valid]) / valid_weight)
+
+    power_avg_w = _mean(columns[4])
+    energy = columns[5]
+    duration_s = end_s - start_s
+    steps = np.diff(energy)
+    if energy_counter_wrap_j is not None:
+        steps = np.where(steps < 0, steps + energy_counter_wrap_j, steps)
+    if energy.size >= 2 and not np.isnan(energy).any() and not (steps < 0).any():
+        energy_delta_j: float | None = float(steps.sum())
+    elif power_avg_w is not None:
+        energy_delta_j = power_avg_w * duration_s
+    else:
+        energy_delta_j = None
+
+    return MetricWindow(
+        sequence_id=sequence_id,
+        start_unix_s=start_s,
+        end_unix_s=end_s,
+        duration_s=duration_s,
+        sample_count=int(np.count_nonzero(timestamps > start_s)),
+        gpu_util_avg_pct=_mean(columns[1]) or 0.0,
+        mem_util_avg_pct=_mean(columns[2]) or 0.0,
+        graphics_clock_avg_mhz=_mean(columns[3]) or 0.0,
+        power_avg_w=power_avg_w,
+        energy_delta_j=energy_delta_j,
+    )
+
+
+class RingBufferTelemetryProvider:
+    """Builds each :class:`MetricWindow` from the samples in a :class:`SampleRingBuffer`.
+
+    The window ends at ``clock()`` and spans ``context.window_seconds``.
+    Pair it with a :class:`~src.common.telemetry.sampler.TelemetrySampler`
+    appending to the same buffer.  Raises :class:`LookupError` while no
+    sample covering the window has been buffered yet.  ``energy_counter_wrap_j``
+    is passed to :func:`aggregate_window`.
+    """
+
+    def __init__(
+        self,
+        buffer: SampleRingBuffer,
+        *,
+        energy_counter_wrap_j: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if energy_counter_wrap_j is not None and energy_counter_wrap_j <= 0:
+            raise ValueError("energy_counter_wrap_j must be > 0.")
+        self._buffer = buffer
+        self._energy_counter_wrap_j = energy_counter_wrap_j
+        self._clock = clock
+
+    def get_window(self, context: ExperimentContext, sequence_id: int) -> MetricWindow:
+        end_s = self._clock()
+        start_s = end_s - context.window_seconds
+        columns = self._buffer.window_columns(start_s, end_s)
+        if columns is None:
+            raise LookupError(
+                f"no telemetry samples buffered at or before window {sequence_id} end."
+            )
+        return aggregate_window(
+            columns,
+            start_s,
+            end_s,
+            sequence_id=sequence_id,
+            energy_counter_wrap_j=self._energy_counter_wrap_j,
+        )
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import Callable, Protocol
+
+from src.common.experiment.types import TelemetrySample
+
+
+class SampleSink(Protocol):
+    """Anything that accepts samples, e.g. a ``SampleRingBuffer``."""
+
+    def append(self, sample: TelemetrySample) -> None:
+        """Stores one sample."""
+
+
+class TelemetrySampler:
+    """Background thread that reads one :class:`TelemetrySample` per interval.
+
+    ``read_sample`` is called every ``interval_s`` on absolute monotonic
+    deadlines, so sampling does not drift by the read cost, and each sample
+    is appended to ``sink``.  If a read overruns the interval, the missed
+    deadlines are skipped rather than bursting to catch up.  Read errors are
+    counted and the sampler keeps going; the latest error is kept for
+    diagnostics.
+    """
+
+    def __init__(
+        self,
+        read_sample: Callable[[], TelemetrySample],
+        sink: SampleSink,
+        *,
+        interval_s: float,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "telemetry-sampler",
+    ) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be > 0.")
+        self._read_sample = read_sample
+        self._sink = sink
+        self.interval_s = float(interval_s)
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+        self.sample_count = 0
+        self.error_count = 0
+        self.skipped_deadline_count = 0
+        self.last_error: str | None = None
+
+    def start(self) -> TelemetrySampler:
+        self._thread.start()
+        return self
+
+    def stop(self, timeout_s: float | None = 5.0) -> None:
+        """Stops the thread and waits for the in-flight read to finish."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout_s)
+
+    def __enter__(self) -> TelemetrySampler:
+        return self.start()
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.stop()
+
+    def metrics(self) -> dict[str, object]:
+        return {
+            "interval_s": self.interval_s,
+            "sample_count": self.sample_count,
+            "error_count": self.error_count,
+            "skipped_deadline_count": self.skipped_deadline_count,
+            "last_error": self.last_error,
+        }
+
+    def _run(self) -> None:
+        deadline = self._clock()
+        while not self._stop.is_set():
+            try:
+                self._sink.append(self._read_sample())
+                self.sample_count += 1
+            except Exception as exc:  # noqa: BLE001
+                self.error_count += 1
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                if self.error_count == 1:
+                    print(f"telemetry sampler read failed: {self.last_error}", file=sys.stderr)
+
+            deadline += self.interval_s
+            now = self._clock()
+            if now > deadline:
+                missed = int((now - deadline) // self.interval_s) + 1
+                self.skipped_deadline_count += missed
+                deadline += missed * self.interval_s
+            self._stop.wait(deadline - now)
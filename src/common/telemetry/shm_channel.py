@@ -0,0 +1,295 @@
+"""Shared-memory telemetry channel between a sampler process and the control loop.
+
+A sampler process (in any language) publishes :class:`TelemetrySample`
+records into a POSIX shared-memory segment; the control loop reads them in
+place through :class:`SharedMemoryTelemetryProvider`, with no file, pipe, or
+text parsing on the hot path.
+
+Layout (little-endian, 64-byte header followed by ``capacity`` 64-byte slots)::
+
+    header  offset  0  char[8]  magic "GPUTEL01"
+                    8  u32      layout version (1)
+                   12  u32      capacity (slot count)
+                   16  u32      slot size in bytes (64)
+                   20  u32      reserved
+                   24  u64      write_count: samples published so far
+                   32  -        reserved up to 64
+    slot i  offset  0  u64      seq: 2 * generation, odd while being written
+                    8  f64      timestamp_unix_s
+                   16  f64      gpu_util_pct
+                   24  f64      mem_util_pct
+                   32  f64      graphics_clock_mhz
+                   40  f64      power_w        (NaN = unavailable)
+                   48  f64      energy_j       (NaN = unavailable)
+                   56  f64      temperature_c  (NaN = unavailable)
+
+Sample ``n`` (0-based) goes to slot ``n % capacity``, generation
+``n // capacity + 1``.  A writer publishes it seqlock-style: store
+``seq = 2 * generation - 1`` (odd), write the payload, store
+``seq = 2 * generation`` (even), then store ``write_count = n + 1``.  Writers
+in other languages must order these stores with release semantics.  Readers
+never lock: they copy a slot between two reads of ``seq`` and retry when the
+slot was being written, and treat a slot whose generation moved past the
+expected one as overwritten (lost).  There must be exactly one writer per
+segment.
+"""
+from __future__ import annotations
+
+import math
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable
+
+from src.common.experiment.types import ExperimentContext, MetricWindow, TelemetrySample
+
+from .streaming import StreamingTelemetryProvider, StreamingWindowAggregator
+
+MAGIC = b"GPUTEL01"
+LAYOUT_VERSION = 1
+HEADER_SIZE = 64
+SLOT_SIZE = 64
+
+_HEADER = struct.Struct("<8sIIII")
+_WRITE_COUNT = struct.Struct("<Q")
+_WRITE_COUNT_OFFSET = 24
+_SEQ = struct.Struct("<Q")
+_PAYLOAD = struct.Struct("<7d")
+_PAYLOAD_OFFSET = 8
+
+# Attempts to copy a slot that keeps changing under the reader before the
+# sample is counted as lost.
+_MAX_READ_RETRIES = 8
+
+# Segments created by writers in this process; readers attached to them leave
+# the resource-tracker registration to the writer.
+_OWNED_SEGMENTS: set[str] = set()
+
+
+def segment_size(capacity: int) -> int:
+    """Returns the segment size in bytes for *capacity* slots."""
+    return HEADER_SIZE + capacity * SLOT_SIZE
+
+
+def _optional(value: float | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _present(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+class SharedMemoryTelemetryWriter:
+    """Creates a telemetry segment and publishes samples into it.
+
+    The writer owns the segment: :meth:`close` detaches and, by default,
+    unlinks it.
+    """
+
+    def __init__(self, name: str, *, capacity: int = 4096) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1.")
+        self.capacity = int(capacity)
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=True, size=segment_size(self.capacity)
+        )
+        _OWNED_SEGMENTS.add(self._shm._name)  # type: ignore[attr-defined]
+        self._buf = self._shm.buf
+        _HEADER.pack_into(self._buf, 0, MAGIC, LAYOUT_VERSION, self.capacity, SLOT_SIZE, 0)
+        _WRITE_COUNT.pack_into(self._buf, _WRITE_COUNT_OFFSET, 0)
+        self._write_count = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def write_count(self) -> int:
+        return self._write_count
+
+    def publish(self, sample: TelemetrySample) -> None:
+        n = self._write_count
+        offset = HEADER_SIZE + (n % self.capacity) * SLOT_SIZE
+        generation = n // self.capacity + 1
+        _SEQ.pack_into(self._buf, offset, 2 * generation - 1)
+        _PAYLOAD.pack_into(
+            self._buf,
+            offset + _PAYLOAD_OFFSET,
+            sample.timestamp_unix_s,
+            sample.gpu_util_pct,
+            sample.mem_util_pct,
+            float(sample.graphics_clock_mhz),
+            _optional(sample.power_w),
+            _optional(sample.energy_j),
+            _optional(sample.temperature_c),
+        )
+        _SEQ.pack_into(self._buf, offset, 2 * generation)
+        self._write_count = n + 1
+        _WRITE_COUNT.pack_into(self._buf, _WRITE_COUNT_OFFSET, self._write_count)
+
+    # ``append`` lets the writer act as a ``TelemetrySampler`` sink.
+    append = publish
+
+    def close(self, *, unlink: bool = True) -> None:
+        if self._shm is None:
+            return
+        self._buf.release()
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+        _OWNED_SEGMENTS.discard(self._shm._name)  # type: ignore[attr-defined]
+        self._shm = None  # type: ignore[assignment]
+
+    def __enter__(self) -> SharedMemoryTelemetryWriter:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+class SharedMemoryTelemetryReader:
+    """Lock-free reader of a telemetry segment created by a writer.
+
+    :meth:`read_new` returns the samples published since the previous call,
+    decoded straight from the shared buffer.  With ``skip_existing`` (the
+    default), the first call starts at the writer's ``write_count`` as of
+    attaching: samples published before then predate the reader and are
+    counted in ``skipped_sample_count``, not returned.  Samples overwritten
+    before they were read (the reader fell more than ``capacity`` samples
+    behind, or a slot kept changing during the copy) are counted in
+    ``lost_sample_count``.
+    """
+
+    def __init__(self, name: str, *, skip_existing: bool = True) -> None:
+        self._shm = shared_memory.SharedMemory(name=name, create=False)
+        # The segment belongs to the writer; without this, Python's resource
+        # tracker unlinks it when this (reading) process exits.
+        if self._shm._name not in _OWNED_SEGMENTS:  # type: ignore[attr-defined]
+            resource_tracker.unregister(self._shm._name, "shared_memory")  # type: ignore[attr-defined]
+        self._buf = self._shm.buf
+        try:
+            magic, version, capacity, slot_size, _ = _HEADER.unpack_from(self._buf, 0)
+            if magic != MAGIC or version != LAYOUT_VERSION or slot_size != SLOT_SIZE:
+                raise ValueError(
+                    f"shared memory segment {name!r} is not a version {LAYOUT_VERSION} "
+                    "telemetry channel."
+                )
+            if self._shm.size < segment_size(capacity):
+                raise ValueError(f"shared memory segment {name!r} is truncated.")
+        except BaseException:
+            self.close()
+            raise
+        self.capacity = capacity
+        # ``write_count`` is stored after the slot's even ``seq``, so every
+        # sample below it is fully published.
+        (write_count,) = _WRITE_COUNT.unpack_from(self._buf, _WRITE_COUNT_OFFSET)
+        self._next_index = write_count if skip_existing else 0
+        self.skipped_sample_count = self._next_index
+        self.lost_sample_count = 0
+        self.retry_count = 0
+
+    def read_new(self) -> list[TelemetrySample]:
+        (write_count,) = _WRITE_COUNT.unpack_from(self._buf, _WRITE_COUNT_OFFSET)
+        if write_count - self._next_index > self.capacity:
+            self.lost_sample_count += write_count - self._next_index - self.capacity
+            self._next_index = write_count - self.capacity
+        samples: list[TelemetrySample] = []
+        for n in range(self._next_index, write_count):
+            sample = self._read_slot(n)
+            if sample is None:
+                self.lost_sample_count += 1
+            else:
+                samples.append(sample)
+        self._next_index = max(self._next_index, write_count)
+        return samples
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        self._buf.release()
+        self._shm.close()
+        self._shm = None  # type: ignore[assignment]
+
+    def _read_slot(self, n: int) -> TelemetrySample | None:
+        offset = HEADER_SIZE + (n % self.capacity) * SLOT_SIZE
+        expected_seq = 2 * (n // self.capacity + 1)
+        for _ in range(_MAX_READ_RETRIES):
+            (seq_before,) = _SEQ.unpack_from(self._buf, offset)
+            if seq_before > expected_seq:
+                return None  # already overwritten by a newer generation
+            if seq_before != expected_seq:
+                self.retry_count += 1
+                continue
+            values = _PAYLOAD.unpack_from(self._buf, offset + _PAYLOAD_OFFSET)
+            (seq_after,) = _SEQ.unpack_from(self._buf, offset)
+            if seq_after == seq_before:
+                timestamp, gpu_util, mem_util, clock, power, energy, temperature = values
+                return TelemetrySample(
+                    timestamp_unix_s=timestamp,
+                    gpu_util_pct=gpu_util,
+                    mem_util_pct=mem_util,
+                    graphics_clock_mhz=int(round(clock)),
+                    power_w=_present(power),
+                    energy_j=_present(energy),
+                    temperature_c=_present(temperature),
+                )
+            self.retry_count += 1
+        return None
+
+
+class SharedMemoryTelemetryProvider:
+    """Builds windows from the samples published to a shared-memory channel.
+
+    Attaches to segment ``name`` when created, skipping samples already
+    published by a sampler that was running before the loop, or on first use
+    when the sampler starts after the loop (its samples are then all read).
+    Each window drains the new samples into a
+    :class:`StreamingWindowAggregator` and rolls the window.  Raises
+    :class:`LookupError` while the segment does not exist or when no sample
+    arrived during the window.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        energy_counter_wrap_j: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.name = name
+        self._reader: SharedMemoryTelemetryReader | None = None
+        self._aggregator = StreamingWindowAggregator(energy_counter_wrap_j=energy_counter_wrap_j)
+        self._windows = StreamingTelemetryProvider(
+            self._aggregator, clock=clock, require_samples=True
+        )
+        try:
+            self._reader = SharedMemoryTelemetryReader(name)
+        except FileNotFoundError:
+            pass
+
+    def get_window(self, context: ExperimentContext, sequence_id: int) -> MetricWindow:
+        if self._reader is None:
+            try:
+                self._reader = SharedMemoryTelemetryReader(self.name, skip_existing=False)
+            except FileNotFoundError:
+                raise LookupError(
+                    f"telemetry shared memory segment {self.name!r} does not exist yet."
+                ) from None
+        for sample in self._reader.read_new():
+            self._aggregator.append(sample)
+        return self._windows.get_window(context, sequence_id)
+
+    def metrics(self) -> dict[str, object]:
+        reader = self._reader
+        return {
+            "name": self.name,
+            "attached": reader is not None,
+            "skipped_sample_count": reader.skipped_sample_count if reader else 0,
+            "lost_sample_count": reader.lost_sample_count if reader else 0,
+            "retry_count": reader.retry_count if reader else 0,
+        }
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
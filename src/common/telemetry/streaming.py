@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from src.common.experiment.types import ExperimentContext, JSONValue, MetricWindow, TelemetrySample
+
+# Sample fields summarized per window; each gets ``<field>_min``,
+# ``<field>_max``, and ``<field>_std`` entries in ``custom_metrics``.
+_STAT_FIELDS = (
+    "gpu_util_pct",
+    "mem_util_pct",
+    "graphics_clock_mhz",
+    "power_w",
+    "temperature_c",
+)
+
+
+@dataclass(slots=True)
+class RunningStats:
+    """Welford running mean/variance with min and max, updated in O(1)."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float | None:
+        """Population variance, or ``None`` before the first value."""
+        return self.m2 / self.count if self.count else None
+
+    @property
+    def std(self) -> float | None:
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+
+class StreamingWindowAggregator:
+    """Folds :class:`TelemetrySample` values into one window at a time.
+
+    :meth:`append` updates per-field :class:`RunningStats` and the window
+    energy in O(1) without keeping any sample history; :meth:`roll` emits the
+    :class:`MetricWindow` and starts the next window.  Appends and rolls are
+    serialized by a lock, so a :class:`~src.common.telemetry.sampler.TelemetrySampler`
+    can feed the aggregator directly while the control loop rolls windows.
+
+    Energy for the interval between consecutive samples comes from the
+    energy-counter difference when both samples carry a counter, else from
+    trapezoid integration of ``power_w``.  A counter that goes backwards is
+    treated as wraparound when ``energy_counter_wrap_j`` (the counter's
+    modulus) is set, and otherwise as a counter reset whose interval falls
+    back to the trapezoid rule.  The previous sample carries across
+    :meth:`roll`, so the interval spanning a window boundary is counted in
+    the window that receives its closing sample.
+
+    Besides the ``MetricWindow`` means (sample means), ``custom_metrics``
+    carries ``<field>_min``/``_max``/``_std`` for every summarized field that
+    had values, ``temperature_c_avg``, and ``energy_source`` (``counter``,
+    ``trapezoid``, or ``mixed``).
+    """
+
+    def __init__(self, *, energy_counter_wrap_j: float | None = None) -> None:
+        if energy_counter_wrap_j is not None and energy_counter_wrap_j <= 0:
+            raise ValueError("energy_counter_wrap_j must be > 0.")
+        self._wrap_j = energy_counter_wrap_j
+        self._lock = threading.Lock()
+        self._sample_arrived = threading.Event()
+        self._previous: TelemetrySample | None = None
+        self.counter_wrap_count = 0
+        self.counter_reset_count = 0
+        self._reset_window()
+
+    def append(self, sample: TelemetrySample) -> None:
+        with self._lock:
+            stats = self._stats
+            stats["gpu_util_pct"].add(sample.gpu_util_pct)
+            stats["mem_util_pct"].add(sample.mem_util_pct)
+            stats["graphics_clock_mhz"].add(sample.graphics_clock_mhz)
+            if sample.power_w is not None:
+                stats["power_w"].add(sample.power_w)
+            if sample.temperature_c is not None:
+                stats["temperature_c"].add(sample.temperature_c)
+            if self._previous is not None:
+                self._integrate(self._previous, sample)
+            self._previous = sample
+        self._sample_arrived.set()
+
+    def wait_for_sample(self, timeout_s: float) -> bool:
+        """Blocks until the first sample has been appended or *timeout_s* elapses."""
+        return self._sample_arrived.wait(timeout_s)
+
+    def roll(self, start_s: float, end_s: float, sequence_id: int) -> MetricWindow:
+        """Returns the window accumulated since the last roll and starts a new one."""
+        with self._lock:
+            stats = self._stats
+            power = stats["power_w"]
+            power_avg_w = power.mean if power.count else None
+            energy_delta_j = self._energy_j
+            if energy_delta_j is None and power_avg_w is not None:
+                energy_delta_j = power_avg_w * (end_s - start_s)
+
+            custom_metrics: dict[str, JSONValue] = {}
+            for name in _STAT_FIELDS:
+                field_stats = stats[name]
+                if field_stats.count:
+                    custom_metrics[f"{name}_min"] = field_stats.min
+                    custom_metrics[f"{name}_max"] = field_stats.max
+                    custom_metrics[f"{name}_std"] = field_stats.std
+            if stats["temperature_c"].count:
+                custom_metrics["temperature_c_avg"] = stats["temperature_c"].mean
+            if self._energy_sources:
+                custom_metrics["energy_source"] = (
+                    next(iter(self._energy_sources)) if len(self._energy_sources) == 1 else "mixed"
+                )
+
+            window = MetricWindow(
+                sequence_id=sequence_id,
+                start_unix_s=start_s,
+                end_unix_s=end_s,
+                duration_s=end_s - start_s,
+                sample_count=stats["gpu_util_pct"].count,
+                gpu_util_avg_pct=stats["gpu_util_pct"].mean,
+                mem_util_avg_pct=stats["mem_util_pct"].mean,
+                graphics_clock_avg_mhz=stats["graphics_clock_mhz"].mean,
+                power_avg_w=power_avg_w,
+                energy_delta_j=energy_delta_j,
+                custom_metrics=custom_metrics,
+            )
+            self._reset_window()
+            return window
+
+    def _reset_window(self) -> None:
+        self._stats = {name: RunningStats() for name in _STAT_FIELDS}
+        self._energy_j: float | None = None
+        self._energy_sources: set[str] = set()
+
+    def _integrate(self, previous: TelemetrySample, sample: TelemetrySample) -> None:
+        if previous.energy_j is not None and sample.energy_j is not None:
+            delta_j = sample.energy_j - previous.energy_j
+            if delta_j >= 0:
+                self._add_energy(delta_j, "counter")
+                return
+            if self._wrap_j is not None:
+                self.counter_wrap_count += 1
+                self._add_energy(delta_j + self._wrap_j, "counter")
+                return
+            self.counter_reset_count += 1
+        if previous.power_w is not None and sample.power_w is not None:
+            dt_s = sample.timestamp_unix_s - previous.timestamp_unix_s
+            if dt_s > 0:
+                self._add_energy(0.5 * (previous.power_w + sample.power_w) * dt_s, "trapezoid")
+
+    def _add_energy(self, energy_j: float, source: str) -> None:
+        self._energy_j = energy_j if self._energy_j is None else self._energy_j + energy_j
+        self._energy_sources.add(source)
+
+
+class StreamingTelemetryProvider:
+    """Emits one :class:`MetricWindow` per call from a :class:`StreamingWindowAggregator`.
+
+    Each window runs from the previous call's end (or ``window_seconds``
+    before the first call) to ``clock()``, so consecutive windows tile time
+    without gaps even when the loop runs late.
+
+    ``before_window`` is called at the start of every :meth:`get_window`
+    (background sources use it to start their collector lazily).  With
+    ``wait_for_first_sample``, the first window waits up to
+    ``window_seconds`` for the collector's first sample, since the loop builds
+    window 0 right after the collector starts.  With ``require_samples``, a
+    window that received no sample is still rolled but raises
+    :class:`LookupError`, which the control loop records as a window failure.
+    """
+
+    def __init__(
+        self,
+        aggregator: StreamingWindowAggregator,
+        *,
+        clock: Callable[[], float] = time.time,
+        before_window: Callable[[], object] | None = None,
+        require_samples: bool = False,
+        wait_for_first_sample: bool = False,
+    ) -> None:
+        self._aggregator = aggregator
+        self._clock = clock
+        self._before_window = before_window
+        self._require_samples = require_samples
+        self._wait_for_first_sample = wait_for_first_sample
+        self._last_end_s: float | None = None
+
+    def get_window(self, context: ExperimentContext, sequence_id: int) -> MetricWindow:
+        if self._before_window is not None:
+            self._before_window()
+        if self._wait_for_first_sample and self._last_end_s is None:
+            self._aggregator.wait_for_sample(context.window_seconds)
+        end_s = self._clock()
+        start_s = end_s - context.window_seconds if self._last_end_s is None else self._last_end_s
+        self._last_end_s = end_s
+        window = self._aggregator.roll(start_s, end_s, sequence_id)
+        if self._require_samples and window.sample_count == 0:
+            raise LookupError(f"no telemetry samples arrived during window {sequence_id}.")
+        return window
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Mapping
+
+from src.common.experiment.types import TelemetrySample
+
+from .sampler import TelemetrySampler
+from .streaming import StreamingTelemetryProvider, StreamingWindowAggregator
+
+_CARD_NAME = re.compile(r"^card(\d+)$")
+_READ_SIZE = 4096
+
+
+def discover_drm_devices(root: Path = Path("/sys/class/drm")) -> list[Path]:
+    """Returns the ``card<N>/device`` directories of amdgpu GPUs, in card order.
+
+    Cards without ``gpu_busy_percent`` (e.g. a BMC display adapter) are
+    skipped, so list position is the GPU index on typical MI210 nodes.
+    """
+    cards: list[tuple[int, Path]] = []
+    if not root.is_dir():
+        return []
+    for entry in root.iterdir():
+        match = _CARD_NAME.match(entry.name)
+        if match and (entry / "device" / "gpu_busy_percent").is_file():
+            cards.append((int(match.group(1)), entry / "device"))
+    return [path for _, path in sorted(cards)]
+
+
+def _open_optional(path: Path | None) -> int | None:
+    if path is None:
+        return None
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def _find_hwmon_file(device_dir: Path, name: str) -> Path | None:
+    for hwmon_dir in sorted((device_dir / "hwmon").glob("hwmon*")):
+        candidate = hwmon_dir / name
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _current_dpm_mhz(text: str) -> int:
+    """Returns the starred level of a ``pp_dpm_sclk`` table (``1: 800Mhz *``)."""
+    for line in text.splitlines():
+        if line.rstrip().endswith("*"):
+            value = line.split(":", 1)[1].split()[0]
+            return int(value.lower().removesuffix("mhz"))
+    raise ValueError("pp_dpm_sclk has no current level.")
+
+
+class SysfsGpuReader:
+    """Reads one amdgpu GPU's telemetry from sysfs without vendor bindings.
+
+    Files under ``device_dir`` (``/sys/class/drm/card<N>/device``) are opened
+    once and re-read with ``os.pread`` at offset 0 (sysfs regenerates the
+    content on every read from the start), so a sample costs a handful of
+    ``pread`` syscalls and no path lookups:
+
+    1. ``gpu_busy_percent`` (required) and ``mem_busy_percent``.
+    2. Graphics clock from hwmon ``freq1_input`` (Hz) when present, else the
+       starred level of ``pp_dpm_sclk``; one of them is required.
+    3. hwmon ``power1_average`` (or ``power1_input``) in microwatts,
+       ``energy1_input`` in microjoules, and ``temp1_input`` in millidegrees.
+
+    Optional files that are missing, or that fail to read (some report
+    ``ENODATA`` while the GPU is idle), yield ``None``.
+    """
+
+    def __init__(self, device_dir: Path, *, clock: Callable[[], float] = time.time) -> None:
+        self.device_dir = Path(device_dir)
+        self._clock = clock
+        self._fds: list[int] = []
+        try:
+            self._gpu_busy = self._open_required(self.device_dir / "gpu_busy_percent")
+            self._mem_busy = self._track(_open_optional(self.device_dir / "mem_busy_percent"))
+            self._freq = self._track(_open_optional(_find_hwmon_file(self.device_dir, "freq1_input")))
+            self._dpm_sclk = self._track(_open_optional(self.device_dir / "pp_dpm_sclk"))
+            if self._freq is None and self._dpm_sclk is None:
+                raise FileNotFoundError(
+                    f"{self.device_dir} exposes neither hwmon freq1_input nor pp_dpm_sclk."
+                )
+            power_path = _find_hwmon_file(self.device_dir, "power1_average") or _find_hwmon_file(
+                self.device_dir, "power1_input"
+            )
+            self._power = self._track(_open_optional(power_path))
+            self._energy = self._track(_open_optional(_find_hwmon_file(self.device_dir, "energy1_input")))
+            self._temperature = self._track(_open_optional(_find_hwmon_file(self.device_dir, "temp1_input")))
+        except BaseException:
+            self.close()
+            raise
+
+    def read_sample(self) -> TelemetrySample:
+        timestamp_s = self._clock()
+        if self._freq is not None:
+            clock_mhz = round(self._read_int(self._freq) / 1e6)
+        else:
+            assert self._dpm_sclk is not None
+            clock_mhz = _current_dpm_mhz(self._read(self._dpm_sclk))
+        return TelemetrySample(
+            timestamp_unix_s=timestamp_s,
+            gpu_util_pct=float(self._read_int(self._gpu_busy)),
+            mem_util_pct=float(self._read_optional(self._mem_busy, 1.0) or 0.0),
+            graphics_clock_mhz=clock_mhz,
+            power_w=self._read_optional(self._power, 1e-6),
+            energy_j=self._read_optional(self._energy, 1e-6),
+            temperature_c=self._read_optional(self._temperature, 1e-3),
+        )
+
+    def close(self) -> None:
+        fds, self._fds = self._fds, []
+        for fd in fds:
+            os.close(fd)
+
+    def __enter__(self) -> SysfsGpuReader:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def _open_required(self, path: Path) -> int:
+        return self._track(os.open(path, os.O_RDONLY))  # type: ignore[return-value]
+
+    def _track(self, fd: int | None) -> int | None:
+        if fd is not None:
+            self._fds.append(fd)
+        return fd
+
+    @staticmethod
+    def _read(fd: int) -> str:
+        return os.pread(fd, _READ_SIZE, 0).decode("ascii", errors="replace")
+
+    def _read_int(self, fd: int) -> int:
+        return int(self._read(fd).strip())
+
+    def _read_optional(self, fd: int | None, scale: float) -> float | None:
+        if fd is None:
+            return None
+        try:
+            return self._read_int(fd) * scale
+        except (OSError, ValueError):
+            return None
+
+
+class SysfsTelemetrySource:
+    """Samples amdgpu sysfs telemetry in the background for one or more GPUs.
+
+    ``device_dirs`` maps a GPU index (``None`` for a single-GPU run) to its
+    ``card<N>/device`` directory.  Each GPU gets a :class:`SysfsGpuReader`
+    polled every ``interval_s`` by a :class:`TelemetrySampler` thread into a
+    :class:`StreamingWindowAggregator`; :meth:`provider` returns that GPU's
+    window provider.  Samplers start at :meth:`start` or, at the latest, on
+    the first window, which waits for the first sample.
+    """
+
+    def __init__(
+        self,
+        device_dirs: Mapping[int | None, Path],
+        *,
+        interval_s: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not device_dirs:
+            raise ValueError("device_dirs must not be empty.")
+        self._readers: dict[int | None, SysfsGpuReader] = {}
+        self._samplers: dict[int | None, TelemetrySampler] = {}
+        self._providers: dict[int | None, StreamingTelemetryProvider] = {}
+        self._start_lock = threading.Lock()
+        self._started = False
+        try:
+            for index, device_dir in device_dirs.items():
+                reader = self._readers[index] = SysfsGpuReader(device_dir, clock=clock)
+                aggregator = StreamingWindowAggregator()
+                suffix = "" if index is None else f"-gpu{index}"
+                self._samplers[index] = TelemetrySampler(
+                    reader.read_sample,
+                    aggregator,
+                    interval_s=interval_s,
+                    name=f"sysfs-sampler{suffix}",
+                )
+                self._providers[index] = StreamingTelemetryProvider(
+                    aggregator,
+                    clock=clock,
+                    before_window=self.start,
+                    require_samples=True,
+                    wait_for_first_sample=True,
+                )
+        except BaseException:
+            self.stop()
+            raise
+
+    def provider(self, device_index: int | None = None) -> StreamingTelemetryProvider:
+        return self._providers[device_index]
+
+    def start(self) -> SysfsTelemetrySource:
+        with self._start_lock:
+            if not self._started:
+                self._started = True
+                for sampler in self._samplers.values():
+                    sampler.start()
+        return self
+
+    def stop(self) -> None:
+        with self._start_lock:
+            if self._started:
+                for sampler in self._samplers.values():
+                    sampler.stop()
+        for reader in self._readers.values():
+            reader.close()
+
+    def metrics(self) -> dict[str, object]:
+        return {
+            ("gpu" if index is None else f"gpu{index}"): {
+                "device_dir": str(self._readers[index].device_dir),
+                **sampler.metrics(),
+            }
+            for index, sampler in self._samplers.items()
+        }
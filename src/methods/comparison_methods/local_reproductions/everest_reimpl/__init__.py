@@ -2,7 +2,12 @@
 
 from .frequency_scaling import FrequencyScaler
 from .policy import EverestPolicy
-from .phase_characterization import PhaseCharacterizer
+from .phase_characterization import (
+    CharacterizationCache,
+    CharacterizationStore,
+    CharacterizationStoreKey,
+    PhaseCharacterizer,
+)
 from .phase_identification import PhaseIdentifier
 from .types import (
     CharacterizationRecord,
@@ -13,8 +18,11 @@ from .types import (
 )
 
 __all__ = [
+    "CharacterizationCache",
     "CharacterizationRecord",
     "CharacterizationResult",
+    "CharacterizationStore",
+    "CharacterizationStoreKey",
     "EverestPolicy",
     "FrequencyScaler",
     "PhaseCharacterizer",
@@ -0,0 +1,744 @@
+"""Vectorized EVeREST evaluation over many lanes at once.
+
+:class:`EverestBatch` advances N independent EVeREST instances ("lanes") by
+one window per :meth:`EverestBatch.step`.  Each lane has its own context and
+config, for example one trace under many hyperparameter settings, and its
+state lives in struct-of-arrays NumPy columns.  Phase Identification,
+Characterization, and Frequency Scaling are evaluated for all lanes with
+array operations instead of one :meth:`EverestPolicy.on_window` call per
+lane.
+
+Decisions (action, target clock, reason code) and the final summary counters
+are bit-for-bit equal to the scalar :class:`EverestPolicy`.  Lane parameters
+come from :meth:`EverestPolicy.initialize`, and every floating-point
+expression is evaluated in the scalar policy's operation order.  Decision
+``debug_fields`` are not reproduced.
+
+This module needs NumPy, so it is not imported by the package; import it
+explicitly::
+
+    from src.methods.comparison_methods.local_reproductions.everest_reimpl.batch import EverestBatch
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from src.common.experiment import (
+    AlgorithmState,
+    Decision,
+    DecisionAction,
+    ExperimentContext,
+    FinalSummary,
+    MetricWindow,
+    PlatformSpec,
+)
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.frequency_scaling import FrequencyScaler
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.policy import EverestPolicy
+
+# Scalar reason codes; ``*_already_at_target`` variants follow at
+# ``index + len(REASON_CODES)`` in :data:`DECISION_REASON_CODES`.
+REASON_CODES: tuple[str, ...] = (
+    "everest_wait_for_stable_phase",
+    "everest_wait_for_characterizable_phase",
+    "everest_defer_characterization_clock_mismatch",
+    "everest_defer_characterization_phase_drift",
+    "everest_collect_high_frequency",
+    "everest_characterize_low_frequency",
+    "everest_apply_cached_phase",
+    "everest_apply_new_characterization",
+)
+DECISION_REASON_CODES: tuple[str, ...] = REASON_CODES + tuple(
+    f"{reason}_already_at_target" for reason in REASON_CODES
+)
+(
+    _WAIT_STABLE,
+    _WAIT_CHARACTERIZABLE,
+    _DEFER_CLOCK_MISMATCH,
+    _DEFER_PHASE_DRIFT,
+    _COLLECT_HIGH,
+    _CHARACTERIZE_LOW,
+    _APPLY_CACHED,
+    _APPLY_NEW,
+) = range(len(REASON_CODES))
+
+ACTION_HOLD = 0
+ACTION_SET = 1
+ACTION_INACTIVE = -1
+
+_STAGE_NONE = 0
+_STAGE_CAPTURE_HIGH = 1
+_STAGE_CAPTURE_LOW = 2
+
+# Phase keys pack (idle flag, gpu bucket, mem bucket) into one int64, and
+# cache keys add the lane above them, so one sorted array serves all lanes.
+_BUCKET_BITS = 20
+_BUCKET_OFFSET = 1 << (_BUCKET_BITS - 1)
+_LANE_SHIFT = 2 * _BUCKET_BITS + 1
+
+# Config keys for the scalar policy's deployment extensions (cross-run store,
+# bounded cache, neighbor lookup), which the batch engine does not model.
+_UNSUPPORTED_CONFIG_KEYS = (
+    "characterization_store_path",
+    "cache_max_entries",
+    "cache_max_age_windows",
+    "cache_max_age_seconds",
+    "neighbor_radius_pct",
+)
+
+# Running sums: weighted gpu, weighted mem, clamped duration, plain gpu, plain mem.
+_SUM_TERMS = 5
+
+
+@dataclass(slots=True, frozen=True)
+class BatchDecisions:
+    """Per-lane decisions of one :meth:`EverestBatch.step`.
+
+    ``action`` is :data:`ACTION_SET`, :data:`ACTION_HOLD`, or
+    :data:`ACTION_INACTIVE` for lanes masked out of the step.  ``target_mhz``
+    is ``-1`` unless the action is a set.  ``reason`` indexes
+    :data:`DECISION_REASON_CODES`.
+    """
+
+    action: np.ndarray
+    target_mhz: np.ndarray
+    reason: np.ndarray
+
+    def decision(self, lane: int) -> Decision:
+        """The lane's decision as a scalar :class:`Decision` (without debug fields)."""
+        action = int(self.action[lane])
+        if action == ACTION_INACTIVE:
+            raise ValueError(f"lane {lane} was inactive in this step.")
+        reason_code = DECISION_REASON_CODES[int(self.reason[lane])]
+        if action == ACTION_HOLD:
+            return Decision(
+                action=DecisionAction.HOLD_CLOCK,
+                target_graphics_clock_mhz=None,
+                reason_code=reason_code,
+            )
+        return Decision(
+            action=DecisionAction.SET_CLOCK,
+            target_graphics_clock_mhz=int(self.target_mhz[lane]),
+            reason_code=reason_code,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class BatchTraceRun:
+    """Decisions of :func:`evaluate_traces` as ``(window, lane)`` arrays, plus summaries."""
+
+    action: np.ndarray
+    target_mhz: np.ndarray
+    reason: np.ndarray
+    summaries: list[FinalSummary]
+
+
+class EverestBatch:
+    """N EVeREST lanes advanced together; see the module docstring.
+
+    ``lanes`` pairs an :class:`ExperimentContext` with a policy config per
+    lane.  :meth:`step` takes one window per lane as arrays, so the caller
+    may feed recorded traces (:func:`evaluate_traces`) or a vectorized model
+    that responds to the returned clocks.
+    """
+
+    def __init__(self, lanes: Sequence[tuple[ExperimentContext, Mapping[str, object]]]) -> None:
+        if not lanes:
+            raise ValueError("EverestBatch needs at least one lane.")
+        if len(lanes) >= 1 << (63 - _LANE_SHIFT):
+            raise ValueError("too many lanes for the packed cache keys.")
+        for _, config in lanes:
+            unsupported = sorted(key for key in _UNSUPPORTED_CONFIG_KEYS if config.get(key) is not None)
+            if unsupported:
+                raise ValueError(f"EverestBatch does not support {', '.join(unsupported)}.")
+        states = [EverestPolicy().initialize(context, config) for context, config in lanes]
+        self._states = states
+        self.lane_count = len(states)
+
+        def column(key: str, dtype: type) -> np.ndarray:
+            return np.array([state.get(key) for state in states], dtype=dtype)
+
+        self._phase_window_s = column("phase_window_seconds", float)
+        self._threshold = column("change_threshold_pct", float)
+        self._bucket_size = np.maximum(self._threshold, 1.0)
+        self._idle_gpu = column("idle_gpu_threshold_pct", float)
+        self._idle_mem = column("idle_mem_threshold_pct", float)
+        self._f_high = column("f_high_mhz", np.int64)
+        self._f_low = column("f_low_mhz", np.int64)
+        self._f_high_f = self._f_high.astype(float)
+        self._f_low_f = self._f_low.astype(float)
+        self._tolerance = np.maximum(column("clock_match_tolerance_mhz", float), 0.5)
+        self._minimum_ratio = column("minimum_performance_ratio", float)
+        self._pd_used = np.clip(column("relative_performance_loss", float), 0.0, 0.99)
+        self._platform_min = column("platform_min_clock_mhz", np.int64)
+        self._platform_step = column("platform_clock_step_mhz", np.int64)
+        self._min_allowed, self._max_allowed = self._scaler_bounds()
+
+        n = self.lane_count
+        self._stage = np.zeros(n, dtype=np.int8)
+        self._pending_key = np.zeros(n, dtype=np.int64)
+        self._pending_gpu = np.zeros(n)
+        self._pending_mem = np.zeros(n)
+        self._pending_idle = np.zeros(n, dtype=bool)
+        self._pending_mem_high = np.zeros(n)
+
+        self._has_active = np.zeros(n, dtype=bool)
+        self._active_key = np.zeros(n, dtype=np.int64)
+        self._last_gpu = np.zeros(n)
+        self._last_mem = np.zeros(n)
+        self._last_idle = np.zeros(n, dtype=bool)
+
+        # Phase-identification history: one ring buffer row per lane.
+        self._capacity = 4
+        self._hist_gpu = np.zeros((n, self._capacity))
+        self._hist_mem = np.zeros((n, self._capacity))
+        self._hist_dur = np.zeros((n, self._capacity))
+        self._hist_start = np.zeros(n, dtype=np.int64)
+        self._hist_len = np.zeros(n, dtype=np.int64)
+        self._hist_duration_s = np.zeros(n)
+        # Running compensated sums, one row per term (see _SUM_TERMS), updated
+        # in the same push/evict order as PhaseIdentifier's _CompensatedSum.
+        self._sum_total = np.zeros((_SUM_TERMS, n))
+        self._sum_compensation = np.zeros((_SUM_TERMS, n))
+        self._non_finite_count = np.zeros(n, dtype=np.int64)
+
+        self._cache_keys = np.zeros(0, dtype=np.int64)
+        self._cache_fs = np.zeros(0)
+
+        self._counters = {
+            name: np.zeros(n, dtype=np.int64)
+            for name in (
+                "total_windows",
+                "stable_window_count",
+                "unstable_window_count",
+                "phase_change_count",
+                "characterization_count",
+                "cache_hit_count",
+                "cache_miss_count",
+                "scaled_decision_count",
+                "reset_to_high_count",
+                "pd_violation_count",
+            )
+        }
+        self._max_pd_violation = np.zeros(n)
+        self._lanes = np.arange(n, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Step
+    # ------------------------------------------------------------------
+
+    def step(
+        self,
+        gpu_util_pct: np.ndarray,
+        mem_util_pct: np.ndarray,
+        graphics_clock_mhz: np.ndarray,
+        duration_s: np.ndarray,
+        performance_ratio: np.ndarray | None = None,
+        active: np.ndarray | None = None,
+    ) -> BatchDecisions:
+        """Feeds one window to every active lane and returns the decisions.
+
+        ``performance_ratio`` is NaN where a window carries none.  Lanes with
+        ``active`` false keep their state unchanged.
+        """
+        n = self.lane_count
+        gpu = np.asarray(gpu_util_pct, dtype=float)
+        mem = np.asarray(mem_util_pct, dtype=float)
+        clock = np.asarray(graphics_clock_mhz, dtype=float)
+        duration = np.asarray(duration_s, dtype=float)
+        active = np.ones(n, dtype=bool) if active is None else np.asarray(active, dtype=bool)
+
+        counters = self._counters
+        counters["total_windows"] += active
+        if performance_ratio is not None:
+            self._update_pd_violation(np.asarray(performance_ratio, dtype=float), active)
+
+        # Each lane requests either "high" (hold or reset to f_high) or "set"
+        # (hold if already at target, else set), with a base reason code.
+        wants_high = np.zeros(n, dtype=bool)
+        wants_set = np.zeros(n, dtype=bool)
+        set_target = np.zeros(n, dtype=np.int64)
+        reason = np.zeros(n, dtype=np.int64)
+        window_idle = (gpu <= self._idle_gpu) & (mem <= self._idle_mem)
+
+        def request_high(mask: np.ndarray, code: int) -> None:
+            wants_high[mask] = True
+            reason[mask] = code
+
+        def request_set(mask: np.ndarray, target: np.ndarray, code: int) -> None:
+            wants_set[mask] = True
+            set_target[mask] = target[mask]
+            reason[mask] = code
+
+        at_high = self._same_clock(clock, self._f_high_f)
+        at_low = self._same_clock(clock, self._f_low_f)
+        # Written as ``~(... >= threshold)`` like the scalar check, so NaN matches.
+        gpu_matches = ~(np.abs(gpu - self._pending_gpu) >= self._threshold)
+
+        # Pending high-frequency capture.
+        capture_high = active & (self._stage == _STAGE_CAPTURE_HIGH)
+        mismatch = capture_high & ~at_high
+        drift = (
+            capture_high
+            & ~mismatch
+            & ~(
+                gpu_matches
+                & ~(np.abs(mem - self._pending_mem) >= self._threshold)
+                & (window_idle == self._pending_idle)
+            )
+        )
+        no_mem = capture_high & ~mismatch & ~drift & (mem <= 0)
+        to_low = capture_high & ~mismatch & ~drift & ~no_mem
+        request_high(mismatch, _DEFER_CLOCK_MISMATCH)
+        request_high(drift, _DEFER_PHASE_DRIFT)
+        request_high(no_mem, _WAIT_CHARACTERIZABLE)
+        self._stage[capture_high & ~to_low] = _STAGE_NONE
+
+        # Pending low-frequency probe.
+        capture_low = active & (self._stage == _STAGE_CAPTURE_LOW)
+        self._stage[capture_low] = _STAGE_NONE
+        mismatch = capture_low & ~at_low
+        drift = capture_low & ~mismatch & ~gpu_matches
+        no_mem = capture_low & ~mismatch & ~drift & ((self._pending_mem_high <= 0) | (mem <= 0))
+        characterized = capture_low & ~mismatch & ~drift & ~no_mem
+        request_high(mismatch, _DEFER_CLOCK_MISMATCH)
+        request_high(drift, _DEFER_PHASE_DRIFT)
+        request_high(no_mem, _WAIT_CHARACTERIZABLE)
+        fs = np.zeros(n)
+        if characterized.any():
+            fs[characterized] = self._estimate_fs(self._pending_mem_high, mem, characterized)
+            self._store(self._pending_key[characterized] | (self._lanes[characterized] << _LANE_SHIFT), fs[characterized])
+            counters["characterization_count"] += characterized
+
+        # Lanes whose high capture succeeded move on to the low probe.
+        self._start_low_probe(to_low, mem_high=mem, gpu=gpu, mem=mem, idle=window_idle)
+        request_set(to_low, self._f_low, _CHARACTERIZE_LOW)
+
+        # No characterization pending: Phase Identification.
+        observe = active & (self._stage == _STAGE_NONE) & ~capture_high & ~capture_low
+        stable, avg_gpu, avg_mem, avg_idle = self._observe(observe, gpu, mem, duration)
+        unstable = observe & ~stable
+        counters["unstable_window_count"] += unstable
+        request_high(unstable, _WAIT_STABLE)
+        counters["stable_window_count"] += stable
+
+        hit, cached_fs = self._lookup(self._active_key | (self._lanes << _LANE_SHIFT), stable)
+        counters["cache_hit_count"] += hit
+        fs[hit] = cached_fs[hit]
+        miss = stable & ~hit
+        counters["cache_miss_count"] += miss
+        uncharacterizable = miss & ((self._f_low >= self._f_high) | (avg_mem <= 0))
+        request_high(uncharacterizable, _WAIT_CHARACTERIZABLE)
+        characterize = miss & ~uncharacterizable
+        collect_high = characterize & ~at_high
+        probe_low = characterize & at_high
+        self._pending_key[characterize] = self._active_key[characterize]
+        self._stage[collect_high] = _STAGE_CAPTURE_HIGH
+        self._pending_gpu[collect_high] = avg_gpu[collect_high]
+        self._pending_mem[collect_high] = avg_mem[collect_high]
+        self._pending_idle[collect_high] = avg_idle[collect_high]
+        request_set(collect_high, self._f_high, _COLLECT_HIGH)
+        self._start_low_probe(probe_low, mem_high=avg_mem, gpu=avg_gpu, mem=avg_mem, idle=avg_idle)
+        request_set(probe_low, self._f_low, _CHARACTERIZE_LOW)
+
+        scaled = characterized | hit
+        if scaled.any():
+            counters["scaled_decision_count"] += scaled
+            scaled_targets = self._scaled_targets(fs)
+            request_set(characterized, scaled_targets, _APPLY_NEW)
+            request_set(hit, scaled_targets, _APPLY_CACHED)
+
+        # Resolve requests into hold / set actions.
+        action = np.full(n, ACTION_INACTIVE, dtype=np.int8)
+        target_mhz = np.full(n, -1, dtype=np.int64)
+        high_set = wants_high & ~at_high
+        counters["reset_to_high_count"] += high_set
+        action[wants_high] = np.where(high_set, ACTION_SET, ACTION_HOLD)[wants_high]
+        target_mhz[high_set] = self._f_high[high_set]
+        already = wants_set & self._same_clock(clock, set_target.astype(float))
+        moves = wants_set & ~already
+        action[wants_set] = np.where(moves, ACTION_SET, ACTION_HOLD)[wants_set]
+        target_mhz[moves] = set_target[moves]
+        reason[already] += len(REASON_CODES)
+        reason[~active] = 0
+        return BatchDecisions(action=action, target_mhz=target_mhz, reason=reason)
+
+    # ------------------------------------------------------------------
+    # Summaries
+    # ------------------------------------------------------------------
+
+    def characterized_phase_counts(self) -> np.ndarray:
+        return np.bincount(self._cache_keys >> _LANE_SHIFT, minlength=self.lane_count)
+
+    def summaries(self) -> list[FinalSummary]:
+        """Per-lane :class:`FinalSummary`, equal to the scalar policy's ``finalize()``."""
+        phase_counts = self.characterized_phase_counts()
+        counters = self._counters
+        summaries = []
+        for lane, state in enumerate(self._states):
+            summaries.append(
+                FinalSummary(
+                    policy_name=EverestPolicy.policy_name,
+                    run_id=str(state.get("run_id")),
+                    total_windows=int(counters["total_windows"][lane]),
+                    pd_target=float(state.get("pd_target", 0.0)),
+                    pd_violation_count=int(counters["pd_violation_count"][lane]),
+                    max_pd_violation=float(self._max_pd_violation[lane]),
+                    custom_summary={
+                        "characterized_phase_count": int(phase_counts[lane]),
+                        **{
+                            name: int(counters[name][lane])
+                            for name in (
+                                "stable_window_count",
+                                "unstable_window_count",
+                                "phase_change_count",
+                                "characterization_count",
+                                "cache_hit_count",
+                                "cache_miss_count",
+                                "scaled_decision_count",
+                                "reset_to_high_count",
+                            )
+                        },
+                        "performance_target_type": str(state.get("performance_target_type", "")),
+                        "relative_performance_loss": float(state.get("relative_performance_loss", 0.0)),
+                        "minimum_performance_ratio": float(state.get("minimum_performance_ratio", 1.0)),
+                        "f_high_mhz": int(state.get("f_high_mhz", 0)),
+                        "f_low_mhz": int(state.get("f_low_mhz", 0)),
+                    },
+                )
+            )
+        return summaries
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _scaler_bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        scaler = FrequencyScaler()
+        bounds = []
+        for state in self._states:
+            output = scaler.compute_target_frequency(
+                freq_high_mhz=int(state.get("f_high_mhz")),
+                fs=1.0,
+                pd=0.0,
+                platform=_platform(state),
+                min_ratio_of_max=float(state.get("min_ratio_of_max", 0.55)),
+                min_frequency_mhz=int(state.get("min_frequency_mhz")),
+            )
+            bounds.append((output.min_allowed_mhz, output.max_allowed_mhz))
+        array = np.array(bounds, dtype=np.int64)
+        return array[:, 0], array[:, 1]
+
+    def _same_clock(self, observed_mhz: np.ndarray, target_mhz: np.ndarray) -> np.ndarray:
+        return np.abs(observed_mhz - target_mhz) <= self._tolerance
+
+    def _update_pd_violation(self, performance_ratio: np.ndarray, active: np.ndarray) -> None:
+        present = active & ~np.isnan(performance_ratio)
+        violation = np.maximum(0.0, self._minimum_ratio - np.where(present, performance_ratio, 0.0))
+        violated = present & (violation > 0)
+        self._counters["pd_violation_count"] += violated
+        self._max_pd_violation[violated] = np.maximum(
+            self._max_pd_violation[violated], violation[violated]
+        )
+
+    def _start_low_probe(
+        self,
+        mask: np.ndarray,
+        *,
+        mem_high: np.ndarray,
+        gpu: np.ndarray,
+        mem: np.ndarray,
+        idle: np.ndarray,
+    ) -> None:
+        self._stage[mask] = _STAGE_CAPTURE_LOW
+        self._pending_mem_high[mask] = mem_high[mask]
+        self._pending_gpu[mask] = gpu[mask]
+        self._pending_mem[mask] = mem[mask]
+        self._pending_idle[mask] = idle[mask]
+
+    def _estimate_fs(self, mem_high: np.ndarray, mem_low: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        mem_ratio = mem_high[mask] / mem_low[mask]
+        freq_ratio = self._f_high_f[mask] / self._f_low_f[mask]
+        return np.clip((mem_ratio - 1.0) / (freq_ratio - 1.0), 0.0, 1.0)
+
+    def _scaled_targets(self, fs: np.ndarray) -> np.ndarray:
+        """Vectorized :meth:`FrequencyScaler.compute_target_frequency`."""
+        fs_used = np.clip(fs, 0.0, 1.0)
+        pd_used = self._pd_used
+        with np.errstate(divide="ignore", invalid="ignore"):
+            equation = self._f_high_f / (1.0 + pd_used / (fs_used * (1.0 - pd_used)))
+        raw = np.where(
+            fs_used <= 1e-8,
+            self._min_allowed.astype(float),
+            np.where(pd_used == 0.0, self._f_high_f, equation),
+        )
+        clamped = np.maximum(self._min_allowed, np.minimum(raw, self._max_allowed))
+        target = self._quantize_up(clamped)
+        return np.where(
+            target < self._min_allowed,
+            self._quantize_up(self._min_allowed.astype(float)),
+            target,
+        )
+
+    def _quantize_up(self, value_mhz: np.ndarray) -> np.ndarray:
+        low, high, step = self._platform_min, self._max_allowed, self._platform_step
+        up = low + np.ceil((value_mhz - low) / step).astype(np.int64) * step
+        down = np.maximum(low, low + ((high - low) // step) * step)
+        return np.where(high < low, low, np.where(up <= high, up, down))
+
+    def _observe(
+        self,
+        mask: np.ndarray,
+        gpu: np.ndarray,
+        mem: np.ndarray,
+        duration: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized :meth:`PhaseIdentifier.observe` for the lanes in *mask*."""
+        self._push(mask, gpu, mem, duration)
+        avg_gpu, avg_mem, gpu_span, mem_span = self._history_statistics(mask)
+        idle = (avg_gpu <= self._idle_gpu) & (avg_mem <= self._idle_mem)
+        stable = (
+            mask
+            & ~(self._hist_duration_s < self._phase_window_s)
+            & (gpu_span < self._threshold)
+            & (mem_span < self._threshold)
+        )
+        if not stable.any():
+            return stable, avg_gpu, avg_mem, idle
+
+        with np.errstate(invalid="ignore"):
+            gpu_bucket = np.floor_divide(avg_gpu, self._bucket_size).astype(np.int64)
+            mem_bucket = np.floor_divide(avg_mem, self._bucket_size).astype(np.int64)
+        key = (
+            (idle.astype(np.int64) << (2 * _BUCKET_BITS))
+            | ((gpu_bucket + _BUCKET_OFFSET) << _BUCKET_BITS)
+            | (mem_bucket + _BUCKET_OFFSET)
+        )
+        changed = (
+            (idle != self._last_idle)
+            | (np.abs(avg_gpu - self._last_gpu) >= self._threshold)
+            | (np.abs(avg_mem - self._last_mem) >= self._threshold)
+        )
+        new_phase = stable & (~self._has_active | changed)
+        self._counters["phase_change_count"] += new_phase
+        self._has_active |= new_phase
+        self._active_key[new_phase] = key[new_phase]
+        self._last_gpu[new_phase] = avg_gpu[new_phase]
+        self._last_mem[new_phase] = avg_mem[new_phase]
+        self._last_idle[new_phase] = idle[new_phase]
+        return stable, avg_gpu, avg_mem, idle
+
+    def _push(self, mask: np.ndarray, gpu: np.ndarray, mem: np.ndarray, duration: np.ndarray) -> None:
+        if not mask.any():
+            return
+        if int(self._hist_len[mask].max()) >= self._capacity:
+            self._grow()
+        lanes = self._lanes[mask]
+        slot = (self._hist_start[mask] + self._hist_len[mask]) % self._capacity
+        self._hist_gpu[lanes, slot] = gpu[mask]
+        self._hist_mem[lanes, slot] = mem[mask]
+        self._hist_dur[lanes, slot] = duration[mask]
+        self._hist_len[mask] += 1
+        self._hist_duration_s[mask] += duration[mask]
+        self._accumulate(mask, gpu, mem, duration, sign=1.0)
+
+        evict = mask & (self._hist_duration_s > self._phase_window_s) & (self._hist_len > 1)
+        while evict.any():
+            oldest = self._hist_start
+            self._hist_duration_s[evict] -= self._hist_dur[self._lanes, oldest][evict]
+            self._accumulate(
+                evict,
+                self._hist_gpu[self._lanes, oldest],
+                self._hist_mem[self._lanes, oldest],
+                self._hist_dur[self._lanes, oldest],
+                sign=-1.0,
+            )
+            self._hist_start[evict] = (self._hist_start[evict] + 1) % self._capacity
+            self._hist_len[evict] -= 1
+            evict &= (self._hist_duration_s > self._phase_window_s) & (self._hist_len > 1)
+
+    def _accumulate(
+        self,
+        mask: np.ndarray,
+        gpu: np.ndarray,
+        mem: np.ndarray,
+        duration: np.ndarray,
+        *,
+        sign: float,
+    ) -> None:
+        """Vectorized ``PhaseIdentifier._add_statistics`` (Neumaier update per term)."""
+        clamped = np.maximum(duration, 0.0)
+        with np.errstate(over="ignore", invalid="ignore"):
+            terms = np.stack([gpu * clamped, mem * clamped, clamped, gpu, mem])
+        finite = np.isfinite(terms).all(axis=0)
+        self._non_finite_count[mask & ~finite] += 1 if sign > 0 else -1
+        update = mask & finite
+        value = sign * np.where(update, terms, 0.0)
+        total = self._sum_total
+        new_total = total + value
+        compensation = np.where(
+            np.abs(total) >= np.abs(value),
+            (total - new_total) + value,
+            (value - new_total) + total,
+        )
+        self._sum_compensation = np.where(update, self._sum_compensation + compensation, self._sum_compensation)
+        self._sum_total = np.where(update, new_total, total)
+
+    def _grow(self) -> None:
+        capacity = self._capacity * 2
+        order = (self._hist_start[:, None] + np.arange(self._capacity)) % self._capacity
+        for name in ("_hist_gpu", "_hist_mem", "_hist_dur"):
+            grown = np.zeros((self.lane_count, capacity))
+            grown[:, : self._capacity] = np.take_along_axis(getattr(self, name), order, axis=1)
+            setattr(self, name, grown)
+        self._hist_start[:] = 0
+        self._capacity = capacity
+
+    def _history_statistics(
+        self,
+        mask: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Duration-weighted averages from the running sums, and value spans over the history."""
+        offsets = (np.arange(self._capacity) - self._hist_start[:, None]) % self._capacity
+        present = mask[:, None] & (offsets < self._hist_len[:, None])
+        # Infinite samples give inf - inf = NaN spans, as in the scalar identifier.
+        with np.errstate(invalid="ignore"):
+            gpu_span = np.max(np.where(present, self._hist_gpu, -np.inf), axis=1) - np.min(
+                np.where(present, self._hist_gpu, np.inf), axis=1
+            )
+            mem_span = np.max(np.where(present, self._hist_mem, -np.inf), axis=1) - np.min(
+                np.where(present, self._hist_mem, np.inf), axis=1
+            )
+
+        weighted_gpu, weighted_mem, duration_sum, plain_gpu, plain_mem = self._sum_total + self._sum_compensation
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zero = duration_sum == 0
+            count = np.maximum(self._hist_len, 1).astype(float)
+            avg_gpu = np.where(zero, plain_gpu / count, weighted_gpu / duration_sum)
+            avg_mem = np.where(zero, plain_mem / count, weighted_mem / duration_sum)
+        recompute = mask & (self._non_finite_count > 0)
+        if recompute.any():
+            avg_gpu[recompute], avg_mem[recompute] = self._recomputed_averages(recompute)
+        return avg_gpu, avg_mem, gpu_span, mem_span
+
+    def _recomputed_averages(self, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Oldest-first full sums, as the scalar identifier uses while non-finite values are held."""
+        lanes = self._lanes[mask]
+        length = self._hist_len[mask]
+        weighted_gpu = np.zeros(lanes.size)
+        weighted_mem = np.zeros(lanes.size)
+        duration_sum = np.zeros(lanes.size)
+        plain_gpu = np.zeros(lanes.size)
+        plain_mem = np.zeros(lanes.size)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            for offset in range(int(length.max())):
+                present = offset < length
+                slot = (self._hist_start[mask] + offset) % self._capacity
+                gpu = self._hist_gpu[lanes, slot]
+                mem = self._hist_mem[lanes, slot]
+                duration = np.maximum(self._hist_dur[lanes, slot], 0.0)
+                weighted_gpu = np.where(present, weighted_gpu + gpu * duration, weighted_gpu)
+                weighted_mem = np.where(present, weighted_mem + mem * duration, weighted_mem)
+                duration_sum = np.where(present, duration_sum + duration, duration_sum)
+                plain_gpu = np.where(present, plain_gpu + gpu, plain_gpu)
+                plain_mem = np.where(present, plain_mem + mem, plain_mem)
+            zero = duration_sum == 0
+            count = length.astype(float)
+            return (
+                np.where(zero, plain_gpu / count, weighted_gpu / duration_sum),
+                np.where(zero, plain_mem / count, weighted_mem / duration_sum),
+            )
+
+    def _lookup(self, keys: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        n = self.lane_count
+        if self._cache_keys.size == 0 or not mask.any():
+            return np.zeros(n, dtype=bool), np.zeros(n)
+        index = np.searchsorted(self._cache_keys, keys)
+        index = np.minimum(index, self._cache_keys.size - 1)
+        hit = mask & (self._cache_keys[index] == keys)
+        return hit, self._cache_fs[index]
+
+    def _store(self, keys: np.ndarray, fs: np.ndarray) -> None:
+        merged_keys = np.concatenate([self._cache_keys, keys])
+        merged_fs = np.concatenate([self._cache_fs, fs])
+        order = np.argsort(merged_keys, kind="stable")
+        merged_keys, merged_fs = merged_keys[order], merged_fs[order]
+        # Keep the newest record for a repeated key, as the scalar upsert does.
+        last = np.append(merged_keys[1:] != merged_keys[:-1], True)
+        self._cache_keys, self._cache_fs = merged_keys[last], merged_fs[last]
+
+
+def evaluate_traces(
+    lanes: Sequence[tuple[ExperimentContext, Mapping[str, object]]],
+    traces: Sequence[Sequence[MetricWindow]],
+) -> BatchTraceRun:
+    """Runs lane ``i`` over the recorded windows ``traces[i]`` (open loop).
+
+    Traces may differ in length; a lane is inactive once its trace ends.
+    """
+    if len(lanes) != len(traces):
+        raise ValueError("evaluate_traces needs one trace per lane.")
+    batch = EverestBatch(lanes)
+    columns = _trace_columns(traces)
+    steps = columns["gpu"].shape[0]
+    action = np.empty((steps, batch.lane_count), dtype=np.int8)
+    target_mhz = np.empty((steps, batch.lane_count), dtype=np.int64)
+    reason = np.empty((steps, batch.lane_count), dtype=np.int64)
+    for index in range(steps):
+        decisions = batch.step(
+            columns["gpu"][index],
+            columns["mem"][index],
+            columns["clock"][index],
+            columns["duration"][index],
+            performance_ratio=columns["performance_ratio"][index],
+            active=columns["active"][index],
+        )
+        action[index], target_mhz[index], reason[index] = (
+            decisions.action,
+            decisions.target_mhz,
+            decisions.reason,
+        )
+    return BatchTraceRun(action=action, target_mhz=target_mhz, reason=reason, summaries=batch.summaries())
+
+
+def _trace_columns(traces: Sequence[Sequence[MetricWindow]]) -> dict[str, np.ndarray]:
+    steps = max((len(trace) for trace in traces), default=0)
+    shape = (steps, len(traces))
+    columns = {
+        "gpu": np.zeros(shape),
+        "mem": np.zeros(shape),
+        "clock": np.zeros(shape),
+        "duration": np.zeros(shape),
+        "performance_ratio": np.full(shape, np.nan),
+        "active": np.zeros(shape, dtype=bool),
+    }
+    for lane, trace in enumerate(traces):
+        length = len(trace)
+        columns["gpu"][:length, lane] = [window.gpu_util_avg_pct for window in trace]
+        columns["mem"][:length, lane] = [window.mem_util_avg_pct for window in trace]
+        columns["clock"][:length, lane] = [window.graphics_clock_avg_mhz for window in trace]
+        columns["duration"][:length, lane] = [window.duration_s for window in trace]
+        columns["performance_ratio"][:length, lane] = [_performance_ratio(window) for window in trace]
+        columns["active"][:length, lane] = True
+    return columns
+
+
+def _performance_ratio(window: MetricWindow) -> float:
+    for key in ("performance_ratio", "relative_performance", "perf_ratio_to_max"):
+        value = window.custom_metrics.get(key)
+        if isinstance(value, (int, float)):
+            return float(value)
+    return float("nan")
+
+
+def _platform(state: AlgorithmState) -> PlatformSpec:
+    return PlatformSpec(
+        vendor=str(state.get("platform_vendor", "unknown")),
+        gpu_model=str(state.get("platform_gpu_model", "unknown")),
+        gpu_count=int(state.get("platform_gpu_count", 1)),
+        min_graphics_clock_mhz=int(state.get("platform_min_clock_mhz", 0)),
+        max_graphics_clock_mhz=int(state.get("platform_max_clock_mhz", state.get("f_high_mhz", 0))),
+        graphics_clock_step_mhz=int(state.get("platform_clock_step_mhz", 1)),
+    )
@@ -1,3 +1,13 @@
+from .characterization_cache import CharacterizationCache
+from .characterization_store import CharacterizationStore, CharacterizationStoreKey
+from .neighbor_lookup import NeighborEstimate, estimate_from_neighbors
 from .phase_characterizer import PhaseCharacterizer
 
-__all__ = ["PhaseCharacterizer"]
+__all__ = [
+    "CharacterizationCache",
+    "CharacterizationStore",
+    "CharacterizationStoreKey",
+    "NeighborEstimate",
+    "PhaseCharacterizer",
+    "estimate_from_neighbors",
+]
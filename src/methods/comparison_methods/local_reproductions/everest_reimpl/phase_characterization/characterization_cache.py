@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    record: CharacterizationRecord
+    confidence: int
+    stored_window_index: int | None
+    stored_unix_s: float | None
+
+
+class CharacterizationCache:
+    """Phase-id keyed FS cache with optional LRU bound, aging, and blending.
+
+    With no limits configured this is a plain dict, which is the EVeREST paper
+    behavior.  ``max_entries`` evicts the least recently used phase.  A record
+    older than ``max_age_windows`` windows or ``max_age_seconds`` seconds is
+    stale: lookups miss, so the policy re-probes the phase.  The new estimate
+    is blended with the stale one, weighting the old FS by its confidence (the
+    number of characterizations merged into it) capped at ``blend_history``.
+    ``blend_history=0`` replaces the old FS.  A record stored without a window
+    index or time (one loaded before the run) ages from its first use.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        max_age_windows: int | None = None,
+        max_age_seconds: float | None = None,
+        blend_history: int = 0,
+    ) -> None:
+        for name, value in (
+            ("max_entries", max_entries),
+            ("max_age_windows", max_age_windows),
+            ("max_age_seconds", max_age_seconds),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0.")
+        if blend_history < 0:
+            raise ValueError("blend_history must be >= 0.")
+
+        self.max_entries = max_entries
+        self.max_age_windows = max_age_windows
+        self.max_age_seconds = max_age_seconds
+        self.blend_history = blend_history
+        self.eviction_count = 0
+        self.reprobe_count = 0
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._evicted_phase_ids: list[str] = []
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_entries is not None or self.max_age_windows is not None or self.max_age_seconds is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        phase_id: str,
+        *,
+        window_index: int = 0,
+        now_unix_s: float | None = None,
+        touch: bool = True,
+    ) -> CharacterizationRecord | None:
+        """Returns the fresh record for *phase_id*, marking it recently used; stale records miss.
+
+        ``touch=False`` only checks freshness: the LRU order is kept and a
+        record loaded before the run does not start aging.
+        """
+        entry = self._entries.get(phase_id)
+        if entry is None:
+            return None
+        if touch:
+            # Records loaded before the run started age from their first use.
+            if entry.stored_window_index is None:
+                entry.stored_window_index = window_index
+            if entry.stored_unix_s is None:
+                entry.stored_unix_s = now_unix_s
+        if self._is_stale(entry, window_index, now_unix_s):
+            return None
+        if touch:
+            self._entries.move_to_end(phase_id)
+        return entry.record
+
+    def peek(self, phase_id: str) -> CharacterizationRecord | None:
+        """Returns the record for *phase_id* without aging or LRU bookkeeping."""
+        entry = self._entries.get(phase_id)
+        return None if entry is None else entry.record
+
+    def confidence(self, phase_id: str) -> int:
+        entry = self._entries.get(phase_id)
+        return 0 if entry is None else entry.confidence
+
+    def put(
+        self,
+        record: CharacterizationRecord,
+        *,
+        window_index: int | None = None,
+        now_unix_s: float | None = None,
+    ) -> CharacterizationRecord:
+        """Stores *record*, blending it with an existing entry; returns the stored record."""
+        confidence = 1
+        existing = self._entries.pop(record.phase_id, None)
+        if existing is not None:
+            if self._is_stale(existing, window_index, now_unix_s):
+                self.reprobe_count += 1
+            weight = min(existing.confidence, self.blend_history)
+            if weight:
+                record = replace(record, fs=(weight * existing.record.fs + record.fs) / (weight + 1))
+            confidence = existing.confidence + 1
+
+        self._entries[record.phase_id] = _CacheEntry(
+            record=record,
+            confidence=confidence,
+            stored_window_index=window_index,
+            stored_unix_s=now_unix_s,
+        )
+        while self.max_entries is not None and len(self._entries) > self.max_entries:
+            evicted_phase_id, _ = self._entries.popitem(last=False)
+            self._evicted_phase_ids.append(evicted_phase_id)
+            self.eviction_count += 1
+        return record
+
+    def pop_evicted(self) -> list[str]:
+        """Returns and clears the phase ids evicted since the previous call."""
+        evicted, self._evicted_phase_ids = self._evicted_phase_ids, []
+        return evicted
+
+    def _is_stale(self, entry: _CacheEntry, window_index: int | None, now_unix_s: float | None) -> bool:
+        if (
+            self.max_age_windows is not None
+            and window_index is not None
+            and entry.stored_window_index is not None
+            and window_index - entry.stored_window_index > self.max_age_windows
+        ):
+            return True
+        return (
+            self.max_age_seconds is not None
+            and now_unix_s is not None
+            and entry.stored_unix_s is not None
+            and now_unix_s - entry.stored_unix_s > self.max_age_seconds
+        )
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord
+
+
+STORE_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS characterizations (
+    workload TEXT NOT NULL,
+    gpu_model TEXT NOT NULL,
+    driver_version TEXT NOT NULL,
+    f_high_mhz INTEGER NOT NULL,
+    f_low_mhz INTEGER NOT NULL,
+    phase_bucket_pct REAL NOT NULL,
+    phase_id TEXT NOT NULL,
+    fs REAL NOT NULL,
+    mem_high REAL NOT NULL,
+    mem_low REAL NOT NULL,
+    run_id TEXT NOT NULL,
+    updated_at_utc TEXT NOT NULL,
+    PRIMARY KEY (workload, gpu_model, driver_version, f_high_mhz, f_low_mhz, phase_bucket_pct, phase_id)
+)
+"""
+
+_KEY_COLUMNS = "workload = ? AND gpu_model = ? AND driver_version = ? AND f_high_mhz = ? AND f_low_mhz = ? AND phase_bucket_pct = ?"
+
+
+@dataclass(slots=True, frozen=True)
+class CharacterizationStoreKey:
+    """Identifies the runs whose phase characterizations are interchangeable.
+
+    ``phase_bucket_pct`` is the Phase Identification bucket size; phase ids
+    built with different bucket sizes name different utilization ranges.
+    """
+
+    workload: str
+    gpu_model: str
+    driver_version: str
+    f_high_mhz: int
+    f_low_mhz: int
+    phase_bucket_pct: float
+
+    def as_params(self) -> tuple[str, str, str, int, int, float]:
+        return (
+            self.workload,
+            self.gpu_model,
+            self.driver_version,
+            self.f_high_mhz,
+            self.f_low_mhz,
+            self.phase_bucket_pct,
+        )
+
+
+class CharacterizationStore:
+    """SQLite-backed cross-run cache of EVeREST phase characterizations.
+
+    Each :meth:`load` and :meth:`save` opens its own short-lived connection, so
+    concurrent jobs sharing one store only contend while a save commits.  A
+    save writes all of its records in one transaction.  The default rollback
+    journal is kept (no WAL) because stores commonly live on shared network
+    filesystems.
+    """
+
+    def __init__(self, path: str | Path, *, timeout_s: float = 30.0) -> None:
+        self.path = Path(path)
+        self.timeout_s = timeout_s
+
+    def load(self, key: CharacterizationStoreKey) -> dict[str, CharacterizationRecord]:
+        """Returns the stored records for *key* by phase id (empty when the store is absent)."""
+        if not self.path.exists():
+            return {}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT phase_id, fs, mem_high, mem_low FROM characterizations WHERE {_KEY_COLUMNS}",
+                key.as_params(),
+            ).fetchall()
+        return {
+            str(phase_id): CharacterizationRecord(
+                phase_id=str(phase_id),
+                fs=float(fs),
+                mem_high=float(mem_high),
+                mem_low=float(mem_low),
+                freq_high_mhz=key.f_high_mhz,
+                freq_low_mhz=key.f_low_mhz,
+            )
+            for phase_id, fs, mem_high, mem_low in rows
+        }
+
+    def save(
+        self,
+        key: CharacterizationStoreKey,
+        records: Iterable[CharacterizationRecord],
+        *,
+        run_id: str,
+    ) -> int:
+        """Upserts *records* under *key* atomically; returns the number written."""
+        updated_at_utc = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        rows = [
+            (*key.as_params(), record.phase_id, record.fs, record.mem_high, record.mem_low, run_id, updated_at_utc)
+            for record in records
+        ]
+        if not rows:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO characterizations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (workload, gpu_model, driver_version, f_high_mhz, f_low_mhz, phase_bucket_pct, phase_id) "
+                "DO UPDATE SET fs = excluded.fs, mem_high = excluded.mem_high, mem_low = excluded.mem_low, "
+                "run_id = excluded.run_id, updated_at_utc = excluded.updated_at_utc",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return len(rows)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout_s, isolation_level=None)
+        version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+        if version == 0:
+            conn.execute(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {STORE_SCHEMA_VERSION}")
+        elif version != STORE_SCHEMA_VERSION:
+            conn.close()
+            raise ValueError(f"{self.path}: characterization store schema {version} is not supported.")
+        return conn
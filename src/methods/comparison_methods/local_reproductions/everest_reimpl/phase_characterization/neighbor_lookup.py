@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.phase_characterization.characterization_cache import (
+    CharacterizationCache,
+)
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord, PhaseSignature
+
+
+@dataclass(slots=True, frozen=True)
+class NeighborEstimate:
+    """FS interpolated from characterized phases near an uncharacterized one."""
+
+    fs: float
+    nearest: CharacterizationRecord
+    nearest_distance_pct: float
+    neighbor_phase_ids: tuple[str, ...]
+
+
+def estimate_from_neighbors(
+    cache: CharacterizationCache,
+    *,
+    gpu_util_pct: float,
+    mem_util_pct: float,
+    is_idle_like: bool,
+    bucket_size_pct: float,
+    radius_pct: float,
+    exclude_phase_id: str | None = None,
+    window_index: int = 0,
+    now_unix_s: float | None = None,
+) -> NeighborEstimate | None:
+    """Inverse-distance-weighted FS of cached phases within *radius_pct* of a point.
+
+    Phase ids are a grid hash: each names one ``bucket_size_pct`` cell of
+    (gpu, mem) utilization for one idle flag.  The cells overlapping the
+    search disc are probed directly in *cache*, and each phase sits at its
+    cell center.  Only fresh records count (see
+    :meth:`CharacterizationCache.get`); probing does not mark them used, so
+    the caller touches the record it acts on.  Returns None when no phase is
+    close enough.
+    """
+    if bucket_size_pct <= 0 or radius_pct <= 0:
+        raise ValueError("bucket_size_pct and radius_pct must be > 0.")
+
+    neighbors: list[tuple[float, CharacterizationRecord]] = []
+    gpu_buckets = range(
+        math.floor((gpu_util_pct - radius_pct) / bucket_size_pct),
+        math.floor((gpu_util_pct + radius_pct) / bucket_size_pct) + 1,
+    )
+    mem_buckets = range(
+        math.floor((mem_util_pct - radius_pct) / bucket_size_pct),
+        math.floor((mem_util_pct + radius_pct) / bucket_size_pct) + 1,
+    )
+    for gpu_bucket in gpu_buckets:
+        for mem_bucket in mem_buckets:
+            distance = math.hypot(
+                (gpu_bucket + 0.5) * bucket_size_pct - gpu_util_pct,
+                (mem_bucket + 0.5) * bucket_size_pct - mem_util_pct,
+            )
+            if distance > radius_pct:
+                continue
+            phase_id = PhaseSignature(gpu_bucket, mem_bucket, is_idle_like).to_phase_id()
+            if phase_id == exclude_phase_id:
+                continue
+            record = cache.get(phase_id, window_index=window_index, now_unix_s=now_unix_s, touch=False)
+            if record is not None:
+                neighbors.append((distance, record))
+
+    if not neighbors:
+        return None
+    neighbors.sort(key=lambda item: (item[0], item[1].phase_id))
+    nearest_distance, nearest = neighbors[0]
+    if nearest_distance == 0.0:
+        fs = nearest.fs
+    else:
+        weights = [1.0 / distance for distance, _ in neighbors]
+        fs = sum(weight * record.fs for weight, (_, record) in zip(weights, neighbors)) / sum(weights)
+    return NeighborEstimate(
+        fs=fs,
+        nearest=nearest,
+        nearest_distance_pct=nearest_distance,
+        neighbor_phase_ids=tuple(record.phase_id for _, record in neighbors),
+    )
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.phase_characterization.characterization_cache import (
+    CharacterizationCache,
+)
 from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord
 
 
 class PhaseCharacterizer:
-    """Implements EVeREST Phase Characterization and phase-wise FS cache."""
+    """Implements EVeREST Phase Characterization and phase-wise FS cache.
 
-    def __init__(self) -> None:
-        self._records: dict[str, CharacterizationRecord] = {}
+    Records live in *cache*, which defaults to an unbounded
+    :class:`CharacterizationCache`.
+    """
+
+    def __init__(self, cache: CharacterizationCache | None = None) -> None:
+        self.cache = cache if cache is not None else CharacterizationCache()
 
     def estimate_frequency_sensitivity(
         self,
@@ -32,8 +39,11 @@ class PhaseCharacterizer:
         mem_low: float,
         freq_high_mhz: int,
         freq_low_mhz: int,
+        *,
+        window_index: int | None = None,
+        now_unix_s: float | None = None,
     ) -> CharacterizationRecord:
-        """Stores or updates one phase characterization in cache."""
+        """Stores or updates one phase characterization in cache; returns the stored record."""
         if not phase_id:
             raise ValueError("phase_id must be non-empty.")
         self._validate_inputs(mem_high, mem_low, freq_high_mhz, freq_low_mhz)
@@ -46,14 +56,19 @@ class PhaseCharacterizer:
             freq_high_mhz=freq_high_mhz,
             freq_low_mhz=freq_low_mhz,
         )
-        self._records[phase_id] = record
-        return record
+        return self.cache.put(record, window_index=window_index, now_unix_s=now_unix_s)
 
-    def get_phase_characterization(self, phase_id: str) -> CharacterizationRecord | None:
-        return self._records.get(phase_id)
+    def get_phase_characterization(
+        self,
+        phase_id: str,
+        *,
+        window_index: int = 0,
+        now_unix_s: float | None = None,
+    ) -> CharacterizationRecord | None:
+        return self.cache.get(phase_id, window_index=window_index, now_unix_s=now_unix_s)
 
     def has_phase_characterization(self, phase_id: str) -> bool:
-        return phase_id in self._records
+        return self.cache.peek(phase_id) is not None
 
     @staticmethod
     def _validate_inputs(mem_high: float, mem_low: float, freq_high_mhz: int, freq_low_mhz: int) -> None:
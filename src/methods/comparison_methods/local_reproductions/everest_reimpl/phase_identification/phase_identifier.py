@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from collections import deque
 from typing import Deque
 
@@ -8,7 +9,14 @@ from src.methods.comparison_methods.local_reproductions.everest_reimpl.types imp
 
 
 class PhaseIdentifier:
-    """Implements EVeREST Phase Identification from windowed utilization metrics."""
+    """Implements EVeREST Phase Identification from windowed utilization metrics.
+
+    ``observe()`` is amortized O(1): duration-weighted sums are kept as running
+    compensated sums and the stability spans come from monotonic min/max deques,
+    all updated as windows enter and leave the history.  While a non-finite
+    utilization value is in the history, averages and spans are recomputed over
+    the whole history instead.
+    """
 
     def __init__(
         self,
@@ -29,6 +37,7 @@ class PhaseIdentifier:
 
         self._history: Deque[MetricWindow] = deque()
         self._history_duration_s = 0.0
+        self._init_running_statistics()
 
         self._active_phase_id: str | None = None
         self._last_stable_gpu_util_pct: float | None = None
@@ -38,6 +47,7 @@ class PhaseIdentifier:
     def reset(self) -> None:
         self._history.clear()
         self._history_duration_s = 0.0
+        self._init_running_statistics()
         self._active_phase_id = None
         self._last_stable_gpu_util_pct = None
         self._last_stable_mem_util_pct = None
@@ -94,17 +104,71 @@ class PhaseIdentifier:
             is_idle_like=is_idle_like,
         )
 
+    def _init_running_statistics(self) -> None:
+        self._weighted_gpu = _CompensatedSum()
+        self._weighted_mem = _CompensatedSum()
+        self._weighted_duration = _CompensatedSum()
+        self._plain_gpu = _CompensatedSum()
+        self._plain_mem = _CompensatedSum()
+        self._non_finite_count = 0
+        self._pushed_count = 0
+        # (push index, value) pairs; values decrease (max) or increase (min)
+        # from front to back, so the front is the extremum of the history.
+        self._gpu_max: Deque[tuple[int, float]] = deque()
+        self._gpu_min: Deque[tuple[int, float]] = deque()
+        self._mem_max: Deque[tuple[int, float]] = deque()
+        self._mem_min: Deque[tuple[int, float]] = deque()
+
     def _push_window(self, window: MetricWindow) -> None:
         self._history.append(window)
         self._history_duration_s += window.duration_s
+        self._add_statistics(window, sign=1.0)
+        index = self._pushed_count
+        self._pushed_count += 1
+        _push_extremum(self._gpu_max, index, window.gpu_util_avg_pct, keep_larger=True)
+        _push_extremum(self._gpu_min, index, window.gpu_util_avg_pct, keep_larger=False)
+        _push_extremum(self._mem_max, index, window.mem_util_avg_pct, keep_larger=True)
+        _push_extremum(self._mem_min, index, window.mem_util_avg_pct, keep_larger=False)
 
         while self._history_duration_s > self.window_seconds and len(self._history) > 1:
             removed = self._history.popleft()
             self._history_duration_s -= removed.duration_s
+            self._add_statistics(removed, sign=-1.0)
+
+        oldest_index = self._pushed_count - len(self._history)
+        for extrema in (self._gpu_max, self._gpu_min, self._mem_max, self._mem_min):
+            while extrema[0][0] < oldest_index:
+                extrema.popleft()
+
+    def _add_statistics(self, window: MetricWindow, *, sign: float) -> None:
+        gpu = window.gpu_util_avg_pct
+        mem = window.mem_util_avg_pct
+        duration = max(window.duration_s, 0.0)
+        weighted_gpu = gpu * duration
+        weighted_mem = mem * duration
+        if not all(map(math.isfinite, (gpu, mem, duration, weighted_gpu, weighted_mem))):
+            self._non_finite_count += 1 if sign > 0 else -1
+            return
+        self._weighted_gpu.add(sign * weighted_gpu)
+        self._weighted_mem.add(sign * weighted_mem)
+        self._weighted_duration.add(sign * duration)
+        self._plain_gpu.add(sign * gpu)
+        self._plain_mem.add(sign * mem)
 
     def _compute_weighted_averages(self) -> tuple[float, float]:
         if not self._history:
             return 0.0, 0.0
+        if self._non_finite_count:
+            return self._recompute_weighted_averages()
+
+        duration_sum = self._weighted_duration.value()
+        if duration_sum == 0:
+            count = float(len(self._history))
+            return self._plain_gpu.value() / count, self._plain_mem.value() / count
+
+        return self._weighted_gpu.value() / duration_sum, self._weighted_mem.value() / duration_sum
+
+    def _recompute_weighted_averages(self) -> tuple[float, float]:
 
         weighted_gpu = 0.0
         weighted_mem = 0.0
@@ -147,9 +211,51 @@ class PhaseIdentifier:
     def _is_history_stable(self) -> bool:
         if not self._history:
             return False
+        if self._non_finite_count:
+            return self._recompute_history_stable()
+
+        gpu_span = self._gpu_max[0][1] - self._gpu_min[0][1]
+        mem_span = self._mem_max[0][1] - self._mem_min[0][1]
+        return gpu_span < self.change_threshold_pct and mem_span < self.change_threshold_pct
 
+    def _recompute_history_stable(self) -> bool:
         gpu_values = [window.gpu_util_avg_pct for window in self._history]
         mem_values = [window.mem_util_avg_pct for window in self._history]
         gpu_span = max(gpu_values) - min(gpu_values)
         mem_span = max(mem_values) - min(mem_values)
         return gpu_span < self.change_threshold_pct and mem_span < self.change_threshold_pct
+
+
+class _CompensatedSum:
+    """Running float sum with Neumaier compensation; removal adds the negated value.
+
+    The compensation term captures each addition's rounding error exactly, so
+    the sum does not drift over long add/remove sequences.
+    """
+
+    __slots__ = ("total", "compensation")
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def add(self, value: float) -> None:
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+
+    def value(self) -> float:
+        return self.total + self.compensation
+
+
+def _push_extremum(extrema: Deque[tuple[int, float]], index: int, value: float, *, keep_larger: bool) -> None:
+    if keep_larger:
+        while extrema and extrema[-1][1] <= value:
+            extrema.pop()
+    else:
+        while extrema and extrema[-1][1] >= value:
+            extrema.pop()
+    extrema.append((index, value))
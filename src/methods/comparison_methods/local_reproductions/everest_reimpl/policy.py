@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+import sqlite3
+from dataclasses import asdict, replace
 from typing import Mapping
 
 from src.common.experiment import (
@@ -13,9 +14,15 @@ from src.common.experiment import (
     PlatformSpec,
 )
 from src.methods.comparison_methods.local_reproductions.everest_reimpl.frequency_scaling import FrequencyScaler
-from src.methods.comparison_methods.local_reproductions.everest_reimpl.phase_characterization import PhaseCharacterizer
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.phase_characterization import (
+    CharacterizationCache,
+    CharacterizationStore,
+    CharacterizationStoreKey,
+    PhaseCharacterizer,
+    estimate_from_neighbors,
+)
 from src.methods.comparison_methods.local_reproductions.everest_reimpl.phase_identification import PhaseIdentifier
-from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord, PhaseObservation
 
 
 _DEFAULT_MIN_FREQUENCY_MHZ = 900
@@ -25,8 +32,14 @@ class EverestPolicy:
     """Online EVeREST-like runtime policy built from the three reimplemented stages.
 
     Live policy state (PhaseIdentifier history and PhaseCharacterizer cache) lives
-    in this object. ``state["phase_cache"]`` is a serialized observability mirror
-    written on every store.
+    in this object. ``state["phase_cache"]`` is a serialized observability mirror,
+    updated entry by entry on every store.
+
+    With ``characterization_store_path`` configured, the cache is warm-started
+    from a :class:`CharacterizationStore` and this run's characterizations are
+    written back to it in ``finalize()``.  With ``neighbor_radius_pct``
+    configured, an uncharacterized phase near characterized ones borrows their
+    interpolated FS instead of probing.
     """
 
     policy_name = "everest"
@@ -35,6 +48,11 @@ class EverestPolicy:
         self._phase_identifier: PhaseIdentifier | None = None
         self._phase_characterizer = PhaseCharacterizer()
         self._frequency_scaler = FrequencyScaler()
+        self._characterization_store: CharacterizationStore | None = None
+        self._characterization_store_key: CharacterizationStoreKey | None = None
+        # This run's characterizations for store write-back; unlike the cache,
+        # never evicted, so only kept when a store is configured.
+        self._run_characterizations: dict[str, CharacterizationRecord] = {}
 
     def initialize(
         self,
@@ -58,7 +76,14 @@ class EverestPolicy:
             idle_gpu_threshold_pct=idle_gpu_threshold_pct,
             idle_mem_threshold_pct=idle_mem_threshold_pct,
         )
-        self._phase_characterizer = PhaseCharacterizer()
+        self._phase_characterizer = PhaseCharacterizer(
+            CharacterizationCache(
+                max_entries=_config_optional_positive_int(config, "cache_max_entries"),
+                max_age_windows=_config_optional_positive_int(config, "cache_max_age_windows"),
+                max_age_seconds=_config_optional_positive_float(config, "cache_max_age_seconds"),
+                blend_history=max(_config_int(config, "cache_blend_history", 3), 0),
+            )
+        )
 
         f_high = _config_int(
             config,
@@ -136,6 +161,14 @@ class EverestPolicy:
         state.set("platform_max_clock_mhz", context.platform.max_graphics_clock_mhz)
         state.set("platform_clock_step_mhz", context.platform.graphics_clock_step_mhz)
         state.set("phase_cache", {})
+        if self._phase_characterizer.cache.bounded:
+            state.set("cache_eviction_count", 0)
+            state.set("cache_reprobe_count", 0)
+        neighbor_radius_pct = _config_optional_positive_float(config, "neighbor_radius_pct")
+        if neighbor_radius_pct is not None:
+            state.set("neighbor_radius_pct", neighbor_radius_pct)
+            state.set("neighbor_reuse_count", 0)
+        self._warm_start(context, config, state)
         state.set("pending_characterization", None)
         state.set("last_target_clock_mhz", None)
         state.set("total_windows", 0)
@@ -184,7 +217,7 @@ class EverestPolicy:
         if observation.is_new_phase:
             state.set("phase_change_count", int(state.get("phase_change_count", 0)) + 1)
 
-        cached = self._cached_record(observation.phase_id)
+        cached = self._cached_record(observation.phase_id, metrics, state)
         if cached is not None:
             state.set("cache_hit_count", int(state.get("cache_hit_count", 0)) + 1)
             return self._scaled_decision(
@@ -195,6 +228,10 @@ class EverestPolicy:
             )
 
         state.set("cache_miss_count", int(state.get("cache_miss_count", 0)) + 1)
+        neighbor_decision = self._neighbor_decision(observation, metrics, state)
+        if neighbor_decision is not None:
+            return neighbor_decision
+
         if int(state.get("f_low_mhz")) >= int(state.get("f_high_mhz")):
             return self._high_frequency_decision(
                 metrics=metrics,
@@ -270,9 +307,91 @@ class EverestPolicy:
                 ),
                 "f_high_mhz": int(state.get("f_high_mhz", 0)),
                 "f_low_mhz": int(state.get("f_low_mhz", 0)),
+                **self._cache_summary(state),
+                **self._write_back_characterizations(state),
             },
         )
 
+    def _warm_start(
+        self,
+        context: ExperimentContext,
+        config: Mapping[str, object],
+        state: AlgorithmState,
+    ) -> None:
+        self._characterization_store = None
+        self._characterization_store_key = None
+        self._run_characterizations = {}
+        store_path = config.get("characterization_store_path")
+        if not isinstance(store_path, str) or not store_path.strip():
+            return
+
+        self._characterization_store = CharacterizationStore(store_path)
+        self._characterization_store_key = CharacterizationStoreKey(
+            workload=context.metadata.workload_name,
+            gpu_model=context.platform.gpu_model,
+            driver_version=context.platform.driver_version or "",
+            f_high_mhz=int(state.get("f_high_mhz")),
+            f_low_mhz=int(state.get("f_low_mhz")),
+            phase_bucket_pct=max(float(state.get("change_threshold_pct")), 1.0),
+        )
+        state.set("characterization_store_path", store_path)
+        state.set("warm_started_phase_count", 0)
+        try:
+            records = self._characterization_store.load(self._characterization_store_key)
+        except (sqlite3.Error, OSError, ValueError) as exc:
+            # A missing or locked store only costs probing; the run proceeds cold.
+            state.set("characterization_store_error", f"load: {type(exc).__name__}: {exc}")
+            return
+
+        phase_cache = _phase_cache(state)
+        for phase_id, record in records.items():
+            self._phase_characterizer.upsert_phase_characterization(
+                phase_id=phase_id,
+                fs=record.fs,
+                mem_high=record.mem_high,
+                mem_low=record.mem_low,
+                freq_high_mhz=record.freq_high_mhz,
+                freq_low_mhz=record.freq_low_mhz,
+            )
+            phase_cache[phase_id] = asdict(record)
+        # Eviction only matters when more phases are stored than the bound allows.
+        for evicted_phase_id in self._phase_characterizer.cache.pop_evicted():
+            phase_cache.pop(evicted_phase_id, None)
+        state.set("phase_cache", phase_cache)
+        state.set("warm_started_phase_count", len(records))
+
+    def _cache_summary(self, state: AlgorithmState) -> dict[str, object]:
+        summary: dict[str, object] = {}
+        if self._phase_characterizer.cache.bounded:
+            summary["cache_eviction_count"] = int(state.get("cache_eviction_count", 0))
+            summary["cache_reprobe_count"] = int(state.get("cache_reprobe_count", 0))
+        if state.get("neighbor_radius_pct") is not None:
+            summary["neighbor_reuse_count"] = int(state.get("neighbor_reuse_count", 0))
+        return summary
+
+    def _write_back_characterizations(self, state: AlgorithmState) -> dict[str, object]:
+        """Saves this run's characterizations; returns the store summary fields."""
+        if self._characterization_store is None or self._characterization_store_key is None:
+            return {}
+        records = [self._run_characterizations[phase_id] for phase_id in sorted(self._run_characterizations)]
+        stored_phase_count = 0
+        try:
+            stored_phase_count = self._characterization_store.save(
+                self._characterization_store_key,
+                records,
+                run_id=str(state.get("run_id")),
+            )
+        except (sqlite3.Error, OSError, ValueError) as exc:
+            state.set("characterization_store_error", f"save: {type(exc).__name__}: {exc}")
+        summary: dict[str, object] = {
+            "warm_started_phase_count": int(state.get("warm_started_phase_count", 0)),
+            "stored_phase_count": stored_phase_count,
+        }
+        error = state.get("characterization_store_error")
+        if error:
+            summary["characterization_store_error"] = str(error)
+        return summary
+
     def _start_low_frequency_probe(
         self,
         *,
@@ -405,6 +524,7 @@ class EverestPolicy:
             freq_low_mhz=freq_low_mhz,
         )
         record = self._store_characterization(
+            metrics=metrics,
             state=state,
             phase_id=phase_id,
             fs=fs,
@@ -429,6 +549,7 @@ class EverestPolicy:
         state: AlgorithmState,
         record: CharacterizationRecord,
         reason: str,
+        debug_fields: Mapping[str, object] | None = None,
     ) -> Decision:
         scaled = self._frequency_scaler.compute_target_frequency(
             freq_high_mhz=int(state.get("f_high_mhz")),
@@ -440,6 +561,7 @@ class EverestPolicy:
         )
         state.set("scaled_decision_count", int(state.get("scaled_decision_count", 0)) + 1)
         debug_fields = {
+            **(debug_fields or {}),
             "phase_id": record.phase_id,
             "fs": record.fs,
             "mem_high": record.mem_high,
@@ -514,6 +636,7 @@ class EverestPolicy:
     def _store_characterization(
         self,
         *,
+        metrics: MetricWindow,
         state: AlgorithmState,
         phase_id: str,
         fs: float,
@@ -530,22 +653,88 @@ class EverestPolicy:
             mem_low=max(mem_low, 1e-12),
             freq_high_mhz=freq_high_mhz,
             freq_low_mhz=freq_low_mhz,
+            window_index=int(state.get("total_windows", 0)),
+            now_unix_s=metrics.end_unix_s,
         )
+        if self._characterization_store is not None:
+            self._run_characterizations[phase_id] = record
         # Observability mirror only — state["phase_cache"] is a JSON-serializable
         # snapshot for inspection and finalize counting.  Lookups always go through
-        # self._phase_characterizer (see _cached_record), not this mirror.
-        phase_cache = _phase_cache(state)
-        phase_cache[phase_id] = asdict(record)
-        state.set("phase_cache", phase_cache)
+        # self._phase_characterizer (see _cached_record), not this mirror.  It is
+        # updated per entry so journaled persistence writes only the changed
+        # records; the full mirror is written at snapshots.
+        state.set_entry("phase_cache", phase_id, asdict(record))
+        cache = self._phase_characterizer.cache
+        for evicted_phase_id in cache.pop_evicted():
+            state.pop_entry("phase_cache", evicted_phase_id)
+        if cache.bounded:
+            state.set("cache_eviction_count", cache.eviction_count)
+            state.set("cache_reprobe_count", cache.reprobe_count)
         return record
 
-    def _cached_record(self, phase_id: str) -> CharacterizationRecord | None:
-        """Return the cached characterization for *phase_id*, or None if absent.
+    def _cached_record(
+        self,
+        phase_id: str,
+        metrics: MetricWindow,
+        state: AlgorithmState,
+    ) -> CharacterizationRecord | None:
+        """Return the fresh cached characterization for *phase_id*, or None if absent or aged out.
 
         This is the authoritative lookup path — it reads from the live
         ``self._phase_characterizer`` cache, not from ``state["phase_cache"]``.
         """
-        return self._phase_characterizer.get_phase_characterization(phase_id)
+        return self._phase_characterizer.get_phase_characterization(
+            phase_id,
+            window_index=int(state.get("total_windows", 0)),
+            now_unix_s=metrics.end_unix_s,
+        )
+
+    def _neighbor_decision(
+        self,
+        observation: PhaseObservation,
+        metrics: MetricWindow,
+        state: AlgorithmState,
+    ) -> Decision | None:
+        """Scale with FS interpolated from nearby characterized phases instead of probing.
+
+        Only active when ``neighbor_radius_pct`` is configured.  A phase just
+        across a bucket edge from a characterized one then reuses its FS
+        rather than spending two probe windows.  The estimate is not cached,
+        so it never feeds further interpolation and the phase is probed once
+        its neighbors age out or are evicted.
+        """
+        radius_pct = state.get("neighbor_radius_pct")
+        if radius_pct is None:
+            return None
+        estimate = estimate_from_neighbors(
+            self._phase_characterizer.cache,
+            gpu_util_pct=observation.gpu_util_avg_pct,
+            mem_util_pct=observation.mem_util_avg_pct,
+            is_idle_like=observation.is_idle_like,
+            bucket_size_pct=max(float(state.get("change_threshold_pct", 10.0)), 1.0),
+            radius_pct=float(radius_pct),
+            exclude_phase_id=observation.phase_id,
+            window_index=int(state.get("total_windows", 0)),
+            now_unix_s=metrics.end_unix_s,
+        )
+        if estimate is None:
+            return None
+        self._phase_characterizer.cache.get(
+            estimate.nearest.phase_id,
+            window_index=int(state.get("total_windows", 0)),
+            now_unix_s=metrics.end_unix_s,
+        )
+        state.set("neighbor_reuse_count", int(state.get("neighbor_reuse_count", 0)) + 1)
+        return self._scaled_decision(
+            metrics=metrics,
+            state=state,
+            record=replace(estimate.nearest, phase_id=str(observation.phase_id), fs=estimate.fs),
+            reason="everest_apply_neighbor_phase",
+            debug_fields={
+                "neighbor_phase_ids": list(estimate.neighbor_phase_ids),
+                "neighbor_distance_pct": estimate.nearest_distance_pct,
+            },
+        )
 
     def _require_identifier(self, state: AlgorithmState) -> PhaseIdentifier:
         if self._phase_identifier is None:
@@ -669,6 +858,24 @@ def _config_int(config: Mapping[str, object], key: str, default: int) -> int:
     return default
 
 
+def _config_optional_positive_float(config: Mapping[str, object], key: str) -> float | None:
+    value = config.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"{key} must be a positive number; got {value!r}.")
+    return float(value)
+
+
+def _config_optional_positive_int(config: Mapping[str, object], key: str) -> int | None:
+    value = _config_optional_positive_float(config, key)
+    if value is None:
+        return None
+    if not value.is_integer():
+        raise ValueError(f"{key} must be a positive integer; got {config.get(key)!r}.")
+    return int(value)
+
+
 def _quantize_clock_up(
     value_mhz: int,
     *,
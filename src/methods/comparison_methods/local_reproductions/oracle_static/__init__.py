@@ -1,5 +1,10 @@
 """Static-oracle policy for offline-profiled fixed-frequency selection."""
 
-from .policy import StaticOraclePolicy, SweepPoint, choose_static_oracle_clock
+from .policy import StaticOraclePolicy, SweepPoint, choose_static_oracle_clock, parse_workload_profiles
 
-__all__ = ["StaticOraclePolicy", "SweepPoint", "choose_static_oracle_clock"]
+__all__ = [
+    "StaticOraclePolicy",
+    "SweepPoint",
+    "choose_static_oracle_clock",
+    "parse_workload_profiles",
+]
@@ -283,6 +283,25 @@ def _load_profile_for_workload(config: Mapping[str, object], workload_name: str)
     )
 
 
+def parse_workload_profiles(raw_workload_profiles: object) -> dict[str, list[SweepPoint]]:
+    """
+    Parses a `workload_profiles` config mapping into sweep points per workload.
+
+    Uses the same point record keys as `StaticOraclePolicy`, so offline tools
+    (e.g. simulator calibration) read the exact profiles the oracle selects
+    from. No frequency floor is applied here.
+    """
+    if not isinstance(raw_workload_profiles, Mapping):
+        raise ValueError("workload_profiles must be a mapping from workload name to point lists.")
+    return {
+        str(workload_name): _parse_profile_object(
+            profile_object,
+            f"workload_profiles[{workload_name}]",
+        )
+        for workload_name, profile_object in raw_workload_profiles.items()
+    }
+
+
 def _parse_profile_object(profile_object: object, provenance: str) -> list[SweepPoint]:
     if not isinstance(profile_object, list):
         raise ValueError(
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.common.control import (
+    ClockController,
+    ClockHelperError,
+    CoprocessClockController,
+)
+from src.common.control import clock_helper
+from src.common.experiment.types import Decision, DecisionAction
+
+_HELPER = Path(clock_helper.__file__).resolve()
+
+
+def _helper_cmd(*args: str) -> list[str]:
+    return [sys.executable, str(_HELPER), "--backend", "dry-run", *args]
+
+
+def _set_clock(target: int) -> Decision:
+    return Decision(
+        action=DecisionAction.SET_CLOCK,
+        target_graphics_clock_mhz=target,
+        reason_code="test_apply",
+    )
+
+
+class CoprocessClockControllerTests(unittest.TestCase):
+    def test_streams_commands_to_one_helper_process(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            record = Path(tmp) / "helper.log"
+            logs: list[str] = []
+            with CoprocessClockController(
+                _helper_cmd("--record", str(record)), logger=logs.append
+            ) as controller:
+                self.assertIsInstance(controller, ClockController)
+                controller.apply(_set_clock(900))
+                controller.apply(_set_clock(1200))
+                controller.apply(
+                    Decision(DecisionAction.HOLD_CLOCK, None, reason_code="hold")
+                )
+                controller.reset()
+
+                self.assertIsNotNone(controller.last_elapsed_us)
+                metrics = controller.metrics()
+                self.assertEqual(metrics["request_count"], 3)
+                self.assertEqual(metrics["restart_count"], 0)
+
+            self.assertEqual(
+                record.read_text(encoding="utf-8").splitlines(),
+                ["SET 900", "SET 1200", "RESET"],
+            )
+            self.assertEqual(sum("started clock helper" in message for message in logs), 1)
+
+    def test_restarts_helper_after_it_exits(self) -> None:
+        logs: list[str] = []
+        controller = CoprocessClockController(
+            _helper_cmd("--exit-after", "1"), logger=logs.append
+        )
+        try:
+            controller.apply(_set_clock(900))
+            controller.apply(_set_clock(1200))
+        finally:
+            controller.close()
+
+        self.assertEqual(controller.metrics()["restart_count"], 1)
+        self.assertTrue(any("restarting" in message for message in logs))
+
+    def test_gives_up_after_max_restarts(self) -> None:
+        controller = CoprocessClockController(
+            [sys.executable, "-c", "pass"], timeout_s=2.0, max_restarts=1
+        )
+        try:
+            # The helper dies, is restarted once for the retry, and dies again.
+            with self.assertRaisesRegex(ClockHelperError, "closed its stdout|pipe failed"):
+                controller.apply(_set_clock(900))
+            with self.assertRaisesRegex(ClockHelperError, "giving up"):
+                controller.apply(_set_clock(900))
+            self.assertEqual(controller.metrics()["error_count"], 2)
+        finally:
+            controller.close()
+
+    def test_timeout_kills_slow_helper(self) -> None:
+        controller = CoprocessClockController(_helper_cmd("--delay-ms", "2000"), timeout_s=0.2)
+        try:
+            with self.assertRaisesRegex(ClockHelperError, "did not answer"):
+                controller.apply(_set_clock(900))
+            self.assertEqual(controller.metrics()["error_count"], 1)
+        finally:
+            controller.close()
+
+    def test_err_response_raises_without_restart(self) -> None:
+        with CoprocessClockController(_helper_cmd()) as controller:
+            with self.assertRaisesRegex(ClockHelperError, "rejected"):
+                controller._request("SET fast")
+            controller.ping()
+
+            self.assertEqual(controller.metrics()["restart_count"], 0)
+
+
+class ClockHelperProtocolTests(unittest.TestCase):
+    def test_serve_answers_each_request(self) -> None:
+        stdin = io.StringIO("PING\nSET 900\nBOGUS\nRESET\nQUIT\nSET 1\n")
+        stdout = io.StringIO()
+
+        code = clock_helper.serve(clock_helper.DryRunBackend(), stdin, stdout)
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(code, 0)
+        self.assertEqual(lines[0], "OK 0")
+        self.assertTrue(lines[1].startswith("OK "))
+        self.assertTrue(lines[2].startswith("ERR unsupported request"))
+        self.assertTrue(lines[3].startswith("OK "))
+        self.assertEqual(lines[4], "OK 0")
+        self.assertEqual(len(lines), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
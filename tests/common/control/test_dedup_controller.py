@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import unittest
+
+from src.common.control import (
+    ClockController,
+    ClockObserver,
+    DeduplicatingClockController,
+)
+from src.common.experiment.types import Decision, DecisionAction
+
+
+def _decision(action: DecisionAction, target: int | None) -> Decision:
+    return Decision(action=action, target_graphics_clock_mhz=target, reason_code="test")
+
+
+class _RecordingController:
+    """Records applied decisions; optionally fails the next apply."""
+
+    def __init__(self) -> None:
+        self.applied: list[Decision] = []
+        self.reset_count = 0
+        self.fail_next = False
+
+    def apply(self, decision: Decision) -> None:
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("actuation failed")
+        self.applied.append(decision)
+
+    def reset(self) -> None:
+        self.reset_count += 1
+
+
+class DeduplicatingClockControllerTests(unittest.TestCase):
+    def test_satisfies_controller_and_observer_protocols(self) -> None:
+        controller = DeduplicatingClockController(_RecordingController())
+        self.assertIsInstance(controller, ClockController)
+        self.assertIsInstance(controller, ClockObserver)
+
+    def test_suppresses_repeated_targets(self) -> None:
+        inner = _RecordingController()
+        controller = DeduplicatingClockController(inner)
+
+        for target in (900, 900, 900, 1200, 1200, 900):
+            controller.apply(_decision(DecisionAction.SET_CLOCK, target))
+        controller.apply(_decision(DecisionAction.HOLD_CLOCK, None))
+
+        self.assertEqual(
+            [decision.target_graphics_clock_mhz for decision in inner.applied],
+            [900, 1200, 900],
+        )
+        metrics = controller.metrics()
+        self.assertEqual(metrics["issued_count"], 3)
+        self.assertEqual(metrics["suppressed_count"], 3)
+        self.assertEqual(controller.applied_clock_mhz, 900)
+
+    def test_reset_to_max_without_target_records_no_clock(self) -> None:
+        inner = _RecordingController()
+        controller = DeduplicatingClockController(inner)
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 1410))
+
+        controller.apply(_decision(DecisionAction.RESET_TO_MAX, None))
+        self.assertIsNone(controller.applied_clock_mhz)
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 1410))
+
+        self.assertEqual(
+            [decision.target_graphics_clock_mhz for decision in inner.applied],
+            [1410, None, 1410],
+        )
+        self.assertEqual(controller.metrics()["issued_count"], 2)
+        self.assertEqual(controller.applied_clock_mhz, 1410)
+
+    def test_failure_and_reset_forget_tracked_clock(self) -> None:
+        inner = _RecordingController()
+        controller = DeduplicatingClockController(inner)
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+
+        inner.fail_next = True
+        with self.assertRaises(RuntimeError):
+            controller.apply(_decision(DecisionAction.SET_CLOCK, 1200))
+        self.assertIsNone(controller.applied_clock_mhz)
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+
+        controller.reset()
+        self.assertEqual(inner.reset_count, 1)
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+
+        self.assertEqual(len(inner.applied), 3)
+
+    def test_observed_clock_mismatch_reissues_actuation(self) -> None:
+        inner = _RecordingController()
+        logs: list[str] = []
+        controller = DeduplicatingClockController(
+            inner, confirm_tolerance_mhz=15.0, logger=logs.append
+        )
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+
+        controller.observe_clock(910.0)  # within tolerance
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+        controller.observe_clock(1410.0)  # clock changed behind our back
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+
+        self.assertEqual(len(inner.applied), 2)
+        self.assertEqual(controller.metrics()["confirmation_mismatch_count"], 1)
+        self.assertTrue(any("not confirmed" in message for message in logs))
+
+    def test_observation_is_ignored_without_confirmation(self) -> None:
+        inner = _RecordingController()
+        controller = DeduplicatingClockController(inner)
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+        controller.observe_clock(1410.0)
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+
+        self.assertEqual(len(inner.applied), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -90,6 +90,23 @@ class ShellTemplateControllerTests(unittest.TestCase):
         self.assertEqual(len(runner.calls), 1)
         self.assertEqual(runner.calls[0][0], "reset-clocks")
 
+    def test_gpu_index_is_substituted_in_both_commands(self) -> None:
+        runner = _RecordingRunner()
+        controller = ShellTemplateController(
+            apply_template="nvidia-smi -i {gpu_index} -lgc {target_mhz}",
+            reset_cmd="nvidia-smi -i {gpu_index} -rgc",
+            gpu_index=3,
+            runner=runner,
+        )
+
+        controller.apply(_set_clock(1200))
+        controller.reset()
+
+        self.assertEqual(
+            [call[0] for call in runner.calls],
+            ["nvidia-smi -i 3 -lgc 1200", "nvidia-smi -i 3 -rgc"],
+        )
+
     def test_reset_without_command_is_noop(self) -> None:
         runner = _RecordingRunner()
         controller = ShellTemplateController(apply_template=None, runner=runner)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import unittest
+
+from src.common.control import (
+    ClockController,
+    DeduplicatingClockController,
+    LatencyHistogram,
+    ShellTemplateController,
+    TimedClockController,
+    controller_backend_name,
+)
+from src.common.experiment.types import Decision, DecisionAction
+
+
+def _decision(action: DecisionAction, target: int | None) -> Decision:
+    return Decision(action=action, target_graphics_clock_mhz=target, reason_code="test")
+
+
+class _FakeClock:
+    """Monotonic clock advanced by the controller under test."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _SteppingController:
+    """Advances a fake clock by a fixed duration per call; optionally fails."""
+
+    backend = "fake"
+
+    def __init__(self, clock: _FakeClock, step_s: float) -> None:
+        self._clock = clock
+        self.step_s = step_s
+        self.fail = False
+
+    def apply(self, decision: Decision) -> None:
+        self._clock.now += self.step_s
+        if self.fail:
+            raise RuntimeError("actuation failed")
+
+    def reset(self) -> None:
+        self._clock.now += self.step_s
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_percentiles_are_within_bucket_error(self) -> None:
+        histogram = LatencyHistogram()
+        for millisecond in range(1, 101):
+            histogram.record(millisecond / 1e3)
+
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 100)
+        self.assertAlmostEqual(summary["mean_ms"], 50.5)
+        self.assertEqual(summary["min_ms"], 1.0)
+        self.assertEqual(summary["max_ms"], 100.0)
+        for key, exact_ms in (("p50_ms", 50.0), ("p95_ms", 95.0), ("p99_ms", 99.0)):
+            self.assertGreaterEqual(summary[key], exact_ms)
+            self.assertLessEqual(summary[key], exact_ms * 1.1)
+
+    def test_empty_histogram_reports_none(self) -> None:
+        summary = LatencyHistogram().summary()
+        self.assertEqual(summary["count"], 0)
+        self.assertIsNone(summary["p99_ms"])
+        self.assertIsNone(summary["max_ms"])
+
+    def test_percentile_is_clamped_to_max(self) -> None:
+        histogram = LatencyHistogram()
+        histogram.record(0.0123)
+        self.assertEqual(histogram.percentile(0.5), 0.0123)
+        with self.assertRaises(ValueError):
+            histogram.percentile(0.0)
+
+
+class TimedClockControllerTests(unittest.TestCase):
+    def test_times_actuations_per_action(self) -> None:
+        clock = _FakeClock()
+        inner = _SteppingController(clock, step_s=0.002)
+        controller = TimedClockController(inner, clock=clock)
+        self.assertIsInstance(controller, ClockController)
+
+        controller.apply(_decision(DecisionAction.SET_CLOCK, 900))
+        self.assertAlmostEqual(controller.pop_last_duration_s(), 0.002)
+        self.assertIsNone(controller.pop_last_duration_s())
+
+        controller.apply(_decision(DecisionAction.HOLD_CLOCK, None))
+        self.assertIsNone(controller.pop_last_duration_s())
+
+        inner.step_s = 0.010
+        controller.apply(_decision(DecisionAction.RESET_TO_MAX, 1410))
+        controller.reset()
+        inner.fail = True
+        with self.assertRaises(RuntimeError):
+            controller.apply(_decision(DecisionAction.SET_CLOCK, 1200))
+
+        metrics = controller.metrics()
+        self.assertEqual(metrics["backend"], "fake")
+        by_action = metrics["by_action"]
+        self.assertEqual(sorted(by_action), ["reset", "reset_to_max", "set_clock"])
+        self.assertEqual(by_action["set_clock"]["count"], 1)
+        self.assertEqual(by_action["set_clock"]["failure_count"], 1)
+        self.assertAlmostEqual(by_action["set_clock"]["max_ms"], 2.0)
+        self.assertAlmostEqual(by_action["reset_to_max"]["p99_ms"], 10.0)
+        self.assertEqual(by_action["reset"]["count"], 1)
+
+    def test_target_less_reset_to_max_is_not_timed(self) -> None:
+        clock = _FakeClock()
+        inner = _SteppingController(clock, step_s=0.002)
+        controller = TimedClockController(inner, clock=clock)
+
+        controller.apply(_decision(DecisionAction.RESET_TO_MAX, None))
+
+        self.assertEqual(clock.now, 0.002)
+        self.assertIsNone(controller.pop_last_duration_s())
+        self.assertEqual(controller.metrics()["by_action"], {})
+
+    def test_backend_name_looks_through_wrappers(self) -> None:
+        shell = ShellTemplateController(apply_template=None)
+        self.assertEqual(controller_backend_name(shell), "shell")
+        wrapped = DeduplicatingClockController(TimedClockController(shell))
+        self.assertEqual(controller_backend_name(wrapped), "shell")
+        self.assertEqual(TimedClockController(wrapped).backend, "shell")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import unittest
+
+from src.common.experiment import AlgorithmState
+
+
+class AlgorithmStateDirtyKeyTests(unittest.TestCase):
+    def test_set_and_mark_dirty_record_changed_keys(self) -> None:
+        state = AlgorithmState(data={"initial": 1})
+        self.assertEqual(state.pop_dirty_keys(), set())
+
+        state.set("total_windows", 1)
+        state.get("initial")
+        state.get("missing", 0)
+        state.data.setdefault("phase_cache", {})["p1"] = {"fs": 0.5}
+        state.mark_dirty("phase_cache")
+
+        self.assertEqual(state.pop_dirty_keys(), {"total_windows", "phase_cache"})
+        self.assertEqual(state.pop_dirty_keys(), set())
+
+    def test_entry_updates_record_only_touched_entries(self) -> None:
+        state = AlgorithmState(data={"phase_cache": {"p1": {"fs": 0.5}}})
+
+        state.set_entry("phase_cache", "p2", {"fs": 0.7})
+        self.assertEqual(state.pop_entry("phase_cache", "p1"), {"fs": 0.5})
+        self.assertIsNone(state.pop_entry("phase_cache", "absent"))
+
+        self.assertEqual(state.data["phase_cache"], {"p2": {"fs": 0.7}})
+        self.assertEqual(state.pop_dirty_keys(), set())
+        self.assertEqual(state.pop_dirty_entries(), {"phase_cache": {"p1", "p2"}})
+        self.assertEqual(state.pop_dirty_entries(), {})
+
+    def test_set_entry_on_missing_mapping_marks_whole_key(self) -> None:
+        state = AlgorithmState()
+
+        state.set_entry("phase_cache", "p1", 1)
+
+        self.assertEqual(state.data, {"phase_cache": {"p1": 1}})
+        self.assertEqual(state.pop_dirty_keys(), {"phase_cache"})
+        self.assertEqual(state.pop_dirty_entries(), {})
+
+    def test_dirty_keys_do_not_affect_equality_or_repr(self) -> None:
+        state = AlgorithmState()
+        state.set("value", 1)
+
+        self.assertEqual(state, AlgorithmState(data={"value": 1}))
+        self.assertEqual(repr(state), "AlgorithmState(data={'value': 1})")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from src.common.experiment.types import PlatformSpec
+from src.common.simulation.calibration import (
+    SurrogateTable,
+    fit_surrogates,
+    load_or_fit_surrogates,
+    platform_clock_grid,
+    profile_hash,
+)
+from src.methods.comparison_methods.local_reproductions.oracle_static import (
+    SweepPoint,
+    choose_static_oracle_clock,
+    parse_workload_profiles,
+)
+
+
+_GRID = np.arange(900, 1411, 30)
+
+_PROFILES = parse_workload_profiles(
+    {
+        "stream": [
+            {"frequency_mhz": 900, "performance_ratio": 0.99, "power_w": 150},
+            {"frequency_mhz": 1200, "performance_ratio": 0.995, "power_w": 190},
+            {"frequency_mhz": 1410, "performance_ratio": 1.0, "power_w": 230},
+        ],
+        "gemm": [
+            {"freq_mhz": 900, "perf_ratio": 0.64, "avg_power_w": 160},
+            {"freq_mhz": 1200, "perf_ratio": 0.85, "avg_power_w": 240},
+            # Measurement noise: slower than the 1200 MHz point.
+            {"freq_mhz": 1300, "perf_ratio": 0.84, "avg_power_w": 270},
+            {"freq_mhz": 1410, "perf_ratio": 1.0, "avg_power_w": 330},
+        ],
+        "unpowered": [
+            {"clock_mhz": 1000, "relative_performance": 0.8},
+            {"clock_mhz": 1410, "relative_performance": 1.0},
+        ],
+    }
+)
+
+
+class TestFitSurrogates(unittest.TestCase):
+    def test_curves_are_monotone_and_pass_through_consistent_points(self) -> None:
+        table = fit_surrogates(_PROFILES, _GRID)
+
+        self.assertEqual(table.workloads, ("gemm", "stream", "unpowered"))
+        self.assertTrue(np.all(np.diff(table.performance_ratio, axis=1) >= 0))
+        self.assertTrue(np.all(np.diff(table.power_w[:2], axis=1) >= 0))
+        self.assertAlmostEqual(table.estimate("stream", 1200, 100.0).performance_ratio, 0.995)
+        # The 1200/1300 MHz violators pool to their mean.
+        self.assertAlmostEqual(table.estimate("gemm", 1200, 100.0).performance_ratio, 0.845)
+        self.assertTrue(np.all(np.isnan(table.power_w[table.row("unpowered")])))
+        with self.assertRaises(ValueError):
+            table.performance_ratio[0, 0] = 2.0
+
+    def test_extrapolates_outside_swept_clocks(self) -> None:
+        table = fit_surrogates(_PROFILES, platform_clock_grid(_platform()))
+
+        below = table.estimate("unpowered", 210, 100.0)
+
+        self.assertEqual(table.clock_grid_mhz[-1], 1410)
+        self.assertLess(below.performance_ratio, 0.8)
+        self.assertGreater(below.performance_ratio, 0.0)
+        self.assertIsNone(below.energy_j)
+
+    def test_estimates_runtime_and_energy(self) -> None:
+        table = fit_surrogates(_PROFILES, _GRID)
+
+        estimate = table.estimate("gemm", 1410, 100.0)
+        energy = table.energy_j("gemm", 100.0)
+
+        self.assertEqual(estimate.runtime_s, 100.0)
+        self.assertEqual(estimate.energy_j, 33000.0)
+        self.assertEqual(energy[-1], 33000.0)
+        self.assertAlmostEqual(table.runtime_s("gemm", 100.0)[0], 100.0 / 0.64)
+        with self.assertRaises(ValueError):
+            table.estimate("gemm", 1405, 100.0)
+        with self.assertRaises(KeyError):
+            table.row("missing")
+
+    def test_energy_optimal_clocks_respect_the_performance_floor(self) -> None:
+        table = fit_surrogates(_PROFILES, _GRID)
+        oracle_clock, _ = choose_static_oracle_clock(_PROFILES["unpowered"], pd_target=0.1)
+
+        clocks = dict(zip(table.workloads, table.energy_optimal_clocks(0.9).tolist()))
+
+        self.assertEqual(clocks["stream"], 900)
+        self.assertEqual(clocks["unpowered"], 1230)
+        self.assertGreater(clocks["gemm"], 1200)
+        self.assertLessEqual(clocks["unpowered"], oracle_clock)
+        self.assertEqual(table.energy_optimal_clocks(1.5).tolist(), [1410, 1410, 1410])
+
+    def test_compute_fraction_recovers_simulator_phase_model(self) -> None:
+        profile = [
+            SweepPoint(clock, 1.0 / (0.7 * 1410 / clock + 0.3)) for clock in (900, 1100, 1410)
+        ]
+        table = fit_surrogates({"synthetic": profile}, [900, 1100, 1410])
+
+        phase = table.simulated_phase("synthetic", work_s=10.0, gpu_util_pct=90, mem_util_pct=30)
+
+        self.assertAlmostEqual(phase.compute_fraction, 0.7, places=6)
+
+    def test_rejects_empty_profile_and_bad_grid(self) -> None:
+        with self.assertRaises(ValueError):
+            fit_surrogates({"empty": []}, _GRID)
+        with self.assertRaises(ValueError):
+            fit_surrogates(_PROFILES, [1410, 900])
+
+
+class TestSurrogateCache(unittest.TestCase):
+    def test_hash_ignores_point_and_workload_order(self) -> None:
+        reordered = {name: list(reversed(points)) for name, points in reversed(_PROFILES.items())}
+
+        self.assertEqual(profile_hash(reordered, _GRID), profile_hash(_PROFILES, _GRID))
+        self.assertNotEqual(profile_hash(_PROFILES, _GRID[:-1]), profile_hash(_PROFILES, _GRID))
+
+    def test_load_or_fit_reuses_the_cached_artifact(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            first = load_or_fit_surrogates(_PROFILES, _GRID, Path(tmp))
+            with mock.patch(
+                "src.common.simulation.calibration.fit_surrogates",
+                side_effect=AssertionError("refit"),
+            ):
+                second = load_or_fit_surrogates(_PROFILES, _GRID, Path(tmp))
+            artifacts = list(Path(tmp).iterdir())
+
+        self.assertEqual(len(artifacts), 1)
+        self.assertEqual(second.profile_hash, first.profile_hash)
+        self.assertEqual(second.workloads, first.workloads)
+        np.testing.assert_array_equal(second.performance_ratio, first.performance_ratio)
+        np.testing.assert_array_equal(second.power_w, first.power_w)
+
+    def test_corrupt_artifact_is_refit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            table = load_or_fit_surrogates(_PROFILES, _GRID, Path(tmp))
+            path = Path(tmp) / f"surrogates-{table.profile_hash[:16]}.npz"
+            path.write_bytes(b"not an npz")
+
+            refit = load_or_fit_surrogates(_PROFILES, _GRID, Path(tmp))
+            reloaded = SurrogateTable.load(path)
+
+        self.assertEqual(refit.profile_hash, table.profile_hash)
+        self.assertEqual(reloaded.profile_hash, table.profile_hash)
+
+
+def _platform() -> PlatformSpec:
+    return PlatformSpec(
+        vendor="nvidia",
+        gpu_model="A100",
+        gpu_count=1,
+        min_graphics_clock_mhz=210,
+        max_graphics_clock_mhz=1410,
+        graphics_clock_step_mhz=15,
+    )
+
+
+if __name__ == "__main__":
+    unittest.main()
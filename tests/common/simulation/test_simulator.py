@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from scripts.run.control_loop import run_control_loop
+from src.common.control import ClockController
+from src.common.experiment.types import (
+    Decision,
+    DecisionAction,
+    ExperimentContext,
+    ExperimentMetadata,
+    PerformanceTargetType,
+    PlatformSpec,
+)
+from src.common.simulation import GpuSimulator, PowerModel, SimulatedPhase, SimulatedWorkload
+from src.common.telemetry import WindowTelemetryProvider
+from src.methods.registry import resolve_policy
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="A100",
+    gpu_count=1,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+
+def _context(policy_name: str = "max_freq", *, window_seconds: float = 5.0) -> ExperimentContext:
+    return ExperimentContext(
+        platform=_PLATFORM,
+        metadata=ExperimentMetadata(
+            run_id="sim-run",
+            experiment_id="sim",
+            policy_name=policy_name,
+            workload_name="synthetic",
+            started_at_utc="2026-01-01T00:00:00Z",
+        ),
+        pd_target=0.10,
+        window_seconds=window_seconds,
+        sampling_interval_ms=100,
+        performance_target_type=PerformanceTargetType.RUNTIME_SLOWDOWN,
+    )
+
+
+def _set_clock(target_mhz: int) -> Decision:
+    return Decision(
+        action=DecisionAction.SET_CLOCK,
+        target_graphics_clock_mhz=target_mhz,
+        reason_code="test",
+    )
+
+
+_COMPUTE = SimulatedPhase("compute", work_s=10.0, compute_fraction=1.0, gpu_util_pct=100.0, mem_util_pct=40.0)
+_MEMORY = SimulatedPhase("memory", work_s=10.0, compute_fraction=0.0, gpu_util_pct=90.0, mem_util_pct=80.0)
+
+
+class TestSimulatedWorkload(unittest.TestCase):
+    def test_from_mapping_and_schedule(self) -> None:
+        workload = SimulatedWorkload.from_mapping(
+            {
+                "phases": [
+                    {"name": "a", "work_s": 2, "compute_fraction": 0.5, "gpu_util_pct": 90, "mem_util_pct": 10},
+                    {"work_s": 3, "compute_fraction": 0, "gpu_util_pct": 20, "mem_util_pct": 60},
+                ],
+                "repeat": 2,
+            }
+        )
+
+        self.assertEqual([phase.name for phase in workload.schedule()], ["a", "phase1", "a", "phase1"])
+        self.assertEqual(workload.baseline_runtime_s, 10.0)
+        self.assertAlmostEqual(workload.phases[0].time_per_work(705, 1410), 1.5)
+
+    def test_load_rejects_invalid_phases(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "workload.json"
+            path.write_text(json.dumps({"phases": [{"work_s": 1}]}), encoding="utf-8")
+            with self.assertRaises(ValueError):
+                SimulatedWorkload.load(path)
+        with self.assertRaises(ValueError):
+            SimulatedPhase("bad", work_s=1.0, compute_fraction=1.5, gpu_util_pct=50, mem_util_pct=50)
+        with self.assertRaises(ValueError):
+            SimulatedWorkload(phases=())
+
+
+class TestGpuSimulator(unittest.TestCase):
+    def test_implements_provider_and_controller(self) -> None:
+        simulator = GpuSimulator(_PLATFORM, SimulatedWorkload(phases=(_COMPUTE,)))
+
+        self.assertIsInstance(simulator, WindowTelemetryProvider)
+        self.assertIsInstance(simulator, ClockController)
+
+    def test_lower_clock_slows_compute_bound_phase_and_lowers_memory_util(self) -> None:
+        simulator = GpuSimulator(_PLATFORM, SimulatedWorkload(phases=(_COMPUTE,)))
+        context = _context(window_seconds=2.0)
+
+        at_max = simulator.get_window(context, 0)
+        simulator.apply(_set_clock(705))
+        at_half = simulator.get_window(context, 1)
+
+        self.assertEqual(at_max.custom_metrics["performance_ratio"], 1.0)
+        self.assertEqual(at_max.mem_util_avg_pct, 40.0)
+        self.assertEqual(at_half.graphics_clock_avg_mhz, 705.0)
+        self.assertAlmostEqual(at_half.custom_metrics["performance_ratio"], 0.5)  # type: ignore[arg-type]
+        self.assertAlmostEqual(at_half.mem_util_avg_pct, 20.0)
+        self.assertLess(at_half.power_avg_w, at_max.power_avg_w)  # type: ignore[operator]
+
+    def test_memory_bound_phase_ignores_clock(self) -> None:
+        simulator = GpuSimulator(_PLATFORM, SimulatedWorkload(phases=(_MEMORY,)))
+        simulator.apply(_set_clock(705))
+
+        window = simulator.get_window(_context(window_seconds=2.0), 0)
+
+        self.assertEqual(window.custom_metrics["performance_ratio"], 1.0)
+        self.assertEqual(window.mem_util_avg_pct, 80.0)
+
+    def test_window_spanning_phases_is_time_weighted_and_run_finishes(self) -> None:
+        finished = threading.Event()
+        simulator = GpuSimulator(
+            _PLATFORM,
+            SimulatedWorkload(phases=(_COMPUTE, _MEMORY)),
+            power_model=PowerModel(idle_w=100.0, core_w=0.0, memory_w=0.0),
+            finished_event=finished,
+        )
+        context = _context(window_seconds=15.0)
+
+        first = simulator.get_window(context, 0)
+        last = simulator.get_window(context, 1)
+        with self.assertRaises(LookupError):
+            simulator.get_window(context, 2)
+
+        self.assertAlmostEqual(first.gpu_util_avg_pct, (100.0 * 10 + 90.0 * 5) / 15)
+        self.assertEqual(first.custom_metrics["phase"], "memory")
+        self.assertEqual(last.duration_s, 5.0)
+        self.assertEqual(last.energy_delta_j, 500.0)
+        self.assertTrue(finished.is_set())
+        summary = simulator.summary()
+        self.assertEqual(summary["runtime_s"], 20.0)
+        self.assertEqual(summary["slowdown"], 0.0)
+        self.assertEqual(summary["energy_j"], 2000.0)
+
+    def test_clock_transition_delays_new_clock_within_window(self) -> None:
+        simulator = GpuSimulator(
+            _PLATFORM, SimulatedWorkload(phases=(_COMPUTE,)), clock_transition_s=1.0
+        )
+        simulator.apply(_set_clock(1010))
+        window = simulator.get_window(_context(window_seconds=2.0), 0)
+        simulator.reset()
+
+        self.assertEqual(window.graphics_clock_avg_mhz, (1410.0 + 1010.0) / 2)
+        self.assertEqual(simulator.applied_clock_mhz, 1410.0)
+        self.assertEqual(simulator.clock_change_count, 2)
+
+    def test_noise_is_seeded(self) -> None:
+        def _utils(seed: int) -> list[float]:
+            simulator = GpuSimulator(
+                _PLATFORM, SimulatedWorkload(phases=(_COMPUTE,)), noise_pct=5.0, seed=seed
+            )
+            return [simulator.get_window(_context(window_seconds=1.0), i).mem_util_avg_pct for i in range(3)]
+
+        self.assertEqual(_utils(7), _utils(7))
+        self.assertNotEqual(_utils(7), _utils(8))
+
+
+class TestClosedLoopPolicies(unittest.TestCase):
+    """Regression check: policies driven end to end by the simulator."""
+
+    def _run(self, policy_name: str, run_dir: Path) -> dict[str, object]:
+        finished = threading.Event()
+        simulator = GpuSimulator(
+            _PLATFORM,
+            SimulatedWorkload(
+                phases=(
+                    SimulatedPhase("memory", work_s=300.0, compute_fraction=0.2, gpu_util_pct=95.0, mem_util_pct=80.0),
+                    SimulatedPhase("compute", work_s=300.0, compute_fraction=0.95, gpu_util_pct=99.0, mem_util_pct=20.0),
+                ),
+                repeat=2,
+            ),
+            finished_event=finished,
+        )
+        run_control_loop(
+            policy=resolve_policy(policy_name),
+            context=_context(policy_name),
+            policy_config={},
+            run_dir=run_dir,
+            control_log=run_dir / "control_loop.log",
+            decisions_csv=run_dir / "control" / "decisions.csv",
+            state_path=run_dir / "control" / "policy_state.json",
+            decision_path=run_dir / "control" / "last_decision.json",
+            window_seconds=5.0,
+            max_windows=10_000,
+            window_builder=simulator.get_window,
+            sleep_fn=lambda _seconds: None,
+            clock_controller=simulator,
+            stop_event=finished,
+        )
+        return simulator.summary()
+
+    def test_everest_saves_energy_within_its_slowdown_target(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = self._run("max_freq", Path(tmp) / "max_freq")
+            everest = self._run("everest", Path(tmp) / "everest")
+
+        self.assertTrue(everest["finished"])
+        self.assertEqual(baseline["slowdown"], 0.0)
+        self.assertLess(everest["energy_j"], baseline["energy_j"])  # type: ignore[operator]
+        self.assertLess(everest["slowdown"], 0.15)  # type: ignore[operator]
+        self.assertGreater(everest["clock_change_count"], 0)  # type: ignore[operator]
+
+
+if __name__ == "__main__":
+    unittest.main()
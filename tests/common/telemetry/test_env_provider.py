@@ -131,6 +131,25 @@ class TestEnvTelemetryProvider(unittest.TestCase):
 
         self.assertEqual(window.gpu_util_avg_pct, 88.0)
 
+    def test_device_variables_override_shared_variables(self) -> None:
+        environ = {
+            "METRIC_GPU_UTIL_PCT": "50",
+            "METRIC_GPU_UTIL_PCT_GPU1": "75",
+            "METRIC_GRAPHICS_CLOCK_MHZ_GPU0": "900",
+        }
+
+        gpu0 = EnvTelemetryProvider(environ=environ, device_index=0).get_window(
+            _make_context(), sequence_id=0
+        )
+        gpu1 = EnvTelemetryProvider(environ=environ, device_index=1).get_window(
+            _make_context(), sequence_id=0
+        )
+
+        self.assertEqual(gpu0.gpu_util_avg_pct, 50.0)
+        self.assertEqual(gpu0.graphics_clock_avg_mhz, 900.0)
+        self.assertEqual(gpu1.gpu_util_avg_pct, 75.0)
+        self.assertEqual(gpu1.graphics_clock_avg_mhz, 1410.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.common.experiment.types import (
+    ExperimentContext,
+    ExperimentMetadata,
+    PlatformSpec,
+)
+from src.common.telemetry import (
+    FileTelemetryProvider,
+    TailReader,
+    TelemetryRowParser,
+    WindowTelemetryProvider,
+)
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="TestGPU",
+    gpu_count=2,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+_METADATA = ExperimentMetadata(
+    run_id="test-run-001",
+    experiment_id="test-exp",
+    policy_name="max_freq",
+    workload_name="synthetic",
+    started_at_utc="2026-01-01T00:00:00Z",
+)
+
+_CONTEXT = ExperimentContext(
+    platform=_PLATFORM,
+    metadata=_METADATA,
+    pd_target=0.05,
+    window_seconds=1.0,
+    sampling_interval_ms=100,
+)
+
+_NVIDIA_SMI_HEADER = (
+    "timestamp, index, utilization.gpu [%], utilization.memory [%], clocks.gr [MHz], "
+    "power.draw [W], total_energy_consumption [mJ]\n"
+)
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+class TestTailReader(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "telemetry.csv"
+
+    def test_missing_file_reads_nothing_until_created(self) -> None:
+        reader = TailReader(self.path)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.read_lines(), [])
+
+        _append(self.path, "a\n")
+
+        self.assertEqual(reader.read_lines(), ["a"])
+
+    def test_reads_only_appended_complete_lines(self) -> None:
+        reader = TailReader(self.path)
+        self.addCleanup(reader.close)
+        _append(self.path, "a\nb\npar")
+
+        self.assertEqual(reader.read_lines(), ["a", "b"])
+        self.assertEqual(reader.read_lines(), [])
+        _append(self.path, "tial\nc\n")
+        self.assertEqual(reader.read_lines(), ["partial", "c"])
+
+    def test_truncation_restarts_from_beginning(self) -> None:
+        reader = TailReader(self.path)
+        self.addCleanup(reader.close)
+        _append(self.path, "old-1\nold-2\n")
+        reader.read_lines()
+
+        self.path.write_text("new\n", encoding="utf-8")
+
+        self.assertEqual(reader.read_lines(), ["new"])
+        self.assertEqual(reader.truncation_count, 1)
+
+    def test_rotation_drains_old_file_then_follows_new(self) -> None:
+        reader = TailReader(self.path)
+        self.addCleanup(reader.close)
+        _append(self.path, "a\n")
+        reader.read_lines()
+        _append(self.path, "b\n")
+        os.rename(self.path, self.path.with_suffix(".csv.1"))
+        _append(self.path, "c\n")
+
+        self.assertEqual(reader.read_lines(), ["b", "c"])
+        self.assertEqual(reader.rotation_count, 1)
+
+    def test_skips_content_present_before_the_reader_started(self) -> None:
+        _append(self.path, "stale-1\nstale-2\ncut-off-li")
+        reader = TailReader(self.path)
+        self.addCleanup(reader.close)
+
+        self.assertEqual(reader.read_lines(), [])
+        _append(self.path, "ne\nfresh\n")
+
+        self.assertEqual(reader.read_lines(), ["fresh"])
+        self.assertEqual(reader.skipped_byte_count, len("stale-1\nstale-2\ncut-off-li"))
+
+    def test_file_replaced_before_first_read_is_read_from_start(self) -> None:
+        _append(self.path, "stale\n")
+        reader = TailReader(self.path)
+        self.addCleanup(reader.close)
+        os.rename(self.path, self.path.with_suffix(".csv.1"))
+        _append(self.path, "new\n")
+
+        self.assertEqual(reader.read_lines(), ["new"])
+
+    def test_skip_existing_can_be_disabled(self) -> None:
+        _append(self.path, "kept\n")
+        reader = TailReader(self.path, skip_existing=False)
+        self.addCleanup(reader.close)
+
+        self.assertEqual(reader.read_lines(), ["kept"])
+
+
+class TestTelemetryRowParser(unittest.TestCase):
+    def test_nvidia_smi_header_and_rows(self) -> None:
+        parser = TelemetryRowParser("csv")
+
+        self.assertIsNone(parser.parse(_NVIDIA_SMI_HEADER))
+        sample = parser.parse("2026/01/01 12:00:00.500, 0, 87 %, 40 %, 1380 MHz, 250.5 W, 1500000\n")
+
+        assert sample is not None
+        self.assertEqual(sample.gpu_util_pct, 87.0)
+        self.assertEqual(sample.mem_util_pct, 40.0)
+        self.assertEqual(sample.graphics_clock_mhz, 1380)
+        self.assertEqual(sample.power_w, 250.5)
+        self.assertEqual(sample.energy_j, 1500.0)
+        self.assertEqual(parser.malformed_row_count, 0)
+
+    def test_headerless_columns_with_nounits(self) -> None:
+        parser = TelemetryRowParser(
+            "csv",
+            columns=["timestamp", "utilization.gpu", "utilization.memory", "clocks.gr", "power.draw"],
+        )
+
+        sample = parser.parse("2026/01/01 12:00:00.500, 87, 40, 1380, [N/A]")
+
+        assert sample is not None
+        self.assertEqual(sample.gpu_util_pct, 87.0)
+        self.assertEqual(sample.mem_util_pct, 40.0)
+        self.assertEqual(sample.graphics_clock_mhz, 1380)
+        self.assertIsNone(sample.power_w)
+        self.assertAlmostEqual(sample.timestamp_unix_s % 1.0, 0.5, places=6)
+
+    def test_energy_counter_converted_from_millijoules(self) -> None:
+        parser = TelemetryRowParser("csv")
+        parser.parse("timestamp, index, clocks.gr [MHz], total_energy_consumption [mJ]")
+
+        sample = parser.parse("12.0, 0, 1410, 1500000")
+
+        assert sample is not None
+        self.assertEqual(sample.energy_j, 1500.0)
+
+    def test_device_filter_skips_other_gpus(self) -> None:
+        parser = TelemetryRowParser("csv", device_index=1)
+        parser.parse("timestamp_unix_s,gpu_index,graphics_clock_mhz")
+
+        self.assertIsNone(parser.parse("1.0,0,900"))
+        sample = parser.parse("1.0,1,1200")
+
+        assert sample is not None
+        self.assertEqual(sample.graphics_clock_mhz, 1200)
+        self.assertEqual(parser.malformed_row_count, 0)
+
+    def test_jsonl_rows(self) -> None:
+        parser = TelemetryRowParser("jsonl")
+
+        sample = parser.parse(
+            json.dumps({"timestamp_unix_s": 3.0, "gpu_util_pct": 55, "graphics_clock_mhz": 1005, "extra": 1})
+        )
+
+        assert sample is not None
+        self.assertEqual(sample.timestamp_unix_s, 3.0)
+        self.assertEqual(sample.gpu_util_pct, 55.0)
+        self.assertEqual(sample.graphics_clock_mhz, 1005)
+
+    def test_malformed_rows_are_counted(self) -> None:
+        csv_parser = TelemetryRowParser("csv")
+        self.assertIsNone(csv_parser.parse("1.0,2.0,3.0"))  # before any header
+        csv_parser.parse("timestamp,graphics_clock_mhz")
+        self.assertIsNone(csv_parser.parse("1.0"))  # wrong width
+        self.assertIsNone(csv_parser.parse("1.0,fast"))
+        jsonl_parser = TelemetryRowParser("jsonl")
+        self.assertIsNone(jsonl_parser.parse("[1, 2]"))
+        self.assertIsNone(jsonl_parser.parse('{"gpu_util_pct": 1}'))  # no clock
+
+        self.assertEqual(csv_parser.malformed_row_count, 3)
+        self.assertEqual(jsonl_parser.malformed_row_count, 2)
+
+    def test_rejects_unknown_format(self) -> None:
+        with self.assertRaises(ValueError):
+            TelemetryRowParser("parquet")
+
+
+class TestFileTelemetryProvider(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "telemetry.csv"
+        self.now = 10.0
+
+    def _provider(self, path: Path, **kwargs: object) -> FileTelemetryProvider:
+        provider = FileTelemetryProvider(path, clock=lambda: self.now, **kwargs)  # type: ignore[arg-type]
+        self.addCleanup(provider.close)
+        return provider
+
+    def test_aggregates_rows_appended_since_previous_window(self) -> None:
+        provider: WindowTelemetryProvider = self._provider(self.path)
+        _append(
+            self.path,
+            "timestamp,utilization.gpu,clocks.gr,power.draw\n"
+            "9.0,20,900,100\n"
+            "9.5,40,900,100\n",
+        )
+
+        first = provider.get_window(_CONTEXT, sequence_id=0)
+        _append(self.path, "10.5,80,1200,300\n11.0,100,1200,300\n")
+        self.now = 11.0
+        second = provider.get_window(_CONTEXT, sequence_id=1)
+
+        self.assertEqual(first.sample_count, 2)
+        self.assertAlmostEqual(first.gpu_util_avg_pct, 30.0)
+        self.assertAlmostEqual(first.energy_delta_j, 50.0)
+        self.assertEqual((second.start_unix_s, second.end_unix_s), (10.0, 11.0))
+        self.assertEqual(second.sample_count, 2)
+        self.assertAlmostEqual(second.gpu_util_avg_pct, 90.0)
+        self.assertAlmostEqual(second.graphics_clock_avg_mhz, 1200.0)
+        # 9.5 -> 10.5 trapezoid (200 W avg) plus 10.5 -> 11.0 at 300 W.
+        self.assertAlmostEqual(second.energy_delta_j, 200.0 + 150.0)
+        self.assertEqual(second.custom_metrics["gpu_util_pct_max"], 100.0)
+
+    def test_window_without_new_rows_raises_lookup_error(self) -> None:
+        provider = self._provider(self.path)
+
+        with self.assertRaises(LookupError):
+            provider.get_window(_CONTEXT, sequence_id=0)
+
+        _append(self.path, "timestamp,clocks.gr\n10.0,1410\n")
+        self.assertEqual(provider.get_window(_CONTEXT, sequence_id=1).sample_count, 1)
+        with self.assertRaises(LookupError):
+            provider.get_window(_CONTEXT, sequence_id=2)
+
+    def test_rows_logged_before_start_are_skipped_but_header_is_kept(self) -> None:
+        _append(self.path, "timestamp,utilization.gpu,clocks.gr\n" + "1.0,5,300\n" * 100)
+        provider = self._provider(self.path)
+        _append(self.path, "9.5,60,1200\n")
+
+        window = provider.get_window(_CONTEXT, sequence_id=0)
+
+        self.assertEqual(window.sample_count, 1)
+        self.assertEqual(window.gpu_util_avg_pct, 60.0)
+        self.assertEqual(provider.metrics()["malformed_row_count"], 0)
+
+    def test_jsonl_format_from_suffix(self) -> None:
+        path = Path(self._tmp.name) / "telemetry.jsonl"
+        provider = self._provider(path)
+        _append(path, json.dumps({"timestamp_unix_s": 9.5, "graphics_clock_mhz": 1110}) + "\n")
+
+        window = provider.get_window(_CONTEXT, sequence_id=0)
+
+        self.assertEqual(window.graphics_clock_avg_mhz, 1110.0)
+        self.assertEqual(provider.metrics()["row_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
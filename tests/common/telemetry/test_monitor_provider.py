@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from pathlib import Path
+
+from src.common.experiment.types import (
+    ExperimentContext,
+    ExperimentMetadata,
+    PlatformSpec,
+)
+from src.common.telemetry import MonitorLineParser, MonitorTelemetrySource
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="TestGPU",
+    gpu_count=2,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+_METADATA = ExperimentMetadata(
+    run_id="test-run-001",
+    experiment_id="test-exp",
+    policy_name="max_freq",
+    workload_name="synthetic",
+    started_at_utc="2026-01-01T00:00:00Z",
+)
+
+_CONTEXT = ExperimentContext(
+    platform=_PLATFORM,
+    metadata=_METADATA,
+    pd_target=0.05,
+    window_seconds=1.0,
+    sampling_interval_ms=1000,
+)
+
+# Recorded ``nvidia-smi dmon -s pucm -o T`` output for two GPUs.
+_DMON_OUTPUT = """\
+#Time        gpu    pwr  gtemp  mtemp     sm    mem    enc    dec    jpg    ofa   mclk   pclk     fb   bar1
+#HH:MM:SS    Idx      W      C      C      %      %      %      %      %      %    MHz    MHz     MB     MB
+ 12:00:01      0    251     61      -     97     42      0      0      0      0   1593   1410  40213      5
+ 12:00:01      1     88     45      -     12      3      0      0      0      0   1593    900   1024      5
+"""
+
+# Recorded ``amd-smi monitor -p -u -t`` output.
+_AMD_SMI_OUTPUT = """\
+GPU  POWER   GPU_TEMP   MEM_TEMP   GFX_UTIL   GFX_CLOCK   MEM_UTIL   MEM_CLOCK
+  0  312 W      58 °C      66 °C       93 %    1700 MHz       51 %    1600 MHz
+"""
+
+
+def _fake_monitor(tmp: str, output: str) -> list[str]:
+    """Returns a command for a monitor that prints *output* and exits."""
+    script = Path(tmp) / "fake_monitor.py"
+    script.write_text(
+        textwrap.dedent(
+            f"""\
+            import sys
+            sys.stdout.write({output!r})
+            sys.stdout.flush()
+            """
+        ),
+        encoding="utf-8",
+    )
+    return [sys.executable, str(script)]
+
+
+def _wait_for(predicate, timeout_s: float = 10.0) -> bool:  # type: ignore[no-untyped-def]
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestMonitorLineParser(unittest.TestCase):
+    def test_parses_dmon_rows(self) -> None:
+        parser = MonitorLineParser(clock=lambda: 42.0)
+
+        samples = [parser.parse(line) for line in _DMON_OUTPUT.splitlines()]
+
+        self.assertIsNone(samples[0])
+        self.assertIsNone(samples[1])
+        first, second = samples[2], samples[3]
+        assert first is not None and second is not None
+        self.assertEqual(first.timestamp_unix_s, 42.0)
+        self.assertEqual(first.raw_counters, {"gpu_index": 0})
+        self.assertEqual(first.power_w, 251.0)
+        self.assertEqual(first.temperature_c, 61.0)
+        self.assertEqual(first.gpu_util_pct, 97.0)
+        self.assertEqual(first.mem_util_pct, 42.0)
+        self.assertEqual(first.graphics_clock_mhz, 1410)
+        self.assertEqual(second.raw_counters, {"gpu_index": 1})
+        self.assertEqual(second.graphics_clock_mhz, 900)
+        self.assertEqual(parser.malformed_row_count, 0)
+
+    def test_parses_amd_smi_rows_with_units(self) -> None:
+        parser = MonitorLineParser(clock=lambda: 1.0)
+
+        samples = [parser.parse(line) for line in _AMD_SMI_OUTPUT.splitlines()]
+
+        sample = samples[1]
+        assert sample is not None
+        self.assertEqual(sample.power_w, 312.0)
+        self.assertEqual(sample.temperature_c, 58.0)
+        self.assertEqual(sample.gpu_util_pct, 93.0)
+        self.assertEqual(sample.mem_util_pct, 51.0)
+        self.assertEqual(sample.graphics_clock_mhz, 1700)
+
+    def test_rows_before_header_or_without_clock_are_malformed(self) -> None:
+        parser = MonitorLineParser()
+        self.assertIsNone(parser.parse("0 251 61"))
+        parser.parse("# gpu pwr pclk")
+        self.assertIsNone(parser.parse("0 251 -"))
+        self.assertIsNone(parser.parse("0 251"))
+
+        self.assertEqual(parser.malformed_row_count, 3)
+
+
+class TestMonitorTelemetrySource(unittest.TestCase):
+    def test_routes_rows_per_device_and_restarts_exited_monitor(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = MonitorTelemetrySource(
+                _fake_monitor(tmp, _DMON_OUTPUT),
+                device_indices=[0, 1],
+                restart_backoff_s=0.01,
+                max_restarts=2,
+            )
+            self.addCleanup(source.stop)
+            source.start()
+
+            self.assertTrue(_wait_for(lambda: source.sample_count == 6))
+            source.stop()
+
+        gpu0 = source.provider(0).get_window(_CONTEXT, sequence_id=0)
+        gpu1 = source.provider(1).get_window(_CONTEXT, sequence_id=0)
+        self.assertEqual(gpu0.sample_count, 3)
+        self.assertEqual(gpu0.graphics_clock_avg_mhz, 1410.0)
+        self.assertEqual(gpu0.custom_metrics["power_w_max"], 251.0)
+        self.assertEqual(gpu1.sample_count, 3)
+        self.assertEqual(gpu1.graphics_clock_avg_mhz, 900.0)
+        metrics = source.metrics()
+        self.assertEqual(metrics["restart_count"], 2)
+        self.assertEqual(metrics["dropped_row_count"], 0)
+
+    def test_unrouted_source_feeds_one_provider_and_empty_window_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = MonitorTelemetrySource(
+                _fake_monitor(tmp, _AMD_SMI_OUTPUT),
+                restart_backoff_s=0.01,
+                max_restarts=0,
+            )
+            self.addCleanup(source.stop)
+            provider = source.provider()
+
+            source.start()
+            self.assertTrue(_wait_for(lambda: source.sample_count == 1))
+            window = provider.get_window(_CONTEXT, sequence_id=0)
+            with self.assertRaises(LookupError):
+                provider.get_window(_CONTEXT, sequence_id=1)
+
+        self.assertEqual(window.graphics_clock_avg_mhz, 1700.0)
+
+    def test_first_window_starts_source_and_waits_for_its_first_sample(self) -> None:
+        script = (
+            "import sys, time\n"
+            "time.sleep(0.2)\n"
+            f"sys.stdout.write({_AMD_SMI_OUTPUT!r})\n"
+            "sys.stdout.flush()\n"
+            "time.sleep(60)\n"
+        )
+        source = MonitorTelemetrySource([sys.executable, "-c", script], max_restarts=0)
+        self.addCleanup(source.stop)
+
+        window = source.provider().get_window(_CONTEXT, sequence_id=0)
+
+        self.assertEqual(window.sample_count, 1)
+        self.assertEqual(window.graphics_clock_avg_mhz, 1700.0)
+
+    def test_stop_terminates_long_running_monitor(self) -> None:
+        source = MonitorTelemetrySource(
+            [sys.executable, "-c", "import time\nprint('# gpu pclk', flush=True)\ntime.sleep(60)"],
+            restart_backoff_s=0.01,
+        )
+        source.start()
+        self.assertTrue(_wait_for(lambda: source.start_count == 1))
+
+        started = time.monotonic()
+        source.stop()
+
+        self.assertLess(time.monotonic() - started, 5.0)
+        self.assertEqual(source.metrics()["restart_count"], 0)
+
+    def test_rejects_empty_command(self) -> None:
+        with self.assertRaises(ValueError):
+            MonitorTelemetrySource([])
+
+
+if __name__ == "__main__":
+    unittest.main()
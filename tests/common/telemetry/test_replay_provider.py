@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.common.experiment.types import (
+    ExperimentContext,
+    ExperimentMetadata,
+    PlatformSpec,
+)
+from src.common.telemetry import TelemetrySource, TraceReplayProvider, TraceReplaySource, load_trace
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="TestGPU",
+    gpu_count=2,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+_METADATA = ExperimentMetadata(
+    run_id="test-run-001",
+    experiment_id="test-exp",
+    policy_name="max_freq",
+    workload_name="synthetic",
+    started_at_utc="2026-01-01T00:00:00Z",
+)
+
+_CONTEXT = ExperimentContext(
+    platform=_PLATFORM,
+    metadata=_METADATA,
+    pd_target=0.05,
+    window_seconds=1.0,
+    sampling_interval_ms=100,
+)
+
+
+class TestLoadTrace(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+
+    def test_window_csv_keeps_recorded_fields_and_extra_columns(self) -> None:
+        path = self.root / "windows.csv"
+        path.write_text(
+            "start_unix_s,end_unix_s,gpu_util_avg_pct,graphics_clock_avg_mhz,"
+            "power_avg_w,performance_ratio\n"
+            "100,105,80,1410,250,1.0\n"
+            "105,110,40,1005,,0.97\n",
+            encoding="utf-8",
+        )
+
+        windows = load_trace(path, window_seconds=1.0)
+
+        self.assertEqual(len(windows), 2)
+        self.assertEqual(windows[0].duration_s, 5.0)
+        self.assertEqual(windows[0].power_avg_w, 250.0)
+        self.assertEqual(windows[1].graphics_clock_avg_mhz, 1005.0)
+        self.assertIsNone(windows[1].power_avg_w)
+        self.assertEqual(windows[1].custom_metrics, {"performance_ratio": 0.97})
+
+    def test_window_jsonl_without_times_is_laid_out_on_the_window_grid(self) -> None:
+        path = self.root / "windows.jsonl"
+        rows = [
+            {"gpu_index": 0, "gpu_util_avg_pct": 10, "graphics_clock_avg_mhz": 900},
+            {"gpu_index": 1, "gpu_util_avg_pct": 90, "graphics_clock_avg_mhz": 1410},
+            {
+                "gpu_index": 0,
+                "gpu_util_avg_pct": 20,
+                "graphics_clock_avg_mhz": 915,
+                "custom_metrics": {"phase": "io"},
+            },
+        ]
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+
+        windows = load_trace(path, window_seconds=2.0, device_index=0)
+
+        self.assertEqual([window.gpu_util_avg_pct for window in windows], [10.0, 20.0])
+        self.assertEqual([window.end_unix_s for window in windows], [2.0, 4.0])
+        self.assertEqual(windows[1].custom_metrics, {"phase": "io"})
+
+    def test_sample_csv_is_binned_into_windows_and_skips_gaps(self) -> None:
+        path = self.root / "samples.csv"
+        path.write_text(
+            "timestamp,utilization.gpu,clocks.gr,power.draw\n"
+            "10.0,50,1410,200\n"
+            "10.5,70,1410,220\n"
+            "11.0,30,900,100\n"
+            "13.2,90,1200,300\n",
+            encoding="utf-8",
+        )
+
+        windows = load_trace(path, window_seconds=1.0)
+
+        self.assertEqual([window.sample_count for window in windows], [2, 1, 1])
+        self.assertEqual([window.start_unix_s for window in windows], [10.0, 11.0, 13.0])
+        self.assertEqual(windows[0].gpu_util_avg_pct, 60.0)
+        self.assertEqual(windows[1].graphics_clock_avg_mhz, 900.0)
+
+    def test_npz_sample_and_window_traces(self) -> None:
+        samples = self.root / "samples.npz"
+        np.savez(
+            samples,
+            timestamp_unix_s=np.arange(4) * 0.5,
+            gpu_util_pct=np.array([10.0, 30.0, 50.0, 70.0]),
+            graphics_clock_mhz=np.full(4, 1410.0),
+            power_w=np.array([100.0, np.nan, 300.0, 300.0]),
+        )
+        windows_path = self.root / "windows.npz"
+        np.savez(windows_path, graphics_clock_avg_mhz=np.array([1410.0, 1200.0]))
+
+        windows = load_trace(samples, window_seconds=1.0)
+        recorded = load_trace(windows_path, window_seconds=5.0)
+
+        self.assertEqual([window.gpu_util_avg_pct for window in windows], [20.0, 60.0])
+        self.assertEqual(windows[0].power_avg_w, 100.0)
+        self.assertEqual([window.graphics_clock_avg_mhz for window in recorded], [1410.0, 1200.0])
+        self.assertEqual(recorded[1].start_unix_s, 5.0)
+
+    def test_rejects_unknown_format(self) -> None:
+        with self.assertRaises(ValueError):
+            load_trace(self.root / "trace.parquet", window_seconds=1.0, row_format="parquet")
+
+
+class TestTraceReplay(unittest.TestCase):
+    def test_replays_windows_by_sequence_id_until_exhausted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "windows.csv"
+            path.write_text("graphics_clock_avg_mhz\n1410\n1200\n", encoding="utf-8")
+            provider = TraceReplayProvider.from_path(path, window_seconds=1.0)
+
+        second = provider.get_window(_CONTEXT, sequence_id=1)
+        with self.assertRaises(LookupError):
+            provider.get_window(_CONTEXT, sequence_id=2)
+
+        self.assertEqual(len(provider), 2)
+        self.assertEqual(second.sequence_id, 1)
+        self.assertEqual(second.graphics_clock_avg_mhz, 1200.0)
+        self.assertEqual(provider.metrics(), {"window_count": 2, "replayed_count": 1})
+
+    def test_source_window_count_is_the_shortest_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "windows.csv"
+            path.write_text("index,graphics_clock_avg_mhz\n0,1410\n1,900\n0,1200\n", encoding="utf-8")
+            gpu0 = TraceReplayProvider.from_path(path, window_seconds=1.0, device_index=0)
+            gpu1 = TraceReplayProvider.from_path(path, window_seconds=1.0, device_index=1)
+        source = TraceReplaySource({0: gpu0, 1: gpu1})
+
+        self.assertIsInstance(source, TelemetrySource)
+        self.assertEqual(source.window_count, 1)
+        self.assertEqual(source.provider(1).get_window(_CONTEXT, 0).graphics_clock_avg_mhz, 900.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import unittest
+
+from src.common.experiment.types import (
+    ExperimentContext,
+    ExperimentMetadata,
+    PlatformSpec,
+    TelemetrySample,
+)
+from src.common.telemetry import WindowTelemetryProvider
+from src.common.telemetry.ring_buffer import (
+    RingBufferTelemetryProvider,
+    SampleRingBuffer,
+    aggregate_window,
+)
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="TestGPU",
+    gpu_count=1,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+_METADATA = ExperimentMetadata(
+    run_id="test-run-001",
+    experiment_id="test-exp",
+    policy_name="max_freq",
+    workload_name="synthetic",
+    started_at_utc="2026-01-01T00:00:00Z",
+)
+
+
+def _make_context(*, window_seconds: float = 1.0) -> ExperimentContext:
+    return ExperimentContext(
+        platform=_PLATFORM,
+        metadata=_METADATA,
+        pd_target=0.05,
+        window_seconds=window_seconds,
+        sampling_interval_ms=100,
+    )
+
+
+def _sample(
+    timestamp_s: float,
+    *,
+    util: float = 50.0,
+    clock: int = 1410,
+    power: float | None = 200.0,
+    energy: float | None = None,
+) -> TelemetrySample:
+    return TelemetrySample(
+        timestamp_unix_s=timestamp_s,
+        gpu_util_pct=util,
+        mem_util_pct=util / 2,
+        graphics_clock_mhz=clock,
+        power_w=power,
+        energy_j=energy,
+    )
+
+
+class TestSampleRingBuffer(unittest.TestCase):
+    def test_rejects_tiny_capacity(self) -> None:
+        with self.assertRaises(ValueError):
+            SampleRingBuffer(1)
+
+    def test_rejects_out_of_order_samples(self) -> None:
+        buffer = SampleRingBuffer(4)
+        buffer.append(_sample(2.0))
+        with self.assertRaises(ValueError):
+            buffer.append(_sample(1.0))
+
+    def test_overwrites_oldest_when_full(self) -> None:
+        buffer = SampleRingBuffer(4)
+        for i in range(10):
+            buffer.append(_sample(float(i)))
+
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.appended_count, 10)
+        self.assertEqual(buffer.overwritten_count, 6)
+        columns = buffer.window_columns(-1.0, 100.0)
+        assert columns is not None
+        self.assertEqual(columns[0].tolist(), [6.0, 7.0, 8.0, 9.0])
+
+    def test_window_includes_held_sample_before_start_across_wraparound(self) -> None:
+        buffer = SampleRingBuffer(5)
+        for i in range(8):  # physical layout wraps: [5, 6, 7, 3, 4]
+            buffer.append(_sample(float(i)))
+
+        for start, end, expected in (
+            (4.5, 6.0, [4.0, 5.0, 6.0]),
+            (4.0, 6.5, [4.0, 5.0, 6.0]),
+            (3.0, 4.0, [3.0, 4.0]),
+            (5.0, 7.0, [5.0, 6.0, 7.0]),
+            (0.0, 3.5, [3.0]),
+        ):
+            with self.subTest(start=start, end=end):
+                columns = buffer.window_columns(start, end)
+                assert columns is not None
+                self.assertEqual(columns[0].tolist(), expected)
+
+    def test_window_before_first_sample_is_none(self) -> None:
+        buffer = SampleRingBuffer(4)
+        self.assertIsNone(buffer.window_columns(0.0, 1.0))
+        buffer.append(_sample(5.0))
+        self.assertIsNone(buffer.window_columns(0.0, 1.0))
+
+
+class TestAggregateWindow(unittest.TestCase):
+    def test_means_are_weighted_by_hold_duration(self) -> None:
+        buffer = SampleRingBuffer(8)
+        buffer.append(_sample(9.0, util=0.0, power=100.0))
+        buffer.append(_sample(10.25, util=40.0, power=100.0))
+        buffer.append(_sample(10.5, util=100.0, power=300.0))
+        columns = buffer.window_columns(10.0, 11.0)
+        assert columns is not None
+
+        window = aggregate_window(columns, 10.0, 11.0, sequence_id=4)
+
+        self.assertEqual(window.sequence_id, 4)
+        self.assertEqual(window.sample_count, 2)
+        self.assertAlmostEqual(window.duration_s, 1.0)
+        self.assertAlmostEqual(window.gpu_util_avg_pct, 0.25 * 0 + 0.25 * 40 + 0.5 * 100)
+        self.assertAlmostEqual(window.power_avg_w, 200.0)
+        self.assertAlmostEqual(window.energy_delta_j, 200.0)
+
+    def test_energy_counter_difference_wins_over_power(self) -> None:
+        buffer = SampleRingBuffer(8)
+        buffer.append(_sample(0.0, energy=1_000.0))
+        buffer.append(_sample(0.5, energy=1_090.0))
+        buffer.append(_sample(1.0, energy=1_210.0))
+        columns = buffer.window_columns(0.0, 1.0)
+        assert columns is not None
+
+        window = aggregate_window(columns, 0.0, 1.0, sequence_id=0)
+
+        self.assertAlmostEqual(window.energy_delta_j, 210.0)
+
+    def test_energy_counter_wrap_and_reset(self) -> None:
+        buffer = SampleRingBuffer(8)
+        buffer.append(_sample(0.0, power=100.0, energy=990.0))
+        buffer.append(_sample(0.5, power=100.0, energy=1_040.0))
+        buffer.append(_sample(1.0, power=300.0, energy=30.0))
+        columns = buffer.window_columns(0.0, 1.0)
+        assert columns is not None
+
+        wrapped = aggregate_window(columns, 0.0, 1.0, sequence_id=0, energy_counter_wrap_j=1_050.0)
+        reset = aggregate_window(columns, 0.0, 1.0, sequence_id=0)
+
+        self.assertAlmostEqual(wrapped.energy_delta_j, 50.0 + 40.0)
+        # Without a modulus the backwards step is a reset: use mean power instead.
+        self.assertAlmostEqual(reset.energy_delta_j, 100.0)
+
+    def test_missing_power_yields_none(self) -> None:
+        buffer = SampleRingBuffer(4)
+        buffer.append(_sample(0.0, power=None))
+        buffer.append(_sample(0.5, power=None))
+        columns = buffer.window_columns(0.0, 1.0)
+        assert columns is not None
+
+        window = aggregate_window(columns, 0.0, 1.0, sequence_id=0)
+
+        self.assertIsNone(window.power_avg_w)
+        self.assertIsNone(window.energy_delta_j)
+
+
+class TestRingBufferTelemetryProvider(unittest.TestCase):
+    def test_builds_window_ending_at_clock(self) -> None:
+        buffer = SampleRingBuffer(64)
+        for i in range(25):
+            buffer.append(_sample(i * 0.125, clock=1200))
+        provider: WindowTelemetryProvider = RingBufferTelemetryProvider(buffer, clock=lambda: 3.0)
+
+        window = provider.get_window(_make_context(window_seconds=1.0), sequence_id=2)
+
+        self.assertAlmostEqual(window.start_unix_s, 2.0)
+        self.assertEqual(window.end_unix_s, 3.0)
+        self.assertEqual(window.sample_count, 8)
+        self.assertAlmostEqual(window.graphics_clock_avg_mhz, 1200.0)
+
+    def test_empty_buffer_raises_lookup_error(self) -> None:
+        provider = RingBufferTelemetryProvider(SampleRingBuffer(4), clock=lambda: 3.0)
+        with self.assertRaises(LookupError):
+            provider.get_window(_make_context(), sequence_id=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
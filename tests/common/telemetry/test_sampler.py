@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import threading
+import unittest
+
+from src.common.experiment.types import TelemetrySample
+from src.common.telemetry import TelemetrySampler
+
+
+class _ListSink:
+    def __init__(self, target_count: int) -> None:
+        self.samples: list[TelemetrySample] = []
+        self.done = threading.Event()
+        self._target_count = target_count
+
+    def append(self, sample: TelemetrySample) -> None:
+        self.samples.append(sample)
+        if len(self.samples) >= self._target_count:
+            self.done.set()
+
+
+def _sample(timestamp_s: float) -> TelemetrySample:
+    return TelemetrySample(
+        timestamp_unix_s=timestamp_s,
+        gpu_util_pct=50.0,
+        mem_util_pct=25.0,
+        graphics_clock_mhz=1410,
+    )
+
+
+class TestTelemetrySampler(unittest.TestCase):
+    def test_rejects_non_positive_interval(self) -> None:
+        with self.assertRaises(ValueError):
+            TelemetrySampler(lambda: _sample(0.0), _ListSink(1), interval_s=0.0)
+
+    def test_appends_samples_until_stopped(self) -> None:
+        counter = iter(range(1_000_000))
+        sink = _ListSink(target_count=5)
+
+        with TelemetrySampler(lambda: _sample(float(next(counter))), sink, interval_s=0.001) as sampler:
+            self.assertTrue(sink.done.wait(5.0))
+
+        count = sampler.sample_count
+        self.assertGreaterEqual(count, 5)
+        self.assertEqual(len(sink.samples), count)
+        self.assertEqual(
+            [s.timestamp_unix_s for s in sink.samples],
+            [float(i) for i in range(count)],
+        )
+        self.assertEqual(sampler.metrics()["error_count"], 0)
+
+    def test_read_errors_are_counted_and_sampling_continues(self) -> None:
+        calls = iter(range(1_000_000))
+        sink = _ListSink(target_count=3)
+
+        def read() -> TelemetrySample:
+            index = next(calls)
+            if index % 2 == 0:
+                raise RuntimeError("nvml busy")
+            return _sample(float(index))
+
+        sampler = TelemetrySampler(read, sink, interval_s=0.001)
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            sampler.start()
+            self.assertTrue(sink.done.wait(5.0))
+            sampler.stop()
+
+        self.assertGreaterEqual(sampler.error_count, 3)
+        self.assertEqual(sampler.last_error, "RuntimeError: nvml busy")
+        self.assertEqual(stderr.getvalue().count("telemetry sampler read failed"), 1)
+
+    def test_overrunning_reads_skip_missed_deadlines(self) -> None:
+        now = [0.0]
+        sink = _ListSink(target_count=2)
+
+        def read() -> TelemetrySample:
+            now[0] += 0.35  # each read takes 3.5 intervals
+            return _sample(now[0])
+
+        sampler = TelemetrySampler(read, sink, interval_s=0.1, clock=lambda: now[0])
+        sampler.start()
+        self.assertTrue(sink.done.wait(5.0))
+        sampler.stop()
+
+        self.assertGreaterEqual(sampler.skipped_deadline_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import os
+import struct
+import unittest
+from multiprocessing import shared_memory
+
+from src.common.experiment.types import (
+    ExperimentContext,
+    ExperimentMetadata,
+    PlatformSpec,
+    TelemetrySample,
+)
+from src.common.telemetry import (
+    SharedMemoryTelemetryProvider,
+    SharedMemoryTelemetryReader,
+    SharedMemoryTelemetryWriter,
+)
+from src.common.telemetry.shm_channel import HEADER_SIZE, SLOT_SIZE
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="TestGPU",
+    gpu_count=1,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+_METADATA = ExperimentMetadata(
+    run_id="test-run-001",
+    experiment_id="test-exp",
+    policy_name="max_freq",
+    workload_name="synthetic",
+    started_at_utc="2026-01-01T00:00:00Z",
+)
+
+_CONTEXT = ExperimentContext(
+    platform=_PLATFORM,
+    metadata=_METADATA,
+    pd_target=0.05,
+    window_seconds=1.0,
+    sampling_interval_ms=100,
+)
+
+
+def _segment_name(tag: str) -> str:
+    return f"gofs-test-{os.getpid()}-{tag}"
+
+
+def _sample(
+    timestamp_s: float,
+    *,
+    power_w: float | None = 200.0,
+    energy_j: float | None = None,
+) -> TelemetrySample:
+    return TelemetrySample(
+        timestamp_unix_s=timestamp_s,
+        gpu_util_pct=90.0,
+        mem_util_pct=40.0,
+        graphics_clock_mhz=1410,
+        power_w=power_w,
+        energy_j=energy_j,
+        temperature_c=None,
+    )
+
+
+class TestSharedMemoryChannel(unittest.TestCase):
+    def _writer(self, tag: str, capacity: int) -> SharedMemoryTelemetryWriter:
+        writer = SharedMemoryTelemetryWriter(_segment_name(tag), capacity=capacity)
+        self.addCleanup(writer.close)
+        return writer
+
+    def _reader(self, name: str) -> SharedMemoryTelemetryReader:
+        reader = SharedMemoryTelemetryReader(name)
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_reader_returns_each_sample_once_with_missing_values(self) -> None:
+        writer = self._writer("roundtrip", capacity=8)
+        reader = self._reader(writer.name)
+
+        writer.publish(_sample(1.0, energy_j=10.0))
+        writer.publish(_sample(2.0, power_w=None))
+        first = reader.read_new()
+        writer.publish(_sample(3.0))
+        second = reader.read_new()
+
+        self.assertEqual([sample.timestamp_unix_s for sample in first], [1.0, 2.0])
+        self.assertEqual(first[0].graphics_clock_mhz, 1410)
+        self.assertEqual(first[0].energy_j, 10.0)
+        self.assertIsNone(first[0].temperature_c)
+        self.assertIsNone(first[1].power_w)
+        self.assertEqual([sample.timestamp_unix_s for sample in second], [3.0])
+        self.assertEqual(reader.read_new(), [])
+
+    def test_lagging_reader_counts_overwritten_samples(self) -> None:
+        writer = self._writer("overrun", capacity=4)
+        reader = self._reader(writer.name)
+
+        for step in range(10):
+            writer.publish(_sample(float(step)))
+        samples = reader.read_new()
+
+        self.assertEqual([sample.timestamp_unix_s for sample in samples], [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(reader.lost_sample_count, 6)
+
+    def test_reader_attached_to_filled_channel_starts_at_write_count(self) -> None:
+        writer = self._writer("prefilled", capacity=4)
+        for step in range(10):
+            writer.publish(_sample(float(step)))
+        reader = self._reader(writer.name)
+
+        self.assertEqual(reader.read_new(), [])
+        writer.publish(_sample(10.0))
+
+        self.assertEqual([sample.timestamp_unix_s for sample in reader.read_new()], [10.0])
+        self.assertEqual((reader.skipped_sample_count, reader.lost_sample_count), (10, 0))
+
+    def test_slot_being_written_is_not_returned(self) -> None:
+        writer = self._writer("torn", capacity=4)
+        reader = self._reader(writer.name)
+        writer.publish(_sample(1.0))
+        # Simulate a writer caught between the odd and even sequence stores.
+        raw = shared_memory.SharedMemory(name=writer.name)
+        self.addCleanup(raw.close)
+        struct.pack_into("<Q", raw.buf, HEADER_SIZE, 1)
+
+        self.assertEqual(reader.read_new(), [])
+        self.assertEqual(reader.lost_sample_count, 1)
+        self.assertGreater(reader.retry_count, 0)
+
+    def test_rejects_segment_with_unknown_layout(self) -> None:
+        raw = shared_memory.SharedMemory(name=_segment_name("foreign"), create=True, size=SLOT_SIZE)
+        self.addCleanup(raw.unlink)
+        self.addCleanup(raw.close)
+
+        with self.assertRaises(ValueError):
+            SharedMemoryTelemetryReader(raw.name)
+
+
+class TestSharedMemoryTelemetryProvider(unittest.TestCase):
+    def test_windows_aggregate_published_samples(self) -> None:
+        now = [10.0]
+        provider = SharedMemoryTelemetryProvider(_segment_name("provider"), clock=lambda: now[0])
+        self.addCleanup(provider.close)
+
+        with self.assertRaises(LookupError):
+            provider.get_window(_CONTEXT, sequence_id=0)
+
+        writer = SharedMemoryTelemetryWriter(provider.name, capacity=16)
+        self.addCleanup(writer.close)
+        writer.publish(_sample(10.5, energy_j=100.0))
+        writer.publish(_sample(11.0, energy_j=150.0))
+        now[0] = 11.0
+        window = provider.get_window(_CONTEXT, sequence_id=1)
+        now[0] = 12.0
+        with self.assertRaises(LookupError):
+            provider.get_window(_CONTEXT, sequence_id=2)
+
+        self.assertEqual(window.sample_count, 2)
+        self.assertEqual(window.graphics_clock_avg_mhz, 1410.0)
+        self.assertEqual(window.energy_delta_j, 50.0)
+        self.assertEqual(window.custom_metrics["energy_source"], "counter")
+        self.assertEqual(provider.metrics()["lost_sample_count"], 0)
+
+    def test_provider_skips_samples_published_before_it_was_created(self) -> None:
+        now = [10.0]
+        writer = SharedMemoryTelemetryWriter(_segment_name("prestarted"), capacity=16)
+        self.addCleanup(writer.close)
+        for step in range(8):
+            writer.publish(_sample(float(step), power_w=50.0))
+        provider = SharedMemoryTelemetryProvider(writer.name, clock=lambda: now[0])
+        self.addCleanup(provider.close)
+
+        writer.publish(_sample(10.5, power_w=300.0))
+        now[0] = 11.0
+        window = provider.get_window(_CONTEXT, sequence_id=0)
+
+        self.assertEqual(window.sample_count, 1)
+        self.assertEqual(window.power_avg_w, 300.0)
+        self.assertEqual(provider.metrics()["skipped_sample_count"], 8)
+        self.assertEqual(provider.metrics()["lost_sample_count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import math
+import statistics
+import unittest
+
+from src.common.experiment.types import (
+    ExperimentContext,
+    ExperimentMetadata,
+    PlatformSpec,
+    TelemetrySample,
+)
+from src.common.telemetry import (
+    RunningStats,
+    StreamingTelemetryProvider,
+    StreamingWindowAggregator,
+    WindowTelemetryProvider,
+)
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="TestGPU",
+    gpu_count=1,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+_METADATA = ExperimentMetadata(
+    run_id="test-run-001",
+    experiment_id="test-exp",
+    policy_name="max_freq",
+    workload_name="synthetic",
+    started_at_utc="2026-01-01T00:00:00Z",
+)
+
+
+def _make_context(*, window_seconds: float = 1.0) -> ExperimentContext:
+    return ExperimentContext(
+        platform=_PLATFORM,
+        metadata=_METADATA,
+        pd_target=0.05,
+        window_seconds=window_seconds,
+        sampling_interval_ms=100,
+    )
+
+
+def _sample(
+    timestamp_s: float,
+    *,
+    util: float = 50.0,
+    clock: int = 1410,
+    power: float | None = None,
+    energy: float | None = None,
+    temperature: float | None = None,
+) -> TelemetrySample:
+    return TelemetrySample(
+        timestamp_unix_s=timestamp_s,
+        gpu_util_pct=util,
+        mem_util_pct=util / 2,
+        graphics_clock_mhz=clock,
+        power_w=power,
+        energy_j=energy,
+        temperature_c=temperature,
+    )
+
+
+class TestRunningStats(unittest.TestCase):
+    def test_matches_population_statistics(self) -> None:
+        values = [3.0, 7.5, 1.25, 9.0, 4.0, 4.0]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.mean, statistics.fmean(values))
+        self.assertAlmostEqual(stats.variance, statistics.pvariance(values))
+        self.assertAlmostEqual(stats.std, statistics.pstdev(values))
+        self.assertEqual((stats.min, stats.max), (1.25, 9.0))
+
+    def test_empty_has_no_variance(self) -> None:
+        self.assertIsNone(RunningStats().variance)
+        self.assertIsNone(RunningStats().std)
+
+
+class TestStreamingWindowAggregator(unittest.TestCase):
+    def test_window_means_and_custom_statistics(self) -> None:
+        aggregator = StreamingWindowAggregator()
+        for i, (util, clock, temperature) in enumerate(
+            ((20.0, 900, 60.0), (60.0, 1200, 64.0), (100.0, 1410, 62.0))
+        ):
+            aggregator.append(_sample(float(i), util=util, clock=clock, temperature=temperature))
+
+        window = aggregator.roll(0.0, 3.0, sequence_id=5)
+
+        self.assertEqual(window.sequence_id, 5)
+        self.assertEqual(window.sample_count, 3)
+        self.assertAlmostEqual(window.gpu_util_avg_pct, 60.0)
+        self.assertAlmostEqual(window.mem_util_avg_pct, 30.0)
+        self.assertAlmostEqual(window.graphics_clock_avg_mhz, 1170.0)
+        self.assertIsNone(window.power_avg_w)
+        self.assertIsNone(window.energy_delta_j)
+        metrics = window.custom_metrics
+        self.assertEqual(metrics["gpu_util_pct_min"], 20.0)
+        self.assertEqual(metrics["gpu_util_pct_max"], 100.0)
+        self.assertAlmostEqual(metrics["gpu_util_pct_std"], statistics.pstdev([20.0, 60.0, 100.0]))
+        self.assertEqual(metrics["graphics_clock_mhz_min"], 900)
+        self.assertEqual(metrics["temperature_c_max"], 64.0)
+        self.assertAlmostEqual(metrics["temperature_c_avg"], 62.0)
+        self.assertNotIn("power_w_max", metrics)
+        self.assertNotIn("energy_source", metrics)
+
+    def test_trapezoid_energy_without_counter(self) -> None:
+        aggregator = StreamingWindowAggregator()
+        aggregator.append(_sample(0.0, power=100.0))
+        aggregator.append(_sample(0.5, power=200.0))
+        aggregator.append(_sample(1.5, power=200.0))
+
+        window = aggregator.roll(0.0, 1.5, sequence_id=0)
+
+        self.assertAlmostEqual(window.energy_delta_j, 0.5 * 150.0 + 1.0 * 200.0)
+        self.assertAlmostEqual(window.power_avg_w, 500.0 / 3)
+        self.assertEqual(window.custom_metrics["power_w_max"], 200.0)
+        self.assertEqual(window.custom_metrics["energy_source"], "trapezoid")
+
+    def test_counter_wraparound_uses_modulus(self) -> None:
+        aggregator = StreamingWindowAggregator(energy_counter_wrap_j=1_000.0)
+        aggregator.append(_sample(0.0, energy=900.0))
+        aggregator.append(_sample(1.0, energy=980.0))
+        aggregator.append(_sample(2.0, energy=30.0))
+
+        window = aggregator.roll(0.0, 2.0, sequence_id=0)
+
+        self.assertAlmostEqual(window.energy_delta_j, 130.0)
+        self.assertEqual(window.custom_metrics["energy_source"], "counter")
+        self.assertEqual(aggregator.counter_wrap_count, 1)
+
+    def test_counter_reset_without_modulus_falls_back_to_trapezoid(self) -> None:
+        aggregator = StreamingWindowAggregator()
+        aggregator.append(_sample(0.0, power=100.0, energy=500.0))
+        aggregator.append(_sample(1.0, power=100.0, energy=600.0))
+        aggregator.append(_sample(2.0, power=300.0, energy=5.0))
+
+        window = aggregator.roll(0.0, 2.0, sequence_id=0)
+
+        self.assertAlmostEqual(window.energy_delta_j, 100.0 + 200.0)
+        self.assertEqual(window.custom_metrics["energy_source"], "mixed")
+        self.assertEqual(aggregator.counter_reset_count, 1)
+
+    def test_boundary_interval_belongs_to_next_window(self) -> None:
+        aggregator = StreamingWindowAggregator()
+        aggregator.append(_sample(0.0, energy=0.0))
+        aggregator.append(_sample(1.0, energy=10.0))
+        first = aggregator.roll(0.0, 1.0, sequence_id=0)
+        aggregator.append(_sample(2.0, energy=25.0))
+        second = aggregator.roll(1.0, 2.0, sequence_id=1)
+
+        self.assertAlmostEqual(first.energy_delta_j, 10.0)
+        self.assertAlmostEqual(second.energy_delta_j, 15.0)
+        self.assertEqual(second.sample_count, 1)
+
+    def test_single_power_sample_estimates_energy_from_duration(self) -> None:
+        aggregator = StreamingWindowAggregator()
+        aggregator.append(_sample(0.0, power=250.0))
+
+        window = aggregator.roll(0.0, 2.0, sequence_id=0)
+
+        self.assertAlmostEqual(window.energy_delta_j, 500.0)
+
+    def test_empty_window(self) -> None:
+        window = StreamingWindowAggregator().roll(0.0, 1.0, sequence_id=0)
+
+        self.assertEqual(window.sample_count, 0)
+        self.assertEqual(window.gpu_util_avg_pct, 0.0)
+        self.assertIsNone(window.power_avg_w)
+        self.assertEqual(window.custom_metrics, {})
+
+    def test_rejects_non_positive_wrap(self) -> None:
+        with self.assertRaises(ValueError):
+            StreamingWindowAggregator(energy_counter_wrap_j=0.0)
+
+
+class TestStreamingTelemetryProvider(unittest.TestCase):
+    def test_windows_tile_time_from_previous_end(self) -> None:
+        now = iter([10.0, 11.5])
+        aggregator = StreamingWindowAggregator()
+        provider: WindowTelemetryProvider = StreamingTelemetryProvider(
+            aggregator,
+            clock=lambda: next(now),
+        )
+
+        aggregator.append(_sample(9.5))
+        first = provider.get_window(_make_context(window_seconds=1.0), sequence_id=0)
+        aggregator.append(_sample(11.0))
+        second = provider.get_window(_make_context(window_seconds=1.0), sequence_id=1)
+
+        self.assertEqual((first.start_unix_s, first.end_unix_s), (9.0, 10.0))
+        self.assertEqual((second.start_unix_s, second.end_unix_s), (10.0, 11.5))
+        self.assertTrue(math.isclose(second.duration_s, 1.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
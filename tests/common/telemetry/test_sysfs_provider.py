@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.common.experiment.types import (
+    ExperimentContext,
+    ExperimentMetadata,
+    PlatformSpec,
+)
+from src.common.telemetry import (
+    SysfsGpuReader,
+    SysfsTelemetrySource,
+    TelemetrySource,
+    discover_drm_devices,
+)
+
+
+_PLATFORM = PlatformSpec(
+    vendor="amd",
+    gpu_model="MI210",
+    gpu_count=2,
+    min_graphics_clock_mhz=500,
+    max_graphics_clock_mhz=1700,
+    graphics_clock_step_mhz=100,
+)
+
+_METADATA = ExperimentMetadata(
+    run_id="test-run-001",
+    experiment_id="test-exp",
+    policy_name="max_freq",
+    workload_name="synthetic",
+    started_at_utc="2026-01-01T00:00:00Z",
+)
+
+_CONTEXT = ExperimentContext(
+    platform=_PLATFORM,
+    metadata=_METADATA,
+    pd_target=0.05,
+    window_seconds=1.0,
+    sampling_interval_ms=10,
+)
+
+_PP_DPM_SCLK = "0: 500Mhz\n1: 800Mhz *\n2: 1700Mhz\n"
+
+
+def _make_card(
+    root: Path,
+    card: int,
+    *,
+    busy: int = 37,
+    hwmon: dict[str, str] | None = None,
+    dpm_sclk: str | None = _PP_DPM_SCLK,
+) -> Path:
+    device_dir = root / f"card{card}" / "device"
+    device_dir.mkdir(parents=True)
+    (device_dir / "gpu_busy_percent").write_text(f"{busy}\n")
+    (device_dir / "mem_busy_percent").write_text("5\n")
+    if dpm_sclk is not None:
+        (device_dir / "pp_dpm_sclk").write_text(dpm_sclk)
+    hwmon_dir = device_dir / "hwmon" / "hwmon3"
+    hwmon_dir.mkdir(parents=True)
+    for name, value in (hwmon or {}).items():
+        (hwmon_dir / name).write_text(value)
+    return device_dir
+
+
+def _rewrite(path: Path, text: str) -> None:
+    # In-place rewrite keeps the inode, like a sysfs attribute refreshing.
+    with path.open("r+") as handle:
+        handle.truncate(0)
+        handle.write(text)
+
+
+class TestSysfsGpuReader(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+
+    def test_reads_hwmon_values_with_units_converted(self) -> None:
+        device_dir = _make_card(
+            self.root,
+            0,
+            hwmon={
+                "freq1_input": "1700000000\n",
+                "power1_average": "245500000\n",
+                "energy1_input": "1500000000\n",
+                "temp1_input": "61000\n",
+            },
+        )
+        with SysfsGpuReader(device_dir, clock=lambda: 5.0) as reader:
+            sample = reader.read_sample()
+
+        self.assertEqual(sample.timestamp_unix_s, 5.0)
+        self.assertEqual(sample.gpu_util_pct, 37.0)
+        self.assertEqual(sample.mem_util_pct, 5.0)
+        self.assertEqual(sample.graphics_clock_mhz, 1700)
+        self.assertAlmostEqual(sample.power_w, 245.5)
+        self.assertAlmostEqual(sample.energy_j, 1500.0)
+        self.assertAlmostEqual(sample.temperature_c, 61.0)
+
+    def test_falls_back_to_pp_dpm_sclk_and_rereads_open_files(self) -> None:
+        device_dir = _make_card(self.root, 0, hwmon={"power1_input": "100000000\n"})
+        with SysfsGpuReader(device_dir) as reader:
+            first = reader.read_sample()
+            _rewrite(device_dir / "pp_dpm_sclk", "0: 500Mhz *\n1: 800Mhz\n2: 1700Mhz\n")
+            _rewrite(device_dir / "gpu_busy_percent", "99\n")
+            second = reader.read_sample()
+
+        self.assertEqual(first.graphics_clock_mhz, 800)
+        self.assertAlmostEqual(first.power_w, 100.0)
+        self.assertIsNone(first.energy_j)
+        self.assertIsNone(first.temperature_c)
+        self.assertEqual(second.graphics_clock_mhz, 500)
+        self.assertEqual(second.gpu_util_pct, 99.0)
+
+    def test_unreadable_optional_value_reads_as_none(self) -> None:
+        device_dir = _make_card(self.root, 0, hwmon={"temp1_input": "N/A\n"})
+        with SysfsGpuReader(device_dir) as reader:
+            self.assertIsNone(reader.read_sample().temperature_c)
+
+    def test_requires_busy_percent_and_a_clock_source(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            SysfsGpuReader(self.root / "missing")
+        device_dir = _make_card(self.root, 0, dpm_sclk=None)
+        with self.assertRaises(FileNotFoundError):
+            SysfsGpuReader(device_dir)
+
+    def test_discover_skips_non_amdgpu_cards(self) -> None:
+        (self.root / "card0" / "device").mkdir(parents=True)  # BMC display adapter
+        second = _make_card(self.root, 2)
+        first = _make_card(self.root, 1)
+        (self.root / "card1-DP-1").mkdir()
+
+        self.assertEqual(discover_drm_devices(self.root), [first, second])
+        self.assertEqual(discover_drm_devices(self.root / "absent"), [])
+
+
+class TestSysfsTelemetrySource(unittest.TestCase):
+    def test_samples_each_device_in_background(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            source = SysfsTelemetrySource(
+                {0: _make_card(root, 1, busy=20), 1: _make_card(root, 2, busy=80)},
+                interval_s=0.005,
+            )
+            self.addCleanup(source.stop)
+            self.assertIsInstance(source, TelemetrySource)
+
+            source.start()
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline and any(
+                metrics["sample_count"] < 2 for metrics in source.metrics().values()  # type: ignore[index]
+            ):
+                time.sleep(0.005)
+            gpu0 = source.provider(0).get_window(_CONTEXT, sequence_id=0)
+            gpu1 = source.provider(1).get_window(_CONTEXT, sequence_id=0)
+            source.stop()
+
+        self.assertGreaterEqual(gpu0.sample_count, 2)
+        self.assertEqual(gpu0.gpu_util_avg_pct, 20.0)
+        self.assertEqual(gpu1.gpu_util_avg_pct, 80.0)
+        self.assertEqual(gpu1.graphics_clock_avg_mhz, 800.0)
+        self.assertEqual(source.metrics()["gpu1"]["error_count"], 0)  # type: ignore[index]
+
+    def test_first_window_without_manual_start_has_samples(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = SysfsTelemetrySource({None: _make_card(Path(tmp), 0, busy=40)}, interval_s=0.01)
+            self.addCleanup(source.stop)
+
+            window = source.provider().get_window(_CONTEXT, sequence_id=0)
+            source.stop()
+
+        self.assertGreaterEqual(window.sample_count, 1)
+        self.assertEqual(window.gpu_util_avg_pct, 40.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
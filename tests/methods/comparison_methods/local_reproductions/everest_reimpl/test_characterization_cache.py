@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import unittest
+
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.phase_characterization import (
+    CharacterizationCache,
+    PhaseCharacterizer,
+)
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord
+
+
+def _record(phase_id: str, fs: float = 0.5) -> CharacterizationRecord:
+    return CharacterizationRecord(
+        phase_id=phase_id,
+        fs=fs,
+        mem_high=50.0,
+        mem_low=40.0,
+        freq_high_mhz=1410,
+        freq_low_mhz=990,
+    )
+
+
+class CharacterizationCacheTests(unittest.TestCase):
+    def test_unbounded_cache_keeps_everything_and_replaces_on_put(self) -> None:
+        cache = CharacterizationCache()
+
+        for index in range(100):
+            cache.put(_record(f"active-g{index}-m1"), window_index=index)
+        replaced = cache.put(_record("active-g0-m1", fs=0.9), window_index=10_000)
+
+        self.assertFalse(cache.bounded)
+        self.assertEqual(len(cache), 100)
+        self.assertEqual(replaced.fs, 0.9)
+        self.assertEqual(cache.get("active-g1-m1", window_index=10**9), _record("active-g1-m1"))
+        self.assertEqual((cache.eviction_count, cache.reprobe_count), (0, 0))
+
+    def test_lru_eviction_keeps_recently_used_phases(self) -> None:
+        cache = CharacterizationCache(max_entries=2)
+
+        cache.put(_record("a"))
+        cache.put(_record("b"))
+        cache.get("a")
+        cache.put(_record("c"))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.peek("b"))
+        self.assertIsNotNone(cache.peek("a"))
+        self.assertEqual(cache.pop_evicted(), ["b"])
+        self.assertEqual(cache.pop_evicted(), [])
+        self.assertEqual(cache.eviction_count, 1)
+
+    def test_aged_record_misses_and_reprobe_blends_by_confidence(self) -> None:
+        cache = CharacterizationCache(max_age_windows=10, blend_history=3)
+
+        cache.put(_record("a", fs=0.2), window_index=0)
+        self.assertIsNotNone(cache.get("a", window_index=10))
+        self.assertIsNone(cache.get("a", window_index=11))
+        self.assertIsNotNone(cache.peek("a"))
+
+        blended = cache.put(_record("a", fs=0.6), window_index=11)
+        self.assertAlmostEqual(blended.fs, 0.4)
+        self.assertEqual(cache.confidence("a"), 2)
+        self.assertEqual(cache.get("a", window_index=12), blended)
+
+        for window_index in (30, 50, 70):
+            cache.put(_record("a", fs=1.0), window_index=window_index)
+        self.assertEqual(cache.reprobe_count, 4)
+        self.assertEqual(cache.confidence("a"), 5)
+        # History weight is capped at blend_history: 0.4 -> 0.6 -> 0.7 -> 0.775.
+        self.assertAlmostEqual(cache.peek("a").fs, 0.775)  # type: ignore[union-attr]
+
+    def test_age_in_seconds_starts_at_first_use_for_preloaded_records(self) -> None:
+        cache = CharacterizationCache(max_age_seconds=60.0)
+        cache.put(_record("stored"))
+        cache.put(_record("fresh"), now_unix_s=1_000.0)
+
+        self.assertIsNotNone(cache.get("stored", now_unix_s=5_000.0))
+        self.assertIsNotNone(cache.get("stored", now_unix_s=5_060.0))
+        self.assertIsNone(cache.get("stored", now_unix_s=5_061.0))
+        self.assertIsNone(cache.get("fresh", now_unix_s=1_061.0))
+
+    def test_age_in_windows_starts_at_first_use_for_preloaded_records(self) -> None:
+        cache = CharacterizationCache(max_age_windows=10)
+        cache.put(_record("stored"))
+
+        self.assertIsNotNone(cache.get("stored", window_index=50, touch=False))
+        self.assertIsNotNone(cache.get("stored", window_index=60))
+        self.assertIsNotNone(cache.get("stored", window_index=70))
+        self.assertIsNone(cache.get("stored", window_index=71))
+
+    def test_untouched_lookup_keeps_lru_order_and_age_clock(self) -> None:
+        cache = CharacterizationCache(max_entries=2, max_age_seconds=60.0)
+        cache.put(_record("stored"))
+        cache.put(_record("b"), now_unix_s=1_000.0)
+
+        self.assertIsNotNone(cache.get("stored", now_unix_s=5_000.0, touch=False))
+        self.assertIsNotNone(cache.get("stored", now_unix_s=9_000.0))
+        self.assertIsNone(cache.get("b", now_unix_s=1_061.0, touch=False))
+
+        cache.get("b", now_unix_s=1_010.0, touch=False)
+        cache.put(_record("c"), now_unix_s=1_010.0)
+        self.assertEqual(cache.pop_evicted(), ["b"])
+
+    def test_rejects_non_positive_limits(self) -> None:
+        for kwargs in ({"max_entries": 0}, {"max_age_windows": -1}, {"max_age_seconds": 0.0}, {"blend_history": -1}):
+            with self.assertRaises(ValueError, msg=str(kwargs)):
+                CharacterizationCache(**kwargs)  # type: ignore[arg-type]
+
+    def test_characterizer_stores_through_its_cache(self) -> None:
+        characterizer = PhaseCharacterizer(CharacterizationCache(max_entries=1))
+
+        characterizer.upsert_phase_characterization("a", 0.4, 1.2, 1.0, 1400, 1000)
+        characterizer.upsert_phase_characterization("b", 0.4, 1.2, 1.0, 1400, 1000)
+
+        self.assertFalse(characterizer.has_phase_characterization("a"))
+        self.assertTrue(characterizer.has_phase_characterization("b"))
+        self.assertEqual(characterizer.cache.eviction_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import dataclasses
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.phase_characterization import (
+    CharacterizationStore,
+    CharacterizationStoreKey,
+)
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord
+
+
+_KEY = CharacterizationStoreKey(
+    workload="lammps",
+    gpu_model="A100",
+    driver_version="535.104",
+    f_high_mhz=1410,
+    f_low_mhz=990,
+    phase_bucket_pct=10.0,
+)
+
+
+def _record(phase_id: str, fs: float) -> CharacterizationRecord:
+    return CharacterizationRecord(
+        phase_id=phase_id,
+        fs=fs,
+        mem_high=50.0,
+        mem_low=40.0,
+        freq_high_mhz=_KEY.f_high_mhz,
+        freq_low_mhz=_KEY.f_low_mhz,
+    )
+
+
+class CharacterizationStoreTests(unittest.TestCase):
+    def test_missing_store_loads_empty(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CharacterizationStore(Path(tmp) / "absent.sqlite")
+
+            self.assertEqual(store.load(_KEY), {})
+            self.assertFalse(store.path.exists())
+
+    def test_save_then_load_round_trips_and_upserts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CharacterizationStore(Path(tmp) / "nested" / "everest.sqlite")
+
+            written = store.save(_KEY, [_record("active-g6-m5", 0.4), _record("active-g9-m2", 0.1)], run_id="a")
+            store.save(_KEY, [_record("active-g6-m5", 0.6)], run_id="b")
+            loaded = store.load(_KEY)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(sorted(loaded), ["active-g6-m5", "active-g9-m2"])
+        self.assertEqual(loaded["active-g6-m5"], _record("active-g6-m5", 0.6))
+
+    def test_records_are_scoped_by_every_key_field(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CharacterizationStore(Path(tmp) / "everest.sqlite")
+            store.save(_KEY, [_record("active-g6-m5", 0.4)], run_id="a")
+
+            for field, value in (
+                ("workload", "gromacs"),
+                ("gpu_model", "H100"),
+                ("driver_version", ""),
+                ("f_high_mhz", 1395),
+                ("f_low_mhz", 1005),
+                ("phase_bucket_pct", 5.0),
+            ):
+                other = dataclasses.replace(_KEY, **{field: value})
+                self.assertEqual(store.load(other), {}, msg=field)
+
+    def test_failed_save_leaves_store_unchanged(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CharacterizationStore(Path(tmp) / "everest.sqlite")
+            store.save(_KEY, [_record("active-g6-m5", 0.4)], run_id="a")
+
+            with self.assertRaises(sqlite3.Error):
+                store.save(_KEY, [_record("active-g1-m1", 0.2), _record("active-g6-m5", None)], run_id="b")  # type: ignore[arg-type]
+
+            self.assertEqual(sorted(store.load(_KEY)), ["active-g6-m5"])
+
+    def test_rejects_unknown_schema_version(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "everest.sqlite"
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA user_version = 99")
+            conn.close()
+
+            with self.assertRaises(ValueError):
+                CharacterizationStore(path).load(_KEY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import random
+import unittest
+import warnings
+from dataclasses import replace
+
+import numpy as np
+
+from src.common.experiment.types import (
+    DecisionAction,
+    ExperimentContext,
+    ExperimentMetadata,
+    MetricWindow,
+    PerformanceTargetType,
+    PlatformSpec,
+)
+from src.methods.comparison_methods.local_reproductions.everest_reimpl import EverestPolicy
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.batch import (
+    ACTION_INACTIVE,
+    EverestBatch,
+    evaluate_traces,
+)
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="A100",
+    gpu_count=1,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+# (gpu %, mem % at f_max, memory sensitivity to the clock)
+_PHASES = (
+    (95.0, 80.0, 0.9),
+    (99.0, 20.0, 0.2),
+    (2.0, 1.0, 0.0),
+    (70.0, 0.0, 0.0),
+    (60.0, 45.0, 0.6),
+)
+
+_LANE_CONFIGS = (
+    (0.10, {}),
+    (0.05, {"change_threshold_pct": 5.0, "phase_window_seconds": 3.0}),
+    (0.20, {"change_threshold_pct": 20.0, "characterization_low_frequency_ratio": 0.6}),
+    (0.00, {"phase_window_seconds": 2.5, "min_ratio_of_max": 0.3, "min_frequency_mhz": 0}),
+    (0.10, {"min_frequency_mhz": 1500}),
+    (0.30, {"change_threshold_pct": 0.5, "clock_match_tolerance_mhz": 20.0}),
+    (0.15, {"high_frequency_mhz": 1200, "characterization_low_frequency_mhz": 1000}),
+    (0.99, {"phase_window_seconds": 1.0, "idle_gpu_threshold_pct": 10.0}),
+)
+
+
+def _context(run_id: str, pd_target: float) -> ExperimentContext:
+    return ExperimentContext(
+        platform=_PLATFORM,
+        metadata=ExperimentMetadata(
+            run_id=run_id,
+            experiment_id="everest-batch-test",
+            policy_name="everest",
+            workload_name="synthetic",
+            started_at_utc="2026-06-01T00:00:00Z",
+        ),
+        pd_target=pd_target,
+        window_seconds=1.0,
+        sampling_interval_ms=1000,
+        performance_target_type=PerformanceTargetType.RELATIVE_PERFORMANCE_LOSS,
+    )
+
+
+def _lanes(copies: int = 1) -> list[tuple[ExperimentContext, dict[str, object]]]:
+    return [
+        (_context(f"lane-{index}-{copy}", pd_target), dict(config))
+        for copy in range(copies)
+        for index, (pd_target, config) in enumerate(_LANE_CONFIGS)
+    ]
+
+
+class _LaneWorkload:
+    """Seeded closed-loop window source; memory utilization follows the applied clock."""
+
+    def __init__(self, seed: int) -> None:
+        rng = random.Random(seed)
+        self.phase_lengths = [rng.randint(3, 25) for _ in range(12)]
+        self.phase_order = [rng.randrange(len(_PHASES)) for _ in range(12)]
+        self.noise = [(rng.gauss(0.0, 2.0), rng.gauss(0.0, 2.0)) for _ in range(400)]
+        self.durations = [rng.choice((1.0, 1.0, 0.5, 1.5, 0.0, 2.25)) for _ in range(400)]
+        self.clock_glitch = [rng.random() < 0.05 for _ in range(400)]
+        self.perf_ratio = [rng.choice((None, 0.97, 0.85, 1.0)) for _ in range(400)]
+
+    def window(self, step: int, clock_mhz: float) -> MetricWindow:
+        elapsed, phase = 0, self.phase_order[-1]
+        for length, index in zip(self.phase_lengths, self.phase_order):
+            if step < elapsed + length:
+                phase = index
+                break
+            elapsed += length
+        gpu, mem, sensitivity = _PHASES[phase]
+        if self.clock_glitch[step]:
+            clock_mhz += 40.0
+        gpu_noise, mem_noise = self.noise[step]
+        mem_at_clock = mem * (1.0 - sensitivity + sensitivity * clock_mhz / 1410.0)
+        custom_metrics = {}
+        if self.perf_ratio[step] is not None:
+            custom_metrics["performance_ratio"] = self.perf_ratio[step]
+        return MetricWindow(
+            sequence_id=step,
+            start_unix_s=float(step),
+            end_unix_s=float(step + 1),
+            duration_s=self.durations[step],
+            sample_count=1,
+            gpu_util_avg_pct=max(gpu + gpu_noise, 0.0),
+            mem_util_avg_pct=max(mem_at_clock + mem_noise, 0.0) if mem > 0 else 0.0,
+            graphics_clock_avg_mhz=clock_mhz,
+            custom_metrics=custom_metrics,
+        )
+
+
+def _column(windows: list[MetricWindow], field: str) -> np.ndarray:
+    return np.array([getattr(window, field) for window in windows], dtype=float)
+
+
+def _performance_ratios(windows: list[MetricWindow]) -> np.ndarray:
+    return np.array(
+        [window.custom_metrics.get("performance_ratio", np.nan) for window in windows],
+        dtype=float,
+    )
+
+
+class EverestBatchTests(unittest.TestCase):
+    def _run_closed_loop(self, *, nan_capture_gpu: bool = False) -> set[str]:
+        """Runs the batch and one scalar policy per lane in lockstep; returns the reasons seen.
+
+        With *nan_capture_gpu*, every other window that arrives while a
+        characterization is pending reports a NaN GPU utilization.
+        """
+        lanes = _lanes(copies=3)
+        policies = [EverestPolicy() for _ in lanes]
+        states = [policy.initialize(context, config) for policy, (context, config) in zip(policies, lanes)]
+        workloads = [_LaneWorkload(seed) for seed in range(len(lanes))]
+        clocks = [1410.0] * len(lanes)
+        batch = EverestBatch(lanes)
+        reasons_seen: set[str] = set()
+
+        for step in range(400):
+            windows = [workload.window(step, clock) for workload, clock in zip(workloads, clocks)]
+            if nan_capture_gpu and step % 2:
+                windows = [
+                    replace(window, gpu_util_avg_pct=np.nan)
+                    if state.get("pending_characterization") is not None
+                    else window
+                    for window, state in zip(windows, states)
+                ]
+            decisions = batch.step(
+                _column(windows, "gpu_util_avg_pct"),
+                _column(windows, "mem_util_avg_pct"),
+                _column(windows, "graphics_clock_avg_mhz"),
+                _column(windows, "duration_s"),
+                performance_ratio=_performance_ratios(windows),
+            )
+            for lane, (policy, state, window) in enumerate(zip(policies, states, windows)):
+                expected = policy.on_window(window, state)
+                actual = decisions.decision(lane)
+                self.assertEqual(
+                    (actual.action, actual.target_graphics_clock_mhz, actual.reason_code),
+                    (expected.action, expected.target_graphics_clock_mhz, expected.reason_code),
+                    msg=f"lane {lane} step {step}",
+                )
+                reasons_seen.add(expected.reason_code)
+                if expected.action == DecisionAction.SET_CLOCK:
+                    clocks[lane] = float(expected.target_graphics_clock_mhz)
+
+        self.assertEqual(batch.summaries(), [policy.finalize(state) for policy, state in zip(policies, states)])
+        return reasons_seen
+
+    def test_closed_loop_decisions_match_scalar_policy(self) -> None:
+        reasons_seen = self._run_closed_loop()
+
+        # The workloads exercise every branch of the state machine.
+        for reason in (
+            "everest_wait_for_stable_phase",
+            "everest_wait_for_characterizable_phase",
+            "everest_defer_characterization_clock_mismatch",
+            "everest_defer_characterization_phase_drift",
+            "everest_collect_high_frequency",
+            "everest_characterize_low_frequency",
+            "everest_apply_cached_phase",
+            "everest_apply_new_characterization",
+        ):
+            self.assertIn(reason, reasons_seen)
+
+    def test_closed_loop_decisions_match_scalar_policy_with_nan_capture_windows(self) -> None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            reasons_seen = self._run_closed_loop(nan_capture_gpu=True)
+
+        self.assertIn("everest_defer_characterization_phase_drift", reasons_seen)
+
+    def test_infinite_utilization_matches_scalar_without_warnings(self) -> None:
+        # A one-second phase window, so the history can hold nothing but inf.
+        lanes = _lanes()[7:8]
+        trace = [_LaneWorkload(0).window(step, 1410.0) for step in range(8)]
+        for step in (2, 3, 4):
+            trace[step] = replace(trace[step], duration_s=1.0, gpu_util_avg_pct=np.inf, mem_util_avg_pct=np.inf)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            run = evaluate_traces(lanes, [trace])
+
+        policy = EverestPolicy()
+        state = policy.initialize(*lanes[0])
+        for window in trace:
+            policy.on_window(window, state)
+        self.assertEqual(run.summaries[0], policy.finalize(state))
+
+    def test_evaluate_traces_masks_lanes_after_their_trace_ends(self) -> None:
+        lanes = _lanes()[:2]
+        traces = [
+            [_LaneWorkload(0).window(step, 1410.0) for step in range(12)],
+            [_LaneWorkload(1).window(step, 1410.0) for step in range(5)],
+        ]
+
+        run = evaluate_traces(lanes, traces)
+
+        self.assertEqual(run.action.shape, (12, 2))
+        self.assertTrue((run.action[5:, 1] == ACTION_INACTIVE).all())
+        self.assertNotIn(ACTION_INACTIVE, run.action[:, 0])
+        self.assertEqual([summary.total_windows for summary in run.summaries], [12, 5])
+        for lane, trace in enumerate(traces):
+            policy = EverestPolicy()
+            state = policy.initialize(*lanes[lane])
+            for window in trace:
+                policy.on_window(window, state)
+            self.assertEqual(run.summaries[lane], policy.finalize(state))
+
+    def test_rejects_empty_batch(self) -> None:
+        with self.assertRaises(ValueError):
+            EverestBatch([])
+
+
+if __name__ == "__main__":
+    unittest.main()
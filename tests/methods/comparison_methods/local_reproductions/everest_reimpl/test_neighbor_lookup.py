@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import unittest
+
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.phase_characterization import (
+    CharacterizationCache,
+    estimate_from_neighbors,
+)
+from src.methods.comparison_methods.local_reproductions.everest_reimpl.types import CharacterizationRecord
+
+
+def _record(phase_id: str, fs: float) -> CharacterizationRecord:
+    return CharacterizationRecord(
+        phase_id=phase_id,
+        fs=fs,
+        mem_high=50.0,
+        mem_low=40.0,
+        freq_high_mhz=1410,
+        freq_low_mhz=990,
+    )
+
+
+def _estimate(cache: CharacterizationCache, gpu: float, mem: float, **kwargs: object):
+    return estimate_from_neighbors(
+        cache,
+        gpu_util_pct=gpu,
+        mem_util_pct=mem,
+        is_idle_like=False,
+        bucket_size_pct=10.0,
+        **{"radius_pct": 10.0, **kwargs},  # type: ignore[arg-type]
+    )
+
+
+class NeighborLookupTests(unittest.TestCase):
+    def test_interpolates_by_inverse_distance_to_bucket_centers(self) -> None:
+        cache = CharacterizationCache()
+        cache.put(_record("active-g6-m5", 0.2))
+        cache.put(_record("active-g6-m6", 0.8))
+
+        # 2.5 points from the m5 center and 7.5 from the m6 center.
+        estimate = _estimate(cache, 65.0, 57.5)
+
+        self.assertIsNotNone(estimate)
+        self.assertAlmostEqual(estimate.fs, 0.35)  # type: ignore[union-attr]
+        self.assertEqual(estimate.nearest.phase_id, "active-g6-m5")  # type: ignore[union-attr]
+        self.assertEqual(estimate.neighbor_phase_ids, ("active-g6-m5", "active-g6-m6"))  # type: ignore[union-attr]
+
+    def test_exact_center_uses_that_phase(self) -> None:
+        cache = CharacterizationCache()
+        cache.put(_record("active-g6-m5", 0.2))
+        cache.put(_record("active-g6-m6", 0.8))
+
+        self.assertEqual(_estimate(cache, 65.0, 55.0).fs, 0.2)  # type: ignore[union-attr]
+
+    def test_ignores_excluded_idle_mismatched_distant_and_stale_phases(self) -> None:
+        cache = CharacterizationCache(max_age_windows=5)
+        cache.put(_record("active-g6-m5", 0.2), window_index=0)
+        cache.put(_record("idle-g6-m6", 0.5), window_index=10)
+        cache.put(_record("active-g9-m9", 0.9), window_index=10)
+
+        self.assertIsNone(_estimate(cache, 65.0, 60.0, window_index=10))
+        self.assertIsNone(_estimate(cache, 65.0, 60.0, exclude_phase_id="active-g6-m5"))
+        self.assertIsNotNone(_estimate(cache, 65.0, 60.0, window_index=5))
+
+    def test_probing_neighbors_does_not_mark_them_used(self) -> None:
+        cache = CharacterizationCache(max_entries=2, max_age_seconds=60.0)
+        cache.put(_record("active-g6-m5", 0.2))
+        cache.put(_record("active-g9-m9", 0.9))
+
+        self.assertIsNotNone(_estimate(cache, 65.0, 57.5, now_unix_s=1_000.0))
+
+        # The preloaded record has not started aging at the probe time ...
+        self.assertIsNotNone(cache.get("active-g6-m5", now_unix_s=9_000.0, touch=False))
+        # ... nor moved ahead of the unprobed one in LRU order.
+        cache.put(_record("active-g1-m1", 0.5))
+        self.assertEqual(cache.pop_evicted(), ["active-g6-m5"])
+
+    def test_rejects_non_positive_sizes(self) -> None:
+        with self.assertRaises(ValueError):
+            _estimate(CharacterizationCache(), 50.0, 50.0, radius_pct=0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
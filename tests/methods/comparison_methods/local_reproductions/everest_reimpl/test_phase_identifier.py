@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import random
 import unittest
 
 from src.common.experiment.types import MetricWindow
@@ -19,6 +20,16 @@ def make_window(sequence_id: int, gpu: float, mem: float, duration_s: float = 1.
     )
 
 
+class _RecomputingPhaseIdentifier(PhaseIdentifier):
+    """Reference identifier that rescans the whole history on every window."""
+
+    def _compute_weighted_averages(self) -> tuple[float, float]:
+        return self._recompute_weighted_averages()
+
+    def _is_history_stable(self) -> bool:
+        return self._recompute_history_stable()
+
+
 class PhaseIdentifierTests(unittest.TestCase):
     def test_stable_window_identification(self) -> None:
         identifier = PhaseIdentifier(window_seconds=3.0, change_threshold_pct=10.0)
@@ -106,5 +117,58 @@ class PhaseIdentifierTests(unittest.TestCase):
         self.assertEqual(base_obs.phase_id, near_zero_noise.phase_id)
 
 
+    def test_incremental_observations_match_full_recompute(self) -> None:
+        rng = random.Random(7)
+        for window_seconds, threshold in ((1.0, 10.0), (5.0, 5.0), (30.0, 2.0), (12.5, 20.0)):
+            incremental = PhaseIdentifier(window_seconds=window_seconds, change_threshold_pct=threshold)
+            reference = _RecomputingPhaseIdentifier(window_seconds=window_seconds, change_threshold_pct=threshold)
+            gpu, mem = 60.0, 30.0
+            for sequence_id in range(3000):
+                if rng.random() < 0.03:
+                    gpu, mem = rng.uniform(0.0, 100.0), rng.uniform(0.0, 100.0)
+                window = make_window(
+                    sequence_id,
+                    max(gpu + rng.gauss(0.0, threshold / 6.0), 0.0),
+                    max(mem + rng.gauss(0.0, threshold / 6.0), 0.0),
+                    duration_s=rng.choice((0.1, 0.25, 1.0, 1.0, 0.0, 2.5)),
+                )
+
+                actual = incremental.observe(window)
+                expected = reference.observe(window)
+
+                self.assertEqual(
+                    (actual.phase_id, actual.is_stable, actual.is_new_phase, actual.is_idle_like),
+                    (expected.phase_id, expected.is_stable, expected.is_new_phase, expected.is_idle_like),
+                )
+                self.assertAlmostEqual(actual.gpu_util_avg_pct, expected.gpu_util_avg_pct, places=9)
+                self.assertAlmostEqual(actual.mem_util_avg_pct, expected.mem_util_avg_pct, places=9)
+
+    def test_running_sums_do_not_drift_over_long_runs(self) -> None:
+        identifier = PhaseIdentifier(window_seconds=5.0, change_threshold_pct=10.0)
+
+        for i in range(50_000):
+            observation = identifier.observe(make_window(i, 60.0 + (i % 7) * 0.3, 30.0, duration_s=0.1))
+        for i in range(50_000, 50_060):
+            observation = identifier.observe(make_window(i, 60.0, 30.0, duration_s=0.1))
+
+        self.assertEqual((observation.gpu_util_avg_pct, observation.mem_util_avg_pct), (60.0, 30.0))
+
+    def test_non_finite_window_falls_back_until_it_leaves_the_history(self) -> None:
+        identifier = PhaseIdentifier(window_seconds=3.0, change_threshold_pct=10.0)
+        reference = _RecomputingPhaseIdentifier(window_seconds=3.0, change_threshold_pct=10.0)
+        windows = [make_window(i, 50.0, 25.0) for i in range(3)]
+        # gpu * duration overflows to inf, so the running sums cannot hold it.
+        windows.append(make_window(3, 1e308, 25.0, duration_s=2.0))
+        windows.extend(make_window(i, 50.0, 25.0) for i in range(4, 10))
+
+        for window in windows:
+            actual = identifier.observe(window)
+            expected = reference.observe(window)
+            self.assertEqual((actual.phase_id, actual.is_stable), (expected.phase_id, expected.is_stable))
+
+        self.assertTrue(actual.is_stable)
+        self.assertEqual(actual.gpu_util_avg_pct, 50.0)
+
+
 if __name__ == "__main__":
     unittest.main()
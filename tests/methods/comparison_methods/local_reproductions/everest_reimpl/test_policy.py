@@ -18,14 +18,18 @@ from src.methods.registry import resolve_policy, supported_policy_names
 from src.methods.comparison_methods.local_reproductions.everest_reimpl import EverestPolicy
 
 
-_PLATFORM = PlatformSpec(
-    vendor="nvidia",
-    gpu_model="A100",
-    gpu_count=1,
-    min_graphics_clock_mhz=210,
-    max_graphics_clock_mhz=1410,
-    graphics_clock_step_mhz=15,
-)
+def _platform_fields() -> dict[str, object]:
+    return {
+        "vendor": "nvidia",
+        "gpu_model": "A100",
+        "gpu_count": 1,
+        "min_graphics_clock_mhz": 210,
+        "max_graphics_clock_mhz": 1410,
+        "graphics_clock_step_mhz": 15,
+    }
+
+
+_PLATFORM = PlatformSpec(**_platform_fields())
 
 
 def _context(
@@ -264,6 +268,277 @@ class EverestPaperFidelityTests(unittest.TestCase):
         self.assertNotIn("characterization_settle_retry_count", summary.custom_summary)
 
 
+class EverestCharacterizationStoreTests(unittest.TestCase):
+    def _characterize_one_phase(self, store_path: Path, context: ExperimentContext | None = None) -> EverestPolicy:
+        policy = EverestPolicy()
+        state = policy.initialize(
+            context or _context(),
+            {"phase_window_seconds": 1.0, "characterization_store_path": str(store_path)},
+        )
+        policy.on_window(_window(0, mem=50.0, clock_mhz=1410.0), state)
+        policy.on_window(_window(1, mem=40.0, clock_mhz=990.0), state)
+        summary = policy.finalize(state)
+        self.assertEqual(summary.custom_summary["stored_phase_count"], 1)
+        return policy
+
+    def test_second_run_warm_starts_and_skips_probing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store_path = Path(tmp) / "everest.sqlite"
+            self._characterize_one_phase(store_path)
+
+            policy = EverestPolicy()
+            state = policy.initialize(
+                _context(),
+                {"phase_window_seconds": 1.0, "characterization_store_path": str(store_path)},
+            )
+            decision = policy.on_window(_window(0, mem=50.0, clock_mhz=1410.0), state)
+            summary = policy.finalize(state)
+
+        self.assertEqual(decision.reason_code, "everest_apply_cached_phase")
+        self.assertEqual(summary.custom_summary["warm_started_phase_count"], 1)
+        self.assertEqual(summary.custom_summary["characterization_count"], 0)
+        self.assertEqual(summary.custom_summary["characterized_phase_count"], 1)
+        self.assertEqual(summary.custom_summary["stored_phase_count"], 0)
+
+    def test_warm_started_phase_ages_in_windows_from_first_use(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store_path = Path(tmp) / "everest.sqlite"
+            self._characterize_one_phase(store_path)
+
+            policy = EverestPolicy()
+            state = policy.initialize(
+                _context(),
+                {
+                    "phase_window_seconds": 1.0,
+                    "characterization_store_path": str(store_path),
+                    "cache_max_age_windows": 10,
+                },
+            )
+            for sequence_id in range(50):
+                policy.on_window(_window(sequence_id, gpu=90.0, mem=90.0, clock_mhz=1410.0), state)
+            decision = policy.on_window(_window(50, mem=50.0, clock_mhz=1410.0), state)
+
+        self.assertEqual(decision.reason_code, "everest_apply_cached_phase")
+
+    def test_phases_evicted_from_bounded_cache_are_still_stored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store_path = Path(tmp) / "everest.sqlite"
+            policy = EverestPolicy()
+            state = policy.initialize(
+                _context(),
+                {
+                    "phase_window_seconds": 1.0,
+                    "characterization_store_path": str(store_path),
+                    "cache_max_entries": 1,
+                },
+            )
+            for window in (
+                _window(0, mem=50.0, clock_mhz=1410.0),
+                _window(1, mem=40.0, clock_mhz=990.0),
+                _window(2, gpu=90.0, mem=90.0, clock_mhz=1410.0),
+                _window(3, gpu=90.0, mem=80.0, clock_mhz=990.0),
+            ):
+                policy.on_window(window, state)
+            self.assertEqual(sorted(state.get("phase_cache")), ["active-g9-m9"])
+            summary = policy.finalize(state)
+
+            warm_state = EverestPolicy().initialize(
+                _context(),
+                {"phase_window_seconds": 1.0, "characterization_store_path": str(store_path)},
+            )
+
+        self.assertEqual(summary.custom_summary["stored_phase_count"], 2)
+        self.assertEqual(warm_state.get("warm_started_phase_count"), 2)
+
+    def test_other_driver_version_does_not_share_characterizations(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store_path = Path(tmp) / "everest.sqlite"
+            self._characterize_one_phase(store_path)
+
+            policy = EverestPolicy()
+            context = _context()
+            other_driver = ExperimentContext(
+                platform=PlatformSpec(**{**_platform_fields(), "driver_version": "550.54"}),
+                metadata=context.metadata,
+                pd_target=context.pd_target,
+                window_seconds=context.window_seconds,
+                sampling_interval_ms=context.sampling_interval_ms,
+            )
+            state = policy.initialize(
+                other_driver,
+                {"phase_window_seconds": 1.0, "characterization_store_path": str(store_path)},
+            )
+            decision = policy.on_window(_window(0, mem=50.0, clock_mhz=1410.0), state)
+
+        self.assertEqual(decision.reason_code, "everest_characterize_low_frequency")
+        self.assertEqual(state.get("warm_started_phase_count"), 0)
+
+    def test_unreadable_store_runs_cold_and_reports_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store_path = Path(tmp) / "everest.sqlite"
+            store_path.write_bytes(b"not a database" * 100)
+
+            policy = EverestPolicy()
+            state = policy.initialize(
+                _context(),
+                {"phase_window_seconds": 1.0, "characterization_store_path": str(store_path)},
+            )
+            decision = policy.on_window(_window(0, mem=50.0, clock_mhz=1410.0), state)
+            summary = policy.finalize(state)
+
+        self.assertEqual(decision.reason_code, "everest_characterize_low_frequency")
+        self.assertIn("DatabaseError", summary.custom_summary["characterization_store_error"])
+
+    def test_store_is_optional(self) -> None:
+        policy = EverestPolicy()
+        state = policy.initialize(_context(), {"phase_window_seconds": 1.0})
+
+        summary = policy.finalize(state)
+
+        self.assertNotIn("stored_phase_count", summary.custom_summary)
+        self.assertNotIn("characterization_store_path", state.data)
+
+
+class EverestBoundedCacheTests(unittest.TestCase):
+    def _run(self, config: dict[str, object], windows: list[MetricWindow]) -> tuple[EverestPolicy, object, list[str]]:
+        policy = EverestPolicy()
+        state = policy.initialize(_context(), {"phase_window_seconds": 1.0, **config})
+        reasons = [policy.on_window(window, state).reason_code for window in windows]
+        return policy, state, reasons
+
+    def test_lru_bound_evicts_phases_from_cache_and_mirror(self) -> None:
+        windows = [
+            _window(0, gpu=60.0, mem=50.0, clock_mhz=1410.0),
+            _window(1, gpu=60.0, mem=40.0, clock_mhz=990.0),
+            _window(2, gpu=90.0, mem=20.0, clock_mhz=1410.0),
+            _window(3, gpu=90.0, mem=18.0, clock_mhz=990.0),
+            _window(4, gpu=60.0, mem=50.0, clock_mhz=1410.0),
+        ]
+
+        policy, state, reasons = self._run({"cache_max_entries": 1}, windows)
+        summary = policy.finalize(state)
+
+        self.assertEqual(reasons[-1], "everest_characterize_low_frequency")
+        self.assertEqual(len(state.get("phase_cache")), 1)
+        self.assertEqual(summary.custom_summary["characterized_phase_count"], 1)
+        self.assertEqual(summary.custom_summary["cache_eviction_count"], 1)
+        self.assertEqual(summary.custom_summary["cache_reprobe_count"], 0)
+
+    def test_phase_cache_mirror_is_updated_per_entry(self) -> None:
+        policy = EverestPolicy()
+        state = policy.initialize(_context(), {"phase_window_seconds": 1.0, "cache_max_entries": 1})
+        state.pop_dirty_keys()
+
+        for window in (
+            _window(0, gpu=60.0, mem=50.0, clock_mhz=1410.0),
+            _window(1, gpu=60.0, mem=40.0, clock_mhz=990.0),
+            _window(2, gpu=90.0, mem=20.0, clock_mhz=1410.0),
+            _window(3, gpu=90.0, mem=18.0, clock_mhz=990.0),
+        ):
+            policy.on_window(window, state)
+
+        self.assertNotIn("phase_cache", state.pop_dirty_keys())
+        self.assertEqual(state.pop_dirty_entries(), {"phase_cache": {"active-g6-m5", "active-g9-m2"}})
+        self.assertEqual(sorted(state.get("phase_cache")), ["active-g9-m2"])
+
+    def test_aged_phase_is_reprobed_and_counted(self) -> None:
+        windows = [
+            _window(0, mem=50.0, clock_mhz=1410.0),
+            _window(1, mem=40.0, clock_mhz=990.0),
+            *(_window(i, mem=46.0, clock_mhz=1155.0) for i in range(2, 6)),
+            _window(6, mem=44.0, clock_mhz=1410.0),
+            _window(7, mem=40.0, clock_mhz=990.0),
+        ]
+
+        policy, state, reasons = self._run({"cache_max_age_windows": 4}, windows)
+        summary = policy.finalize(state)
+
+        self.assertEqual(reasons[2:6], ["everest_apply_cached_phase"] * 4)
+        self.assertEqual(reasons[6], "everest_characterize_low_frequency")
+        self.assertEqual(reasons[7], "everest_apply_new_characterization")
+        self.assertEqual(summary.custom_summary["characterization_count"], 2)
+        self.assertEqual(summary.custom_summary["cache_reprobe_count"], 1)
+        self.assertEqual(summary.custom_summary["cache_eviction_count"], 0)
+
+    def test_unbounded_default_omits_cache_counters(self) -> None:
+        policy, state, _ = self._run({}, [_window(0, mem=50.0, clock_mhz=1410.0)])
+
+        summary = policy.finalize(state)
+
+        self.assertNotIn("cache_eviction_count", summary.custom_summary)
+        self.assertNotIn("cache_reprobe_count", summary.custom_summary)
+
+    def test_invalid_cache_limits_are_rejected(self) -> None:
+        for config in ({"cache_max_entries": 0}, {"cache_max_age_windows": 2.5}, {"cache_max_age_seconds": "60"}):
+            with self.assertRaises(ValueError, msg=str(config)):
+                EverestPolicy().initialize(_context(), config)
+
+
+class EverestNeighborLookupTests(unittest.TestCase):
+    _WINDOWS = [
+        _window(0, mem=50.0, clock_mhz=1410.0),
+        _window(1, mem=40.0, clock_mhz=990.0),
+        # Crosses into the next mem bucket, 7.8 points from the g6-m5 center.
+        _window(2, mem=61.0, clock_mhz=1155.0),
+    ]
+
+    def _run(self, config: dict[str, object]) -> tuple[EverestPolicy, object, list[object]]:
+        policy = EverestPolicy()
+        state = policy.initialize(_context(), {"phase_window_seconds": 1.0, **config})
+        decisions = [policy.on_window(window, state) for window in self._WINDOWS]
+        return policy, state, decisions
+
+    def test_phase_near_characterized_one_reuses_its_fs_without_probing(self) -> None:
+        policy, state, decisions = self._run({"neighbor_radius_pct": 10.0})
+        summary = policy.finalize(state)
+
+        self.assertEqual(decisions[2].reason_code, "everest_apply_neighbor_phase")
+        self.assertEqual(decisions[2].debug_fields["phase_id"], "active-g6-m6")
+        self.assertEqual(decisions[2].debug_fields["neighbor_phase_ids"], ["active-g6-m5"])
+        self.assertEqual(decisions[2].debug_fields["fs"], decisions[1].debug_fields["fs"])
+        self.assertEqual(decisions[2].target_graphics_clock_mhz, decisions[1].target_graphics_clock_mhz)
+        self.assertEqual(summary.custom_summary["neighbor_reuse_count"], 1)
+        self.assertEqual(summary.custom_summary["characterization_count"], 1)
+        self.assertEqual(sorted(state.get("phase_cache")), ["active-g6-m5"])
+
+    def test_only_the_nearest_neighbor_counts_as_used(self) -> None:
+        policy = EverestPolicy()
+        state = policy.initialize(
+            _context(),
+            {"phase_window_seconds": 1.0, "neighbor_radius_pct": 10.0, "cache_max_entries": 2},
+        )
+        windows = [
+            _window(0, mem=50.0, clock_mhz=1410.0),
+            _window(1, mem=40.0, clock_mhz=990.0),
+            _window(2, gpu=90.0, mem=90.0, clock_mhz=1410.0),
+            _window(3, gpu=90.0, mem=80.0, clock_mhz=990.0),
+            _window(4, mem=61.0, clock_mhz=1155.0),
+            _window(5, gpu=10.0, mem=10.0, clock_mhz=1410.0),
+            _window(6, gpu=10.0, mem=5.0, clock_mhz=990.0),
+        ]
+        decisions = [policy.on_window(window, state) for window in windows]
+
+        self.assertEqual(decisions[4].reason_code, "everest_apply_neighbor_phase")
+        # Reusing active-g6-m5 made it more recent than active-g9-m9.
+        self.assertEqual(sorted(state.get("phase_cache")), ["active-g1-m1", "active-g6-m5"])
+
+    def test_phase_outside_radius_is_probed(self) -> None:
+        policy, state, decisions = self._run({"neighbor_radius_pct": 5.0})
+
+        self.assertEqual(decisions[2].reason_code, "everest_collect_high_frequency")
+        self.assertEqual(policy.finalize(state).custom_summary["neighbor_reuse_count"], 0)
+
+    def test_default_probes_and_omits_neighbor_counter(self) -> None:
+        policy, state, decisions = self._run({})
+
+        self.assertEqual(decisions[2].reason_code, "everest_collect_high_frequency")
+        self.assertNotIn("neighbor_reuse_count", policy.finalize(state).custom_summary)
+
+    def test_invalid_radius_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            EverestPolicy().initialize(_context(), {"neighbor_radius_pct": 0})
+
+
 class EverestRunnerIntegrationTests(unittest.TestCase):
     def test_runner_accepts_everest_policy_and_writes_summary(self) -> None:
         policy = resolve_policy("everest")
@@ -0,0 +1,183 @@
+"""Tests for the control-loop artifact writers."""
+from __future__ import annotations
+
+import csv
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.run.artifact_writer import (
+    ArtifactWriter,
+    BackgroundArtifactWriter,
+    InlineArtifactWriter,
+    build_artifact_writer,
+)
+from src.common.experiment.types import AlgorithmState, Decision, DecisionAction
+
+
+def _decision(clock_mhz: int) -> Decision:
+    return Decision(
+        action=DecisionAction.SET_CLOCK,
+        target_graphics_clock_mhz=clock_mhz,
+        reason_code="test",
+    )
+
+
+def _write_windows(writer: ArtifactWriter, run_dir: Path, window_count: int) -> None:
+    state = AlgorithmState()
+    for window_index in range(window_count):
+        state.set("last_window", window_index)
+        decision = _decision(900 + 15 * window_index)
+        writer.persist_state(run_dir / "control" / "policy_state.json", state)
+        writer.append_decision_row(
+            run_dir / "control" / "decisions.csv", "test", decision, window_index
+        )
+        writer.write_last_decision(
+            run_dir / "control" / "last_decision.json", "test", window_index, decision
+        )
+        writer.append_log(run_dir / "control_loop.log", f"window={window_index}")
+
+
+class DecisionsCsvTests(unittest.TestCase):
+    def test_rows_appended_to_a_pre_actuation_file_keep_its_columns(self) -> None:
+        legacy_header = "timestamp_utc,component,decision,reason\n"
+        legacy_row = "2026-01-01T00:00:00Z,policy:test,set_clock:900,test;window=0\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            for writer in (InlineArtifactWriter(), BackgroundArtifactWriter(flush_interval_s=60.0)):
+                path = Path(tmp) / type(writer).__name__ / "decisions.csv"
+                path.parent.mkdir()
+                path.write_text(legacy_header + legacy_row, encoding="utf-8")
+
+                writer.append_decision_row(path, "test", _decision(915), 1, actuation_ms=1.5)
+                writer.append_decision_row(path, "test", _decision(930), 2)
+                writer.close()
+
+                with path.open(encoding="utf-8", newline="") as fp:
+                    rows = list(csv.reader(fp))
+                self.assertEqual(rows[0], ["timestamp_utc", "component", "decision", "reason"])
+                self.assertEqual([len(row) for row in rows], [4] * 4)
+                self.assertEqual([row[2] for row in rows[2:]], ["set_clock:915", "set_clock:930"])
+
+
+class BackgroundArtifactWriterTests(unittest.TestCase):
+    def test_matches_inline_artifacts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            inline_dir = Path(tmp) / "inline"
+            background_dir = Path(tmp) / "background"
+            _write_windows(InlineArtifactWriter(), inline_dir, 5)
+            writer = BackgroundArtifactWriter(flush_interval_s=60.0)
+            _write_windows(writer, background_dir, 5)
+            writer.close()
+
+            for run_dir in (inline_dir, background_dir):
+                with (run_dir / "control" / "decisions.csv").open(encoding="utf-8") as fp:
+                    rows = list(csv.reader(fp))
+                self.assertEqual(
+                    rows[0],
+                    ["timestamp_utc", "component", "decision", "reason", "actuation_ms"],
+                )
+                self.assertEqual([row[2] for row in rows[1:]], [
+                    "set_clock:900",
+                    "set_clock:915",
+                    "set_clock:930",
+                    "set_clock:945",
+                    "set_clock:960",
+                ])
+                log_lines = (run_dir / "control_loop.log").read_text(encoding="utf-8").splitlines()
+                self.assertEqual(
+                    [line.split("] ", 1)[1] for line in log_lines],
+                    [f"window={index}" for index in range(5)],
+                )
+                last = json.loads((run_dir / "control" / "last_decision.json").read_text(encoding="utf-8"))
+                self.assertEqual(last["window_index"], 4)
+                state = json.loads((run_dir / "control" / "policy_state.json").read_text(encoding="utf-8"))
+                self.assertEqual(state["policy_state"], {"last_window": 4})
+
+    def test_batches_and_coalesces_until_flush(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            writer = BackgroundArtifactWriter(flush_interval_s=60.0)
+            try:
+                _write_windows(writer, run_dir, 4)
+                writer.flush()
+
+                metrics = writer.metrics()
+                self.assertEqual(metrics["enqueued_count"], 16)
+                self.assertEqual(metrics["written_op_count"], 16)
+                # One batch; three stale rewrites for each of the two JSON files.
+                self.assertEqual(metrics["batch_count"], 1)
+                self.assertEqual(metrics["coalesced_replace_count"], 6)
+                self.assertGreaterEqual(metrics["max_queue_depth"], 1)
+                self.assertGreaterEqual(metrics["max_flush_latency_s"], 0.0)
+                self.assertEqual(metrics["write_error_count"], 0)
+                self.assertTrue((run_dir / "control" / "last_decision.json").exists())
+            finally:
+                writer.close()
+
+    def test_state_is_captured_when_enqueued(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            state_path = Path(tmp) / "policy_state.json"
+            writer = BackgroundArtifactWriter(flush_interval_s=60.0)
+            state = AlgorithmState(data={"value": 1})
+            writer.persist_state(state_path, state)
+            state.set("value", 2)
+            writer.close()
+
+            payload = json.loads(state_path.read_text(encoding="utf-8"))
+            self.assertEqual(payload["policy_state"], {"value": 1})
+
+    def test_write_errors_are_counted_not_raised(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            blocker = Path(tmp) / "not_a_dir"
+            blocker.write_text("", encoding="utf-8")
+            writer = BackgroundArtifactWriter(flush_interval_s=0.0)
+            writer.append_log(blocker / "control_loop.log", "lost")
+            writer.append_log(Path(tmp) / "control_loop.log", "kept")
+            writer.close()
+
+            self.assertEqual(writer.metrics()["write_error_count"], 1)
+            self.assertIn("kept", (Path(tmp) / "control_loop.log").read_text(encoding="utf-8"))
+
+    def test_non_os_errors_keep_the_writer_thread_alive(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "control_loop.log"
+            writer = BackgroundArtifactWriter(max_queue_size=1, flush_interval_s=0.0)
+            # A lone surrogate cannot be encoded as UTF-8 (UnicodeEncodeError).
+            writer.replace_text(Path(tmp) / "last_decision.json", "\ud800")
+            writer.flush()
+            for index in range(5):
+                writer.append_log(log_path, f"after error {index}")
+            writer.flush()
+            writer.close()
+
+            metrics = writer.metrics()
+            self.assertEqual(metrics["write_error_count"], 1)
+            self.assertIn("UnicodeEncodeError", str(metrics["last_write_error"]))
+            self.assertIn("after error 4", log_path.read_text(encoding="utf-8"))
+
+    def test_writes_after_close_are_synchronous(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "control_loop.log"
+            writer = BackgroundArtifactWriter()
+            writer.close()
+            writer.close()
+            writer.append_log(log_path, "after close")
+            writer.flush()
+
+            self.assertIn("after close", log_path.read_text(encoding="utf-8"))
+
+    def test_build_artifact_writer_modes(self) -> None:
+        self.assertIsInstance(build_artifact_writer("inline"), InlineArtifactWriter)
+        writer = build_artifact_writer("background", max_queue_size=4, flush_interval_s=0.1)
+        try:
+            self.assertIsInstance(writer, BackgroundArtifactWriter)
+            self.assertIsInstance(writer, ArtifactWriter)
+        finally:
+            writer.close()
+        with self.assertRaisesRegex(ValueError, "Unsupported CONTROL_ARTIFACT_WRITER"):
+            build_artifact_writer("mmap")
+
+
+if __name__ == "__main__":
+    unittest.main()
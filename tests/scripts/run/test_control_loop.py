@@ -7,16 +7,23 @@ stays in dry-run mode and writes no real clock commands.
 """
 from __future__ import annotations
 
+import csv
 import json
 import os
 import tempfile
+import threading
+import time
 import unittest
 from unittest import mock
 from pathlib import Path
 
 from scripts.run import control_loop
+from scripts.run.artifact_writer import BackgroundArtifactWriter
 from scripts.run.control_loop import ControlLoopAbortError, run_control_loop
 from scripts.run.control_runtime import build_window
+from scripts.run.stage_profiler import TraceProfiler
+from scripts.run.window_scheduler import DeadlineScheduler
+from src.common.control import DeduplicatingClockController
 from src.common.experiment.types import (
     AlgorithmState,
     Decision,
@@ -453,6 +460,65 @@ class TestControlLoopAbortsAfterMaxConsecutiveFailures(unittest.TestCase):
             self.assertEqual(summary_data["window_failure_count"], 2)
 
 
+class TestControlLoopDeadlineScheduler(unittest.TestCase):
+    """Deadline mode wakes on the window grid and reports overruns."""
+
+    def test_deadline_mode_records_overrun_statistics(self) -> None:
+        context = _make_context()
+        policy = resolve_policy("max_freq")
+        clock = {"now": 0.0}
+
+        def _sleep(seconds: float) -> None:
+            clock["now"] += seconds
+
+        def _window_builder(ctx: ExperimentContext, window_index: int):
+            # Window 1 takes longer than a whole window.
+            clock["now"] += 6.0 if window_index == 1 else 1.0
+            return build_window(ctx, window_index)
+
+        scheduler = DeadlineScheduler(
+            5.0,
+            overrun_policy="skip",
+            clock=lambda: clock["now"],
+            sleep_fn=_sleep,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            paths = _make_paths(run_dir)
+
+            summary = run_control_loop(
+                policy=policy,
+                context=context,
+                policy_config={},
+                run_dir=run_dir,
+                control_log=paths["control_log"],
+                decisions_csv=paths["decisions_csv"],
+                state_path=paths["state_path"],
+                decision_path=paths["decision_path"],
+                window_seconds=5.0,
+                max_windows=5,
+                sleep_fn=lambda _seconds: self.fail("deadline mode must not use sleep_fn"),
+                window_builder=_window_builder,
+                window_scheduler=scheduler,
+            )
+
+            # Window 1 overran into window 2's slot, which was skipped.
+            self.assertEqual(summary.total_windows, 4)
+            self.assertAlmostEqual(clock["now"], 25.0)
+            data = json.loads(
+                (run_dir / "control" / "final_summary.json").read_text(encoding="utf-8")
+            )
+            scheduler_stats = data["scheduler"]
+            self.assertEqual(scheduler_stats["mode"], "deadline")
+            self.assertEqual(scheduler_stats["overrun_policy"], "skip")
+            self.assertEqual(scheduler_stats["overrun_count"], 1)
+            self.assertEqual(scheduler_stats["skipped_window_count"], 1)
+            self.assertAlmostEqual(scheduler_stats["max_overrun_s"], 1.0)
+            log_text = paths["control_log"].read_text(encoding="utf-8")
+            self.assertIn("schedule window=1 overrun_s=1.000000", log_text)
+
+
 class TestControlLoopStopFileHaltsLoop(unittest.TestCase):
     """A pre-existing stop file causes the loop to exit before any window."""
 
@@ -493,5 +559,431 @@ class TestControlLoopStopFileHaltsLoop(unittest.TestCase):
             self.assertTrue(summary_path.exists(), "final_summary.json was not written after stop-file exit")
 
 
+
+class TestControlLoopStopEvent(unittest.TestCase):
+    """Setting the stop event (as the SIGTERM handler does) ends the run cleanly."""
+
+    def test_stop_event_finalizes_and_flushes_background_writer(self) -> None:
+        context = _make_context()
+        policy = resolve_policy("max_freq")
+        stop_event = threading.Event()
+
+        def _window_builder(ctx: ExperimentContext, window_index: int) -> MetricWindow:
+            if window_index == 2:
+                stop_event.set()
+            return build_window(ctx, window_index)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            paths = _make_paths(run_dir)
+            writer = BackgroundArtifactWriter(flush_interval_s=60.0)
+            try:
+                summary = run_control_loop(
+                    policy=policy,
+                    context=context,
+                    policy_config={},
+                    run_dir=run_dir,
+                    window_seconds=5.0,
+                    max_windows=10,
+                    sleep_fn=lambda _seconds: None,
+                    window_builder=_window_builder,
+                    artifact_writer=writer,
+                    stop_event=stop_event,
+                    **paths,
+                )
+
+                # Everything written before final_summary.json is already on
+                # disk, even though the writer's batch interval never elapsed.
+                self.assertEqual(summary.total_windows, 3)
+                rows = paths["decisions_csv"].read_text(encoding="utf-8").splitlines()
+                # Header, the initial decision (window -1), and windows 0-2.
+                self.assertEqual(len(rows), 5)
+                last = json.loads(paths["decision_path"].read_text(encoding="utf-8"))
+                self.assertEqual(last["window_index"], 2)
+                data = json.loads(
+                    (run_dir / "control" / "final_summary.json").read_text(encoding="utf-8")
+                )
+                self.assertEqual(data["control_status"], "completed")
+                self.assertEqual(data["artifact_writer"]["mode"], "background")
+                self.assertGreater(data["artifact_writer"]["coalesced_replace_count"], 0)
+                log_text = paths["control_log"].read_text(encoding="utf-8")
+                self.assertIn("control_loop finished", log_text)
+            finally:
+                writer.close()
+
+
+class TestControlLoopProfiler(unittest.TestCase):
+    """CONTROL_PROFILE-style profiling records every hot-path stage."""
+
+    def test_profiler_records_stages_and_writes_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            run_control_loop(
+                policy=resolve_policy("max_freq"),
+                context=_make_context(),
+                policy_config={},
+                run_dir=run_dir,
+                window_seconds=5.0,
+                max_windows=3,
+                sleep_fn=lambda _seconds: None,
+                window_builder=build_window,
+                profiler=TraceProfiler(),
+                **_make_paths(run_dir),
+            )
+            data = json.loads(
+                (run_dir / "control" / "final_summary.json").read_text(encoding="utf-8")
+            )
+            trace = json.loads((run_dir / "control" / "trace.json").read_text(encoding="utf-8"))
+
+        stages = data["profile"]["stages"]
+        self.assertEqual(
+            sorted(stages),
+            sorted(
+                [
+                    "window_builder",
+                    "on_window",
+                    "validate_decision",
+                    "apply_decision",
+                    "capture_state",
+                    "persist_state",
+                    "append_decision_row",
+                    "write_last_decision",
+                    "append_log",
+                ]
+            ),
+        )
+        self.assertTrue(all(stage["count"] == 3 for stage in stages.values()))
+        spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual(len(spans), 27)
+
+    def test_profiling_is_disabled_by_default(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            run_control_loop(
+                policy=resolve_policy("max_freq"),
+                context=_make_context(),
+                policy_config={},
+                run_dir=run_dir,
+                window_seconds=5.0,
+                max_windows=1,
+                sleep_fn=lambda _seconds: None,
+                window_builder=build_window,
+                **_make_paths(run_dir),
+            )
+            data = json.loads(
+                (run_dir / "control" / "final_summary.json").read_text(encoding="utf-8")
+            )
+            self.assertFalse((run_dir / "control" / "trace.json").exists())
+        self.assertEqual(data["profile"], {"enabled": False})
+
+
+class _FixedClockPolicy:
+    """Online policy that re-emits the same SET_CLOCK every window."""
+
+    policy_name = "fixed_online"
+
+    def initialize(self, ctx: ExperimentContext, config: object) -> AlgorithmState:
+        state = AlgorithmState()
+        state.set("run_id", ctx.metadata.run_id)
+        state.set("total_windows", 0)
+        return state
+
+    def on_window(self, metrics: MetricWindow, state: AlgorithmState) -> Decision:
+        state.set("total_windows", int(state.get("total_windows", 0)) + 1)
+        return Decision(
+            action=DecisionAction.SET_CLOCK,
+            target_graphics_clock_mhz=900,
+            reason_code="fixed_online",
+        )
+
+    def finalize(self, state: AlgorithmState) -> FinalSummary:
+        return FinalSummary(
+            policy_name=self.policy_name,
+            run_id=str(state.get("run_id")),
+            total_windows=int(state.get("total_windows", 0)),
+            pd_target=0.05,
+            pd_violation_count=0,
+            max_pd_violation=0.0,
+        )
+
+
+class _RecordingController:
+    def __init__(self) -> None:
+        self.applied: list[Decision] = []
+
+    def apply(self, decision: Decision) -> None:
+        self.applied.append(decision)
+
+    def reset(self) -> None:
+        return None
+
+
+class TestControlLoopClockController(unittest.TestCase):
+    """The loop owns one controller and skips repeated actuations."""
+
+    def _run(self, run_dir: Path, **kwargs: object) -> dict[str, object]:
+        run_control_loop(
+            policy=_FixedClockPolicy(),
+            context=_make_context(),
+            policy_config={},
+            run_dir=run_dir,
+            window_seconds=5.0,
+            max_windows=5,
+            sleep_fn=lambda _seconds: None,
+            window_builder=build_window,
+            **_make_paths(run_dir),
+            **kwargs,
+        )
+        summary_path = run_dir / "control" / "final_summary.json"
+        return json.loads(summary_path.read_text(encoding="utf-8"))
+
+    def test_injected_controller_is_reused_and_deduplicated(self) -> None:
+        inner = _RecordingController()
+        controller = DeduplicatingClockController(inner)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            data = self._run(Path(tmp), clock_controller=controller)
+
+        self.assertEqual(len(inner.applied), 1)
+        self.assertEqual(data["actuation"]["issued_count"], 1)
+        self.assertEqual(data["actuation"]["suppressed_count"], 4)
+
+    def test_default_controller_confirms_against_observed_clock(self) -> None:
+        for confirm, expected_issued in (("0", 1), ("1", 5)):
+            with self.subTest(confirm=confirm), tempfile.TemporaryDirectory() as tmp:
+                run_dir = Path(tmp)
+                # The env telemetry reports the max clock, never the applied 900 MHz.
+                with mock.patch.dict(
+                    os.environ,
+                    {"CONTROL_CONFIRM_APPLIED_CLOCK": confirm},
+                    clear=True,
+                ):
+                    data = self._run(run_dir)
+
+                self.assertEqual(data["actuation"]["issued_count"], expected_issued)
+                log_text = (run_dir / "control_loop.log").read_text(encoding="utf-8")
+                self.assertEqual(log_text.count("dry-run control action"), expected_issued)
+
+    def test_actuation_latency_is_recorded_per_decision(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            with mock.patch.dict(os.environ, {}, clear=True):
+                data = self._run(run_dir)
+
+            with (run_dir / "control" / "decisions.csv").open(encoding="utf-8") as fp:
+                rows = list(csv.DictReader(fp))
+            log_lines = (run_dir / "control_loop.log").read_text(encoding="utf-8").splitlines()
+            last = json.loads(
+                (run_dir / "control" / "last_decision.json").read_text(encoding="utf-8")
+            )
+
+        # Only the first SET_CLOCK reaches the backend; the rest are deduplicated.
+        self.assertEqual(len(rows), 5)
+        self.assertGreaterEqual(float(rows[0]["actuation_ms"]), 0.0)
+        self.assertEqual([row["actuation_ms"] for row in rows[1:]], [""] * 4)
+        window_lines = [line for line in log_lines if "] window=" in line]
+        self.assertRegex(window_lines[0], r"actuation_ms=\d+\.\d{3}$")
+        self.assertTrue(window_lines[-1].endswith("actuation_ms=none"))
+        self.assertIsNone(last["actuation_ms"])
+
+        set_clock = data["actuation_latency"]["shell"]["set_clock"]
+        self.assertEqual(set_clock["count"], 1)
+        self.assertEqual(set_clock["failure_count"], 0)
+        self.assertLessEqual(set_clock["p50_ms"], set_clock["max_ms"])
+
+    def test_injected_controller_without_timer_is_timed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            data = self._run(Path(tmp), clock_controller=_RecordingController())
+
+        self.assertEqual(
+            data["actuation_latency"]["_RecordingController"]["set_clock"]["count"], 5
+        )
+
+
+
+class _BarrierController:
+    """Blocks each apply until every device's controller is applying."""
+
+    def __init__(self, barrier: threading.Barrier) -> None:
+        self._barrier = barrier
+        self.applied: list[Decision] = []
+
+    def apply(self, decision: Decision) -> None:
+        self._barrier.wait()
+        self.applied.append(decision)
+
+    def reset(self) -> None:
+        return None
+
+
+class _DeviceClockPolicy(_FixedClockPolicy):
+    """Sets the clock to 900 MHz plus one 15 MHz step per GPU index and window."""
+
+    def initialize(self, ctx: ExperimentContext, config: object) -> AlgorithmState:
+        state = super().initialize(ctx, config)
+        state.set("gpu_index", int(ctx.metadata.tags["gpu_index"]))
+        return state
+
+    def on_window(self, metrics: MetricWindow, state: AlgorithmState) -> Decision:
+        super().on_window(metrics, state)
+        if metrics.custom_metrics.get("fail"):
+            raise RuntimeError("bad telemetry")
+        return Decision(
+            action=DecisionAction.SET_CLOCK,
+            target_graphics_clock_mhz=900 + 15 * (int(state.get("gpu_index")) + metrics.sequence_id),
+            reason_code="per_device",
+        )
+
+
+class TestMultiGpuControlLoop(unittest.TestCase):
+    """One process drives an independent policy instance per GPU."""
+
+    def _run(self, run_dir: Path, **kwargs: object) -> dict[str, object]:
+        options: dict[str, object] = {
+            "policy_factory": _DeviceClockPolicy,
+            "context": _make_context(),
+            "policy_config": {},
+            "run_dir": run_dir,
+            "control_log": run_dir / "control_loop.log",
+            "device_indices": [0, 1, 2],
+            "window_seconds": 5.0,
+            "max_windows": 3,
+            "sleep_fn": lambda _seconds: None,
+        }
+        options.update(kwargs)
+        control_loop.run_multi_gpu_control_loop(**options)
+        return json.loads(
+            (run_dir / "control" / "final_summary.json").read_text(encoding="utf-8")
+        )
+
+    def test_actuates_devices_concurrently_with_per_device_artifacts(self) -> None:
+        barrier = threading.Barrier(3, timeout=5.0)
+        controllers = {index: _BarrierController(barrier) for index in (0, 1, 2)}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            data = self._run(run_dir, clock_controllers=controllers)
+
+            for index in (0, 1, 2):
+                device_dir = run_dir / "control" / f"gpu{index}"
+                with (device_dir / "decisions.csv").open(encoding="utf-8") as fp:
+                    rows = list(csv.DictReader(fp))
+                self.assertEqual(
+                    [row["decision"] for row in rows],
+                    [f"set_clock:{900 + 15 * (index + window)}" for window in range(3)],
+                )
+                state = json.loads((device_dir / "policy_state.json").read_text(encoding="utf-8"))
+                self.assertEqual(state["policy_state"]["gpu_index"], index)
+            log_text = (run_dir / "control_loop.log").read_text(encoding="utf-8")
+
+        for index, controller in controllers.items():
+            self.assertEqual(len(controller.applied), 3)
+        self.assertIn("window=2 gpu=1 policy=max_freq decision=set_clock target=945", log_text)
+        self.assertEqual(data["mode"], "multi_gpu")
+        self.assertEqual(data["device_indices"], [0, 1, 2])
+        self.assertEqual(data["total_windows"], 3)
+        self.assertEqual(sorted(data["devices"]), ["0", "1", "2"])
+        self.assertEqual(data["devices"]["2"]["total_windows"], 3)
+        self.assertEqual(
+            data["devices"]["1"]["actuation_latency"]["_BarrierController"]["set_clock"]["count"],
+            3,
+        )
+
+    def test_device_failures_are_isolated_and_can_abort(self) -> None:
+        def _window_builder(ctx: ExperimentContext, device_index: int, window_index: int):
+            window = build_window(ctx, window_index)
+            if device_index == 1:
+                window.custom_metrics["fail"] = True
+            return window
+
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            data = self._run(
+                run_dir,
+                device_indices=[0, 1],
+                window_builder=_window_builder,
+                max_windows=10,
+                max_consecutive_failures=2,
+                clock_controllers={0: _RecordingController(), 1: _RecordingController()},
+            )
+            rows = (run_dir / "control" / "gpu0" / "decisions.csv").read_text(encoding="utf-8")
+            self.assertFalse((run_dir / "control" / "gpu1" / "decisions.csv").exists())
+
+        self.assertEqual(len(rows.splitlines()), 3)
+        self.assertEqual(data["control_status"], "aborted")
+        self.assertEqual(data["abort_reason"], "max_consecutive_failures_reached:2/2:gpu=1")
+        self.assertEqual(data["devices"]["0"]["window_failure_count"], 0)
+        self.assertEqual(data["devices"]["1"]["window_failure_count"], 2)
+
+    def test_default_controllers_substitute_gpu_index(self) -> None:
+        env = {"APPLY_CLOCK_CMD_TEMPLATE": "true {gpu_index} {target_mhz}"}
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, env, clear=True):
+            run_dir = Path(tmp)
+            self._run(run_dir, device_indices=[0, 3], max_windows=1)
+            log_text = (run_dir / "control_loop.log").read_text(encoding="utf-8")
+
+        self.assertIn("applying control command: true 0 900", log_text)
+        self.assertIn("applying control command: true 3 945", log_text)
+
+
+class TestControlLoopReplayMode(unittest.TestCase):
+    def test_replays_trace_to_its_end_without_sleeping(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            trace = run_dir / "trace.csv"
+            trace.write_text(
+                "gpu_util_avg_pct,mem_util_avg_pct,graphics_clock_avg_mhz,power_avg_w\n"
+                + "".join(f"{50 + window % 40},20,1410,{200 + window}\n" for window in range(40)),
+                encoding="utf-8",
+            )
+            env = {
+                "RUN_DIR": str(run_dir),
+                "BENCH_ID": "synthetic",
+                "POLICY_NAME": "max_freq",
+                "CONTROL_WINDOW_SECONDS": "60",
+                "CONTROL_SCHEDULER": "deadline",
+                "CONTROL_REPLAY_TRACE": str(trace),
+            }
+            started = time.monotonic()
+            with mock.patch.dict(os.environ, env, clear=True):
+                rc = control_loop.main([])
+            elapsed_s = time.monotonic() - started
+
+            rows = (run_dir / "control" / "decisions.csv").read_text(encoding="utf-8").splitlines()
+            summary = json.loads(
+                (run_dir / "control" / "final_summary.json").read_text(encoding="utf-8")
+            )
+
+        self.assertEqual(rc, 0)
+        self.assertLess(elapsed_s, 30.0)  # 40 paced 60 s windows would take 40 minutes
+        self.assertEqual(len(rows), 42)  # header, initial decision, one row per trace window
+        self.assertEqual(summary["control_status"], "completed")
+
+    def test_replay_ignores_configured_clock_commands(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            trace = run_dir / "trace.csv"
+            trace.write_text(
+                "gpu_util_avg_pct,mem_util_avg_pct,graphics_clock_avg_mhz\n"
+                + "".join(f"{50 + window * 10},20,1410\n" for window in range(4)),
+                encoding="utf-8",
+            )
+            marker = run_dir / "actuated.txt"
+            for gpu_env in ({}, {"CONTROL_GPU_INDICES": "0,1"}):
+                env = {
+                    "RUN_DIR": str(run_dir),
+                    "BENCH_ID": "synthetic",
+                    "POLICY_NAME": "max_freq",
+                    "CONTROL_REPLAY_TRACE": str(trace),
+                    "APPLY_CLOCK_CMD_TEMPLATE": f"echo {{target_mhz}} >> {marker}",
+                    "APPLY_CLOCK_RESET_CMD": f"echo reset >> {marker}",
+                    **gpu_env,
+                }
+                with mock.patch.dict(os.environ, env, clear=True):
+                    self.assertEqual(control_loop.main([]), 0, msg=str(gpu_env))
+
+            self.assertFalse(marker.exists())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,222 @@
+"""Tests for the pipelined ``run_control_loop_async`` runner."""
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from scripts.run.artifact_writer import InlineArtifactWriter
+from scripts.run.control_loop import ControlLoopAbortError, run_control_loop_async
+from scripts.run.control_runtime import build_window
+from scripts.run.stage_profiler import TraceProfiler
+from src.common.experiment.types import (
+    AlgorithmState,
+    Decision,
+    DecisionAction,
+    ExperimentContext,
+    ExperimentMetadata,
+    FinalSummary,
+    MetricWindow,
+    PlatformSpec,
+)
+from src.methods.registry import resolve_policy
+
+
+_PLATFORM = PlatformSpec(
+    vendor="nvidia",
+    gpu_model="TestGPU",
+    gpu_count=1,
+    min_graphics_clock_mhz=210,
+    max_graphics_clock_mhz=1410,
+    graphics_clock_step_mhz=15,
+)
+
+_METADATA = ExperimentMetadata(
+    run_id="test-run-async",
+    experiment_id="test-exp",
+    policy_name="max_freq",
+    workload_name="synthetic",
+    started_at_utc="2026-01-01T00:00:00Z",
+)
+
+
+def _make_context() -> ExperimentContext:
+    return ExperimentContext(
+        platform=_PLATFORM,
+        metadata=_METADATA,
+        pd_target=0.05,
+        window_seconds=5.0,
+        sampling_interval_ms=1000,
+    )
+
+
+def _loop_kwargs(run_dir: Path) -> dict[str, object]:
+    return {
+        "context": _make_context(),
+        "policy_config": {},
+        "run_dir": run_dir,
+        "control_log": run_dir / "control_loop.log",
+        "decisions_csv": run_dir / "control" / "decisions.csv",
+        "state_path": run_dir / "control" / "policy_state.json",
+        "decision_path": run_dir / "control" / "last_decision.json",
+        "window_seconds": 5.0,
+    }
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+class _OrderedPolicy:
+    """Records the window order seen by ``on_window``."""
+
+    policy_name = "ordered"
+
+    def __init__(self) -> None:
+        self.seen: list[int] = []
+
+    def initialize(self, ctx: ExperimentContext, config: object) -> AlgorithmState:
+        state = AlgorithmState()
+        state.set("run_id", ctx.metadata.run_id)
+        state.set("total_windows", 0)
+        return state
+
+    def on_window(self, metrics: MetricWindow, state: AlgorithmState) -> Decision:
+        self.seen.append(metrics.sequence_id)
+        state.set("total_windows", int(state.get("total_windows", 0)) + 1)
+        state.set("last_sequence_id", metrics.sequence_id)
+        return Decision(
+            action=DecisionAction.SET_CLOCK,
+            target_graphics_clock_mhz=900 + 15 * (metrics.sequence_id % 2),
+            reason_code="ordered_step",
+        )
+
+    def finalize(self, state: AlgorithmState) -> FinalSummary:
+        return FinalSummary(
+            policy_name=self.policy_name,
+            run_id=str(state.get("run_id")),
+            total_windows=int(state.get("total_windows", 0)),
+            pd_target=0.05,
+            pd_violation_count=0,
+            max_pd_violation=0.0,
+        )
+
+
+class RunControlLoopAsyncTests(unittest.TestCase):
+    def test_windows_are_decided_in_order_and_persisted(self) -> None:
+        policy = _OrderedPolicy()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            summary = asyncio.run(
+                run_control_loop_async(
+                    policy=policy,
+                    max_windows=6,
+                    sleep_fn=_no_sleep,
+                    window_builder=build_window,
+                    **_loop_kwargs(run_dir),
+                )
+            )
+
+            self.assertEqual(summary.total_windows, 6)
+            self.assertEqual(policy.seen, [0, 1, 2, 3, 4, 5])
+            rows = (run_dir / "control" / "decisions.csv").read_text(encoding="utf-8").splitlines()
+            self.assertEqual(len(rows), 7)
+            for window_index, row in enumerate(rows[1:]):
+                self.assertIn(f";window={window_index}", row)
+
+            last = json.loads((run_dir / "control" / "last_decision.json").read_text(encoding="utf-8"))
+            self.assertEqual(last["window_index"], 5)
+            state = json.loads((run_dir / "control" / "policy_state.json").read_text(encoding="utf-8"))
+            self.assertEqual(state["policy_state"]["last_sequence_id"], 5)
+
+            data = json.loads((run_dir / "control" / "final_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(data["control_status"], "completed")
+            self.assertEqual(data["pipeline"]["mode"], "async")
+            self.assertEqual(data["pipeline"]["decision_count"], 6)
+            self.assertEqual(data["pipeline"]["persist_failure_count"], 0)
+
+    def test_profiler_times_stages_on_worker_threads(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            asyncio.run(
+                run_control_loop_async(
+                    policy=_OrderedPolicy(),
+                    max_windows=4,
+                    sleep_fn=_no_sleep,
+                    window_builder=build_window,
+                    profiler=TraceProfiler(),
+                    **_loop_kwargs(run_dir),
+                )
+            )
+            data = json.loads((run_dir / "control" / "final_summary.json").read_text(encoding="utf-8"))
+            trace = json.loads((run_dir / "control" / "trace.json").read_text(encoding="utf-8"))
+
+        stages = data["profile"]["stages"]
+        for stage in ("window_builder", "on_window", "apply_decision", "persist_state", "append_log"):
+            self.assertEqual(stages[stage]["count"], 4, stage)
+        tids = {
+            event["name"]: event["tid"] for event in trace["traceEvents"] if event["ph"] == "X"
+        }
+        self.assertNotEqual(tids["window_builder"], tids["on_window"])
+
+    def test_slow_persistence_does_not_delay_decisions(self) -> None:
+        policy = resolve_policy("max_freq")
+        persisted_on: list[str] = []
+
+        class _SlowWriter(InlineArtifactWriter):
+            def replace_text(self, path: Path, text: str) -> None:
+                persisted_on.append(threading.current_thread().name)
+                time.sleep(0.05)
+                super().replace_text(path, text)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            asyncio.run(
+                run_control_loop_async(
+                    policy=policy,
+                    max_windows=4,
+                    sleep_fn=_no_sleep,
+                    window_builder=build_window,
+                    artifact_writer=_SlowWriter(),
+                    **_loop_kwargs(run_dir),
+                )
+            )
+
+            data = json.loads((run_dir / "control" / "final_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(data["pipeline"]["decision_count"], 4)
+            self.assertLess(data["pipeline"]["max_decision_latency_s"], 0.05)
+            # Window persistence happened off the event-loop thread.
+            self.assertTrue(any(name != "MainThread" for name in persisted_on))
+
+    def test_aborts_after_consecutive_telemetry_failures(self) -> None:
+        def _always_raise(ctx: ExperimentContext, window_index: int) -> MetricWindow:
+            raise RuntimeError("telemetry down")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            with self.assertRaises(ControlLoopAbortError):
+                asyncio.run(
+                    run_control_loop_async(
+                        policy=resolve_policy("max_freq"),
+                        max_windows=100,
+                        max_consecutive_failures=3,
+                        raise_on_abort=True,
+                        sleep_fn=_no_sleep,
+                        window_builder=_always_raise,
+                        **_loop_kwargs(run_dir),
+                    )
+                )
+
+            data = json.loads((run_dir / "control" / "final_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(data["control_status"], "aborted")
+            self.assertEqual(data["window_failure_count"], 3)
+            self.assertIn("aborting", (run_dir / "control_loop.log").read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
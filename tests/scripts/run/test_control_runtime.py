@@ -2,13 +2,29 @@ from __future__ import annotations
 
 import json
 import os
+import shlex
+import sys
 import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
 
-from scripts.run.control_runtime import build_context, write_run_manifest
+from scripts.run.control_runtime import (
+    build_clock_controller,
+    build_context,
+    build_device_window,
+    build_device_window_builder,
+    build_telemetry_source,
+    build_window,
+    build_window_builder,
+    parse_bool_env,
+    parse_gpu_indices,
+    write_run_manifest,
+)
+from src.common.control import CoprocessClockController, ShellTemplateController
 from src.common.experiment import PerformanceTargetType
+from src.common.telemetry import SharedMemoryTelemetryProvider, SysfsTelemetrySource
 
 
 def _build_context():
@@ -82,5 +98,168 @@ class BuildContextPerformanceTargetTests(unittest.TestCase):
         self.assertEqual(manifest["environment"]["PERFORMANCE_TARGET_TYPE"], "runtime_slowdown")
 
 
+
+class ParseBoolEnvTests(unittest.TestCase):
+    def test_parses_common_spellings_and_rejects_others(self) -> None:
+        for raw, expected in (("1", True), ("TRUE", True), ("off", False), ("0", False)):
+            with self.subTest(raw=raw), mock.patch.dict(os.environ, {"FLAG": raw}, clear=True):
+                self.assertIs(parse_bool_env("FLAG", not expected), expected)
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertTrue(parse_bool_env("FLAG", True))
+        with mock.patch.dict(os.environ, {"FLAG": "maybe"}, clear=True):
+            with self.assertRaisesRegex(ValueError, "FLAG"):
+                parse_bool_env("FLAG", False)
+
+
+class ParseGpuIndicesTests(unittest.TestCase):
+    def test_parses_all_lists_and_rejects_bad_values(self) -> None:
+        self.assertIsNone(parse_gpu_indices("", 8))
+        self.assertEqual(parse_gpu_indices("all", 4), [0, 1, 2, 3])
+        self.assertEqual(parse_gpu_indices(" 3, 1 ", 4), [3, 1])
+        for raw in ("0,0", "-1", "x", ","):
+            with self.subTest(raw=raw), self.assertRaisesRegex(ValueError, "CONTROL_GPU_INDICES"):
+                parse_gpu_indices(raw, 4)
+
+
+class BuildClockControllerTests(unittest.TestCase):
+    def test_helper_command_selects_coprocess_backend(self) -> None:
+        env = {
+            "APPLY_CLOCK_HELPER_CMD": "python3 src/common/control/clock_helper.py --backend dry-run",
+            "APPLY_CLOCK_CMD_TEMPLATE": "nvidia-smi -lgc {target_mhz}",
+        }
+        with mock.patch.dict(os.environ, env, clear=True):
+            controller = build_clock_controller(lambda _message: None)
+        self.assertIsInstance(controller, CoprocessClockController)
+        self.assertEqual(controller.metrics()["command"][-2:], ["--backend", "dry-run"])
+
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsInstance(
+                build_clock_controller(lambda _message: None), ShellTemplateController
+            )
+
+
+class BuildWindowBuilderTests(unittest.TestCase):
+    def test_defaults_to_env_telemetry(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIs(build_window_builder(), build_window)
+            self.assertIs(build_device_window_builder([0, 1]), build_device_window)
+
+    def test_monitor_command_builds_routed_monitor(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(build_telemetry_source())
+        # A stand-in monitor printing one dmon row, so no real GPU tool runs.
+        command = [
+            sys.executable,
+            "-c",
+            "import time\n"
+            "print('# gpu sm mem pclk', flush=True)\n"
+            "print('0 97 42 1410', flush=True)\n"
+            "time.sleep(60)\n",
+        ]
+        env = {"CONTROL_TELEMETRY_MONITOR_CMD": shlex.join(command)}
+        with mock.patch.dict(os.environ, env, clear=True):
+            monitor = build_telemetry_source()
+            routed = build_telemetry_source([0, 1])
+        assert monitor is not None and routed is not None
+        self.addCleanup(monitor.stop)
+        self.addCleanup(routed.stop)
+        self.assertEqual(monitor.metrics()["command"], command)
+        # Sources come back already collecting, so window 0 is not empty.
+        deadline = time.monotonic() + 10.0
+        while monitor.metrics()["sample_count"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(monitor.metrics()["sample_count"], 1)
+        self.assertIs(
+            build_window_builder(monitor).__self__,  # type: ignore[attr-defined]
+            monitor.provider(),
+        )
+        self.assertIsNot(routed.provider(0), routed.provider(1))
+
+    def test_sysfs_template_builds_sysfs_source(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for card in (0, 1):
+                device_dir = Path(tmp) / f"card{card}" / "device"
+                device_dir.mkdir(parents=True)
+                (device_dir / "gpu_busy_percent").write_text("10\n")
+                (device_dir / "pp_dpm_sclk").write_text("0: 500Mhz *\n")
+            env = {"CONTROL_TELEMETRY_SYSFS": str(Path(tmp) / "card{gpu_index}" / "device")}
+            with mock.patch.dict(os.environ, env, clear=True):
+                source = build_telemetry_source([0, 1], sampling_interval_s=0.5)
+            assert source is not None
+            self.addCleanup(source.stop)
+
+        self.assertIsInstance(source, SysfsTelemetrySource)
+        self.assertTrue(source._started)  # type: ignore[union-attr]
+        self.assertEqual(
+            [Path(entry["device_dir"]).parent.name for entry in source.metrics().values()],  # type: ignore[index]
+            ["card0", "card1"],
+        )
+
+    def test_shared_memory_segment_takes_precedence_over_file(self) -> None:
+        env = {
+            "CONTROL_TELEMETRY_SHM": "gpu-telemetry-{gpu_index}",
+            "CONTROL_TELEMETRY_FILE": "/unused/telemetry.csv",
+        }
+        with mock.patch.dict(os.environ, env, clear=True):
+            single = build_window_builder()
+            with self.assertRaises(LookupError):
+                build_device_window_builder([0, 3])(_build_context(), 3, 0)
+
+        provider = single.__self__  # type: ignore[attr-defined]
+        self.assertIsInstance(provider, SharedMemoryTelemetryProvider)
+        self.assertEqual(provider.name, "gpu-telemetry-")
+
+    def test_shared_memory_requires_per_device_segments(self) -> None:
+        with mock.patch.dict(os.environ, {"CONTROL_TELEMETRY_SHM": "gpu-telemetry"}, clear=True):
+            with self.assertRaises(ValueError):
+                build_device_window_builder([0, 1])
+
+    def test_telemetry_file_feeds_windows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "telemetry.csv"
+            path.write_text("800.0,5,300\n", encoding="utf-8")  # logged before the run: skipped
+            env = {
+                "CONTROL_TELEMETRY_FILE": str(path),
+                "CONTROL_TELEMETRY_COLUMNS": "timestamp,utilization.gpu,clocks.gr",
+            }
+            with mock.patch.dict(os.environ, env, clear=True):
+                builder = build_window_builder()
+            with path.open("a", encoding="utf-8") as fp:
+                fp.write("900.0,55,1230\n")
+            window = builder(_build_context(), 0)
+
+        self.assertEqual(window.sample_count, 1)
+        self.assertEqual(window.gpu_util_avg_pct, 55.0)
+        self.assertEqual(window.graphics_clock_avg_mhz, 1230.0)
+
+    def test_device_builder_splits_shared_file_by_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "telemetry.csv"
+            path.write_text("timestamp,index,clocks.gr\n", encoding="utf-8")
+            with mock.patch.dict(os.environ, {"CONTROL_TELEMETRY_FILE": str(path)}, clear=True):
+                builder = build_device_window_builder([0, 1])
+                context = _build_context()
+                with path.open("a", encoding="utf-8") as fp:
+                    fp.write("900.0,0,1005\n900.0,1,1200\n")
+                clocks = [builder(context, index, 0).graphics_clock_avg_mhz for index in (0, 1)]
+
+        self.assertEqual(clocks, [1005.0, 1200.0])
+
+    def test_device_builder_formats_per_device_paths(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for index in (0, 1):
+                (Path(tmp) / f"gpu{index}.csv").write_text("timestamp,index,clocks.gr\n", encoding="utf-8")
+            env = {"CONTROL_TELEMETRY_FILE": str(Path(tmp) / "gpu{gpu_index}.csv")}
+            with mock.patch.dict(os.environ, env, clear=True):
+                builder = build_device_window_builder([0, 1])
+                context = _build_context()
+                for index, clock in ((0, 1005), (1, 1200)):
+                    with (Path(tmp) / f"gpu{index}.csv").open("a", encoding="utf-8") as fp:
+                        fp.write(f"900.0,0,{clock}\n")
+                clocks = [builder(context, index, 0).graphics_clock_avg_mhz for index in (0, 1)]
+
+        self.assertEqual(clocks, [1005.0, 1200.0])
+
+
 if __name__ == "__main__":
     unittest.main()
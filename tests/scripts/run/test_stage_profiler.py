@@ -0,0 +1,88 @@
+"""Tests for the control-loop stage profiler."""
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from scripts.run.stage_profiler import (
+    NullProfiler,
+    StageProfiler,
+    TraceProfiler,
+    build_stage_profiler,
+    profiled_call,
+)
+
+
+class _FakeClock:
+    def __init__(self, step_ns: int) -> None:
+        self.now_ns = 0
+        self.step_ns = step_ns
+
+    def __call__(self) -> int:
+        self.now_ns += self.step_ns
+        return self.now_ns
+
+
+class TraceProfilerTests(unittest.TestCase):
+    def test_aggregates_wall_and_cpu_time_per_stage(self) -> None:
+        profiler = TraceProfiler(clock_ns=_FakeClock(1_000_000), cpu_clock_ns=_FakeClock(250_000))
+        for window_index in range(3):
+            with profiler.span("on_window", window_index):
+                pass
+        self.assertEqual(profiled_call(profiler, "apply_decision", 2, max, 1, 2), 2)
+
+        summary = profiler.summary()
+        self.assertTrue(summary["enabled"])
+        self.assertEqual(summary["trace_event_count"], 4)
+        on_window = summary["stages"]["on_window"]
+        self.assertEqual(on_window["count"], 3)
+        self.assertAlmostEqual(on_window["total_ms"], 3.0)
+        self.assertAlmostEqual(on_window["max_ms"], 1.0)
+        self.assertAlmostEqual(on_window["cpu_total_ms"], 0.75)
+        self.assertEqual(summary["stages"]["apply_decision"]["count"], 1)
+
+    def test_writes_chrome_trace_events(self) -> None:
+        profiler = TraceProfiler(max_trace_events=2)
+        with profiler.span("window_builder", 0):
+            pass
+        worker = threading.Thread(
+            target=profiled_call,
+            args=(profiler, "apply_decision", 0, lambda: None),
+            name="worker-a",
+        )
+        worker.start()
+        worker.join()
+        with profiler.span("append_log", 0):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_path = Path(tmp) / "control" / "trace.json"
+            profiler.write_trace(trace_path)
+            trace = json.loads(trace_path.read_text(encoding="utf-8"))
+
+        spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual([span["name"] for span in spans], ["window_builder", "apply_decision"])
+        self.assertEqual(spans[0]["args"]["window_index"], 0)
+        self.assertNotEqual(spans[0]["tid"], spans[1]["tid"])
+        names = {event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+        self.assertIn("worker-a", names)
+        self.assertEqual(profiler.summary()["dropped_trace_event_count"], 1)
+        self.assertEqual(profiler.summary()["stages"]["append_log"]["count"], 1)
+
+    def test_null_profiler_records_nothing(self) -> None:
+        profiler = build_stage_profiler(False)
+        self.assertIsInstance(profiler, NullProfiler)
+        self.assertIsInstance(profiler, StageProfiler)
+        self.assertIs(profiler.span("on_window", 0), profiler.span("append_log", 1))
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler.write_trace(Path(tmp) / "trace.json")
+            self.assertFalse((Path(tmp) / "trace.json").exists())
+        self.assertEqual(profiler.summary(), {"enabled": False})
+        self.assertIsInstance(build_stage_profiler(True), TraceProfiler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+"""Tests for journaled policy-state persistence."""
+from __future__ import annotations
+
+import copy
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.run.artifact_writer import BackgroundArtifactWriter, InlineArtifactWriter
+from scripts.run.control_loop import run_control_loop
+from scripts.run.control_runtime import build_window
+from scripts.run.state_journal import (
+    JournalStateStore,
+    SnapshotStateStore,
+    build_state_store,
+    journal_segments,
+    persist_window_state,
+    rebuild_state,
+)
+from src.common.experiment.types import (
+    AlgorithmState,
+    ExperimentContext,
+    ExperimentMetadata,
+    PlatformSpec,
+)
+from src.methods.registry import resolve_policy
+
+
+def _context() -> ExperimentContext:
+    return ExperimentContext(
+        platform=PlatformSpec(
+            vendor="nvidia",
+            gpu_model="TestGPU",
+            gpu_count=1,
+            min_graphics_clock_mhz=210,
+            max_graphics_clock_mhz=1410,
+            graphics_clock_step_mhz=15,
+        ),
+        metadata=ExperimentMetadata(
+            run_id="journal-test",
+            experiment_id="journal-test",
+            policy_name="everest",
+            workload_name="synthetic",
+            started_at_utc="2026-01-01T00:00:00Z",
+        ),
+        pd_target=0.05,
+        window_seconds=5.0,
+        sampling_interval_ms=1000,
+    )
+
+
+def _mutate(state: AlgorithmState, window_index: int) -> None:
+    state.set("total_windows", window_index + 1)
+    if window_index % 3 == 0:
+        cache = dict(state.get("phase_cache", {}))
+        cache[f"phase-{window_index}"] = {"fs": window_index / 10}
+        state.set("phase_cache", cache)
+    if window_index == 6:
+        state.data.pop("scratch", None)
+        state.mark_dirty("scratch")
+
+
+class JournalStateStoreTests(unittest.TestCase):
+    def test_rebuilds_state_at_every_window(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            journal_path = Path(tmp) / "policy_state.jsonl"
+            state_path = Path(tmp) / "policy_state.json"
+            store = JournalStateStore(
+                journal_path, state_path, InlineArtifactWriter(), snapshot_every=4
+            )
+            state = AlgorithmState()
+            state.set("run_id", "journal-test")
+            state.set("scratch", [1, 2, 3])
+            persist_window_state(store, state, -1)
+
+            expected = {-1: copy.deepcopy(state.data)}
+            for window_index in range(10):
+                _mutate(state, window_index)
+                persist_window_state(store, state, window_index)
+                expected[window_index] = copy.deepcopy(state.data)
+
+            for window_index, data in expected.items():
+                self.assertEqual(rebuild_state(journal_path, window_index).data, data)
+            self.assertEqual(rebuild_state(journal_path).data, expected[9])
+
+            # Each periodic snapshot opens a new segment.
+            segments = journal_segments(journal_path)
+            self.assertEqual(
+                [path.name for path in segments],
+                ["policy_state.jsonl", "policy_state.1.jsonl", "policy_state.2.jsonl"],
+            )
+            records = [
+                [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+                for path in segments
+            ]
+            self.assertEqual(
+                [[record["kind"] for record in segment] for segment in records],
+                [["snapshot"] + ["delta"] * 4, ["snapshot"] + ["delta"] * 4, ["snapshot"]],
+            )
+            # Deltas carry only the changed keys.
+            self.assertEqual(set(records[0][2]["set"]), {"total_windows"})
+            self.assertEqual(records[1][2]["window_index"], 6)
+            self.assertEqual(records[1][2]["unset"], ["scratch"])
+            metrics = store.metrics()
+            self.assertEqual(metrics["segment_count"], 3)
+            self.assertEqual(metrics["snapshot_count"], 3)
+            self.assertEqual(metrics["delta_count"], 8)
+
+            snapshot = json.loads(state_path.read_text(encoding="utf-8"))
+            self.assertEqual(snapshot["policy_state"], expected[9])
+
+    def test_rebuilds_earlier_windows_after_final_forced_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            journal_path = Path(tmp) / "policy_state.jsonl"
+            store = JournalStateStore(
+                journal_path, Path(tmp) / "policy_state.json", InlineArtifactWriter(), snapshot_every=4
+            )
+            state = AlgorithmState()
+            persist_window_state(store, state, -1)
+            for window_index in range(10):
+                state.set("total_windows", window_index + 1)
+                persist_window_state(store, state, window_index)
+            state.set("finalized", True)
+            persist_window_state(store, state, 9, force_snapshot=True)
+
+            self.assertEqual(rebuild_state(journal_path, 5).data, {"total_windows": 6})
+            self.assertEqual(rebuild_state(journal_path, 2).data, {"total_windows": 3})
+            self.assertEqual(rebuild_state(journal_path).data, {"total_windows": 10, "finalized": True})
+            self.assertEqual(store.metrics()["segment_count"], 3)
+
+    def test_entry_updates_journal_only_changed_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            journal_path = Path(tmp) / "policy_state.jsonl"
+            store = JournalStateStore(
+                journal_path, Path(tmp) / "policy_state.json", InlineArtifactWriter()
+            )
+            state = AlgorithmState()
+            state.set("phase_cache", {f"phase-{index}": {"fs": index / 10} for index in range(5)})
+            persist_window_state(store, state, 0)
+
+            state.set_entry("phase_cache", "phase-9", {"fs": 0.9})
+            state.pop_entry("phase_cache", "phase-0")
+            persist_window_state(store, state, 1)
+            # A whole-key set in the same window supersedes entry updates.
+            state.set_entry("phase_cache", "phase-8", {"fs": 0.8})
+            state.set("phase_cache", {"phase-1": {"fs": 1.0}})
+            persist_window_state(store, state, 2)
+
+            records = [json.loads(line) for line in journal_path.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(records[1]["set"], {})
+            self.assertEqual(records[1]["set_entries"], {"phase_cache": {"phase-9": {"fs": 0.9}}})
+            self.assertEqual(records[1]["unset_entries"], {"phase_cache": ["phase-0"]})
+            self.assertEqual(records[2]["set"], {"phase_cache": {"phase-1": {"fs": 1.0}}})
+            self.assertNotIn("set_entries", records[2])
+            self.assertEqual(
+                sorted(rebuild_state(journal_path, 1).data["phase_cache"]),
+                ["phase-1", "phase-2", "phase-3", "phase-4", "phase-9"],
+            )
+            self.assertEqual(rebuild_state(journal_path).data, state.data)
+            self.assertEqual(store.metrics()["journaled_key_count"], 3)
+
+    def test_ignores_truncated_final_record(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            journal_path = Path(tmp) / "policy_state.jsonl"
+            store = JournalStateStore(
+                journal_path, Path(tmp) / "policy_state.json", InlineArtifactWriter()
+            )
+            state = AlgorithmState()
+            state.set("total_windows", 0)
+            persist_window_state(store, state, 0)
+            state.set("total_windows", 1)
+            persist_window_state(store, state, 1)
+            with journal_path.open("a", encoding="utf-8") as fp:
+                fp.write('{"kind": "delta", "window_ind')
+
+            self.assertEqual(rebuild_state(journal_path).data, {"total_windows": 1})
+
+    def test_rejects_window_before_first_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            journal_path = Path(tmp) / "policy_state.jsonl"
+            store = JournalStateStore(
+                journal_path, Path(tmp) / "policy_state.json", InlineArtifactWriter()
+            )
+            persist_window_state(store, AlgorithmState(data={"a": 1}), 3)
+
+            with self.assertRaisesRegex(ValueError, "no snapshot"):
+                rebuild_state(journal_path, 2)
+
+    def test_snapshot_store_rewrites_full_state(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            state_path = Path(tmp) / "policy_state.json"
+            store = build_state_store(
+                "snapshot",
+                state_path=state_path,
+                journal_path=Path(tmp) / "policy_state.jsonl",
+                writer=InlineArtifactWriter(),
+            )
+            self.assertIsInstance(store, SnapshotStateStore)
+            persist_window_state(store, AlgorithmState(data={"a": 1}), 0)
+
+            self.assertEqual(json.loads(state_path.read_text(encoding="utf-8")), {"policy_state": {"a": 1}})
+            self.assertFalse((Path(tmp) / "policy_state.jsonl").exists())
+            with self.assertRaisesRegex(ValueError, "Unsupported CONTROL_STATE_PERSISTENCE"):
+                build_state_store(
+                    "sqlite",
+                    state_path=state_path,
+                    journal_path=state_path,
+                    writer=InlineArtifactWriter(),
+                )
+
+    def test_control_loop_journal_matches_final_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            journal_path = run_dir / "control" / "policy_state.jsonl"
+            state_path = run_dir / "control" / "policy_state.json"
+            writer = BackgroundArtifactWriter(flush_interval_s=0.01)
+            try:
+                run_control_loop(
+                    policy=resolve_policy("everest"),
+                    context=_context(),
+                    policy_config={},
+                    run_dir=run_dir,
+                    control_log=run_dir / "control_loop.log",
+                    decisions_csv=run_dir / "control" / "decisions.csv",
+                    state_path=state_path,
+                    decision_path=run_dir / "control" / "last_decision.json",
+                    window_seconds=5.0,
+                    max_windows=12,
+                    sleep_fn=lambda _seconds: None,
+                    window_builder=build_window,
+                    artifact_writer=writer,
+                    state_store=JournalStateStore(
+                        journal_path, state_path, writer, snapshot_every=5
+                    ),
+                )
+            finally:
+                writer.close()
+
+            snapshot = json.loads(state_path.read_text(encoding="utf-8"))["policy_state"]
+            self.assertEqual(rebuild_state(journal_path).data, snapshot)
+            # Windows before the last periodic and the final forced snapshot still rebuild.
+            self.assertEqual(rebuild_state(journal_path, 5).data["total_windows"], 6)
+            self.assertEqual(rebuild_state(journal_path, 0).data["total_windows"], 1)
+            self.assertGreater(len(journal_segments(journal_path)), 1)
+            summary = json.loads((run_dir / "control" / "final_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(summary["state_persistence"]["mode"], "journal")
+            self.assertEqual(summary["state_persistence"]["delta_count"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import unittest
+
+from scripts.run.window_scheduler import (
+    DeadlineScheduler,
+    OverrunPolicy,
+    build_window_scheduler,
+)
+
+
+class _FakeClock:
+    """Monotonic clock whose time only advances through ``sleep`` or ``advance``."""
+
+    def __init__(self, start: float = 100.0) -> None:
+        self.now = start
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _scheduler(clock: _FakeClock, policy: str = "skip") -> DeadlineScheduler:
+    scheduler = DeadlineScheduler(
+        5.0,
+        overrun_policy=policy,
+        clock=clock,
+        sleep_fn=clock.sleep,
+    )
+    scheduler.start()
+    return scheduler
+
+
+class DeadlineSchedulerTests(unittest.TestCase):
+    def test_wakes_at_absolute_boundaries_without_drift(self) -> None:
+        clock = _FakeClock()
+        scheduler = _scheduler(clock)
+
+        for _ in range(100):
+            clock.advance(1.25)  # per-window work
+            timing = scheduler.wait_next()
+            self.assertEqual(timing.overrun_s, 0.0)
+
+        # 100 windows of 5 s each, regardless of the per-window work time.
+        self.assertAlmostEqual(clock.now, 100.0 + 500.0, places=9)
+        self.assertEqual(scheduler.summary()["overrun_count"], 0)
+
+    def test_skip_policy_drops_missed_boundaries(self) -> None:
+        clock = _FakeClock()
+        scheduler = _scheduler(clock, "skip")
+
+        clock.advance(12.0)  # deadline at 105, finished at 112
+        timing = scheduler.wait_next()
+
+        self.assertAlmostEqual(timing.overrun_s, 7.0)
+        self.assertEqual(timing.skipped_windows, 2)
+        self.assertAlmostEqual(clock.now, 115.0)
+
+        clock.advance(1.0)
+        scheduler.wait_next()
+        self.assertAlmostEqual(clock.now, 120.0)
+        summary = scheduler.summary()
+        self.assertEqual(summary["skipped_window_count"], 2)
+        self.assertEqual(summary["overrun_count"], 1)
+        self.assertAlmostEqual(summary["max_overrun_s"], 7.0)
+
+    def test_catch_up_policy_runs_back_to_back_on_original_grid(self) -> None:
+        clock = _FakeClock()
+        scheduler = _scheduler(clock, "catch_up")
+
+        clock.advance(12.0)
+        first = scheduler.wait_next()
+        self.assertEqual(first.skipped_windows, 0)
+        self.assertAlmostEqual(clock.now, 112.0)  # no sleep: behind schedule
+
+        clock.advance(0.5)
+        scheduler.wait_next()  # deadline 110 already passed
+        self.assertAlmostEqual(clock.now, 112.5)
+
+        clock.advance(0.5)
+        scheduler.wait_next()  # deadline 115 is ahead again
+        self.assertAlmostEqual(clock.now, 115.0)
+
+    def test_stretch_policy_reanchors_grid(self) -> None:
+        clock = _FakeClock()
+        scheduler = _scheduler(clock, "stretch")
+
+        clock.advance(7.0)  # 2 s past the 105 deadline
+        scheduler.wait_next()
+        self.assertAlmostEqual(clock.now, 107.0)
+
+        clock.advance(1.0)
+        scheduler.wait_next()
+        self.assertAlmostEqual(clock.now, 112.0)
+        self.assertAlmostEqual(scheduler.summary()["stretched_s"], 2.0)
+
+    def test_jitter_measures_late_wakeups(self) -> None:
+        clock = _FakeClock()
+
+        def _late_sleep(seconds: float) -> None:
+            clock.sleep(seconds + 0.003)
+
+        scheduler = DeadlineScheduler(5.0, clock=clock, sleep_fn=_late_sleep)
+        scheduler.start()
+        clock.advance(1.0)
+        timing = scheduler.wait_next()
+
+        self.assertAlmostEqual(timing.jitter_s, 0.003)
+        self.assertAlmostEqual(scheduler.summary()["max_jitter_s"], 0.003)
+
+    def test_rejects_unknown_policy_and_mode(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Unsupported overrun policy"):
+            OverrunPolicy.parse("drop")
+        with self.assertRaisesRegex(ValueError, "Unsupported CONTROL_SCHEDULER"):
+            build_window_scheduler("busy", 5.0)
+        self.assertIsNone(build_window_scheduler("sleep", 5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,6 @@
+"""Tests for the offline sweep runner."""
+from __future__ import annotations
+
+from pathlib import Path
+
+__path__.append(str(Path(__file__).resolve().parents[3] / "scripts" / "sweep"))
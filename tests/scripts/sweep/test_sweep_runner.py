@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import csv
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scripts.sweep.sweep_runner import (
+    RESULTS_CSV_FILE,
+    RESULTS_FILE,
+    SweepMatrix,
+    expand_config_grid,
+    load_results,
+    main,
+    run_sweep,
+)
+
+
+_PLATFORM = {
+    "vendor": "nvidia",
+    "gpu_model": "A100",
+    "gpu_count": 1,
+    "min_graphics_clock_mhz": 210,
+    "max_graphics_clock_mhz": 1410,
+    "graphics_clock_step_mhz": 15,
+}
+
+_PHASES = {
+    "phases": [
+        {"name": "memory", "work_s": 60, "compute_fraction": 0.2, "gpu_util_pct": 95, "mem_util_pct": 80},
+        {"name": "compute", "work_s": 60, "compute_fraction": 0.9, "gpu_util_pct": 99, "mem_util_pct": 20},
+    ]
+}
+
+
+def _matrix(root: Path, **overrides: object) -> dict[str, object]:
+    trace = root / "trace.csv"
+    trace.write_text(
+        "graphics_clock_avg_mhz,gpu_util_avg_pct,mem_util_avg_pct\n"
+        + "1410,90,40\n" * 6,
+        encoding="utf-8",
+    )
+    matrix: dict[str, object] = {
+        "name": "unit",
+        "platform": _PLATFORM,
+        "window_seconds": 5.0,
+        "policies": ["max_freq", "everest"],
+        "pd_targets": [0.05, 0.10],
+        "performance_target_types": ["runtime_slowdown"],
+        "workloads": [
+            {"name": "synthetic", "simulated": _PHASES, "simulator": {"noise_pct": 1.0, "seed": 3}},
+            {"name": "recorded", "trace": "trace.csv"},
+        ],
+        "policy_configs": {"everest": {"grid": {"change_threshold_pct": [5.0, 10.0]}}},
+    }
+    matrix.update(overrides)
+    return matrix
+
+
+class TestSweepMatrix(unittest.TestCase):
+    def test_expand_config_grid_merges_combinations_over_base(self) -> None:
+        configs = expand_config_grid({"base": {"a": 1, "b": 0}, "grid": {"b": [1, 2], "c": ["x", "y"]}})
+
+        self.assertEqual(len(configs), 4)
+        self.assertIn({"a": 1, "b": 2, "c": "x"}, configs)
+        self.assertEqual(expand_config_grid({}), ({},))
+        with self.assertRaises(ValueError):
+            expand_config_grid({"grid": {"b": []}})
+
+    def test_cells_cover_the_product_with_stable_ids(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            matrix = SweepMatrix.from_mapping(_matrix(Path(tmp)), base_dir=Path(tmp))
+            again = SweepMatrix.from_mapping(_matrix(Path(tmp)), base_dir=Path(tmp))
+
+        cells = matrix.cells()
+
+        # max_freq: 2 PD x 2 workloads; everest: 2 configs x 2 PD x 2 workloads.
+        self.assertEqual(len(cells), 12)
+        self.assertEqual(len({cell.cell_id for cell in cells}), 12)
+        self.assertEqual([cell.cell_id for cell in cells], [cell.cell_id for cell in again.cells()])
+        self.assertEqual(cells[-1].workload.trace, str(Path(tmp) / "trace.csv"))
+
+    def test_rejects_unknown_policy_and_ambiguous_workload(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            with self.assertRaises(ValueError):
+                SweepMatrix.from_mapping(_matrix(root, policies=["no_such_policy"]), base_dir=root)
+            with self.assertRaises(ValueError):
+                SweepMatrix.from_mapping(
+                    _matrix(root, workloads=[{"name": "x", "trace": "t.csv", "simulated": _PHASES}]),
+                    base_dir=root,
+                )
+
+
+class TestRunSweep(unittest.TestCase):
+    def test_process_pool_sweep_writes_results_and_resumes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            matrix = SweepMatrix.from_mapping(_matrix(root), base_dir=root)
+            out_dir = root / "out"
+
+            first = run_sweep(matrix, out_dir, workers=2)
+            rows = load_results(out_dir / RESULTS_FILE)
+            with (out_dir / RESULTS_CSV_FILE).open(encoding="utf-8", newline="") as fp:
+                table = list(csv.DictReader(fp))
+
+            # Simulate an interrupted sweep: one row lost, one line torn mid-write.
+            lines = (out_dir / RESULTS_FILE).read_text(encoding="utf-8").splitlines()
+            (out_dir / RESULTS_FILE).write_text("\n".join(lines[1:]) + '\n{"cell_id": "torn', encoding="utf-8")
+            resumed = run_sweep(matrix, out_dir, workers=2)
+
+        self.assertEqual((first.total, first.completed, first.failed), (12, 12, 0))
+        self.assertTrue(all(row["status"] == "ok" for row in rows.values()))
+        simulated = [row for row in rows.values() if row["workload"]["name"] == "synthetic"]  # type: ignore[index]
+        self.assertTrue(all(row["simulation"]["finished"] for row in simulated))  # type: ignore[index]
+        recorded = [row for row in rows.values() if row["workload"]["name"] == "recorded"]  # type: ignore[index]
+        self.assertTrue(all(row["final_summary"]["total_windows"] == 6 for row in recorded))  # type: ignore[index]
+        self.assertEqual(len(table), 12)
+        self.assertIn("final_summary.pd_violation_count", table[0])
+        self.assertEqual((resumed.skipped, resumed.completed), (11, 1))
+
+    def test_failed_cell_is_recorded_and_retried(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            # oracle_static without workload_profiles fails in initialize().
+            matrix = SweepMatrix.from_mapping(
+                _matrix(root, policies=["oracle_static"], pd_targets=[0.1]),
+                base_dir=root,
+            )
+            out_dir = root / "out"
+
+            report = run_sweep(matrix, out_dir, workers=1)
+            rerun = run_sweep(matrix, out_dir, workers=1)
+            rows = load_results(out_dir / RESULTS_FILE)
+
+        self.assertEqual((report.completed, report.failed), (0, 2))
+        self.assertEqual((rerun.skipped, rerun.failed), (0, 2))
+        self.assertTrue(all("ValueError" in str(row["error"]) for row in rows.values()))
+
+    def test_cli_reads_matrix_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            matrix_path = root / "matrix.json"
+            matrix_path.write_text(
+                json.dumps(_matrix(root, policies=["min_freq"], pd_targets=[0.0])),
+                encoding="utf-8",
+            )
+
+            with mock.patch("builtins.print"):
+                rc = main([str(matrix_path), "--out-dir", str(root / "out"), "--workers", "1"])
+                bad_rc = main([str(root / "missing.json"), "--out-dir", str(root / "out")])
+
+            rows = load_results(root / "out" / RESULTS_FILE)
+
+        self.assertEqual(rc, 0)
+        self.assertEqual(bad_rc, 2)
+        self.assertEqual(len(rows), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()